@@ -3166,28 +3166,21 @@ def _build_learning_v2_snapshot() -> Dict[str, Any]:
 
     try:
         storage = get_storage_v2()
-        proposals_data = storage.get_proposals_v2()
-        proposals = proposals_data.get("proposals", []) if isinstance(proposals_data.get("proposals"), list) else []
         runs = storage.get_experiment_runs(limit=300)
         evidences = storage.list_outcome_evidence(limit=300)
         learning_events = storage.list_learning_events(limit=500)
 
-        status_counts: Dict[str, int] = {}
-        for row in proposals:
-            if not isinstance(row, dict):
-                continue
-            status = str(row.get("status", "unknown")).strip().lower() or "unknown"
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Funnel numbers come from the incrementally maintained counters, not a row scan.
+        status_counts = storage.get_proposal_status_counts()
 
         proposal_funnel = {
-            "created": len(proposals),
+            "created": storage.get_proposal_total(),
             "pending_approval": status_counts.get("pending_approval", 0),
             "approved": status_counts.get("approved", 0),
             "executed": status_counts.get("executed", 0),
             "verified": status_counts.get("verified", 0),
             "rejected": status_counts.get("rejected", 0),
         }
-        now_dt = datetime.now()
 
         def _safe_ratio(num: int, den: int) -> float:
             return round(float(num) / float(den), 4) if den > 0 else 0.0
@@ -3205,52 +3198,10 @@ def _build_learning_v2_snapshot() -> Dict[str, Any]:
             "verified_from_created_rate": _safe_ratio(proposal_funnel["verified"], proposal_funnel["created"]),
         }
 
-        def _parse_time(value: Any):
-            if not value:
-                return None
-            if isinstance(value, datetime):
-                return value
-            try:
-                return datetime.fromisoformat(str(value))
-            except Exception:
-                return None
-
-        def _window_funnel(hours: int) -> Dict[str, Any]:
-            window_seconds = max(1, int(hours)) * 3600
-            cohort: List[Dict[str, Any]] = []
-            for row in proposals:
-                if not isinstance(row, dict):
-                    continue
-                created_at = _parse_time(row.get("created_at"))
-                if not created_at:
-                    continue
-                if (now_dt - created_at).total_seconds() <= window_seconds:
-                    cohort.append(row)
-            created = len(cohort)
-            approved = 0
-            executed = 0
-            verified_window = 0
-            for row in cohort:
-                status = str(row.get("status", "")).strip().lower()
-                if status in {"approved", "executed", "verified"}:
-                    approved += 1
-                if status in {"executed", "verified"}:
-                    executed += 1
-                if status == "verified":
-                    verified_window += 1
-            return {
-                "created": created,
-                "approved": approved,
-                "executed": executed,
-                "verified": verified_window,
-                "approval_rate": _safe_ratio(approved, created),
-                "execution_rate": _safe_ratio(executed, approved),
-                "verification_rate": _safe_ratio(verified_window, executed),
-                "verified_from_created_rate": _safe_ratio(verified_window, created),
-            }
-
-        proposal_funnel["window_24h"] = _window_funnel(24)
-        proposal_funnel["window_7d"] = _window_funnel(24 * 7)
+        funnel_24h = storage.get_funnel_window(24)
+        funnel_7d = storage.get_funnel_window(24 * 7)
+        proposal_funnel["window_24h"] = funnel_24h
+        proposal_funnel["window_7d"] = funnel_7d
 
         verdict_counts = {"win": 0, "loss": 0, "inconclusive": 0}
         pending_recheck_runs = 0
@@ -3275,25 +3226,11 @@ def _build_learning_v2_snapshot() -> Dict[str, Any]:
         cost_values: List[float] = []
         latency_delta_values: List[float] = []
         error_delta_values: List[float] = []
-        trend_24h = {"win": 0, "loss": 0, "inconclusive": 0}
-        trend_7d = {"win": 0, "loss": 0, "inconclusive": 0}
+        trend_24h = dict(funnel_24h.get("verdicts", {}))
+        trend_7d = dict(funnel_7d.get("verdicts", {}))
         for evd in evidences:
             if not isinstance(evd, dict):
                 continue
-            verdict = str(evd.get("verdict", "")).strip().lower()
-            ts = evd.get("ts")
-            ts_dt = None
-            if ts:
-                try:
-                    ts_dt = datetime.fromisoformat(str(ts))
-                except Exception:
-                    ts_dt = None
-            if verdict in trend_24h and ts_dt and not bool(evd.get("holdout_pending", False)):
-                age_sec = (now_dt - ts_dt).total_seconds()
-                if age_sec <= 24 * 3600:
-                    trend_24h[verdict] += 1
-                if age_sec <= 7 * 24 * 3600:
-                    trend_7d[verdict] += 1
             try:
                 confidence_values.append(float(evd.get("confidence", 0.0) or 0.0))
             except (TypeError, ValueError):
@@ -3339,8 +3276,8 @@ def _build_learning_v2_snapshot() -> Dict[str, Any]:
             "trend_7d": trend_7d,
         }
         stream_counts = {"production": 0, "non_production": 0, "unknown": 0}
-        stream_trend_24h = {"production": 0, "non_production": 0}
-        stream_trend_7d = {"production": 0, "non_production": 0}
+        stream_trend_24h = dict(funnel_24h.get("events", {}))
+        stream_trend_7d = dict(funnel_7d.get("events", {}))
         source_counts: Dict[str, int] = {}
         for event in learning_events:
             if not isinstance(event, dict):
@@ -3351,13 +3288,6 @@ def _build_learning_v2_snapshot() -> Dict[str, Any]:
             stream_counts[stream] = stream_counts.get(stream, 0) + 1
             source = str(event.get("source", "")).strip() or "unknown"
             source_counts[source] = source_counts.get(source, 0) + 1
-            ts_dt = _parse_time(event.get("ts"))
-            if ts_dt:
-                age_sec = (now_dt - ts_dt).total_seconds()
-                if age_sec <= 24 * 3600:
-                    stream_trend_24h[stream] = stream_trend_24h.get(stream, 0) + 1
-                if age_sec <= 7 * 24 * 3600:
-                    stream_trend_7d[stream] = stream_trend_7d.get(stream, 0) + 1
         total_events = sum(stream_counts.values())
         production_events = stream_counts.get("production", 0)
         non_production_events = stream_counts.get("non_production", 0)
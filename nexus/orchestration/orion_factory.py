@@ -4,12 +4,26 @@ The system that creates Project Managers on demand
 
 Philosophy: Why have ONE PM when you can have INFINITE PMs?
 Each ORION is a specialized instance managing its own domain.
+
+Dispatch:
+- Tasks go through ``submit_task`` (or straight onto ``task_queue``).
+  The autonomous loop wakes on each queued task and starts it at once;
+  it never sleeps between tasks.
+- Each domain has a gate allowing ``concurrency_per_orion`` running
+  tasks per ORION in that domain. Spawning an ORION for a domain widens
+  its gate.
+- A maintenance tick scales domains up on backlog or queue wait, and
+  retires surplus idle ORIONs. It also reclaims ORIONs whose heartbeat
+  is older than ``stuck_timeout_sec``.
 """
 
 import asyncio
+import os
+import time
 import uuid
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Set
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -29,6 +43,28 @@ class OrionDomain(Enum):
     MONITORING = "monitoring"  # System monitoring
 
 
+TASK_DOMAINS = {
+    "code": OrionDomain.CODE,
+    "refactor": OrionDomain.CODE,
+    "ui": OrionDomain.UI_UX,
+    "ux": OrionDomain.UI_UX,
+    "design": OrionDomain.UI_UX,
+    "test": OrionDomain.TESTING,
+    "qa": OrionDomain.TESTING,
+    "deploy": OrionDomain.DEPLOYMENT,
+    "security": OrionDomain.SECURITY,
+    "research": OrionDomain.RESEARCH,
+    "project": OrionDomain.PROJECT,
+    "monitor": OrionDomain.MONITORING,
+}
+
+ESSENTIAL_DOMAINS = (
+    OrionDomain.PROJECT,    # Main project ORION
+    OrionDomain.CODE,       # Code ORION
+    OrionDomain.UI_UX,      # UI/UX ORION
+)
+
+
 @dataclass
 class OrionInstance:
     """A single ORION instance with its own context and responsibilities"""
@@ -42,11 +78,70 @@ class OrionInstance:
     context: Dict[str, Any] = field(default_factory=dict)
     decisions_made: int = 0
     tasks_completed: int = 0
+    active_tasks: int = 0
+    last_heartbeat: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
 
     def __post_init__(self):
         self.name = f"ORION-{self.domain.value.upper()}-{self.id[:8]}"
 
 
+@dataclass
+class _QueuedTask:
+    task: Dict[str, Any]
+    enqueued_at: float
+    future: Optional[asyncio.Future] = None
+
+
+_STOP = object()
+
+
+class _DomainGate:
+    """Resizable FIFO counting gate (single event loop, no locking needed)."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # granted just before the cancel landed
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < self.limit:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                self.active += 1
+                fut.set_result(None)
+
+
 class OrionFactory:
     """
     Factory that spawns and manages ORION instances
@@ -55,17 +150,45 @@ class OrionFactory:
     - Spawn new ORIONs on demand
     - Route tasks to appropriate ORION
     - ORION-to-ORION communication
-    - Auto-scale based on workload
+    - Auto-scale based on queue depth and queue wait
+    - Reclaim stuck ORIONs from heartbeat timestamps
     - Full autonomy mode
     """
 
-    def __init__(self, max_orions: int = 10, autonomy_level: str = "full"):
+    def __init__(
+        self,
+        max_orions: int = 10,
+        autonomy_level: str = "full",
+        concurrency_per_orion: Optional[int] = None,
+        max_inflight: Optional[int] = None,
+        stuck_timeout_sec: Optional[float] = None,
+        maintenance_interval_sec: Optional[float] = None,
+    ):
         self.max_orions = max_orions
         self.autonomy_level = autonomy_level  # "full", "semi", "manual"
         self.instances: Dict[str, OrionInstance] = {}
         self.task_queue: asyncio.Queue = asyncio.Queue()
         self.is_running = False
 
+        self.concurrency_per_orion = max(1, int(
+            concurrency_per_orion if concurrency_per_orion is not None
+            else os.getenv("ORION_CONCURRENCY_PER_ORION", "4")
+        ))
+        self.max_inflight = max(1, int(
+            max_inflight if max_inflight is not None else os.getenv("ORION_MAX_INFLIGHT", "256")
+        ))
+        self.stuck_timeout_sec = float(
+            stuck_timeout_sec if stuck_timeout_sec is not None
+            else os.getenv("ORION_STUCK_TIMEOUT_SEC", "300")
+        )
+        self.maintenance_interval_sec = max(0.01, float(
+            maintenance_interval_sec if maintenance_interval_sec is not None
+            else os.getenv("ORION_MAINTENANCE_INTERVAL_SEC", "1.0")
+        ))
+        self.scale_backlog = max(1, int(os.getenv("ORION_SCALE_BACKLOG", str(self.concurrency_per_orion))))
+        self.scale_wait_ms = float(os.getenv("ORION_SCALE_WAIT_MS", "500"))
+        self.idle_retire_sec = float(os.getenv("ORION_IDLE_RETIRE_SEC", "300"))
+
         # Domain to agent mapping
         self.domain_agents = {
             OrionDomain.CODE: ["NOVA", "CIPHER"],
@@ -78,21 +201,66 @@ class OrionFactory:
             OrionDomain.MONITORING: ["GUARDIAN"]
         }
 
+        # Indexes kept in step with instances so scaling never rescans them
+        self._domain_instances: Dict[OrionDomain, Set[str]] = {}
+        self._status_counts: Dict[str, int] = {}
+        self._orion_tasks: Dict[str, Set[asyncio.Task]] = {}
+        self._reclaimed: Set[asyncio.Task] = set()
+
+        # Dispatcher state
+        self._gates: Dict[OrionDomain, _DomainGate] = {}
+        self._wait_ewma_ms: Dict[OrionDomain, float] = {}
+        self._inflight: Set[asyncio.Task] = set()
+        self._inflight_slots: Optional[asyncio.Semaphore] = None
+        self._orion_freed = asyncio.Event()
+        self._latencies_ms: Deque[float] = deque(maxlen=4096)
+        self.dispatched = 0
+        self.completed = 0
+        self.failed = 0
+        self.reclaimed = 0
+        self.scaled_up = 0
+        self.retired = 0
+
         # Spawn initial ORIONs
         self._spawn_initial_orions()
 
     def _spawn_initial_orions(self):
         """Spawn essential ORIONs at startup"""
-        essential = [
-            OrionDomain.PROJECT,    # Main project ORION
-            OrionDomain.CODE,       # Code ORION
-            OrionDomain.UI_UX,      # UI/UX ORION
-        ]
-
-        for domain in essential:
+        for domain in ESSENTIAL_DOMAINS:
             self.spawn_orion(domain)
 
-        logger.info(f"Spawned {len(essential)} initial ORIONs")
+        logger.info(f"Spawned {len(ESSENTIAL_DOMAINS)} initial ORIONs")
+
+    # ── Bookkeeping ───────────────────────────────────────────────
+
+    def _set_status(self, orion: OrionInstance, status: str) -> None:
+        if orion.status == status:
+            return
+        self._status_counts[orion.status] = self._status_counts.get(orion.status, 0) - 1
+        self._status_counts[status] = self._status_counts.get(status, 0) + 1
+        orion.status = status
+
+    def _index(self, orion: OrionInstance) -> None:
+        self._domain_instances.setdefault(orion.domain, set()).add(orion.id)
+        self._resize_gate(orion.domain)
+
+    def _unindex(self, orion: OrionInstance) -> None:
+        self._domain_instances.get(orion.domain, set()).discard(orion.id)
+        self._resize_gate(orion.domain)
+
+    def _resize_gate(self, domain: OrionDomain) -> None:
+        gate = self._gates.get(domain)
+        if gate is not None:
+            gate.resize(self._gate_limit(domain))
+
+    def _gate_limit(self, domain: OrionDomain) -> int:
+        return self.concurrency_per_orion * max(1, len(self._domain_instances.get(domain, ())))
+
+    def _gate(self, domain: OrionDomain) -> _DomainGate:
+        gate = self._gates.get(domain)
+        if gate is None:
+            gate = self._gates[domain] = _DomainGate(self._gate_limit(domain))
+        return gate
 
     def spawn_orion(self, domain: OrionDomain, context: Dict = None) -> OrionInstance:
         """Spawn a new ORION instance for a specific domain"""
@@ -101,8 +269,11 @@ class OrionFactory:
             for orion in self.instances.values():
                 if orion.status == "idle":
                     logger.info(f"Repurposing {orion.name} for {domain.value}")
+                    self._unindex(orion)
                     orion.domain = domain
                     orion.name = f"ORION-{domain.value.upper()}-{orion.id[:8]}"
+                    orion.assigned_agents = self.domain_agents.get(domain, [])
+                    self._index(orion)
                     return orion
             raise RuntimeError(f"Max ORIONs reached ({self.max_orions})")
 
@@ -116,33 +287,41 @@ class OrionFactory:
         )
 
         self.instances[orion_id] = orion
+        self._status_counts[orion.status] = self._status_counts.get(orion.status, 0) + 1
+        self._index(orion)
         logger.info(f"Spawned new ORION: {orion.name} for domain: {domain.value}")
 
         return orion
 
-    def get_orion_for_task(self, task_type: str) -> Optional[OrionInstance]:
-        """Get the best ORION for a specific task type"""
-        domain_mapping = {
-            "code": OrionDomain.CODE,
-            "refactor": OrionDomain.CODE,
-            "ui": OrionDomain.UI_UX,
-            "ux": OrionDomain.UI_UX,
-            "design": OrionDomain.UI_UX,
-            "test": OrionDomain.TESTING,
-            "qa": OrionDomain.TESTING,
-            "deploy": OrionDomain.DEPLOYMENT,
-            "security": OrionDomain.SECURITY,
-            "research": OrionDomain.RESEARCH,
-            "project": OrionDomain.PROJECT,
-            "monitor": OrionDomain.MONITORING,
-        }
+    def retire_orion(self, orion_id: str) -> bool:
+        """Remove an idle ORION. Returns False if it is busy or unknown."""
+        orion = self.instances.get(orion_id)
+        if orion is None or orion.active_tasks:
+            return False
+        self._unindex(orion)
+        self._status_counts[orion.status] = self._status_counts.get(orion.status, 0) - 1
+        del self.instances[orion_id]
+        logger.info(f"Retired {orion.name}")
+        return True
+
+    @staticmethod
+    def domain_for_task(task_type: str) -> OrionDomain:
+        return TASK_DOMAINS.get(str(task_type).lower(), OrionDomain.PROJECT)
 
-        domain = domain_mapping.get(task_type.lower(), OrionDomain.PROJECT)
+    def get_orion_for_task(self, task_type: str) -> Optional[OrionInstance]:
+        """Get the best ORION for a specific task type (least loaded in its domain)"""
+        domain = self.domain_for_task(task_type)
 
         # Find existing ORION for this domain
-        for orion in self.instances.values():
-            if orion.domain == domain:
-                return orion
+        best = None
+        for orion_id in self._domain_instances.get(domain, ()):
+            orion = self.instances[orion_id]
+            if best is None or orion.active_tasks < best.active_tasks:
+                best = orion
+                if not orion.active_tasks:
+                    break
+        if best is not None:
+            return best
 
         # Spawn new ORION if needed (FULL AUTONOMY)
         if self.autonomy_level == "full":
@@ -150,6 +329,12 @@ class OrionFactory:
 
         return None
 
+    def heartbeat(self, orion_id: str) -> None:
+        """Mark an ORION as alive; long-running work should call this periodically."""
+        orion = self.instances.get(orion_id)
+        if orion is not None:
+            orion.last_heartbeat = time.monotonic()
+
     async def delegate_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Delegate a task to the appropriate ORION"""
         task_type = task.get("type", "project")
@@ -158,19 +343,30 @@ class OrionFactory:
         if not orion:
             return {"error": "No ORION available", "task": task}
 
-        orion.status = "working"
+        orion.active_tasks += 1
+        orion.last_heartbeat = time.monotonic()
+        self._set_status(orion, "working")
         orion.current_task = task.get("description", "Unknown task")
+        current = asyncio.current_task()
+        if current is not None:
+            self._orion_tasks.setdefault(orion.id, set()).add(current)
 
         logger.info(f"{orion.name} assigned task: {orion.current_task}")
 
-        # Execute task through ORION
-        result = await self._execute_with_orion(orion, task)
-
-        orion.status = "idle"
-        orion.current_task = None
-        orion.tasks_completed += 1
-
-        return result
+        try:
+            # Execute task through ORION
+            result = await self._execute_with_orion(orion, task)
+            orion.tasks_completed += 1
+            return result
+        finally:
+            if current is not None:
+                self._orion_tasks.get(orion.id, set()).discard(current)
+            orion.active_tasks = max(0, orion.active_tasks - 1)
+            orion.last_active = time.monotonic()
+            if not orion.active_tasks:
+                self._set_status(orion, "idle")
+                orion.current_task = None
+                self._orion_freed.set()
 
     async def _execute_with_orion(self, orion: OrionInstance, task: Dict) -> Dict:
         """Execute a task using ORION's assigned agents"""
@@ -200,12 +396,47 @@ class OrionFactory:
                     "domain": o.domain.value,
                     "status": o.status,
                     "current_task": o.current_task,
+                    "active_tasks": o.active_tasks,
                     "tasks_completed": o.tasks_completed,
                     "decisions_made": o.decisions_made,
                     "assigned_agents": o.assigned_agents
                 }
                 for o in self.instances.values()
-            ]
+            ],
+            "dispatcher": self.get_dispatch_stats(),
+        }
+
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput counters and latency percentiles (enqueue to done)."""
+        latencies = sorted(self._latencies_ms)
+
+        def pct(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3)
+
+        return {
+            "queue_depth": self.task_queue.qsize(),
+            "inflight": len(self._inflight),
+            "dispatched": self.dispatched,
+            "completed": self.completed,
+            "failed": self.failed,
+            "reclaimed": self.reclaimed,
+            "scaled_up": self.scaled_up,
+            "retired": self.retired,
+            "latency_p50_ms": pct(0.50),
+            "latency_p99_ms": pct(0.99),
+            "status_counts": {k: v for k, v in self._status_counts.items() if v},
+            "domains": {
+                domain.value: {
+                    "orions": len(self._domain_instances.get(domain, ())),
+                    "limit": gate.limit,
+                    "active": gate.active,
+                    "waiting": gate.waiting,
+                    "wait_ewma_ms": round(self._wait_ewma_ms.get(domain, 0.0), 3),
+                }
+                for domain, gate in self._gates.items()
+            },
         }
 
     def broadcast_to_orions(self, message: str, exclude: str = None):
@@ -216,59 +447,170 @@ class OrionFactory:
             # In full implementation, this would send to ORION's message queue
             logger.info(f"Broadcast to {orion.name}: {message}")
 
+    # ── Dispatcher ────────────────────────────────────────────────
+
+    def submit_task(self, task: Dict[str, Any]) -> asyncio.Future:
+        """Queue a task for the autonomous loop; the future resolves to its result."""
+        future = asyncio.get_running_loop().create_future()
+        self.task_queue.put_nowait(_QueuedTask(task, time.monotonic(), future))
+        return future
+
     async def run_autonomous_loop(self):
         """
         Main autonomous loop - runs 24/7 without human intervention
 
-        This is the HEART of the full automation system
+        This is the HEART of the full automation system. It blocks on the
+        task queue, so an idle factory costs nothing and a queued task is
+        started as soon as it arrives.
         """
         self.is_running = True
+        self._inflight_slots = asyncio.Semaphore(self.max_inflight)
         logger.info("ORION FACTORY - Autonomous Mode ACTIVATED")
         logger.info(f"Running {len(self.instances)} ORIONs")
 
-        while self.is_running:
+        maintenance = asyncio.create_task(self._maintenance_loop())
+        try:
+            while True:
+                item = await self.task_queue.get()
+                if item is _STOP:
+                    self.task_queue.task_done()
+                    break
+                if not isinstance(item, _QueuedTask):
+                    item = _QueuedTask(item, time.monotonic())
+                await self._inflight_slots.acquire()
+                runner = asyncio.create_task(self._run_queued(item))
+                self._inflight.add(runner)
+                runner.add_done_callback(self._inflight.discard)
+                self.dispatched += 1
+        finally:
+            maintenance.cancel()
+            pending = list(self._inflight)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.gather(maintenance, return_exceptions=True)
+            self.is_running = False
+
+    async def _run_queued(self, item: _QueuedTask) -> None:
+        domain = self.domain_for_task(item.task.get("type", "project"))
+        gate = self._gate(domain)
+        acquired = False
+        try:
+            await gate.acquire()
+            acquired = True
+            wait_ms = (time.monotonic() - item.enqueued_at) * 1000
+            prev = self._wait_ewma_ms.get(domain)
+            self._wait_ewma_ms[domain] = wait_ms if prev is None else prev * 0.8 + wait_ms * 0.2
+
+            await self._wait_for_orion(item.task.get("type", "project"))
+            result = await self.delegate_task(item.task)
+            self.completed += 1
+            if item.future is not None and not item.future.done():
+                item.future.set_result(result)
+        except asyncio.CancelledError:
+            me = asyncio.current_task()
+            if me not in self._reclaimed:
+                if item.future is not None and not item.future.done():
+                    item.future.cancel()
+                raise
+            self._reclaimed.discard(me)
+            self.failed += 1
+            if item.future is not None and not item.future.done():
+                item.future.set_result({"error": "ORION reclaimed after missed heartbeat", "task": item.task})
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Task dispatch error: {e}")
+            if item.future is not None and not item.future.done():
+                item.future.set_exception(e)
+        finally:
+            if acquired:
+                gate.release()
+            self._latencies_ms.append((time.monotonic() - item.enqueued_at) * 1000)
+            self._inflight_slots.release()
+            self.task_queue.task_done()
+
+    async def _wait_for_orion(self, task_type: str) -> None:
+        """At max_orions with none idle, wait until one frees up for repurposing."""
+        while True:
             try:
-                # Process task queue
-                if not self.task_queue.empty():
-                    task = await self.task_queue.get()
-                    await self.delegate_task(task)
+                self.get_orion_for_task(task_type)
+                return
+            except RuntimeError:
+                self._orion_freed.clear()
+                await self._orion_freed.wait()
 
+    async def _maintenance_loop(self):
+        while self.is_running:
+            await asyncio.sleep(self.maintenance_interval_sec)
+            try:
                 # Auto-scale: spawn more ORIONs if needed
                 await self._auto_scale()
 
                 # Health check all ORIONs
                 await self._health_check()
-
-                await asyncio.sleep(1)  # Prevent CPU spinning
-
             except Exception as e:
                 logger.error(f"Autonomous loop error: {e}")
-                await asyncio.sleep(5)
 
     async def _auto_scale(self):
-        """Auto-scale ORIONs based on workload"""
-        working_count = sum(1 for o in self.instances.values() if o.status == "working")
-        idle_count = sum(1 for o in self.instances.values() if o.status == "idle")
-
-        # If all ORIONs are working, spawn more (up to max)
-        if working_count > 0 and idle_count == 0 and len(self.instances) < self.max_orions:
-            # Determine which domain needs more ORIONs
-            domains_in_use = [o.domain for o in self.instances.values() if o.status == "working"]
-            if domains_in_use:
-                most_busy = max(set(domains_in_use), key=domains_in_use.count)
-                logger.info(f"Auto-scaling: Spawning new ORION for {most_busy.value}")
-                self.spawn_orion(most_busy)
+        """Auto-scale ORIONs on per-domain backlog and queue wait"""
+        busiest, pressure = None, 0.0
+        for domain, gate in self._gates.items():
+            backlog = gate.waiting
+            wait_ms = self._wait_ewma_ms.get(domain, 0.0)
+            if backlog >= self.scale_backlog or (backlog and wait_ms >= self.scale_wait_ms):
+                score = backlog + wait_ms / max(self.scale_wait_ms, 1.0)
+                if score > pressure:
+                    busiest, pressure = domain, score
+
+        idle = self._status_counts.get("idle", 0)
+        if busiest is not None and (len(self.instances) < self.max_orions or idle):
+            logger.info(f"Auto-scaling: Spawning new ORION for {busiest.value}")
+            try:
+                self.spawn_orion(busiest)
+                self.scaled_up += 1
+            except RuntimeError:
+                pass
+            return
+
+        # Retire surplus ORIONs that have sat idle with nothing queued
+        now = time.monotonic()
+        for domain, ids in list(self._domain_instances.items()):
+            if len(ids) <= 1 or (domain in self._gates and self._gates[domain].waiting):
+                continue
+            for orion_id in list(ids):
+                orion = self.instances[orion_id]
+                if len(ids) > 1 and not orion.active_tasks and now - orion.last_active >= self.idle_retire_sec:
+                    if self.retire_orion(orion_id):
+                        self.retired += 1
 
     async def _health_check(self):
-        """Health check all ORION instances"""
-        for orion in self.instances.values():
-            # Reset stuck ORIONs (working for more than 5 minutes)
-            if orion.status == "working":
-                # In full implementation, check timestamps
-                pass
+        """Reclaim ORIONs whose heartbeat is older than stuck_timeout_sec"""
+        if not self._status_counts.get("working"):
+            return
+        now = time.monotonic()
+        for orion in list(self.instances.values()):
+            if orion.status != "working" or now - orion.last_heartbeat < self.stuck_timeout_sec:
+                continue
+            tasks = [t for t in self._orion_tasks.get(orion.id, ()) if not t.done()]
+            logger.warning(
+                f"{orion.name} missed heartbeat for {now - orion.last_heartbeat:.0f}s; "
+                f"reclaiming ({len(tasks)} task(s))"
+            )
+            orion.last_heartbeat = now
+            self.reclaimed += 1
+            if not tasks:
+                # Nothing left to cancel: the counters leaked, reset them here
+                orion.active_tasks = 0
+                orion.current_task = None
+                self._set_status(orion, "idle")
+                continue
+            for task in tasks:
+                self._reclaimed.add(task)
+                task.cancel()  # delegate_task's finally returns the ORION to idle
 
     def shutdown(self):
         """Gracefully shutdown all ORIONs"""
+        if self.is_running:
+            self.task_queue.put_nowait(_STOP)
         self.is_running = False
         logger.info("ORION FACTORY - Shutting down...")
         for orion in self.instances.values():
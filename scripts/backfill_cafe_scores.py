@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Backfill CAFE scores on stored learning events.
+
+Streams the sealed day partitions of the learning events store in
+chunks and scores each chunk with CAFEScorer.score_events. By default
+only events without a "cafe" block are scored; --all re-scores every
+event, e.g. after a calibration changed the model confidence bias. Each
+file is rewritten atomically; lines that are not JSON objects are
+copied through unchanged.
+
+The active file takes appends from the running daemon, which a rewrite
+would lose, so it is skipped unless --include-active is given. Only pass
+it while the daemon is stopped.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from memory.cafe_loop import get_cafe_scorer  # noqa: E402
+from memory.retention import _tmp_path, list_partitions  # noqa: E402
+from memory.storage_v2 import LearningStorageV2  # noqa: E402
+
+
+def _chunks(path: Path, size: int):
+    """Chunks of parsed event dicts, with any other line kept as its raw string."""
+    chunk = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line) if line.strip() else None
+            except ValueError:
+                row = None
+            chunk.append(row if isinstance(row, dict) else line)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _line(row) -> str:
+    if isinstance(row, dict):
+        return json.dumps(row, ensure_ascii=False) + "\n"
+    return row if row.endswith("\n") else row + "\n"
+
+
+def backfill_file(path: Path, rescore_all: bool, chunk_size: int, dry_run: bool) -> tuple:
+    scorer = get_cafe_scorer()
+    rows = scored = 0
+    tmp = _tmp_path(path)
+    out = None if dry_run else open(tmp, "w", encoding="utf-8")
+    try:
+        for chunk in _chunks(path, chunk_size):
+            events = [row for row in chunk if isinstance(row, dict)]
+            rows += len(events)
+            targets = events if rescore_all else [row for row in events if "cafe" not in row]
+            scored += len(targets)
+            if out is None:
+                continue
+            for row, cafe in zip(targets, scorer.score_events(targets)):
+                row["cafe"] = cafe
+            out.write("".join(_line(row) for row in chunk))
+        if out is not None:
+            out.close()
+            out = None
+            if scored:
+                os.replace(tmp, path)
+    finally:
+        if out is not None:
+            out.close()
+        if tmp.exists():
+            tmp.unlink()
+    return rows, scored
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data")
+    parser.add_argument("--all", action="store_true", help="Re-score events that already have a score")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many events would be scored")
+    parser.add_argument("--include-active", action="store_true",
+                        help="Also rewrite the active file (only while the daemon is stopped)")
+    args = parser.parse_args()
+
+    storage = LearningStorageV2(base_path=str(args.data_dir))
+    active = storage.learning_events_file
+    files = [path for _day, path in list_partitions(active)]
+    if args.include_active and active.exists():
+        files.append(active)
+
+    print("=" * 68)
+    print(f"CAFE score backfill{' (dry run)' if args.dry_run else ''}: {len(files)} files")
+    print("=" * 68)
+    total_rows = total_scored = 0
+    start = time.perf_counter()
+    for path in files:
+        rows, scored = backfill_file(path, args.all, max(1, args.chunk_size), args.dry_run)
+        total_rows += rows
+        total_scored += scored
+        print(f"{path.name:<28} {rows:10d} rows {scored:10d} scored")
+    elapsed = time.perf_counter() - start
+    print(f"{'total':<28} {total_rows:10d} rows {total_scored:10d} scored in {elapsed:.1f}s")
+    if active.exists() and not args.include_active:
+        print(f"{active.name} skipped: stop the daemon and pass --include-active to backfill it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
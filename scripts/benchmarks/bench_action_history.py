@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark ActionExecutor start-up with a large action history: the legacy
+full parse into ActionResult objects vs the bounded ring + stats snapshot.
+
+Each mode runs in a fresh interpreter so start-up time and peak RSS are
+measured in isolation.
+"""
+
+import argparse
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+ACTION_TYPES = ["read_file", "write_file", "run_python", "run_shell", "http_get", "web_search"]
+
+
+def _write_history(path: Path, count: int) -> None:
+    statuses = ["success"] * 8 + ["failed", "timeout"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            status = statuses[i % len(statuses)]
+            f.write(json.dumps({
+                "action_id": f"action_{i}",
+                "action_type": ACTION_TYPES[i % len(ACTION_TYPES)],
+                "status": status,
+                "output": f"output line for action {i}",
+                "error": None if status == "success" else "boom",
+                "data": {"i": i},
+                "started_at": "2026-01-01T00:00:00",
+                "completed_at": "2026-01-01T00:00:01",
+                "duration_ms": float(i % 5000),
+                "objective_success": status == "success",
+                "failure_code": None if status == "success" else ("timeout" if status == "timeout" else "handler_error"),
+                "policy_blocked": False,
+                "verification": {},
+            }) + "\n")
+
+
+def _measure(mode: str, data_dir: Path) -> None:
+    from brain import action_executor as ae
+
+    ae.DATA_DIR = data_dir
+    ae.WORKSPACE_DIR = data_dir / "workspace"
+    start = time.perf_counter()
+    if mode == "legacy":
+        history = []
+        with open(data_dir / "action_history.jsonl", "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    data["status"] = ae.ActionStatus(data.get("status", "failed"))
+                    history.append(ae.ActionResult(**data))
+                except Exception:
+                    continue
+        total = len(history)
+    else:
+        executor = ae.ActionExecutor()
+        total = executor.get_stats()["total"]
+    elapsed = time.perf_counter() - start
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "rss_kb": rss_kb, "total": total}))
+
+
+def _run(mode: str, data_dir: Path) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--measure", mode, "--data-dir", str(data_dir)],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Action history start-up benchmark")
+    parser.add_argument("--actions", type=int, default=1_000_000, help="Historical actions in the file")
+    parser.add_argument("--measure", choices=["legacy", "cold", "warm"], help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        _measure(args.measure, Path(args.data_dir))
+        return
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_actions_"))
+    try:
+        _write_history(workdir / "action_history.jsonl", args.actions)
+        size_mb = (workdir / "action_history.jsonl").stat().st_size / 1e6
+        legacy = _run("legacy", workdir)
+        cold = _run("cold", workdir)   # no stats snapshot yet: one streaming pass builds it
+        warm = _run("warm", workdir)   # snapshot present: only the ring is read from the tail
+
+        print("=" * 72)
+        print("ACTION HISTORY START-UP BENCHMARK")
+        print("=" * 72)
+        print(f"history                    {args.actions} actions, {size_mb:.1f} MB")
+        for name, res in (("legacy full parse", legacy), ("ring, no snapshot", cold), ("ring + snapshot", warm)):
+            print(f"{name:<26} {res['seconds'] * 1000:10.1f} ms   peak RSS {res['rss_kb'] / 1024:8.1f} MB   total={res['total']}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
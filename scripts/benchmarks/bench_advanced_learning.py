@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark AdvancedLearningEngine spaced repetition at 100k items under a
+review-heavy workload: fetch the next due batch, review every item in it,
+occasionally re-add known content.
+
+The legacy path (filter + sort of every item per fetch, full state
+rewrite per review) is reconstructed inline and sampled, because a full
+run would take hours at this size.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _seed(path: Path, items: int) -> None:
+    rng = random.Random(1)
+    now = datetime.now()
+    rows = []
+    for n in range(items):
+        due = now + timedelta(hours=rng.uniform(-72, 72))
+        rows.append({
+            "id": f"seed_{n}", "content": f"fact number {n}", "category": f"cat{n % 25}",
+            "importance": rng.randint(1, 10), "created": (now - timedelta(days=30)).isoformat(),
+            "last_reviewed": None, "review_count": rng.randint(0, 5), "ease_factor": 2.5,
+            "interval_days": 1, "next_review": due.isoformat(), "mastery_level": 0.0, "tags": [],
+        })
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "advanced_learning_state.json").write_text(
+        json.dumps({"knowledge_items": rows, "learning_sessions": []}), encoding="utf-8"
+    )
+
+
+def _legacy_due(engine):
+    now = datetime.now()
+    due = [i for i in engine.knowledge_items if i.next_review is None or i.next_review <= now]
+    due.sort(key=lambda i: (i.next_review.timestamp() if i.next_review else 0, -i.importance, i.created.timestamp()))
+    return due
+
+
+def _legacy_save(engine, path: Path) -> None:
+    payload = {
+        "updated_at": datetime.now().isoformat(),
+        "knowledge_items": [engine._serialize_knowledge_item(i) for i in engine.knowledge_items],
+        "learning_sessions": [],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=500, help="Fetch-and-review rounds")
+    parser.add_argument("--batch", type=int, default=20, help="Items fetched per round")
+    parser.add_argument("--legacy-rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["ADVANCED_LEARNING_MAX_ITEMS"] = "0"
+    from memory.advanced_learning import AdvancedLearningEngine
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_adv_learning_"))
+    try:
+        _seed(workdir, args.items)
+        start = time.perf_counter()
+        engine = AdvancedLearningEngine(str(workdir))
+        load_s = time.perf_counter() - start
+        rng = random.Random(2)
+
+        fetch, review, adds = [], [], []
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            due = engine.get_items_for_review(limit=args.batch)
+            fetch.append(time.perf_counter() - t0)
+            for item in due:
+                t0 = time.perf_counter()
+                engine.review_item(item, rng.randint(2, 5))
+                review.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            engine.add_knowledge(f"fact  number {rng.randrange(args.items)}", f"CAT{rng.randrange(25)}")
+            adds.append(time.perf_counter() - t0)
+
+        legacy_fetch, legacy_review, legacy_add = [], [], []
+        for _ in range(args.legacy_rounds):
+            t0 = time.perf_counter()
+            due = _legacy_due(engine)[: args.batch]
+            legacy_fetch.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            _legacy_save(engine, workdir / "legacy_state.json")
+            legacy_review.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            target = f"fact number {rng.randrange(args.items)}"
+            next((i for i in engine.knowledge_items if i.content.strip().lower() == target), None)
+            legacy_add.append(time.perf_counter() - t0)
+
+        def ms(values):
+            return sum(values) / len(values) * 1000
+
+        print("=" * 72)
+        print(f"Spaced repetition at {args.items} items ({args.rounds} rounds x {args.batch} reviews)")
+        print("=" * 72)
+        print(f"load state + journal          {load_s * 1000:10.1f} ms")
+        print(f"{'':30}{'legacy':>12}{'heap+journal':>16}")
+        print(f"{'fetch due batch (ms)':<30}{ms(legacy_fetch):12.3f}{ms(fetch):16.3f}")
+        print(f"{'review one item (ms)':<30}{ms(legacy_review):12.3f}{ms(review):16.3f}")
+        print(f"{'add_knowledge dedup (ms)':<30}{ms(legacy_add):12.3f}{ms(adds):16.3f}")
+        round_legacy = ms(legacy_fetch) + args.batch * ms(legacy_review)
+        round_new = ms(fetch) + args.batch * ms(review)
+        print(f"{'full round (ms)':<30}{round_legacy:12.1f}{round_new:16.3f}   ({round_legacy / round_new:.0f}x)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark NexusBrain periodic cycles: one sleeping thread per cycle plus
+the daemon heartbeat loop vs the shared PeriodicScheduler.
+
+Both setups register the same jobs (five brain cycles plus the daemon's
+self-reminder and heartbeat jobs). Idle wakeups are counted over a window
+in which no job is due. Shutdown latency is the time shutdown() takes to
+return. The legacy cycle threads are reproduced inline; their wake
+interval is NEXUS_CYCLE_INTERVAL, scaled down by --scale so the window
+stays short, and reported per real minute.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from core.periodic_scheduler import PeriodicScheduler  # noqa: E402
+
+CYCLES_MIN = {"news_scan": 5, "github_scan": 15, "consolidate": 60, "deep_learning": 360, "report": 1440}
+CYCLE_INTERVAL_SEC = 60     # NEXUS_CYCLE_INTERVAL default
+HEARTBEAT_SEC = 60          # NEXUS_HEARTBEAT_INTERVAL default
+
+
+class LegacyCycles:
+    """NexusBrain.start / shutdown and the daemon loop before the scheduler."""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+        self.running = False
+        self.wakeups = 0
+        self._threads = []
+        self._last = {}
+
+    def _run_cycle(self, name, interval_minutes):
+        while self.running:
+            last = self._last.get(name)
+            now = time.monotonic()
+            if last is None or (now - last) >= interval_minutes * 60 * self.scale:
+                self._last[name] = now
+            time.sleep(CYCLE_INTERVAL_SEC * self.scale)
+            self.wakeups += 1
+
+    def _daemon_heartbeat(self):
+        while self.running:
+            time.sleep(HEARTBEAT_SEC * self.scale)
+            self.wakeups += 1
+
+    def start(self):
+        self.running = True
+        targets = [(self._run_cycle, (n, m)) for n, m in CYCLES_MIN.items()] + [(self._daemon_heartbeat, ())]
+        for target, args in targets:
+            thread = threading.Thread(target=target, args=args, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self):
+        self.running = False
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+def _scheduler(scale: float) -> PeriodicScheduler:
+    scheduler = PeriodicScheduler(max_workers=2, name="bench")
+    for name, minutes in CYCLES_MIN.items():
+        scheduler.add_job(name, minutes * 60 * scale, lambda: None, jitter=0.05)
+    scheduler.add_job("self_reminder", HEARTBEAT_SEC * scale, lambda: None, first_delay_sec=HEARTBEAT_SEC * scale)
+    scheduler.add_job("heartbeat", HEARTBEAT_SEC * 5 * scale, lambda: None, first_delay_sec=HEARTBEAT_SEC * 5 * scale)
+    return scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.01, help="Time compression for the legacy wake loop")
+    parser.add_argument("--window-sec", type=float, default=3.0, help="Idle observation window (real seconds)")
+    args = parser.parse_args()
+    minutes_per_window = args.window_sec / (60 * args.scale)
+
+    legacy = LegacyCycles(args.scale)
+    legacy.start()
+    time.sleep(0.1)
+    before = legacy.wakeups
+    time.sleep(args.window_sec)
+    legacy_wakeups = legacy.wakeups - before
+    start = time.perf_counter()
+    legacy.shutdown()
+    legacy_shutdown = time.perf_counter() - start
+
+    # Unscaled intervals so nothing is due inside the window: any wakeup is overhead.
+    scheduler = _scheduler(1.0)
+    scheduler.run_pending()  # the cycles' initial run at start
+    scheduler.start()
+    time.sleep(0.1)
+    before = scheduler.wakeups
+    time.sleep(args.window_sec)
+    sched_wakeups = scheduler.wakeups - before
+    start = time.perf_counter()
+    scheduler.stop(timeout=5)
+    sched_shutdown = time.perf_counter() - start
+
+    # Legacy shutdown at real intervals: each join waits up to 5s for a thread
+    # asleep for NEXUS_CYCLE_INTERVAL, so it is bounded by 6 x 5s.
+    real = LegacyCycles(1.0)
+    real.start()
+    time.sleep(0.1)
+    start = time.perf_counter()
+    real.shutdown()
+    real_shutdown = time.perf_counter() - start
+
+    print("=" * 72)
+    print(f"NexusBrain periodic cycles ({len(CYCLES_MIN)} cycles + daemon heartbeat)")
+    print("=" * 72)
+    print(f"{'':40}{'threads+sleep':>16}{'scheduler':>14}")
+    print(f"{'idle wakeups / minute':<40}{legacy_wakeups / minutes_per_window:16.1f}"
+          f"{sched_wakeups / (args.window_sec / 60):14.1f}")
+    print(f"{'threads':<40}{len(CYCLES_MIN) + 1:16d}{1 + scheduler.max_workers:14d}")
+    print(f"{'shutdown latency (ms, real intervals)':<40}{real_shutdown * 1000:16.1f}{sched_shutdown * 1000:14.2f}")
+    print(f"{'shutdown latency (ms, scaled)':<40}{legacy_shutdown * 1000:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
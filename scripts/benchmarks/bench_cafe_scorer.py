@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark CAFEScorer throughput over 1M learning events: score_event per
+event with the old unmemoized model-bias scan vs score_events batches
+with the LRU bias resolver.
+
+Also times the column kernel alone (no per-event result dicts) and the
+bias lookup by itself. Events are generated chunk by chunk so memory
+stays bounded; the legacy path is the same scorer with its bias cache
+bypassed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _chunk(rng: random.Random, size: int, models: list) -> list:
+    events = []
+    for _ in range(size):
+        model = rng.choice(models)
+        event = {
+            "value_score": rng.random(),
+            "novelty_score": rng.random(),
+            "confidence": rng.random(),
+            "risk_score": rng.random(),
+        }
+        if rng.random() < 0.5:
+            event["model"] = model
+        else:
+            event["context"] = {"route_model": model}
+        events.append(event)
+    return events
+
+
+def _timed(label: str, total: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {total / elapsed:12.0f} events/s   {elapsed:7.2f} s")
+    return total / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=50_000)
+    parser.add_argument("--bias-keys", type=int, default=200)
+    parser.add_argument("--models", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    bias = {f"family-{i}": round((i % 9 - 4) / 25, 3) for i in range(args.bias_keys)}
+    os.environ["CAFE_MODEL_CONF_BIAS_JSON"] = json.dumps(bias)
+    from memory import cafe_loop
+
+    scorer = cafe_loop.CAFEScorer()
+    models = [f"vendor/family-{i % (args.bias_keys * 2)}-v{i}" for i in range(args.models)]
+    chunks = max(1, args.events // args.chunk)
+    total = chunks * args.chunk
+
+    def each_chunk(fn):
+        rng = random.Random(0)
+        for _ in range(chunks):
+            fn(_chunk(rng, args.chunk, models))
+
+    print("=" * 72)
+    print(f"CAFEScorer over {total} events ({args.bias_keys} bias keys, {args.models} model names, "
+          f"numpy={'yes' if cafe_loop.NUMPY_AVAILABLE else 'no'})")
+    print("=" * 72)
+    _timed("generate events only", total, lambda: each_chunk(lambda events: None))
+
+    memoized = scorer._resolve_bias
+    scorer._resolve_bias = scorer._resolve_model_bias
+    legacy = _timed("score_event, unmemoized bias", total,
+                    lambda: each_chunk(lambda events: [scorer.score_event(e) for e in events]))
+    scorer._resolve_bias = memoized
+    single = _timed("score_event, LRU bias", total,
+                    lambda: each_chunk(lambda events: [scorer.score_event(e) for e in events]))
+    batch = _timed("score_events", total, lambda: each_chunk(scorer.score_events))
+    print(f"{'speedup vs legacy':<34} {single / legacy:11.1f}x (single)   {batch / legacy:5.1f}x (batch)")
+
+    rng = random.Random(1)
+    columns = [[rng.random() for _ in range(args.chunk)] for _ in range(4)] + [[0.05] * args.chunk]
+    _timed("score_columns kernel", total, lambda: [scorer.score_columns(*columns) for _ in range(chunks)])
+
+    names = [models[i % len(models)] for i in range(total)]
+    start = time.perf_counter()
+    for name in names:
+        scorer._resolve_model_bias(name)
+    scan = (time.perf_counter() - start) / total * 1e9
+    start = time.perf_counter()
+    for name in names:
+        scorer._model_bias(name)
+    cached = (time.perf_counter() - start) / total * 1e9
+    print(f"{'bias lookup, linear scan':<34} {scan:12.0f} ns/lookup")
+    print(f"{'bias lookup, LRU':<34} {cached:12.0f} ns/lookup   {scorer._resolve_bias.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark similar-error lookup: the legacy linear word-overlap scan vs the
+MinHash/LSH index used by EvolutionEngine, on a synthetic error corpus.
+
+Recall is measured against brute-force exact Jaccard: a query counts as a hit
+when the index returns the corpus entry with the highest true Jaccard (among
+entries at or above the threshold).
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from src.evolution.similarity_index import MinHashLSHIndex, jaccard, normalize_error_tokens  # noqa: E402
+
+ERROR_TYPES = [
+    "ConnectionError", "TimeoutError", "KeyError", "ValueError", "PermissionError",
+    "FileNotFoundError", "ImportError", "RuntimeError", "TypeError", "OSError",
+]
+
+
+def _make_corpus(size: int, vocab_size: int, rng: random.Random) -> list:
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    corpus = []
+    for i in range(size):
+        words = rng.sample(vocab, 8)
+        corpus.append(
+            f"{rng.choice(ERROR_TYPES)}: {' '.join(words)} at /srv/app/mod_{i % 97}.py line {rng.randint(1, 999)}"
+        )
+    return corpus
+
+
+def _mutate(text: str, rng: random.Random) -> str:
+    words = text.split()
+    # Swap one content word and change the volatile tail (path, line number).
+    idx = rng.randrange(1, 9)
+    words[idx] = f"q{rng.randint(0, 10**6)}"
+    return " ".join(words[:9]) + f" at /tmp/other_{rng.randint(0, 99)}.py line {rng.randint(1, 9999)}"
+
+
+def _legacy_scan(error: str, names: list):
+    error_words = set(error.lower().split())
+    for key, name in names:
+        pattern_words = set(name.lower().split())
+        if len(error_words & pattern_words) / max(len(error_words), 1) > 0.5:
+            return key
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Similar-error lookup benchmark")
+    parser.add_argument("--errors", type=int, default=100000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=200, help="Number of lookups")
+    parser.add_argument("--vocab", type=int, default=20000, help="Synthetic vocabulary size")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Jaccard threshold")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = _make_corpus(args.errors, args.vocab, rng)
+    keys = [f"error:{i}" for i in range(len(corpus))]
+    token_sets = [normalize_error_tokens(text) for text in corpus]
+    legacy_names = [(key, f"Error: {text[:50]}") for key, text in zip(keys, corpus)]
+
+    index = MinHashLSHIndex()
+    start = time.perf_counter()
+    for key, tokens in zip(keys, token_sets):
+        index.add_tokens(key, tokens)
+    build_seconds = time.perf_counter() - start
+
+    picks = [rng.randrange(len(corpus)) for _ in range(args.queries)]
+    queries = [_mutate(corpus[i], rng) for i in picks]
+
+    # Ground truth: best exact Jaccard over the whole corpus.
+    truth = []
+    for query in queries:
+        q_tokens = normalize_error_tokens(query)
+        best_key, best_score = None, 0.0
+        for key, tokens in zip(keys, token_sets):
+            score = jaccard(q_tokens, tokens)
+            if score > best_score:
+                best_key, best_score = key, score
+        truth.append(best_key if best_score >= args.threshold else None)
+
+    start = time.perf_counter()
+    legacy_results = [_legacy_scan(query, legacy_names) for query in queries]
+    legacy_per_query = (time.perf_counter() - start) / max(1, len(queries))
+
+    start = time.perf_counter()
+    lsh_results = [index.query(query, threshold=args.threshold, top_k=1) for query in queries]
+    lsh_per_query = (time.perf_counter() - start) / max(1, len(queries))
+    candidate_sizes = [len(index.candidates(normalize_error_tokens(q))) for q in queries]
+
+    expected = [t for t in truth if t is not None]
+    lsh_hits = sum(1 for t, r in zip(truth, lsh_results) if t is not None and r and r[0][0] == t)
+    legacy_hits = sum(1 for t, r in zip(truth, legacy_results) if t is not None and r == t)
+
+    print("=" * 72)
+    print("SIMILAR-ERROR LOOKUP BENCHMARK")
+    print("=" * 72)
+    print(f"corpus                     {len(corpus)} errors, {len(expected)}/{len(queries)} queries with a match")
+    print(f"index build                {build_seconds:9.2f} s")
+    print(f"linear scan                {legacy_per_query * 1000:9.3f} ms/query, recall {legacy_hits / max(1, len(expected)):.3f}")
+    print(f"minhash/lsh                {lsh_per_query * 1000:9.3f} ms/query, recall {lsh_hits / max(1, len(expected)):.3f}")
+    print(f"avg candidates re-ranked   {sum(candidate_sizes) / max(1, len(candidate_sizes)):9.1f}")
+    print(f"speedup                    {legacy_per_query / max(lsh_per_query, 1e-9):9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark experiment-run updates: legacy whole-file JSON rewrite vs the
+append-only run log used by LearningStorageV2.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from src.memory.storage_v2 import ExperimentRunLog, read_tail_lines  # noqa: E402
+
+
+def _legacy_update(path: Path, run_id: str, updates: dict) -> None:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for run in data["runs"]:
+        if run.get("id") == run_id:
+            run.update(updates)
+            break
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _seed_runs(count: int) -> list:
+    return [
+        {"id": f"run_{i}", "proposal_id": f"pv2_{i}", "execution_status": "running", "artifacts": {"i": i}}
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Experiment run update benchmark")
+    parser.add_argument("--runs", type=int, default=3000, help="Live runs in the store")
+    parser.add_argument("--updates", type=int, default=10000, help="Number of updates to apply")
+    parser.add_argument("--legacy-updates", type=int, default=500, help="Updates for the slow legacy path")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_runs_"))
+    try:
+        runs = _seed_runs(args.runs)
+
+        legacy_path = workdir / "experiment_runs_v2.json"
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs}, f, indent=2)
+        start = time.perf_counter()
+        for i in range(args.legacy_updates):
+            _legacy_update(legacy_path, f"run_{i % args.runs}", {"execution_status": "completed", "n": i})
+        legacy_per_op = (time.perf_counter() - start) / max(1, args.legacy_updates)
+
+        log = ExperimentRunLog(workdir / "experiment_runs_v2.jsonl", max_runs=args.runs)
+        log.import_rows(runs)
+        start = time.perf_counter()
+        for i in range(args.updates):
+            log.update(f"run_{i % args.runs}", {"execution_status": "completed", "n": i})
+        log_elapsed = time.perf_counter() - start
+        log_per_op = log_elapsed / max(1, args.updates)
+
+        events_path = workdir / "learning_events.jsonl"
+        with open(events_path, "w", encoding="utf-8") as f:
+            for i in range(200000):
+                f.write(json.dumps({"id": f"evt_{i}", "content": "x" * 64}) + "\n")
+        start = time.perf_counter()
+        with open(events_path, "r", encoding="utf-8") as f:
+            [x for x in f.readlines() if x.strip()][-100:]
+        full_tail = time.perf_counter() - start
+        start = time.perf_counter()
+        read_tail_lines(events_path, limit=100)
+        seek_tail = time.perf_counter() - start
+
+        print("=" * 72)
+        print("EXPERIMENT RUN STORE BENCHMARK")
+        print("=" * 72)
+        print(f"live runs                  {args.runs}")
+        print(f"legacy update              {legacy_per_op * 1000:9.3f} ms/op ({args.legacy_updates} ops)")
+        print(f"run log update             {log_per_op * 1000:9.3f} ms/op ({args.updates} ops, {log_elapsed:.2f}s)")
+        print(f"speedup                    {legacy_per_op / max(log_per_op, 1e-9):9.1f}x")
+        print(f"tail 100 of 200k (readall) {full_tail * 1000:9.3f} ms")
+        print(f"tail 100 of 200k (seek)    {seek_tail * 1000:9.3f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark log-call latency from a hot loop: handlers called synchronously
+in the caller thread vs the queued nexus_logger pipeline.
+
+Each mode runs in a fresh interpreter so logging is configured from scratch.
+Console output goes to /dev/null and the file handler writes JSON lines,
+which is how production runs with NEXUS_LOG_FILE set.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _measure(iterations: int) -> None:
+    from core.nexus_logger import get_logger, get_logging_stats, shutdown_logging
+
+    logger = get_logger("bench.hot_loop")
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        logger.info("processed item %d of batch %s", i, "alpha")
+        samples.append(time.perf_counter_ns() - start)
+    stats = get_logging_stats()
+    drain_start = time.perf_counter()
+    shutdown_logging()
+    samples.sort()
+    print(json.dumps({
+        "mean_us": sum(samples) / len(samples) / 1000,
+        "p50_us": samples[len(samples) // 2] / 1000,
+        "p99_us": samples[int(len(samples) * 0.99)] / 1000,
+        "max_us": samples[-1] / 1000,
+        "drain_ms": (time.perf_counter() - drain_start) * 1000,
+        "dropped": stats.get("dropped", 0),
+    }))
+
+
+def _run_mode(mode: str, iterations: int, log_dir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "NEXUS_LOG_ASYNC": "true" if mode == "queued" else "false",
+        "NEXUS_LOG_FILE": os.path.join(log_dir, f"{mode}.log"),
+        "NEXUS_LOG_MAX_BYTES": "0",
+        "NEXUS_LOG_QUEUE_SIZE": str(iterations + 100),
+    })
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--iterations", str(iterations)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.stderr = open(os.devnull, "w")
+        _measure(args.iterations)
+        return
+
+    print("=" * 72)
+    print(f"Log-call latency in the caller thread ({args.iterations} calls)")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory() as log_dir:
+        for mode in ("sync", "queued"):
+            r = _run_mode(mode, args.iterations, log_dir)
+            print(
+                f"{mode:<7} mean={r['mean_us']:7.2f} us  p50={r['p50_us']:7.2f} us  "
+                f"p99={r['p99_us']:7.2f} us  max={r['max_us']:9.1f} us  "
+                f"drain={r['drain_ms']:7.1f} ms  dropped={r['dropped']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Load-test OrionFactory dispatch: push stub tasks through the autonomous
+loop and report throughput and p50/p99 latency (enqueue to completion).
+
+The legacy loop (one task per iteration, awaited inline, then a 1s sleep)
+is reproduced inline and run on a small sample; its throughput cannot
+exceed one task per second, so the full task count is extrapolated.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from core.orion_factory import OrionFactory  # noqa: E402
+
+TASK_TYPES = ["code", "ui", "test", "deploy", "security", "research", "project", "monitor"]
+
+
+class StubFactory(OrionFactory):
+    async def _execute_with_orion(self, orion, task):
+        await asyncio.sleep(task["work_ms"] / 1000)
+        orion.decisions_made += 1
+        return {"orion": orion.name, "status": "completed"}
+
+
+def _tasks(count: int, work_ms: float):
+    rng = random.Random(5)
+    return [
+        {"type": rng.choice(TASK_TYPES), "description": f"stub {i}", "work_ms": rng.uniform(0.5, 1.5) * work_ms}
+        for i in range(count)
+    ]
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _legacy(tasks, sleep_sec: float):
+    factory = StubFactory()
+    queue = asyncio.Queue()
+    start = time.perf_counter()
+    for task in tasks:
+        queue.put_nowait(task)
+    latencies = []
+    while not queue.empty():
+        task = await queue.get()
+        await factory.delegate_task(task)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(sleep_sec)
+    return time.perf_counter() - start, latencies
+
+
+async def _dispatcher(tasks, concurrency: int):
+    factory = StubFactory(concurrency_per_orion=concurrency, maintenance_interval_sec=0.05)
+    loop = asyncio.create_task(factory.run_autonomous_loop())
+    start = time.perf_counter()
+    futures = [factory.submit_task(task) for task in tasks]
+    await asyncio.gather(*futures)
+    elapsed = time.perf_counter() - start
+    factory.shutdown()
+    await loop
+    return elapsed, factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--work-ms", type=float, default=50.0, help="Mean stub task duration")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent tasks per ORION")
+    parser.add_argument("--legacy-tasks", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = _tasks(args.tasks, args.work_ms)
+    legacy_s, legacy_lat = asyncio.run(_legacy(tasks[: args.legacy_tasks], 1.0))
+    per_task = legacy_s / args.legacy_tasks
+    new_s, factory = asyncio.run(_dispatcher(tasks, args.concurrency))
+    stats = factory.get_dispatch_stats()
+
+    print("=" * 72)
+    print(f"OrionFactory load test ({args.tasks} stub tasks, ~{args.work_ms:.0f} ms each)")
+    print("=" * 72)
+    print(f"legacy loop      {1 / per_task:10.2f} tasks/s   {args.tasks} tasks ~{per_task * args.tasks:8.0f} s"
+          f"   (measured on {args.legacy_tasks}, p99 of sample {_pct(legacy_lat, 0.99):.0f} ms)")
+    print(f"dispatcher       {args.tasks / new_s:10.2f} tasks/s   {args.tasks} tasks  {new_s:8.2f} s"
+          f"   p50={stats['latency_p50_ms']:.0f} ms  p99={stats['latency_p99_ms']:.0f} ms")
+    print(f"orions={len(factory.instances)}  scaled_up={stats['scaled_up']}  failed={stats['failed']}")
+    print(f"throughput gain  {(args.tasks / new_s) * per_task:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark PolicyBandit decisions per second: the old full state rewrite
+(arms plus 1000 history entries) on every select and update vs the
+in-memory state with a journal row per decision, single and batched.
+
+A decision is one Thompson draw plus the verdict update that follows it.
+The legacy path is reconstructed inline from the same bandit state.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _legacy(bandit, ops: int) -> float:
+    state = bandit.state
+    state["history"] = [
+        {"ts": datetime.now().isoformat(), "selected": state["selected"], "verdict": "win", "weight": 1.0, "metadata": {}}
+        for _ in range(1000)
+    ]
+    start = time.perf_counter()
+    for i in range(ops):
+        selected = {family: bandit._sample_arm(family) for family in bandit.POLICY_FAMILIES}
+        state["selected"] = selected
+        bandit.storage.save_policy_state(state)
+        bandit._apply_update(selected, float(i % 3 != 0), 1.0, 1.0)
+        state["history"].append(
+            {"ts": datetime.now().isoformat(), "selected": selected, "verdict": "win", "weight": 1.0, "metadata": {}}
+        )
+        state["history"] = state["history"][-1000:]
+        bandit.storage.save_policy_state(state)
+    return ops / (time.perf_counter() - start)
+
+
+def _journal(bandit, ops: int, batch: int) -> float:
+    start = time.perf_counter()
+    done = 0
+    while done < ops:
+        selections = bandit.select_policies(batch) if batch > 1 else [bandit.select_policy()]
+        for selected in selections:
+            bandit.update("win" if done % 3 else "loss", selected=selected)
+            done += 1
+    bandit.flush()
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=3000)
+    parser.add_argument("--batch", type=int, default=32)
+    args = parser.parse_args()
+
+    random.seed(0)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_policy_bandit_"))
+    try:
+        from memory import storage_v2
+        from memory.policy_bandit import PolicyBandit
+
+        def fresh(name):
+            storage_v2.LearningStorageV2._instance = None
+            storage_v2._storage_v2 = storage_v2.LearningStorageV2(base_path=str(workdir / name))
+            return PolicyBandit()
+
+        os.environ.setdefault("POLICY_CHECKPOINT_EVERY", "200")
+        print("=" * 72)
+        print(f"PolicyBandit decisions/s ({args.ops} select+update decisions)")
+        print("=" * 72)
+        legacy = _legacy(fresh("legacy"), max(200, args.ops // 10))
+        single = _journal(fresh("journal"), args.ops, 1)
+        batched = _journal(fresh("batched"), args.ops, args.batch)
+        print(f"{'full rewrite per call':<30} {legacy:10.0f} decisions/s")
+        print(f"{'journal, select_policy':<30} {single:10.0f} decisions/s   {single / legacy:6.1f}x")
+        print(f"{f'journal, select_policies({args.batch})':<30} {batched:10.0f} decisions/s   {batched / legacy:6.1f}x")
+
+        bandit = fresh("replay")
+        bandit.checkpoint_every = args.ops * 10
+        for _ in range(args.ops):
+            bandit.update("win", selected=bandit.select_policy())
+        start = time.perf_counter()
+        PolicyBandit()
+        print(f"{f'restart replaying {args.ops * 2} rows':<30} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
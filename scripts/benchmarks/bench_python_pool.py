@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark run_python latency: a cold ``python -c`` subprocess per snippet
+vs the warm PythonInterpreterPool.
+
+Snippets are the kind agents emit: tiny prints plus some stdlib imports.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+SNIPPETS = [
+    "print(2 + 2)",
+    "import json; print(json.dumps({'a': [1, 2, 3]}))",
+    "import re, collections; print(collections.Counter(re.findall(r'\\w+', 'a b a c b a')).most_common(1))",
+    "import datetime; print(datetime.date(2026, 1, 1).isoformat())",
+    "import statistics; print(statistics.mean(range(1000)))",
+]
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _summary(name, samples):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{name:<8} n={len(ms):<5} mean={statistics.mean(ms):8.2f} ms  "
+        f"p50={_percentile(ms, 50):8.2f} ms  p95={_percentile(ms, 95):8.2f} ms"
+    )
+    return statistics.mean(ms)
+
+
+def bench_cold(iterations, cwd):
+    samples = []
+    for i in range(iterations):
+        code = SNIPPETS[i % len(SNIPPETS)]
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=30, cwd=cwd)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_pooled(iterations, cwd, size):
+    from brain.python_pool import PythonInterpreterPool
+
+    pool = PythonInterpreterPool(size=size)
+    pool.prestart()
+    samples = []
+    try:
+        for i in range(iterations):
+            code = SNIPPETS[i % len(SNIPPETS)]
+            start = time.perf_counter()
+            pool.run(code, cwd=cwd, timeout=30)
+            samples.append(time.perf_counter() - start)
+    finally:
+        stats = dict(pool.stats)
+        pool.shutdown()
+    print(f"pool stats: {stats}")
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=1)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"run_python latency: cold subprocess vs warm pool ({args.iterations} snippets)")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory() as cwd:
+        cold = _summary("cold", bench_cold(args.iterations, cwd))
+        pooled = _summary("pooled", bench_pooled(args.iterations, cwd, args.pool_size))
+    print(f"speedup (mean): {cold / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
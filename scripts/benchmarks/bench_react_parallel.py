@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark MultiAgentOrchestrator batch execution with stubbed tools that
+sleep (standing in for LLM and network latency): the old sequential loop
+over delegate_task vs parallel_execute.
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=12)
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--parallel", type=int, default=8)
+    parser.add_argument("--tool-ms", type=float, default=150.0, help="Mean stub tool latency")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_react_"))
+    try:
+        from brain import react_agent
+
+        react_agent._LLM_AVAILABLE = False
+        react_agent.DATA_DIR = workdir
+        rng = random.Random(13)
+        # Each task needs 1-4 cycles; a tool call only completes the task on its last cycle.
+        plan = {f"find topic {i}": rng.randint(1, 4) for i in range(args.tasks)}
+        calls = {}
+
+        def tool(target, **kwargs):
+            time.sleep(rng.uniform(0.5, 1.5) * args.tool_ms / 1000)
+            calls[target] = calls.get(target, 0) + 1
+            if calls[target] >= plan.get(target, 1):
+                return f"Found a detailed, conclusive answer for {target}, ready to report back."
+            return "partial"
+
+        orch = react_agent.MultiAgentOrchestrator(max_parallel=args.parallel, task_timeout_sec=60)
+        for i in range(args.agents):
+            agent = orch.create_agent(f"agent_{i}", "general")
+            agent.tools = {name: tool for name in agent.tools}
+        tasks = list(plan)
+
+        start = time.perf_counter()
+        for task in tasks:  # the former parallel_execute body
+            orch.delegate_task(task)
+        sequential = time.perf_counter() - start
+
+        calls.clear()
+        first = []
+        start = time.perf_counter()
+        results = orch.parallel_execute(tasks, on_result=lambda r: first.append(time.perf_counter() - start))
+        parallel = time.perf_counter() - start
+        slowest = max(r["duration_ms"] for r in results) / 1000
+
+        print("=" * 72)
+        print(f"ReAct batch ({args.tasks} tasks, {sum(plan.values())} tool cycles, ~{args.tool_ms:.0f} ms/tool)")
+        print("=" * 72)
+        print(f"sequential loop        {sequential:8.2f} s")
+        print(f"parallel_execute       {parallel:8.2f} s   (max_parallel={args.parallel})")
+        print(f"slowest single task    {slowest:8.2f} s")
+        print(f"first result after     {first[0]:8.2f} s")
+        print(f"speedup                {sequential / parallel:8.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark SelfReminderEngine cycles over a few hundred large principle
+files where only a handful change between cycles.
+
+The legacy path (read, hash and parse every due file under the engine
+lock, one log append per source) is reconstructed inline.
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _seed(root: Path, files: int, kb: int) -> list:
+    body = "".join(f"- principle line {i}: keep the system on track\n" if i % 3 else f"plain text {i}\n"
+                   for i in range(kb * 1024 // 44))
+    docs = root / "docs"
+    docs.mkdir(parents=True)
+    old = time.time() - 3600
+    sources = []
+    for n in range(files):
+        path = docs / f"principle_{n}.md"
+        path.write_text(f"# Source {n}\n{body}", encoding="utf-8")
+        os.utime(path, (old, old))
+        sources.append({"path": f"docs/principle_{n}.md", "name": f"P{n}", "priority": 5,
+                        "interval_sec": 0, "category": f"c{n % 10}"})
+    return sources
+
+
+def _touch(root: Path, files: int, changed: int, cycle: int) -> None:
+    old = time.time() - 600
+    for n in range(changed):
+        path = root / "docs" / f"principle_{(cycle * changed + n) % files}.md"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"- amended in cycle {cycle}\n")
+        os.utime(path, (old, old))
+
+
+def _legacy_cycle(engine, root: Path, lock: threading.Lock) -> None:
+    with lock:
+        for source in engine._sources:
+            content = (root / source.path).read_text(encoding="utf-8")
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+            sum(1 for line in content.splitlines() if line.strip() and line.strip()[0] in "-*#")
+            source.content_hash = digest
+            with open(engine._log_path, "a", encoding="utf-8") as f:
+                f.write(digest + "\n")
+
+
+def _status_latency(engine, lock=None) -> float:
+    start = time.perf_counter()
+    if lock is not None:
+        with lock:
+            pass
+    engine.get_status()
+    return time.perf_counter() - start
+
+
+def _run(label, cycle_fn, engine, lock, root, args):
+    cycles, status = [], []
+    for c in range(args.cycles):
+        _touch(root, args.files, args.changed, c)
+        stop = threading.Event()
+
+        def probe():
+            while not stop.is_set():
+                status.append(_status_latency(engine, lock))
+                time.sleep(0.002)
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        start = time.perf_counter()
+        cycle_fn()
+        cycles.append(time.perf_counter() - start)
+        stop.set()
+        prober.join()
+    status.sort()
+    avg = sum(cycles) / len(cycles) * 1000
+    worst = status[-1] * 1000 if status else 0.0
+    print(f"{label:<28}{avg:12.1f}{worst:18.2f}")
+    return avg
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--kb", type=int, default=256, help="Size of each source file")
+    parser.add_argument("--changed", type=int, default=5, help="Files modified per cycle")
+    parser.add_argument("--cycles", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_self_reminder_"))
+    try:
+        import brain.self_reminder as sr
+
+        sources = _seed(workdir, args.files, args.kb)
+        sr.PROJECT_ROOT = workdir
+        legacy = sr.SelfReminderEngine(sources=sources, log_path=workdir / "legacy.jsonl")
+        engine = sr.SelfReminderEngine(sources=sources, log_path=workdir / "log.jsonl")
+        engine.check_and_remind()
+        legacy_lock = threading.Lock()
+
+        print("=" * 72)
+        print(f"Self-reminder cycle: {args.files} files x {args.kb} KB, {args.changed} changed per cycle")
+        print("=" * 72)
+        print(f"{'':28}{'cycle (ms)':>12}{'max status (ms)':>18}")
+        old = _run("read everything under lock", lambda: _legacy_cycle(legacy, workdir, legacy_lock),
+                   legacy, legacy_lock, workdir, args)
+        new = _run("stat-first, parallel scan", engine.check_and_remind, engine, None, workdir, args)
+        stats = engine.get_stats()
+        print(f"speedup                     {old / new:12.1f}x")
+        print(f"stat hits / reads           {stats['stat_hits']:>8} / {stats['reads']}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
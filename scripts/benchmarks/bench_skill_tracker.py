@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark SkillTracker.record_execution: a full skills-file rewrite per
+call vs the write-behind aggregator with latency sketches.
+
+The legacy cost is reproduced as the old _save() (json.dump of the skills
+table, no telemetry fields) after every recorded execution.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+TELEMETRY_FIELDS = ("latency_sketch", "recent_outcomes")
+
+
+class FakeBrain:
+    def log(self, msg, level="INFO"):
+        pass
+
+
+def _workload(skills: int, ops: int):
+    rng = random.Random(9)
+    for _ in range(ops):
+        name = f"skill_{int(rng.paretovariate(1.2)) % skills}"
+        duration = rng.lognormvariate(5, 0.6) * (8 if rng.random() < 0.02 else 1)
+        yield name, duration, rng.random() > 0.05
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("--ops", type=int, default=5000)
+    parser.add_argument("--legacy-ops", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_skills_"))
+    try:
+        from brain import nexus_brain
+
+        nexus_brain.DATA_DIR = workdir
+        os.environ["SKILL_FLUSH_EVERY"] = "1000000"
+        os.environ["SKILL_FLUSH_INTERVAL"] = "3600"
+        warm = nexus_brain.SkillTracker(FakeBrain())
+        for name, duration, ok in _workload(args.skills, 20 * args.skills):
+            warm.record_execution(name, duration, ok)
+        warm.flush()
+
+        legacy = nexus_brain.SkillTracker(FakeBrain())
+        legacy_file = workdir / "legacy_skills.json"
+        start = time.perf_counter()
+        for name, duration, ok in _workload(args.skills, args.legacy_ops):
+            legacy.record_execution(name, duration, ok)
+            plain = {k: {f: v for f, v in s.items() if f not in TELEMETRY_FIELDS} for k, s in legacy.skills.items()}
+            with open(legacy_file, "w", encoding="utf-8") as f:
+                json.dump(plain, f, indent=2, default=str)
+        legacy_ms = (time.perf_counter() - start) * 1000 / args.legacy_ops
+        legacy.flush()
+
+        os.environ["SKILL_FLUSH_EVERY"] = "50"
+        os.environ["SKILL_FLUSH_INTERVAL"] = "30"
+        tracker = nexus_brain.SkillTracker(FakeBrain())
+        start = time.perf_counter()
+        for name, duration, ok in _workload(args.skills, args.ops):
+            tracker.record_execution(name, duration, ok)
+        tracker.flush()
+        new_ms = (time.perf_counter() - start) * 1000 / args.ops
+
+        start = time.perf_counter()
+        for i in range(200):
+            tracker.get_skill_recommendation(f"skill_{i % args.skills}")
+        rec_us = (time.perf_counter() - start) * 1e6 / 200
+
+        size_kb = sum(f.stat().st_size for f in workdir.glob("state.db*")) / 1024
+        print("=" * 72)
+        print(f"SkillTracker.record_execution ({args.skills} skills, {args.ops} ops)")
+        print("=" * 72)
+        print(f"rewrite per call          {legacy_ms:10.3f} ms/op   {1000 / legacy_ms:10.0f} ops/s")
+        print(f"write-behind + sketches   {new_ms:10.3f} ms/op   {1000 / new_ms:10.0f} ops/s")
+        print(f"speedup                   {legacy_ms / new_ms:10.1f}x")
+        print(f"get_skill_recommendation  {rec_us:10.1f} us/call   state.db {size_kb:.0f} KB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Benchmark write latency and throughput of the stores moved onto the
+shared SQLite state engine, against the whole-file JSON rewrite each
+one did before.
+
+- SkillTracker: a flush rewrote every skill; now only changed skills are
+  written, in one transaction
+- ReActAgent history: every think/act/observe/reflect rewrote up to 350
+  entries; now each appends one row (trimmed every 50 appends)
+- WisdomHub: every record rewrote three JSON files; now one row
+- UserFeedbackManager: every feedback rewrote three JSON files (up to
+  5000 history rows); now one journal row
+- TeamPersonaStore: every member change rewrote the snapshot; now one
+  journal row per flushed member (flushed on every change here)
+- AdvancedLearningEngine: every review rewrote all items; now one
+  journal row
+- PolicyBandit: every select and update rewrote the state with 1000
+  history entries; now a journal row each (plus a history row)
+- raw engine: put() from 1 and from 8 threads
+
+The legacy writes are reconstructed inline from the same in-memory state.
+Checkpoints are pushed out of the measured loop for the journaled stores.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _rewrite(path: Path, payload) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, default=str)
+    os.replace(tmp, path)
+
+
+def _row(label: str, legacy_ms: float, engine_ms: float) -> None:
+    print(f"{label:<34}{legacy_ms:10.3f}{engine_ms:10.3f}{1000 / legacy_ms:11.0f}{1000 / engine_ms:11.0f}"
+          f"{legacy_ms / engine_ms:8.1f}x")
+
+
+def _per_op_ms(fn, ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return (time.perf_counter() - start) / ops * 1000
+
+
+def bench_skills(workdir: Path, skills: int, ops: int) -> None:
+    import brain.nexus_brain as nb
+
+    class Brain:
+        def log(self, msg, level="INFO"):
+            pass
+
+    nb.DATA_DIR = workdir
+    os.environ.update({"SKILL_FLUSH_EVERY": "1", "SKILL_FLUSH_INTERVAL": "0"})
+    tracker = nb.SkillTracker(Brain())
+    for n in range(skills):
+        tracker.record_execution(f"skill_{n}", 100.0, True)
+
+    legacy_file = workdir / "legacy_skills.json"
+    legacy = _per_op_ms(lambda i: _rewrite(legacy_file, tracker.skills), max(20, ops // 10))
+    engine = _per_op_ms(lambda i: tracker.record_execution(f"skill_{i % skills}", 90.0 + i % 20, i % 7 != 0), ops)
+    _row(f"SkillTracker flush ({skills} skills)", legacy, engine)
+
+
+def bench_react(workdir: Path, ops: int) -> None:
+    import brain.react_agent as ra
+
+    ra._LLM_AVAILABLE = False
+    ra.DATA_DIR = workdir
+    agent = ra.ReActAgent()
+    for i in range(400):
+        agent.think(f"warm up {i}")
+        agent.observe(f"found result {i}")
+
+    legacy_file = workdir / "legacy_react_history.json"
+
+    def legacy_step(i):
+        agent.thoughts.append(ra.Thought(f"step {i}", "t", "r"))
+        _rewrite(legacy_file, {
+            "thoughts": [vars(t) for t in agent.thoughts[-100:]],
+            "actions": [vars(a) for a in agent.actions[-100:]],
+            "observations": [vars(o) for o in agent.observations[-100:]],
+            "reflections": [vars(r) for r in agent.reflections[-50:]],
+        })
+
+    legacy = _per_op_ms(legacy_step, ops)
+    agent._saved_counts["thoughts"] = len(agent.thoughts)
+    engine = _per_op_ms(lambda i: agent.think(f"step {i}"), ops)
+    _row("ReActAgent think/observe step", legacy, engine)
+
+
+def bench_wisdom(workdir: Path, patterns: int, ops: int) -> None:
+    from wisdom import WisdomHub
+
+    hub = WisdomHub(str(workdir / "wisdom_root"))
+    with hub._store.transaction():
+        for n in range(patterns):
+            hub.record_pattern(f"pattern {n}", "code", "description " * 6)
+    legacy_file = workdir / "legacy_patterns.json"
+    legacy = _per_op_ms(lambda i: _rewrite(legacy_file, {k: asdict(v) for k, v in hub.patterns.items()}),
+                        max(5, ops // 50))
+    engine = _per_op_ms(lambda i: hub.record_pattern(f"pattern {i % patterns}", "code", "d"), ops)
+    hub.close()
+    _row(f"WisdomHub record_pattern ({patterns})", legacy, engine)
+
+
+def _learning_storage(workdir: Path) -> None:
+    """Point the LearningStorageV2 singleton at the scratch dir."""
+    from memory import storage_v2
+
+    storage_v2.LearningStorageV2._instance = None
+    storage_v2._storage_v2 = storage_v2.LearningStorageV2(base_path=str(workdir / "learning"))
+
+
+def bench_feedback(workdir: Path, history: int, ops: int) -> None:
+    from memory.user_feedback import UserFeedbackManager
+
+    os.environ.update({
+        "FEEDBACK_CHECKPOINT_EVERY": str(10 * (history + ops)),
+        "FEEDBACK_CHECKPOINT_INTERVAL": "100000",
+        "FEEDBACK_EVENT_BATCH": "500",
+    })
+    fm = UserFeedbackManager(str(workdir))
+    for n in range(history):
+        fm.record_approval(f"warm up {n % 500}")
+
+    def legacy_write(i):
+        _rewrite(workdir / "legacy_feedback.json", {"history": fm.feedback_history[-5000:], "stats": fm.stats})
+        _rewrite(workdir / "legacy_preferences.json", fm.user_preferences)
+        _rewrite(workdir / "legacy_learning.json", {"rules": fm.learning_rules, "patterns": fm.preference_patterns})
+
+    legacy = _per_op_ms(legacy_write, max(20, ops // 10))
+    engine = _per_op_ms(lambda i: fm.record_approval(f"action {i % 200}"), ops)
+    fm.flush()
+    _row(f"UserFeedbackManager ({history} rows)", legacy, engine)
+
+
+def bench_persona(workdir: Path, members: int, ops: int) -> None:
+    from memory.team_persona import TeamPersonaStore
+
+    os.environ.update({"TEAM_PERSONA_FLUSH_EVERY": "1", "TEAM_PERSONA_COMPACT_EVERY": str(10 * (members + ops))})
+    store = TeamPersonaStore(state_path=workdir / "team_personas.json", events_path=workdir / "events.jsonl")
+    for n in range(members):
+        store.upsert_member(f"member-{n}", {"name": f"Member {n}", "role": "dev"})
+
+    legacy = _per_op_ms(lambda i: _rewrite(workdir / "legacy_personas.json", store._state), max(20, ops // 10))
+    engine = _per_op_ms(lambda i: store.upsert_member(f"member-{i % members}", {"notes": f"note {i}"}), ops)
+    store.flush()
+    _row(f"TeamPersonaStore upsert ({members})", legacy, engine)
+
+
+def bench_learning(workdir: Path, items: int, ops: int) -> None:
+    from memory.advanced_learning import AdvancedLearningEngine
+
+    os.environ.update({"ADVANCED_LEARNING_MAX_ITEMS": str(items * 2),
+                       "ADVANCED_LEARNING_COMPACT_EVERY": str(10 * (items + ops))})
+    engine = AdvancedLearningEngine(str(workdir))
+    knowledge = [engine.add_knowledge(f"fact number {n}", f"topic {n % 20}") for n in range(items)]
+
+    def legacy_write(i):
+        _rewrite(workdir / "legacy_learning.json", {
+            "knowledge_items": [engine._serialize_knowledge_item(item) for item in engine.knowledge_items],
+            "learning_sessions": [],
+        })
+
+    legacy = _per_op_ms(legacy_write, max(20, ops // 10))
+    journaled = _per_op_ms(lambda i: engine.review_item(knowledge[i % items], 3 + i % 3), ops)
+    _row(f"AdvancedLearning review ({items})", legacy, journaled)
+
+
+def bench_bandit(workdir: Path, ops: int) -> None:
+    from memory.policy_bandit import PolicyBandit
+
+    os.environ.update({"POLICY_CHECKPOINT_EVERY": str(10 * ops), "POLICY_CHECKPOINT_INTERVAL": "100000"})
+    _learning_storage(workdir)
+    bandit = PolicyBandit()
+    legacy_state = dict(bandit.state, history=[
+        {"ts": "2026-01-01T00:00:00", "selected": bandit.state["selected"], "verdict": "win", "weight": 1.0}
+        for _ in range(1000)
+    ])
+
+    def legacy_decision(i):
+        bandit.storage.save_policy_state(legacy_state)
+        bandit.storage.save_policy_state(legacy_state)
+
+    def decision(i):
+        bandit.update("win" if i % 3 else "loss", selected=bandit.select_policy())
+
+    legacy = _per_op_ms(legacy_decision, max(20, ops // 10))
+    engine = _per_op_ms(decision, ops)
+    bandit.flush()
+    _row("PolicyBandit select+update", legacy, engine)
+
+
+def bench_raw(workdir: Path, ops: int, threads: int) -> None:
+    from core.state_engine import StateEngine
+
+    engine = StateEngine(workdir / "raw" / "state.db")
+    single = _per_op_ms(lambda i: engine.put("bench", f"k{i}", {"n": i, "payload": "x" * 200}), ops)
+
+    def worker(t):
+        for i in range(ops // threads):
+            engine.put("bench", f"t{t}-{i}", {"n": i, "payload": "x" * 200})
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for th in pool:
+        th.start()
+    for th in pool:
+        th.join()
+    multi = (time.perf_counter() - start) / (ops // threads * threads) * 1000
+
+    start = time.perf_counter()
+    with engine.transaction():
+        for i in range(ops):
+            engine.put("bench", f"b{i}", {"n": i})
+    batched = (time.perf_counter() - start) / ops * 1000
+    engine.close()
+    print(f"{'engine put, 1 thread':<34}{'':10}{single:10.3f}{'':11}{1000 / single:11.0f}")
+    print(f"{f'engine put, {threads} threads':<34}{'':10}{multi:10.3f}{'':11}{1000 / multi:11.0f}")
+    print(f"{'engine put, batched transaction':<34}{'':10}{batched:10.3f}{'':11}{1000 / batched:11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--patterns", type=int, default=20000)
+    parser.add_argument("--feedback", type=int, default=5000, help="Feedback history rows")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5000, help="AdvancedLearningEngine items")
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_state_engine_"))
+    try:
+        print("=" * 84)
+        print(f"Store writes: whole-file JSON rewrite vs shared state engine ({args.ops} ops each)")
+        print("=" * 84)
+        print(f"{'':34}{'legacy ms':>10}{'engine ms':>10}{'legacy/s':>11}{'engine/s':>11}{'':>9}")
+        bench_skills(workdir / "skills", args.skills, args.ops)
+        bench_react(workdir / "react", args.ops)
+        bench_wisdom(workdir, args.patterns, args.ops)
+        _learning_storage(workdir)
+        bench_feedback(workdir / "feedback", args.feedback, args.ops)
+        bench_persona(workdir / "persona", args.members, args.ops)
+        bench_learning(workdir / "learning_engine", args.items, args.ops)
+        bench_bandit(workdir / "bandit", args.ops)
+        bench_raw(workdir, args.ops, args.threads)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
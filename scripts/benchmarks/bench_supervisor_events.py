@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark SupervisorDaemon reaction to file changes: the fixed-interval
+polling loop vs the event-driven loop.
+
+A synthetic project is generated, then files are written at random
+moments. Latency is measured from the write to the end of the first
+project scan that has seen the new file (a change that leaves the issue
+list unchanged does not produce a decision). Idle CPU is process CPU time per wall second
+while nothing changes. Each mode runs in a fresh interpreter.
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _make_project(root: Path, files: int) -> None:
+    (root / "README.md").write_text("# synthetic\n")
+    for i in range(files):
+        pkg = root / f"pkg_{i % 40}"
+        pkg.mkdir(exist_ok=True)
+        (pkg / f"mod_{i}.py").write_text(f"VALUE_{i} = {i}\n" * 20)
+
+
+def _measure(mode: str, workdir: Path, changes: int, idle_sec: float, cycle_sec: float) -> None:
+    from brain.project_supervisor import ProjectSupervisor
+    from core.supervisor_daemon import SupervisorDaemon
+
+    project = workdir / "project"
+    daemon = SupervisorDaemon(
+        project_path=str(project),
+        mode="OBSERVE",
+        cycle_interval_sec=cycle_sec,
+        project_scan_interval_sec=cycle_sec,
+        decision_log_path=str(workdir / f"decisions_{mode}.jsonl"),
+        event_driven=(mode == "event"),
+    )
+    supervisor = ProjectSupervisor(str(project), state_dir=str(workdir / f"state_{mode}"))
+
+    def init_components():
+        daemon._project_supervisor = supervisor
+
+    daemon._init_components = init_components
+    seen_at = {}
+    real_scan = supervisor.scan
+
+    def scan(*args, **kwargs):
+        snapshot = real_scan(*args, **kwargs)
+        now = time.perf_counter()
+        for rel in list(supervisor._file_hashes):
+            if rel.startswith(f"changes/{mode}_") and rel not in seen_at:
+                seen_at[rel] = now
+        return snapshot
+
+    supervisor.scan = scan
+    (project / "changes").mkdir(exist_ok=True)
+    daemon.start()
+    time.sleep(max(1.0, cycle_sec) + 0.5)  # initial scan settles
+
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    time.sleep(idle_sec)
+    idle_cpu = (time.process_time() - cpu0) / (time.perf_counter() - wall0)
+
+    rng = random.Random(3)
+    latencies = []
+    for i in range(changes):
+        time.sleep(rng.uniform(0.2, cycle_sec + 0.2))
+        rel = f"changes/{mode}_{i}.py"
+        written = time.perf_counter()
+        (project / rel).write_text("x = 1\n")
+        deadline = written + cycle_sec * 3 + 5
+        while rel not in seen_at and time.perf_counter() < deadline:
+            time.sleep(0.002)
+        latencies.append((seen_at.get(rel, deadline) - written) * 1000)
+    daemon.stop()
+    latencies.sort()
+    print(json.dumps({
+        "idle_cpu_pct": idle_cpu * 100,
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "max_ms": latencies[-1],
+        "decisions": daemon._decisions_made,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=3000, help="Files in the synthetic project")
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--idle-sec", type=float, default=10.0)
+    parser.add_argument("--cycle-sec", type=float, default=5.0, help="cycle_interval_sec / project scan interval")
+    parser.add_argument("--child", choices=["polling", "event"], help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _measure(args.child, Path(args.workdir), args.changes, args.idle_sec, args.cycle_sec)
+        return
+
+    print("=" * 72)
+    print(f"Supervisor file-change reaction ({args.files} files, {args.changes} changes, cycle={args.cycle_sec}s)")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "project").mkdir()
+        _make_project(workdir / "project", args.files)
+        for mode in ("polling", "event"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--workdir", str(workdir),
+                 "--changes", str(args.changes), "--idle-sec", str(args.idle_sec),
+                 "--cycle-sec", str(args.cycle_sec)],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(
+                f"{mode:<8} latency mean={r['mean_ms']:8.1f} ms  p50={r['p50_ms']:8.1f} ms  "
+                f"max={r['max_ms']:8.1f} ms   idle CPU={r['idle_cpu_pct']:6.2f}%   decisions={r['decisions']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark TeamPersonaStore at team scale: member history reads from the
+shared events log vs per-member segments, and record_interaction with a
+full state rewrite per call vs write-behind deltas.
+
+The events log is generated directly; the store folds it into segments
+once on first use, which is reported as the one-off segment build.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _write_events(path: Path, members: int, interactions: int) -> None:
+    rng = random.Random(7)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(interactions):
+            member = f"member-{rng.randrange(members)}"
+            f.write(json.dumps({
+                "timestamp": f"2026-01-01T00:00:00.{i:07d}",
+                "member_id": member,
+                "intent": "delivery_push",
+                "message_preview": f"ship item {i} now",
+                "signals": {"direct": True},
+            }, ensure_ascii=False) + "\n")
+
+
+def _legacy_list(events_path: Path, member_id: str, limit: int):
+    """list_interactions before segments: parse the whole log, filter, sort."""
+    rows = []
+    with open(events_path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            text = line.strip()
+            if not text:
+                continue
+            item = json.loads(text)
+            if member_id and item.get("member_id") != member_id:
+                continue
+            rows.append(item)
+    rows.sort(key=lambda row: str(row.get("timestamp", "")), reverse=True)
+    return rows[:limit]
+
+
+def _ms(samples):
+    return statistics.mean(samples) * 1000, sorted(samples)[len(samples) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--interactions", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500, help="Segment-backed history reads")
+    parser.add_argument("--legacy-queries", type=int, default=3, help="Full-scan reads (each parses the whole log)")
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault("TEAM_PERSONA_FLUSH_EVERY", "32")
+    os.environ.setdefault("TEAM_PERSONA_FLUSH_INTERVAL", "2")
+    from memory.team_persona import TeamPersonaStore, _now_iso
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_persona_"))
+    try:
+        events = workdir / "team_persona_events.jsonl"
+        state = workdir / "team_personas.json"
+        _write_events(events, args.members, args.interactions)
+        size_mb = events.stat().st_size / 1e6
+
+        store = TeamPersonaStore(state_path=state, events_path=events)
+        start = time.perf_counter()
+        store._segments.catch_up()
+        build_s = time.perf_counter() - start
+        for m in range(args.members):
+            store.upsert_member(f"member-{m}", {"name": f"Member {m}"})
+        store.flush()
+
+        rng = random.Random(11)
+        seg_samples = []
+        for _ in range(args.queries):
+            member = f"member-{rng.randrange(args.members)}"
+            start = time.perf_counter()
+            store.list_interactions(member, limit=args.limit)
+            seg_samples.append(time.perf_counter() - start)
+
+        legacy_samples = []
+        for _ in range(args.legacy_queries):
+            member = f"member-{rng.randrange(args.members)}"
+            start = time.perf_counter()
+            _legacy_list(events, member, args.limit)
+            legacy_samples.append(time.perf_counter() - start)
+
+        wb_samples = []
+        for i in range(args.writes):
+            start = time.perf_counter()
+            store.record_interaction(f"member-{rng.randrange(args.members)}", "Chỉ làm luôn, không cần hỏi lại.")
+            wb_samples.append(time.perf_counter() - start)
+        store.flush()
+
+        # Legacy commit: the full member table re-serialised (indent=2) on every call.
+        snapshot = store._load_state()
+        rewrite_samples = []
+        for i in range(min(args.writes, 200)):
+            start = time.perf_counter()
+            snapshot["updated_at"] = _now_iso()
+            tmp = state.with_suffix(".legacy.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, workdir / "legacy_state.json")
+            rewrite_samples.append(time.perf_counter() - start)
+
+        adapt_samples = []
+        for _ in range(args.queries):
+            member = f"member-{rng.randrange(args.members)}"
+            start = time.perf_counter()
+            store.recommend_adaptation(member, intent="deploy")
+            adapt_samples.append(time.perf_counter() - start)
+
+        print("=" * 72)
+        print("TEAM PERSONA STORE BENCHMARK")
+        print("=" * 72)
+        print(f"events log                 {args.interactions} rows, {args.members} members, {size_mb:.1f} MB")
+        print(f"segment build (one-off)    {build_s:10.2f} s")
+        for name, samples in (
+            ("history, full scan", legacy_samples),
+            ("history, segment tail", seg_samples),
+            ("record, full rewrite", rewrite_samples),
+            ("record, write-behind", wb_samples),
+            ("recommend_adaptation", adapt_samples),
+        ):
+            mean, p50 = _ms(samples)
+            print(f"{name:<26} mean={mean:10.3f} ms   p50={p50:10.3f} ms   n={len(samples)}")
+        print(f"speedup history (mean)     {_ms(legacy_samples)[0] / _ms(seg_samples)[0]:10.0f}x")
+        print(f"speedup record (mean)      {_ms(rewrite_samples)[0] / _ms(wb_samples)[0]:10.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark UserFeedbackManager throughput at UI-interaction rates: a full
+rewrite plus one learning event per call (checkpoint every change, event
+batch of one) vs the write-behind journal with batched events.
+
+Both runs start from the same pre-populated state (history, rules,
+patterns) so the rewrite cost reflects a store that has been in use.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def _seed(path: Path, history: int, rules: int) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "user_feedback.json").write_text(json.dumps({
+        "history": [
+            {"id": f"impl_{i}", "type": "implicit", "signal": "engage", "target": f"widget_{i % 300}",
+             "value": 1, "context": {}, "source": "auto", "timestamp": "2026-01-01T00:00:00"}
+            for i in range(history)
+        ],
+        "stats": {"total_feedback": history, "implicit_feedback": history},
+    }), encoding="utf-8")
+    (path / "feedback_learning.json").write_text(json.dumps({
+        "rules": {
+            f"correction:original text {i}": {
+                "original": f"original text {i}", "corrected": f"fixed {i}", "count": i % 7 + 1,
+                "last_seen": "2026-01-01T00:00:00",
+            }
+            for i in range(rules)
+        },
+        "patterns": {f"widget_{i}": 0.5 for i in range(300)},
+    }), encoding="utf-8")
+
+
+def _run(label: str, path: Path, ops: int, env: dict) -> float:
+    os.environ.update(env)
+    from memory.user_feedback import UserFeedbackManager
+
+    fm = UserFeedbackManager(str(path))
+    start = time.perf_counter()
+    for i in range(ops):
+        fm.record_implicit_feedback("engage" if i % 3 else "ignore", f"widget_{i % 300}")
+        if i % 50 == 0:
+            fm.record_correction(f"original text {i % 500}", f"fixed again {i}")
+        if i % 100 == 0:
+            fm.get_corrections(limit=10)
+    fm.flush()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {ops / elapsed:10.0f} ops/s   {elapsed * 1000 / ops:8.3f} ms/op")
+    return ops / elapsed
+
+
+def _corrections_lookup(path: Path, calls: int) -> None:
+    from memory.user_feedback import UserFeedbackManager
+
+    fm = UserFeedbackManager(str(path))
+    rules = fm.learning_rules
+    start = time.perf_counter()
+    for _ in range(calls):
+        sorted((v for k, v in rules.items() if k.startswith("correction:")), key=lambda x: x.get("count", 0), reverse=True)
+    scan = (time.perf_counter() - start) / calls
+    start = time.perf_counter()
+    for _ in range(calls):
+        fm.get_corrections()
+    ranked = (time.perf_counter() - start) / calls
+    print(f"{'get_corrections, scan+sort':<28} {scan * 1e6:10.1f} us/call")
+    print(f"{'get_corrections, ranked':<28} {ranked * 1e6:10.1f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=5000)
+    parser.add_argument("--rules", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_feedback_"))
+    try:
+        from memory import storage_v2
+
+        storage_v2._storage_v2 = storage_v2.LearningStorageV2(base_path=str(workdir / "learning"))
+
+        print("=" * 72)
+        print(f"UserFeedbackManager throughput ({args.ops} ops, {args.history} history rows, {args.rules} rules)")
+        print("=" * 72)
+        _seed(workdir / "legacy", args.history, args.rules)
+        _seed(workdir / "journal", args.history, args.rules)
+        legacy = _run("rewrite per call", workdir / "legacy", args.ops,
+                      {"FEEDBACK_CHECKPOINT_EVERY": "1", "FEEDBACK_EVENT_BATCH": "1"})
+        journal = _run("journal + batched events", workdir / "journal", args.ops,
+                       {"FEEDBACK_CHECKPOINT_EVERY": "200", "FEEDBACK_EVENT_BATCH": "50"})
+        print(f"speedup                      {journal / legacy:10.1f}x")
+        _corrections_lookup(workdir / "journal", 200)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark WisdomHub recording and querying at 100k patterns: one commit
+per record against the SQLite store vs rewriting every JSON file on each
+record_pattern, plus indexed queries vs scan-and-sort.
+
+The legacy save (full JSON dump of all patterns, insights and lessons)
+and legacy queries are reconstructed inline and sampled, because a full
+legacy run would take hours at this size.
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+CATEGORIES = ("code", "architecture", "workflow", "optimization")
+
+
+def _legacy_save(hub, path: Path) -> None:
+    data = {"total_patterns": len(hub.patterns), "patterns": {k: asdict(v) for k, v in hub.patterns.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def _timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patterns", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=5000, help="Re-recordings of existing patterns")
+    parser.add_argument("--legacy-saves", type=int, default=3)
+    args = parser.parse_args()
+
+    from wisdom import WisdomHub
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_wisdom_"))
+    try:
+        rng = random.Random(1)
+        hub = WisdomHub(str(workdir))
+
+        start = time.perf_counter()
+        for n in range(args.patterns):
+            hub.record_pattern(f"pattern {n}", CATEGORIES[n % 4], "description " * 8, project_id=f"p{n % 50}")
+        insert_ms = (time.perf_counter() - start) / args.patterns * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.updates):
+            hub.record_pattern(f"pattern {rng.randrange(args.patterns)}", "code", "d",
+                               project_id=f"p{rng.randrange(50)}", success=rng.random() < 0.8)
+        update_ms = (time.perf_counter() - start) / args.updates * 1000
+
+        legacy_save_ms = _timed(lambda: _legacy_save(hub, workdir / "legacy_patterns.json"), args.legacy_saves)
+        hub.close()
+
+        start = time.perf_counter()
+        hub = WisdomHub(str(workdir))
+        reopen_ms = (time.perf_counter() - start) * 1000
+        patterns = hub.patterns
+
+        legacy_cat = _timed(lambda: [p for p in patterns.values() if p.category == "workflow"], 20)
+        legacy_best = _timed(lambda: sorted(
+            (p for p in patterns.values() if p.confidence >= 0.7 and p.success_count >= 2),
+            key=lambda x: (x.confidence, x.success_count), reverse=True)[:10], 20)
+        new_cat = _timed(lambda: hub.get_patterns_by_category("workflow"), 20)
+        new_best = _timed(lambda: hub.get_best_patterns(0.7, 10), 200)
+        hub.close()
+
+        db_mb = sum(f.stat().st_size for f in workdir.glob("wisdom/wisdom.db*")) / 1e6
+        print("=" * 72)
+        print(f"WisdomHub at {len(patterns)} patterns ({args.updates} repeat recordings merged)")
+        print("=" * 72)
+        print(f"{'':32}{'legacy JSON':>14}{'SQLite':>14}")
+        print(f"{'record_pattern, new (ms)':<32}{legacy_save_ms:14.1f}{insert_ms:14.3f}")
+        print(f"{'record_pattern, repeat (ms)':<32}{legacy_save_ms:14.1f}{update_ms:14.3f}")
+        print(f"{'get_patterns_by_category (ms)':<32}{legacy_cat:14.2f}{new_cat:14.2f}")
+        print(f"{'get_best_patterns (ms)':<32}{legacy_best:14.2f}{new_best:14.3f}")
+        print(f"reopen {reopen_ms:.0f} ms, store {db_mb:.1f} MB, "
+              f"record speedup {legacy_save_ms / update_ms:.0f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
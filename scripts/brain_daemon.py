@@ -14,8 +14,8 @@ Usage:
 
 import sys
 import os
-import time
 import signal
+import threading
 import json
 from pathlib import Path
 from datetime import datetime
@@ -138,66 +138,68 @@ def run_daemon():
     except Exception as exc:
         log(f"Supervisor init skipped: {exc}")
 
-    # Main loop - heartbeat
+    # Heartbeat jobs run on the brain's scheduler; the main thread only waits
     heartbeat_sec = int(os.getenv("NEXUS_HEARTBEAT_INTERVAL", "60"))
-    try:
-        counter = 0
-        while True:
-            time.sleep(heartbeat_sec)
-            counter += 1
-
-            # Self-Reminder check every heartbeat cycle
-            if self_reminder and self_reminder.enabled:
-                try:
-                    reminders = self_reminder.check_and_remind()
-                    if reminders:
-                        changed = [r for r in reminders if r.get("changed")]
-                        log(f"Self-Reminder: {len(reminders)} source(s) refreshed"
-                            + (f", {len(changed)} CHANGED" if changed else ""))
-                except Exception as exc:
-                    try:
-                        log(f"Self-Reminder error (non-fatal): {exc}")
-                    except Exception:
-                        pass
-
-            # Heartbeat every 5 cycles (wrapped so one failure can't crash daemon)
-            if counter % 5 == 0:
-                try:
-                    stats = brain_stats()
-                    knowledge = stats.get("memory", {}).get("total_knowledge", 0)
-                    skills = len(stats.get("skills", {}))
-                    msg = f"Heartbeat - Knowledge: {knowledge}, Skills: {skills}"
-
-                    # Add budget info if available
-                    try:
-                        from core.model_router import ModelRouter
-                        proj = ModelRouter().get_budget_projection()
-                        msg += f", Budget: ${proj.get('total_spent', 0):.4f}/{proj.get('daily_budget', 0)} ({proj.get('status', '?')})"
-                    except Exception:
-                        pass
-
-                    # Add self-reminder stats
-                    if self_reminder:
-                        sr_stats = self_reminder.get_stats()
-                        msg += f", Reminders: {sr_stats.get('total_reminders', 0)}"
-
-                    # Add 24/7 supervisor stats
-                    if supervisor and supervisor._running:
-                        sv_status = supervisor.get_status()
-                        msg += (
-                            f", Supervisor: {sv_status.get('mode', '?')}"
-                            f" (cycles={sv_status.get('cycle_count', 0)}"
-                            f", decisions={sv_status.get('decisions_made', 0)}"
-                            f", errors={sv_status.get('errors_detected', 0)})"
-                        )
-
-                    log(msg)
-                except Exception as exc:
-                    try:
-                        log(f"Heartbeat error (non-fatal): {exc}")
-                    except Exception:
-                        pass
 
+    def remind():
+        if not (self_reminder and self_reminder.enabled):
+            return
+        try:
+            reminders = self_reminder.check_and_remind()
+            if reminders:
+                changed = [r for r in reminders if r.get("changed")]
+                log(f"Self-Reminder: {len(reminders)} source(s) refreshed"
+                    + (f", {len(changed)} CHANGED" if changed else ""))
+        except Exception as exc:
+            try:
+                log(f"Self-Reminder error (non-fatal): {exc}")
+            except Exception:
+                pass
+
+    def heartbeat():
+        # Wrapped so one failure can't crash daemon
+        try:
+            stats = brain_stats()
+            knowledge = stats.get("memory", {}).get("total_knowledge", 0)
+            skills = len(stats.get("skills", {}))
+            msg = f"Heartbeat - Knowledge: {knowledge}, Skills: {skills}"
+
+            # Add budget info if available
+            try:
+                from core.model_router import ModelRouter
+                proj = ModelRouter().get_budget_projection()
+                msg += f", Budget: ${proj.get('total_spent', 0):.4f}/{proj.get('daily_budget', 0)} ({proj.get('status', '?')})"
+            except Exception:
+                pass
+
+            # Add self-reminder stats
+            if self_reminder:
+                sr_stats = self_reminder.get_stats()
+                msg += f", Reminders: {sr_stats.get('total_reminders', 0)}"
+
+            # Add 24/7 supervisor stats
+            if supervisor and supervisor._running:
+                sv_status = supervisor.get_status()
+                msg += (
+                    f", Supervisor: {sv_status.get('mode', '?')}"
+                    f" (cycles={sv_status.get('cycle_count', 0)}"
+                    f", decisions={sv_status.get('decisions_made', 0)}"
+                    f", errors={sv_status.get('errors_detected', 0)})"
+                )
+
+            log(msg)
+        except Exception as exc:
+            try:
+                log(f"Heartbeat error (non-fatal): {exc}")
+            except Exception:
+                pass
+
+    # Self-Reminder check every heartbeat, stats line every 5 heartbeats
+    brain.schedule("self_reminder", heartbeat_sec, remind, first_delay_sec=heartbeat_sec)
+    brain.schedule("heartbeat", heartbeat_sec * 5, heartbeat, first_delay_sec=heartbeat_sec * 5)
+
+    try:
+        threading.Event().wait()
     except KeyboardInterrupt:
         shutdown(None, None)
 
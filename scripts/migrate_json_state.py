@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Import legacy JSON state files into the shared SQLite state engine.
+
+Each store imports its own file on first open; this tool does the same
+offline (e.g. before starting the brain after an upgrade) and reports
+what it imported. Imported files are renamed to <name>.migrated.
+
+Covers the document stores (SkillTracker, ReActAgent history), the
+WisdomHub database and the JSONL journals of the write-behind stores
+(UserFeedbackManager, TeamPersonaStore, AdvancedLearningEngine,
+PolicyBandit). Their checkpoint files stay where they are.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from core.state_engine import engine_for, journal_for  # noqa: E402
+
+
+def _skills_rows(data):
+    return data.items()
+
+
+def _react_rows(data):
+    from brain.react_agent import ReActAgent
+
+    return ReActAgent._legacy_history_rows(data)
+
+
+# (label, JSON file relative to the data dir, rows converter)
+BRAIN_STORES = (
+    ("SkillTracker", "skills.json", _skills_rows),
+    ("ReActAgent history", "react_history.json", _react_rows),
+)
+
+# (label, directory argument, legacy JSONL journal)
+JOURNAL_STORES = (
+    ("UserFeedbackManager", "memory_dir", "user_feedback.journal.jsonl"),
+    ("TeamPersonaStore", "memory_dir", "team_personas.deltas.jsonl"),
+    ("AdvancedLearningEngine", "memory_dir", "advanced_learning_state.journal.jsonl"),
+    ("PolicyBandit", "state_dir", "learning_policy_state.journal.jsonl"),
+    ("PolicyBandit history", "state_dir", "learning_policy_history.jsonl"),
+)
+
+
+def _count_rows(path: Path, to_items) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return str(len(list(to_items(json.load(f)))))
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        return f"unreadable ({e})"
+
+
+def _count_lines(path: Path) -> str:
+    rows = 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    json.loads(line)
+                except ValueError:
+                    continue
+                rows += 1
+    except OSError as e:
+        return f"unreadable ({e})"
+    return str(rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=PROJECT_ROOT / "data" / "brain")
+    parser.add_argument("--memory-dir", type=Path, default=PROJECT_ROOT / "data" / "memory")
+    parser.add_argument("--state-dir", type=Path, default=PROJECT_ROOT / "data" / "state",
+                        help="LearningStorageV2 state directory (PolicyBandit)")
+    parser.add_argument("--wisdom-root", type=Path, default=PROJECT_ROOT,
+                        help="Project root whose wisdom/ directory holds the WisdomHub files")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be imported")
+    args = parser.parse_args()
+
+    print("=" * 84)
+    print(f"JSON -> state engine migration{' (dry run)' if args.dry_run else ''}")
+    print("=" * 84)
+
+    for label, name, to_items in BRAIN_STORES:
+        path = args.data_dir / name
+        if not path.exists():
+            print(f"{label:<22} {name:<38} not present")
+            continue
+        if args.dry_run:
+            print(f"{label:<22} {name:<38} {_count_rows(path, to_items)} rows")
+            continue
+        engine, ns = engine_for(path)
+        if engine.get_meta(f"imported:{ns}") is not None:
+            print(f"{label:<22} {name:<38} skipped (already imported)")
+            continue
+        count = engine.import_json_once(ns, path, to_items)
+        status = f"{count} rows -> {engine.path.name}:{ns}" if not path.exists() else "skipped (unreadable)"
+        print(f"{label:<22} {name:<38} {status}")
+
+    for label, dir_arg, name in JOURNAL_STORES:
+        path = getattr(args, dir_arg) / name
+        if not path.exists():
+            print(f"{label:<22} {name:<38} not present")
+            continue
+        if args.dry_run:
+            print(f"{label:<22} {name:<38} {_count_lines(path)} rows")
+            continue
+        journal = journal_for(path)
+        if journal.engine.get_meta(f"imported:journal:{journal.ns}") is not None:
+            print(f"{label:<22} {name:<38} skipped (already imported)")
+            continue
+        count = journal.import_jsonl_once(path)
+        status = f"{count} rows -> {journal.engine.path.name}:{journal.ns}" if not path.exists() else "skipped"
+        print(f"{label:<22} {name:<38} {status}")
+
+    wisdom_dir = args.wisdom_root / "wisdom"
+    legacy = [wisdom_dir / "patterns" / "patterns.json", wisdom_dir / "insights" / "insights.json",
+              wisdom_dir / "patterns" / "lessons.json"]
+    if not any(p.exists() for p in legacy):
+        print(f"{'WisdomHub':<22} {'wisdom/*.json':<38} not present")
+    elif args.dry_run:
+        print(f"{'WisdomHub':<22} {'wisdom/*.json':<38} {sum(p.exists() for p in legacy)} files")
+    else:
+        from wisdom.store import WisdomStore
+
+        store = WisdomStore(wisdom_dir / "wisdom.db")
+        imported = store.import_legacy_json(*legacy)
+        store.close()
+        print(f"{'WisdomHub':<22} {'wisdom/*.json':<38} {imported}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
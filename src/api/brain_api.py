@@ -335,7 +335,7 @@ async def system_overview():
         executor = get_executor()
         recent = executor.history[-50:]
         overview["subsystems"]["executor"] = {
-            "total_actions": len(executor.history),
+            "total_actions": executor.get_stats().get("total", 0),
             "recent_success_rate": sum(1 for r in recent if r.status.value == "success") / max(len(recent), 1),
             "execution_mode": executor.execution_mode,
         }
@@ -570,7 +570,9 @@ async def list_backups():
 @router.post("/restore/{backup_name}")
 async def restore_backup(backup_name: str):
     """Restore brain data from a backup."""
-    if not backup_name.startswith("nexus_backup_") or not backup_name.endswith(".tar.gz"):
+    is_archive = backup_name.startswith("nexus_backup_") and backup_name.endswith(".tar.gz")
+    is_snapshot = backup_name.startswith("nexus_snapshot_") and backup_name.endswith(".json")
+    if not (is_archive or is_snapshot) or "/" in backup_name or ".." in backup_name:
         raise HTTPException(400, detail="Invalid backup name format")
     try:
         from core.backup import restore_backup as _restore
@@ -616,7 +618,7 @@ async def system_health():
         recent = executor.history[-50:]
         fail_rate = sum(1 for r in recent if r.status.value in ("failed", "timeout")) / max(len(recent), 1)
         health["subsystems"]["executor"] = {
-            "total_actions": len(executor.history),
+            "total_actions": executor.get_stats().get("total", 0),
             "recent_fail_rate": round(fail_rate, 3),
             "mode": executor.execution_mode,
         }
@@ -60,10 +60,27 @@ from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+import atexit
 import threading
+import weakref
 
 from core.nexus_logger import get_logger
 
+try:
+    from .action_history import ActionStatsCounters, RecentResults, iter_lines_reverse
+except ImportError:
+    from brain.action_history import ActionStatsCounters, RecentResults, iter_lines_reverse
+
+try:
+    from .action_workers import ProcessWorkerPool, WorkerCrashedError, fork_available
+except ImportError:
+    from brain.action_workers import ProcessWorkerPool, WorkerCrashedError, fork_available
+
+try:
+    from .python_pool import PythonInterpreterPool, python_pool_enabled
+except ImportError:
+    from brain.python_pool import PythonInterpreterPool, python_pool_enabled
+
 logger = get_logger(__name__)
 
 try:
@@ -114,12 +131,35 @@ class ActionExecutor:
         self.workspace.mkdir(parents=True, exist_ok=True)
 
         self.history_file = DATA_DIR / "action_history.jsonl"
-        self.history: List[ActionResult] = []
+        self.stats_file = DATA_DIR / "action_stats.json"
+        # Only the newest results stay in memory; older ones are read on demand via read_history().
+        self.history_limit = max(1, int(os.getenv("NEXUS_ACTION_HISTORY_LIMIT", "1000")))
+        self._history = RecentResults(self.history_limit)
+        self._history_lock = threading.Lock()
 
         # Timeout settings (configurable via env vars)
         self.default_timeout = int(os.getenv("NEXUS_ACTION_TIMEOUT", "60"))
         self.max_timeout = int(os.getenv("NEXUS_ACTION_MAX_TIMEOUT", "300"))
 
+        # Execution backend: "thread" runs handlers in an in-process thread; "process"
+        # (opt-in) runs them in pre-forked workers that are hard-killed on timeout.
+        # The workers are forked from this multithreaded process, so only enable it
+        # where handlers do not depend on locks other threads may hold at fork time.
+        backend = os.getenv("NEXUS_ACTION_BACKEND", "thread").strip().lower()
+        self.backend = "process" if backend == "process" and fork_available() else "thread"
+        # These touch in-memory NEXUS state that only exists in this process.
+        self.in_process_actions = {"learn_knowledge", "query_knowledge", "open_browser"}
+        self.worker_limits = {
+            # 0 = use the action timeout as the CPU budget
+            "cpu_seconds": int(os.getenv("NEXUS_ACTION_CPU_SECONDS", "0")),
+            "memory_mb": int(os.getenv("NEXUS_ACTION_MEMORY_MB", "2048")),
+            "open_files": int(os.getenv("NEXUS_ACTION_MAX_OPEN_FILES", "256")),
+        }
+        self._worker_pool: Optional[ProcessWorkerPool] = None
+        self._worker_pool_lock = threading.Lock()
+        # Warm interpreters for run_python, created on first use in whichever process runs it.
+        self._python_pool: Optional[PythonInterpreterPool] = None
+
         # Policy
         self.execution_mode = os.getenv("NEXUS_EXECUTION_MODE", "FULL_AUTO").upper()
         self.allowed_roots = [PROJECT_ROOT / "workspace", PROJECT_ROOT / "data", PROJECT_ROOT / "src"]
@@ -167,23 +207,78 @@ class ActionExecutor:
 
         self._load_history()
 
+    @property
+    def history(self) -> RecentResults:
+        """Newest ``history_limit`` results, oldest first."""
+        return self._history
+
+    @history.setter
+    def history(self, items):
+        self._history = RecentResults(self.history_limit, items)
+
+    @staticmethod
+    def _result_from_dict(data: Dict) -> Optional[ActionResult]:
+        try:
+            data = dict(data)
+            data["status"] = ActionStatus(data.get("status", ActionStatus.FAILED.value))
+            return ActionResult(**data)
+        except Exception:
+            return None
+
     def _load_history(self):
-        """Load action history"""
-        if self.history_file.exists():
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        data = json.loads(line)
-                        status = data.get("status", ActionStatus.FAILED.value)
-                        data["status"] = ActionStatus(status)
-                        result = ActionResult(**data)
-                        self.history.append(result)
-                    except Exception:
-                        continue
+        """Load stats snapshot, fold in rows it has not seen, and fill the recent ring from the file tail"""
+        self.stats = ActionStatsCounters(self.stats_file)
+        atexit.register(self.stats.flush)
+        if not self.history_file.exists():
+            return
+        try:
+            self.stats.catch_up(self.history_file)
+        except OSError:
+            pass
+        recent: List[ActionResult] = []
+        for line in iter_lines_reverse(self.history_file):
+            try:
+                result = self._result_from_dict(json.loads(line))
+            except ValueError:
+                continue
+            if result is not None:
+                recent.append(result)
+                if len(recent) >= self.history_limit:
+                    break
+        self._history.extend(reversed(recent))
+
+    def read_history(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        action_type: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[ActionResult]:
+        """Read results newest first straight from the history file, beyond the in-memory ring."""
+        out: List[ActionResult] = []
+        skipped = 0
+        for line in iter_lines_reverse(self.history_file):
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            if action_type and data.get("action_type") != action_type:
+                continue
+            if status and data.get("status") != status:
+                continue
+            if skipped < skip:
+                skipped += 1
+                continue
+            result = self._result_from_dict(data)
+            if result is not None:
+                out.append(result)
+                if len(out) >= limit:
+                    break
+        return out
 
     def _save_result(self, result: ActionResult):
         """Save action result"""
-        with open(self.history_file, 'a', encoding='utf-8') as f:
+        with self._history_lock, open(self.history_file, 'a', encoding='utf-8') as f:
             data = {
                 "action_id": result.action_id,
                 "action_type": result.action_type,
@@ -200,6 +295,8 @@ class ActionExecutor:
                 "verification": result.verification,
             }
             f.write(json.dumps(data) + "\n")
+            f.flush()
+            self.stats.catch_up(self.history_file, flush=False)
 
     def _generate_action_id(self) -> str:
         """Generate unique action ID"""
@@ -299,7 +396,7 @@ class ActionExecutor:
             timeout = min(timeout or self.default_timeout, self.max_timeout)
 
             # Run with timeout
-            output, data, error = self._run_with_timeout(handler, params, timeout)
+            output, data, error = self._run_with_timeout(handler, params, timeout, action_type)
 
             result.output = output
             result.data = data
@@ -320,6 +417,12 @@ class ActionExecutor:
             result.objective_success = False
             result.failure_code = "timeout"
 
+        except WorkerCrashedError as e:
+            result.status = ActionStatus.FAILED
+            result.error = str(e)
+            result.objective_success = False
+            result.failure_code = "worker_crashed"
+
         except Exception as e:
             result.status = ActionStatus.FAILED
             result.error = f"{type(e).__name__}: {str(e)}"
@@ -371,8 +474,16 @@ class ActionExecutor:
 
         return result
 
-    def _run_with_timeout(self, handler: Callable, params: Dict, timeout: int) -> Tuple[str, Dict, Optional[Any]]:
+    def _run_with_timeout(
+        self, handler: Callable, params: Dict, timeout: int, action_type: Optional[str] = None
+    ) -> Tuple[str, Dict, Optional[Any]]:
         """Run handler with timeout"""
+        if self.backend == "process" and action_type and action_type not in self.in_process_actions:
+            limits = dict(self.worker_limits)
+            if not limits["cpu_seconds"]:
+                limits["cpu_seconds"] = int(timeout)
+            return self._get_worker_pool().run(action_type, params, timeout, limits)
+
         result = {"output": "", "data": {}, "error": None}
 
         def run():
@@ -392,6 +503,50 @@ class ActionExecutor:
 
         return result["output"], result["data"], result["error"]
 
+    def _worker_fingerprint(self) -> Tuple:
+        """Everything a forked worker snapshots from this executor; a change re-forks the pool."""
+        return (
+            str(self.workspace),
+            tuple(str(root) for root in self.allowed_roots),
+            self.execution_mode,
+            tuple(self.sensitive_prefixes),
+            tuple(sorted((name, id(h)) for name, h in self.handlers.items())),
+            str(PROJECT_ROOT),
+            str(DATA_DIR),
+        )
+
+    def _get_worker_pool(self) -> ProcessWorkerPool:
+        """Create the worker pool on first use, so workers fork from the configured executor."""
+        with self._worker_pool_lock:
+            if self._worker_pool is None:
+                ref = weakref.ref(self)
+                self._worker_pool = ProcessWorkerPool(
+                    resolve=lambda name: ref().handlers[name],
+                    size=int(os.getenv("NEXUS_ACTION_WORKERS", "2")),
+                    max_tasks_per_worker=int(os.getenv("NEXUS_ACTION_WORKER_MAX_TASKS", "500")),
+                )
+                weakref.finalize(self, self._worker_pool.shutdown)
+            pool = self._worker_pool
+        pool.refresh(self._worker_fingerprint())
+        return pool
+
+    def _get_python_pool(self) -> PythonInterpreterPool:
+        with self._worker_pool_lock:
+            if self._python_pool is None:
+                self._python_pool = PythonInterpreterPool()
+                weakref.finalize(self, self._python_pool.shutdown)
+            return self._python_pool
+
+    def shutdown_workers(self):
+        """Stop the worker and interpreter pools (they are recreated on next use)."""
+        with self._worker_pool_lock:
+            pool, self._worker_pool = self._worker_pool, None
+            python_pool, self._python_pool = self._python_pool, None
+        if pool is not None:
+            pool.shutdown()
+        if python_pool is not None:
+            python_pool.shutdown()
+
     # ==================== FILE OPERATIONS ====================
 
     def _action_read_file(self, params: Dict) -> Tuple[str, Dict]:
@@ -561,13 +716,16 @@ class ActionExecutor:
 
         variables = self._extract_python_defined_names(code)
         try:
-            result = subprocess.run(
-                [sys.executable, '-c', code],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                cwd=str(WORKSPACE_DIR),
-            )
+            if python_pool_enabled():
+                result = self._get_python_pool().run(code, cwd=str(WORKSPACE_DIR), timeout=30)
+            else:
+                result = subprocess.run(
+                    [sys.executable, '-c', code],
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                    cwd=str(WORKSPACE_DIR),
+                )
         except Exception as e:
             raise RuntimeError(f"Execution error: {e}")
 
@@ -963,20 +1121,12 @@ class ActionExecutor:
     # ==================== STATS ====================
 
     def get_stats(self) -> Dict:
-        """Get execution statistics"""
-        if not self.history:
+        """Get execution statistics (all-time, from incrementally maintained counters)"""
+        stats = self.stats.summary()
+        if not stats["total"]:
             return {"total": 0, "success": 0, "failed": 0, "success_rate": 0}
-
-        success = sum(1 for a in self.history if a.status == ActionStatus.SUCCESS)
-        failed = sum(1 for a in self.history if a.status == ActionStatus.FAILED)
-
-        return {
-            "total": len(self.history),
-            "success": success,
-            "failed": failed,
-            "success_rate": success / len(self.history) if self.history else 0,
-            "available_actions": list(self.handlers.keys())
-        }
+        stats["available_actions"] = list(self.handlers.keys())
+        return stats
 
     def list_available_actions(self) -> List[Dict]:
         """List all available actions"""
@@ -0,0 +1,255 @@
+"""
+Bounded action history for ActionExecutor.
+
+The JSONL history file is the source of truth and is only ever appended to.
+In memory we keep:
+- RecentResults: a fixed-size ring of the newest results
+- ActionStatsCounters: running totals per action type, status and
+  failure_code plus duration histograms, snapshotted to a small JSON file
+  together with the history byte offset they cover
+
+Older rows are read on demand with iter_lines_reverse, which seeks
+backwards through the file in chunks.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional
+
+# Upper bounds (ms) of the duration histogram buckets; the last bucket is open-ended.
+DURATION_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+def duration_bucket(duration_ms: float) -> str:
+    idx = bisect_left(DURATION_BUCKETS_MS, float(duration_ms or 0))
+    if idx >= len(DURATION_BUCKETS_MS):
+        return f">{DURATION_BUCKETS_MS[-1]}"
+    return f"<={DURATION_BUCKETS_MS[idx]}"
+
+
+def iter_lines_reverse(path: Path, end: Optional[int] = None, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield non-empty lines of ``path`` newest first, reading backwards from ``end``."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell() if end is None else min(int(end), f.tell())
+            remainder = b""
+            while pos > 0:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step) + remainder
+                lines = block.split(b"\n")
+                # The first piece may be a partial line; keep it for the next chunk.
+                remainder = lines.pop(0)
+                for raw in reversed(lines):
+                    raw = raw.strip()
+                    if raw:
+                        yield raw.decode("utf-8", errors="replace")
+            remainder = remainder.strip()
+            if remainder:
+                yield remainder.decode("utf-8", errors="replace")
+    except OSError:
+        return
+
+
+class RecentResults:
+    """Fixed-size ring of the newest ActionResults; supports len, iteration and slicing."""
+
+    def __init__(self, maxlen: int = 1000, items: Iterable[Any] = ()):
+        self._items: Deque[Any] = deque(items, maxlen=max(1, int(maxlen)))
+
+    @property
+    def maxlen(self) -> int:
+        return self._items.maxlen
+
+    def append(self, item: Any) -> None:
+        self._items.append(item)
+
+    def extend(self, items: Iterable[Any]) -> None:
+        self._items.extend(items)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self._items)[key]
+        return self._items[key]
+
+
+class ActionStatsCounters:
+    """Incrementally maintained execution counters persisted as a small snapshot."""
+
+    def __init__(self, path: Optional[Path], flush_every: int = 25, flush_interval_sec: float = 5.0):
+        self.path = Path(path) if path else None
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval_sec = max(0.0, float(flush_interval_sec))
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.reset()
+        self.loaded = self._load()
+
+    def reset(self) -> None:
+        self.total = 0
+        self.by_status: Dict[str, int] = {}
+        self.by_failure_code: Dict[str, int] = {}
+        self.by_type: Dict[str, Dict[str, Any]] = {}
+        self.history_offset = 0
+        self.policy_blocked = 0
+
+    # ==================== PERSISTENCE ====================
+
+    def _load(self) -> bool:
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.total = int(data.get("total", 0))
+            self.by_status = dict(data.get("by_status", {}))
+            self.by_failure_code = dict(data.get("by_failure_code", {}))
+            self.by_type = dict(data.get("by_type", {}))
+            self.history_offset = int(data.get("history_offset", 0))
+            self.policy_blocked = int(data.get("policy_blocked", 0))
+            return True
+        except (OSError, ValueError, TypeError, AttributeError):
+            self.reset()
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total,
+                "by_status": dict(self.by_status),
+                "by_failure_code": dict(self.by_failure_code),
+                "by_type": json.loads(json.dumps(self.by_type)),
+                "policy_blocked": self.policy_blocked,
+                "history_offset": self.history_offset,
+                "duration_buckets_ms": list(DURATION_BUCKETS_MS),
+            }
+
+    def flush(self, force: bool = True) -> bool:
+        if self.path is None:
+            return True
+        if not self._pending:
+            return True
+        if not force and self._pending < self.flush_every and time.monotonic() - self._last_flush < self.flush_interval_sec:
+            return True
+        payload = self.snapshot()
+        payload["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            return False
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        return True
+
+    # ==================== UPDATES ====================
+
+    def observe(self, row: Dict[str, Any], offset: Optional[int] = None, flush: bool = True) -> None:
+        """Fold one history row (as written to the JSONL file) into the counters."""
+        action_type = str(row.get("action_type") or "unknown")
+        status = str(row.get("status") or "failed")
+        failure_code = row.get("failure_code")
+        bucket = duration_bucket(row.get("duration_ms") or 0)
+        with self._lock:
+            self.total += 1
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            if failure_code:
+                self.by_failure_code[failure_code] = self.by_failure_code.get(failure_code, 0) + 1
+            if row.get("policy_blocked"):
+                self.policy_blocked += 1
+            entry = self.by_type.setdefault(
+                action_type,
+                {"total": 0, "statuses": {}, "failure_codes": {}, "duration_ms_total": 0.0, "duration_histogram": {}},
+            )
+            entry["total"] += 1
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            if failure_code:
+                entry["failure_codes"][failure_code] = entry["failure_codes"].get(failure_code, 0) + 1
+            entry["duration_ms_total"] += float(row.get("duration_ms") or 0)
+            entry["duration_histogram"][bucket] = entry["duration_histogram"].get(bucket, 0) + 1
+            if offset is not None:
+                self.history_offset = int(offset)
+            self._pending += 1
+        if flush:
+            self.flush(force=False)
+
+    def catch_up(self, history_file: Path, flush: bool = True) -> int:
+        """Fold rows appended after ``history_offset``; rebuild from scratch if the file shrank.
+
+        Other processes append to the same file, so after a local append this
+        is called instead of observing the one row: everything from the stored
+        offset to EOF is folded. ``flush=False`` leaves the snapshot write to
+        the usual every-N / every-T policy.
+        """
+        try:
+            size = history_file.stat().st_size
+        except OSError:
+            size = 0
+        if size < self.history_offset:
+            self.reset()
+        if size == self.history_offset:
+            return 0
+        folded = 0
+        with open(history_file, "rb") as f:
+            f.seek(self.history_offset)
+            for raw in f:
+                offset = f.tell()
+                if not raw.endswith(b"\n"):
+                    break  # torn trailing write; pick it up next time
+                try:
+                    row = json.loads(raw)
+                except ValueError:
+                    self.history_offset = offset
+                    continue
+                if isinstance(row, dict):
+                    self.observe(row, offset, flush=False)
+                    folded += 1
+                else:
+                    self.history_offset = offset
+        if flush:
+            self._pending = max(self._pending, 1)
+        self.flush(force=flush)
+        return folded
+
+    def summary(self) -> Dict[str, Any]:
+        snap = self.snapshot()
+        success = snap["by_status"].get("success", 0)
+        for entry in snap["by_type"].values():
+            entry["avg_duration_ms"] = round(entry["duration_ms_total"] / entry["total"], 2) if entry["total"] else 0.0
+        return {
+            "total": snap["total"],
+            "success": success,
+            "failed": snap["by_status"].get("failed", 0),
+            "timeout": snap["by_status"].get("timeout", 0),
+            "success_rate": success / snap["total"] if snap["total"] else 0,
+            "policy_blocked": snap["policy_blocked"],
+            "by_status": snap["by_status"],
+            "by_failure_code": snap["by_failure_code"],
+            "by_type": snap["by_type"],
+            "duration_buckets_ms": snap["duration_buckets_ms"],
+        }
@@ -0,0 +1,310 @@
+"""
+Pre-forked worker processes for ActionExecutor handlers.
+
+A worker is forked from the executor's process, so it already has the
+executor, its handlers and every imported module in memory. The parent
+sends ``(action_type, params, limits)`` over a pipe; the worker applies the
+per-action resource limits, runs the handler and sends back
+``(output, data, error)``.
+
+A handler that overruns its timeout is SIGKILLed together with its worker,
+and a fresh worker replaces it. Nothing keeps running in the background.
+Workers are reused across actions, so cheap actions only pay one pipe
+round-trip, and are recycled after ``max_tasks_per_worker`` actions.
+
+The workers rely on fork to inherit the handlers, and forking a process
+that runs other threads can copy a lock that one of those threads holds.
+For that reason the executor only uses this pool when
+NEXUS_ACTION_BACKEND=process is set explicitly.
+"""
+
+import json
+import multiprocessing
+import os
+import subprocess
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def fork_available() -> bool:
+    return hasattr(os, "fork") and "fork" in multiprocessing.get_all_start_methods()
+
+
+class WorkerCrashedError(RuntimeError):
+    """The worker died while running an action (resource limit, signal, hard exit)."""
+
+
+def _vm_size_bytes() -> int:
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _open_fd_count() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return 0
+
+
+def _set_soft_limit(which: int, value: int) -> None:
+    soft, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    try:
+        resource.setrlimit(which, (value, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def apply_action_limits(limits: Dict[str, Any]) -> None:
+    """Apply per-action rlimits inside a worker.
+
+    RLIMIT_CPU counts the worker's whole lifetime, so the soft limit is set to
+    CPU already used plus this action's budget. Address-space and open-file
+    limits never go below what the worker already uses.
+    """
+    if resource is None or not limits:
+        return
+    cpu_seconds = int(limits.get("cpu_seconds") or 0)
+    if cpu_seconds > 0:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime) + 1
+        _set_soft_limit(resource.RLIMIT_CPU, used + cpu_seconds)
+    memory_mb = int(limits.get("memory_mb") or 0)
+    if memory_mb > 0:
+        floor = _vm_size_bytes() + 256 * 1024 * 1024
+        _set_soft_limit(resource.RLIMIT_AS, max(memory_mb * 1024 * 1024, floor))
+    open_files = int(limits.get("open_files") or 0)
+    if open_files > 0:
+        _set_soft_limit(resource.RLIMIT_NOFILE, max(open_files, _open_fd_count() + 16))
+
+
+def _portable_error(error: Optional[BaseException]) -> Optional[BaseException]:
+    if error is None:
+        return None
+    try:
+        multiprocessing.reduction.ForkingPickler.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _worker_main(conn, inherited: List[Any], resolve: Callable[[str], Callable]) -> None:
+    # Drop the parent's pipe ends copied by fork, or the worker would never see EOF.
+    for other in inherited:
+        try:
+            other.close()
+        except Exception:
+            pass
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        action_type, params, limits = msg
+        apply_action_limits(limits)
+        output, data, error = "", {}, None
+        try:
+            output, data = resolve(action_type)(params)
+        except Exception as e:
+            error = e
+        try:
+            conn.send((output, data, _portable_error(error)))
+        except Exception:
+            safe_data = json.loads(json.dumps(data, default=str)) if isinstance(data, dict) else {}
+            conn.send((str(output), safe_data, _portable_error(error)))
+
+
+class _Worker:
+    __slots__ = ("process", "conn", "tasks", "generation")
+
+    def __init__(self, process, conn, generation: int):
+        self.process = process
+        self.conn = conn
+        self.tasks = 0
+        self.generation = generation
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+
+class ProcessWorkerPool:
+    """Pool of forked workers that run handlers resolved by ``resolve(action_type)``."""
+
+    def __init__(
+        self,
+        resolve: Callable[[str], Callable],
+        size: int = 2,
+        max_tasks_per_worker: int = 500,
+        limits: Optional[Dict[str, Any]] = None,
+    ):
+        self.resolve = resolve
+        self.size = max(1, int(size))
+        self.max_tasks_per_worker = max(1, int(max_tasks_per_worker))
+        self.limits = dict(limits or {})
+        self._ctx = multiprocessing.get_context("fork")
+        self._idle: List[_Worker] = []
+        self._busy = 0
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._workers: Set[_Worker] = set()
+        self._fingerprint: Any = None
+        self._closed = False
+        self.stats = {"spawned": 0, "killed": 0, "recycled": 0, "timeouts": 0, "crashes": 0, "runs": 0}
+
+    def _spawn(self) -> _Worker:
+        # Held across the fork so the child's list of inherited pipe ends is
+        # complete and no other spawn adds a worker while we read the set.
+        with self._cond:
+            parent_conn, child_conn = self._ctx.Pipe()
+            inherited = [parent_conn] + [w.conn for w in self._workers]
+            process = self._ctx.Process(target=_worker_main, args=(child_conn, inherited, self.resolve), daemon=True)
+            process.start()
+            child_conn.close()
+            self.stats["spawned"] += 1
+            worker = _Worker(process, parent_conn, self._generation)
+            self._workers.add(worker)
+            return worker
+
+    def _retire(self, worker: _Worker, graceful: bool) -> None:
+        with self._cond:
+            self._workers.discard(worker)
+        if graceful:
+            worker.stop()
+        else:
+            worker.kill()
+
+    def prestart(self) -> None:
+        """Fork idle workers up to ``size`` so the first actions do not pay for the fork."""
+        with self._cond:
+            while len(self._idle) + self._busy < self.size:
+                self._idle.append(self._spawn())
+
+    def refresh(self, fingerprint: Any) -> None:
+        """Retire workers forked before the owner's configuration changed."""
+        with self._cond:
+            if fingerprint == self._fingerprint:
+                return
+            self._fingerprint = fingerprint
+            self._generation += 1
+            stale, self._idle = self._idle, []
+        for worker in stale:
+            self._retire(worker, graceful=True)
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("worker pool is shut down")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive() and worker.generation == self._generation:
+                        self._busy += 1
+                        return worker
+                    self._retire(worker, graceful=False)
+                if self._busy < self.size:
+                    self._busy += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._spawn()
+        except Exception:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        retire = (
+            not healthy
+            or worker.tasks >= self.max_tasks_per_worker
+            or worker.generation != self._generation
+            or self._closed
+        )
+        if retire:
+            if healthy:
+                self.stats["recycled"] += 1
+            else:
+                self.stats["killed"] += 1
+            self._retire(worker, graceful=healthy)
+        with self._cond:
+            self._busy -= 1
+            if not retire:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def run(
+        self, action_type: str, params: Dict, timeout: float, limits: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict, Optional[BaseException]]:
+        """Run one action in a worker; raises TimeoutExpired (worker killed) or WorkerCrashedError."""
+        worker = self._acquire()
+        healthy = False
+        try:
+            worker.tasks += 1
+            self.stats["runs"] += 1
+            worker.conn.send((action_type, params, self.limits if limits is None else limits))
+            if not worker.conn.poll(max(0.0, float(timeout))):
+                self.stats["timeouts"] += 1
+                raise subprocess.TimeoutExpired(action_type, timeout)
+            try:
+                output, data, error = worker.conn.recv()
+            except (EOFError, OSError):
+                self.stats["crashes"] += 1
+                worker.process.join(timeout=1)
+                raise WorkerCrashedError(
+                    f"worker for {action_type} exited with code {worker.process.exitcode}"
+                )
+            healthy = True
+            return output, data, error
+        finally:
+            self._release(worker, healthy)
+
+    def worker_pids(self) -> List[int]:
+        with self._cond:
+            return [w.process.pid for w in self._idle]
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            self._retire(worker, graceful=True)
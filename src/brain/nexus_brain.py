@@ -39,18 +39,22 @@ import asyncio
 import subprocess
 import hashlib
 import re
+import sqlite3
 import traceback
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable, Set
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
-from collections import defaultdict
+from collections import defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor
 import random
 
 import logging
 
+from core.latency_sketch import LatencySketch
 from core.nexus_logger import get_logger
+from core.periodic_scheduler import PeriodicScheduler
+from core.state_engine import engine_for
 
 logger = get_logger(__name__)
 
@@ -266,58 +270,148 @@ class SkillTracker:
     """
     Track skill progression for different tasks
     Level 1-10, from novice to master
+
+    Executions are aggregated in memory and written behind to the shared
+    state engine (namespace "skills" in the data dir's state.db): only the
+    skills that changed are written, in one transaction, every
+    SKILL_FLUSH_EVERY recorded executions, SKILL_FLUSH_INTERVAL seconds
+    (checked on record and by the brain's scheduler), or at shutdown. An
+    existing skills.json is imported on first load. Each skill keeps a
+    latency sketch (p50/p95/p99) and a success window of its last
+    SKILL_WINDOW runs.
     """
 
     def __init__(self, brain):
         self.brain = brain
         self.skills: Dict[str, Dict] = {}
         self.skills_file = DATA_DIR / "skills.json"
+        self.flush_every = max(1, int(os.getenv("SKILL_FLUSH_EVERY", "50")))
+        self.flush_interval_sec = max(0.0, float(os.getenv("SKILL_FLUSH_INTERVAL", "30")))
+        self.window_size = max(1, int(os.getenv("SKILL_WINDOW", "50")))
+        self._sketches: Dict[str, LatencySketch] = {}
+        self._windows: Dict[str, deque] = {}
+        self._dirty = 0
+        self._dirty_names: Set[str] = set()
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
         self._load()
+        import atexit
+        atexit.register(self.flush)
 
     def _load(self):
-        if self.skills_file.exists():
-            try:
-                with open(self.skills_file, 'r', encoding='utf-8') as f:
-                    self.skills = json.load(f)
-            except (json.JSONDecodeError, OSError, KeyError) as e:
-                logger.warning(f"Failed to load skills: {e}")
+        try:
+            engine, ns = engine_for(self.skills_file)
+            engine.import_json_once(ns, self.skills_file, lambda data: data.items())
+            self.skills = dict(engine.items(ns))
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"Failed to load skills: {e}")
+        for name, skill in self.skills.items():
+            if skill.get("latency_sketch"):
+                self._sketches[name] = LatencySketch.from_dict(skill["latency_sketch"])
+            self._windows[name] = deque(skill.get("recent_outcomes") or [], maxlen=self.window_size)
 
     def _save(self):
-        with open(self.skills_file, 'w', encoding='utf-8') as f:
-            json.dump(self.skills, f, indent=2, default=str)
+        rows = []
+        for name in self._dirty_names:
+            skill = self.skills[name]
+            if name in self._sketches:
+                skill["latency_sketch"] = self._sketches[name].to_dict()
+            if name in self._windows:
+                skill["recent_outcomes"] = list(self._windows[name])
+            rows.append((name, skill))
+        engine, ns = engine_for(self.skills_file)
+        engine.put_many(ns, rows)
+
+    def flush(self):
+        """Write the skills changed since the last flush to the state engine"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._save()
+            except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to save skills: {e}")
+                return
+            self._dirty = 0
+            self._dirty_names.clear()
+            self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        """Flush if the dirty count or the flush interval has been reached"""
+        if self._dirty and (
+            self._dirty >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval_sec
+        ):
+            self.flush()
 
     def record_execution(self, skill_name: str, duration_ms: float, success: bool, context: Dict = None):
         """Record a skill execution"""
-        if skill_name not in self.skills:
-            self.skills[skill_name] = {
-                "level": 1,
-                "total_executions": 0,
-                "total_failures": 0,
-                "total_time_ms": 0,
-                "best_time_ms": float('inf'),
-                "avg_time_ms": 0,
-                "mastered": False,
-                "can_delegate": False,
-                "first_execution": datetime.now().isoformat(),
-                "last_execution": None,
-                "level_history": []
-            }
-
-        skill = self.skills[skill_name]
-        skill["total_executions"] += 1
-        skill["total_time_ms"] += duration_ms
-        skill["avg_time_ms"] = skill["total_time_ms"] / skill["total_executions"]
-        skill["last_execution"] = datetime.now().isoformat()
-
-        if not success:
-            skill["total_failures"] += 1
-
-        if duration_ms < skill["best_time_ms"]:
-            skill["best_time_ms"] = duration_ms
+        with self._lock:
+            if skill_name not in self.skills:
+                self.skills[skill_name] = {
+                    "level": 1,
+                    "total_executions": 0,
+                    "total_failures": 0,
+                    "total_time_ms": 0,
+                    "best_time_ms": float('inf'),
+                    "avg_time_ms": 0,
+                    "mastered": False,
+                    "can_delegate": False,
+                    "first_execution": datetime.now().isoformat(),
+                    "last_execution": None,
+                    "level_history": []
+                }
 
-        # Calculate level
-        self._update_level(skill_name)
-        self._save()
+            skill = self.skills[skill_name]
+            skill["total_executions"] += 1
+            skill["total_time_ms"] += duration_ms
+            skill["avg_time_ms"] = skill["total_time_ms"] / skill["total_executions"]
+            skill["last_execution"] = datetime.now().isoformat()
+
+            if not success:
+                skill["total_failures"] += 1
+
+            if duration_ms < skill["best_time_ms"]:
+                skill["best_time_ms"] = duration_ms
+
+            sketch = self._sketches.get(skill_name)
+            if sketch is None:
+                sketch = self._sketches[skill_name] = LatencySketch()
+            sketch.add(duration_ms)
+            window = self._windows.get(skill_name)
+            if window is None:
+                window = self._windows[skill_name] = deque(maxlen=self.window_size)
+            window.append(1 if success else 0)
+
+            # Calculate level
+            self._update_level(skill_name)
+            self._dirty += 1
+            self._dirty_names.add(skill_name)
+            self.maybe_flush()
+
+    def get_telemetry(self, skill_name: str) -> Dict:
+        """Tail latency and recent reliability for one skill"""
+        skill = self.skills.get(skill_name) or {}
+        total = skill.get("total_executions", 0)
+        lifetime = (total - skill.get("total_failures", 0)) / max(total, 1)
+        window = self._windows.get(skill_name)
+        recent = sum(window) / len(window) if window else lifetime
+        sketch = self._sketches.get(skill_name)
+        if sketch is not None and sketch.count:
+            p50, p95, p99 = sketch.quantile(0.5), sketch.quantile(0.95), sketch.quantile(0.99)
+        else:
+            # Skills recorded before sketches existed only know their mean
+            p50 = p95 = p99 = skill.get("avg_time_ms") or None
+        tail_ratio = (p99 / p50) if p50 and p99 else 1.0
+        return {
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "tail_ratio": tail_ratio,
+            "recent_success_rate": recent,
+            "recent_window": len(window) if window else 0,
+            "lifetime_success_rate": lifetime,
+        }
 
     def _update_level(self, skill_name: str):
         """Update skill level based on performance"""
@@ -349,27 +443,38 @@ class SkillTracker:
             skill["mastered"] = True
 
         # Delegation check
-        if skill["level"] >= 9 and skill["total_executions"] >= 50:
+        if skill["level"] >= 9 and skill["total_executions"] >= 50 and not skill["can_delegate"]:
             skill["can_delegate"] = True
             self.brain.log(f"SKILL READY FOR DELEGATION: {skill_name}")
 
     def get_skill_report(self) -> Dict:
         """Get skill progression report"""
-        return {
-            name: {
+        report = {}
+        for name, data in self.skills.items():
+            telemetry = self.get_telemetry(name)
+            report[name] = {
                 "level": data["level"],
                 "executions": data["total_executions"],
                 "success_rate": (data["total_executions"] - data["total_failures"]) / max(data["total_executions"], 1),
+                "recent_success_rate": telemetry["recent_success_rate"],
                 "avg_time_ms": data["avg_time_ms"],
                 "best_time_ms": data["best_time_ms"] if data["best_time_ms"] != float('inf') else 0,
+                "p50_ms": telemetry["p50_ms"],
+                "p95_ms": telemetry["p95_ms"],
+                "p99_ms": telemetry["p99_ms"],
                 "mastered": data["mastered"],
                 "can_delegate": data["can_delegate"]
             }
-            for name, data in self.skills.items()
-        }
+        return report
 
     def get_skill_recommendation(self, task_type: str) -> Dict:
-        """Recommend how to handle a task based on skill data."""
+        """
+        Recommend how to handle a task based on skill data.
+
+        Reliability is the success rate over the recent window, not the
+        lifetime average. Confidence is discounted when the p99 latency
+        runs far beyond the median (an unpredictable skill).
+        """
         skill = self.skills.get(task_type, None)
 
         if skill is None:
@@ -382,55 +487,67 @@ class SkillTracker:
 
         level = skill.get('level', 1)
         total = skill.get('total_executions', 0)
-        failures = skill.get('total_failures', 0)
-        success_rate = (total - failures) / max(total, 1)
-        mastered = skill.get('mastered', False)
-        can_delegate = skill.get('can_delegate', False)
+        telemetry = self.get_telemetry(task_type)
+        success_rate = telemetry['recent_success_rate']
+        stability = max(0.5, min(1.0, 3.0 / max(telemetry['tail_ratio'], 1.0)))
+        mastered = skill.get('mastered', False) and success_rate >= 0.8
+        can_delegate = skill.get('can_delegate', False) and success_rate >= 0.9
+        extra = {
+            'recent_success_rate': round(success_rate, 3),
+            'p95_ms': telemetry['p95_ms'],
+            'p99_ms': telemetry['p99_ms'],
+        }
 
         if can_delegate:
-            return {
+            rec = {
                 'recommendation': 'delegate',
-                'confidence': min(1.0, success_rate),
-                'reason': f'Mastered skill (level {level}, {success_rate:.0%} success)',
+                'confidence': min(1.0, success_rate * stability),
+                'reason': f'Mastered skill (level {level}, {success_rate:.0%} recent success)',
                 'suggested_approach': 'autonomous',
             }
         elif mastered:
-            return {
+            rec = {
                 'recommendation': 'execute',
-                'confidence': min(1.0, success_rate),
+                'confidence': min(1.0, success_rate * stability),
                 'reason': f'High proficiency (level {level})',
                 'suggested_approach': 'confident',
             }
         elif level >= 5 and success_rate >= 0.7:
-            return {
+            rec = {
                 'recommendation': 'execute',
-                'confidence': success_rate * 0.8,
+                'confidence': success_rate * 0.8 * stability,
                 'reason': f'Moderate proficiency (level {level})',
                 'suggested_approach': 'standard',
             }
         elif level >= 3:
-            return {
+            rec = {
                 'recommendation': 'execute_with_verification',
-                'confidence': success_rate * 0.5,
+                'confidence': success_rate * 0.5 * stability,
                 'reason': f'Learning phase (level {level})',
                 'suggested_approach': 'careful',
             }
         else:
-            return {
+            rec = {
                 'recommendation': 'learn_then_execute',
-                'confidence': max(0.1, success_rate * 0.3),
+                'confidence': max(0.1, success_rate * 0.3 * stability),
                 'reason': f'Beginner (level {level}, {total} attempts)',
                 'suggested_approach': 'cautious',
             }
+        rec.update(extra)
+        return rec
 
     def get_best_skill_for_task(self, task_description: str) -> Optional[str]:
-        """Find the most relevant skill for a task based on keyword matching."""
+        """
+        Find the most relevant skill for a task.
+
+        Keyword match is combined with level, recent success rate and p95
+        latency relative to the fastest matching skill.
+        """
         if not self.skills:
             return None
 
         task_lower = task_description.lower()
-        best_match = None
-        best_score = 0.0
+        candidates = []
 
         for skill_name, skill_data in self.skills.items():
             # Keyword match score
@@ -441,11 +558,23 @@ class SkillTracker:
 
             keyword_score = match_count / max(len(skill_words), 1)
             level_score = skill_data.get('level', 1) / 10.0
-            total = skill_data.get('total_executions', 0)
-            failures = skill_data.get('total_failures', 0)
-            success_score = (total - failures) / max(total, 1)
+            telemetry = self.get_telemetry(skill_name)
+            candidates.append((skill_name, keyword_score, level_score, telemetry))
+
+        if not candidates:
+            return None
 
-            combined = keyword_score * 0.4 + level_score * 0.3 + success_score * 0.3
+        fastest_p95 = min((t['p95_ms'] for *_, t in candidates if t['p95_ms']), default=None)
+        best_match = None
+        best_score = 0.0
+        for skill_name, keyword_score, level_score, telemetry in candidates:
+            tail_score = fastest_p95 / telemetry['p95_ms'] if fastest_p95 and telemetry['p95_ms'] else 1.0
+            combined = (
+                keyword_score * 0.4
+                + level_score * 0.2
+                + telemetry['recent_success_rate'] * 0.25
+                + tail_score * 0.15
+            )
             if combined > best_score:
                 best_score = combined
                 best_match = skill_name
@@ -601,7 +730,16 @@ class NexusBrain:
 
         # State
         self.running = False
-        self._threads: List[threading.Thread] = []
+        self.scheduler = PeriodicScheduler(
+            max_workers=int(os.getenv("NEXUS_SCHEDULER_WORKERS", "2")),
+            name="nexus-brain",
+        )
+        self.schedule(
+            "skills_flush",
+            self.skills.flush_interval_sec or 30,
+            self.skills.flush,
+            first_delay_sec=self.skills.flush_interval_sec or 30,
+        )
         self._last_cycles: Dict[str, datetime] = {}
 
         # Log file
@@ -718,29 +856,18 @@ class NexusBrain:
 
     # ==================== AUTONOMOUS CYCLES ====================
 
-    def _run_cycle(self, name: str, interval_minutes: int, callback: Callable):
-        """Run a periodic cycle"""
-        while self.running:
-            try:
-                # Check if it's time to run
-                last_run = self._last_cycles.get(name)
-                now = datetime.now()
-
-                if last_run is None or (now - last_run).total_seconds() >= interval_minutes * 60:
-                    self.log(f"Running cycle: {name}")
-                    try:
-                        callback()
-                    except (OSError, ValueError, TypeError, RuntimeError) as e:
-                        self.log(f"Cycle {name} error: {e}", "ERROR")
-
-                    self._last_cycles[name] = now
-
-                # Sleep
-                time.sleep(int(os.getenv("NEXUS_CYCLE_INTERVAL", "60")))
+    def _run_cycle(self, name: str, callback: Callable):
+        """Run one cycle; called by the scheduler when the cycle is due"""
+        self.log(f"Running cycle: {name}")
+        try:
+            callback()
+        except (OSError, ValueError, TypeError, RuntimeError) as e:
+            self.log(f"Cycle {name} error: {e}", "ERROR")
+        self._last_cycles[name] = datetime.now()
 
-            except (OSError, ValueError, TypeError, RuntimeError) as e:
-                self.log(f"Cycle thread error: {e}", "ERROR")
-                time.sleep(int(os.getenv("NEXUS_CYCLE_INTERVAL", "60")))
+    def schedule(self, name: str, interval_sec: float, callback: Callable, **options):
+        """Run callback every interval_sec on the brain's shared scheduler"""
+        return self.scheduler.add_job(name, interval_sec, callback, **options)
 
     def _cycle_news_scan(self):
         """Scan news for new knowledge"""
@@ -820,15 +947,18 @@ class NexusBrain:
             ("report", self.config.report_interval, self._cycle_report),
         ]
 
+        jitter = float(os.getenv("NEXUS_CYCLE_JITTER", "0.05"))
+        catch_up = os.getenv("NEXUS_CYCLE_CATCH_UP", "skip")
         for name, interval, callback in cycles:
-            thread = threading.Thread(
-                target=self._run_cycle,
-                args=(name, interval, callback),
-                daemon=True
+            self.schedule(
+                name,
+                interval * 60,
+                lambda name=name, callback=callback: self._run_cycle(name, callback),
+                jitter=jitter,
+                catch_up=catch_up,
             )
-            thread.start()
-            self._threads.append(thread)
             self.log(f"Started cycle: {name} (every {interval} min)")
+        self.scheduler.start()
 
         return {"status": "started", "cycles": len(cycles)}
 
@@ -839,9 +969,10 @@ class NexusBrain:
         logging.raiseExceptions = False
         self.log("NEXUS BRAIN SHUTTING DOWN")
 
-        # Wait for threads
-        for thread in self._threads:
-            thread.join(timeout=5)
+        # Wakes the timer at once; only in-flight cycles are waited for
+        if not self.scheduler.stop(timeout=float(os.getenv("NEXUS_SHUTDOWN_TIMEOUT", "5"))):
+            self.log("Cycles still running at shutdown; left to finish in the background", "WARNING")
+        self.skills.flush()
 
         self.log("NEXUS BRAIN STOPPED")
 
@@ -865,6 +996,7 @@ class NexusBrain:
             "memory": memory_stats,
             "skills": skill_report,
             "cycles": cycle_times,
+            "scheduler": self.scheduler.get_stats(),
             "uptime": "active"
         }
 
@@ -929,11 +1061,14 @@ if __name__ == "__main__":
     print("Press Ctrl+C to stop")
     print()
 
+    def print_stats():
+        stats = brain_stats()
+        print(f"[{datetime.now().isoformat()}] Knowledge: {stats['memory']['total_knowledge']}, Skills: {len(stats['skills'])}")
+
+    brain.schedule("console_stats", 60, print_stats, first_delay_sec=60)
+
     try:
-        while True:
-            time.sleep(60)
-            stats = brain_stats()
-            print(f"[{datetime.now().isoformat()}] Knowledge: {stats['memory']['total_knowledge']}, Skills: {len(stats['skills'])}")
+        threading.Event().wait()
     except KeyboardInterrupt:
         print("\nShutting down...")
         brain.shutdown()
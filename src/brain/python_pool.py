@@ -0,0 +1,297 @@
+"""
+Pool of warm Python interpreters for ``run_python`` actions.
+
+``python -c code`` pays interpreter start-up and imports on every call. This
+pool keeps a few ``python_worker.py`` processes alive with common modules
+already imported. Code is sent over a pipe and the reply comes back as a
+``subprocess.CompletedProcess``, so callers can treat it like
+``subprocess.run``.
+
+- Isolation: each snippet runs in a child forked from a warm interpreter,
+  with file descriptors 1 and 2 redirected to capture files. Output from
+  os.system and subprocesses is captured, and changes a snippet makes to
+  modules, cwd or the environment die with its child.
+- Timeouts: the parent stops waiting after ``timeout`` seconds, SIGKILLs the
+  interpreter's process group (the snippet and anything it started) and
+  raises ``subprocess.TimeoutExpired``. Snippets also run under an
+  RLIMIT_CPU budget, so they cannot outlive a parent that died.
+- Output caps: stdout and stderr are each truncated to ``max_output``
+  bytes.
+- Recycling: an interpreter is replaced after ``max_executions`` snippets,
+  or when its RSS exceeds ``max_rss_mb``.
+- Limits: snippets run with ``stdin`` closed. Like ``python -c`` they get no
+  address-space or open-file rlimits unless ``limits`` (or
+  NEXUS_PYTHON_POOL_MEMORY_MB) asks for them.
+
+Environment variables:
+    NEXUS_PYTHON_POOL_ENABLED        – use the pool for run_python (default: true)
+    NEXUS_PYTHON_POOL_SIZE           – interpreters per executor process (default: 2)
+    NEXUS_PYTHON_POOL_MAX_EXECUTIONS – snippets before an interpreter is replaced (default: 200)
+    NEXUS_PYTHON_POOL_MAX_RSS_MB     – RSS that triggers replacement (default: 512)
+    NEXUS_PYTHON_POOL_MAX_OUTPUT     – cap on stdout/stderr bytes (default: 1048576)
+    NEXUS_PYTHON_POOL_MEMORY_MB      – address-space limit per snippet, 0 = none (default: 0)
+    NEXUS_PYTHON_POOL_PRELOAD        – comma-separated modules imported at start-up
+"""
+
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+WORKER_SCRIPT = Path(__file__).with_name("python_worker.py")
+DEFAULT_PRELOAD = (
+    "json,re,math,os,sys,time,datetime,collections,itertools,functools,"
+    "random,statistics,pathlib,decimal,fractions,textwrap,string"
+)
+_HEADER_SIZE = 4
+
+
+def python_pool_enabled() -> bool:
+    return os.getenv("NEXUS_PYTHON_POOL_ENABLED", "true").strip().lower() == "true"
+
+
+class _Interpreter:
+    __slots__ = ("process", "request_fd", "response_fd", "executions", "rss_kb")
+
+    def __init__(self, process: subprocess.Popen, request_fd: int, response_fd: int):
+        self.process = process
+        self.request_fd = request_fd
+        self.response_fd = response_fd
+        self.executions = 0
+        self.rss_kb = 0
+
+    def send(self, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        data = len(body).to_bytes(_HEADER_SIZE, "big") + body
+        while data:
+            data = data[os.write(self.request_fd, data):]
+
+    def _read_exact(self, n: int, deadline: float) -> Optional[bytes]:
+        chunks = []
+        while n:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([self.response_fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(self.response_fd, n)
+            if not chunk:
+                raise EOFError("interpreter exited")
+            chunks.append(chunk)
+            n -= len(chunk)
+        return b"".join(chunks)
+
+    def recv(self, timeout: float) -> Optional[Dict]:
+        """Next reply, or None when ``timeout`` elapses first."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        header = self._read_exact(_HEADER_SIZE, deadline)
+        if header is None:
+            return None
+        body = self._read_exact(int.from_bytes(header, "big"), deadline)
+        if body is None:
+            return None
+        return json.loads(body.decode("utf-8"))
+
+    def close(self, kill: bool = False) -> None:
+        for fd in (self.request_fd, self.response_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        if kill:
+            # The interpreter leads its own session; take the snippet and its children too.
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=1 if not kill else 5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class PythonInterpreterPool:
+    """Warm interpreters shared by the threads of one process."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_executions: Optional[int] = None,
+        max_rss_mb: Optional[int] = None,
+        max_output: Optional[int] = None,
+        preload: Optional[str] = None,
+        limits: Optional[Dict] = None,
+    ):
+        self.size = max(1, int(size if size is not None else os.getenv("NEXUS_PYTHON_POOL_SIZE", "2")))
+        self.max_executions = max(1, int(
+            max_executions if max_executions is not None else os.getenv("NEXUS_PYTHON_POOL_MAX_EXECUTIONS", "200")
+        ))
+        self.max_rss_mb = int(max_rss_mb if max_rss_mb is not None else os.getenv("NEXUS_PYTHON_POOL_MAX_RSS_MB", "512"))
+        self.max_output = int(max_output if max_output is not None else os.getenv("NEXUS_PYTHON_POOL_MAX_OUTPUT", "1048576"))
+        self.preload = preload if preload is not None else os.getenv("NEXUS_PYTHON_POOL_PRELOAD", DEFAULT_PRELOAD)
+        if limits is None:
+            limits = {"memory_mb": int(os.getenv("NEXUS_PYTHON_POOL_MEMORY_MB", "0"))}
+        self.limits = dict(limits)
+        self._idle: List[_Interpreter] = []
+        self._busy = 0
+        self._cond = threading.Condition()
+        self._owner_pid = os.getpid()
+        self.stats = {"spawned": 0, "executions": 0, "timeouts": 0, "recycled": 0, "crashes": 0}
+
+    # ==================== LIFECYCLE ====================
+
+    def _check_owner(self) -> None:
+        # A forked copy (e.g. an ActionExecutor worker) must not share the parent's pipes.
+        if os.getpid() != self._owner_pid:
+            for interp in self._idle:
+                for fd in (interp.request_fd, interp.response_fd):
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+            self._idle = []
+            self._busy = 0
+            self._cond = threading.Condition()
+            self._owner_pid = os.getpid()
+
+    def _spawn(self) -> _Interpreter:
+        req_r, req_w = os.pipe()
+        resp_r, resp_w = os.pipe()
+        try:
+            process = subprocess.Popen(
+                [sys.executable, str(WORKER_SCRIPT), str(req_r), str(resp_w), self.preload, json.dumps(self.limits)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=(req_r, resp_w),
+                close_fds=True,
+                start_new_session=True,
+            )
+        except Exception:
+            for fd in (req_r, req_w, resp_r, resp_w):
+                os.close(fd)
+            raise
+        os.close(req_r)
+        os.close(resp_w)
+        interp = _Interpreter(process, req_w, resp_r)
+        try:
+            hello = interp.recv(timeout=30)
+        except (EOFError, ValueError):
+            hello = None
+        if not hello or not hello.get("ready"):
+            interp.close(kill=True)
+            raise RuntimeError("python worker failed to start")
+        interp.rss_kb = int(hello.get("rss_kb") or 0)
+        self.stats["spawned"] += 1
+        return interp
+
+    def prestart(self) -> None:
+        """Start interpreters up to ``size`` ahead of the first snippet."""
+        self._check_owner()
+        with self._cond:
+            missing = self.size - len(self._idle) - self._busy
+            self._busy += max(0, missing)
+        for _ in range(max(0, missing)):
+            interp = None
+            try:
+                interp = self._spawn()
+            finally:
+                with self._cond:
+                    self._busy -= 1
+                    if interp is not None:
+                        self._idle.append(interp)
+                    self._cond.notify()
+
+    def _acquire(self) -> _Interpreter:
+        self._check_owner()
+        with self._cond:
+            while True:
+                while self._idle:
+                    interp = self._idle.pop()
+                    if interp.process.poll() is None:
+                        self._busy += 1
+                        return interp
+                    interp.close()
+                if self._busy < self.size:
+                    self._busy += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._spawn()
+        except Exception:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, interp: _Interpreter, healthy: bool) -> None:
+        worn_out = (
+            interp.executions >= self.max_executions
+            or (self.max_rss_mb > 0 and interp.rss_kb > self.max_rss_mb * 1024)
+        )
+        if healthy and worn_out:
+            self.stats["recycled"] += 1
+        if not healthy or worn_out:
+            interp.close(kill=not healthy)
+        with self._cond:
+            self._busy -= 1
+            if healthy and not worn_out:
+                self._idle.append(interp)
+            self._cond.notify()
+
+    def shutdown(self) -> None:
+        if os.getpid() != self._owner_pid:
+            return
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for interp in idle:
+            interp.close()
+
+    # ==================== EXECUTION ====================
+
+    def run(self, code: str, cwd: Optional[str] = None, timeout: float = 30) -> subprocess.CompletedProcess:
+        """Run ``code`` like ``subprocess.run([python, "-c", code], capture_output=True, text=True)``."""
+        args = [sys.executable, "-c", code]
+        interp = self._acquire()
+        healthy = False
+        try:
+            interp.executions += 1
+            self.stats["executions"] += 1
+            try:
+                interp.send({
+                    "code": code,
+                    "cwd": str(cwd) if cwd else None,
+                    "env": dict(os.environ),
+                    "max_output": self.max_output,
+                    "cpu_seconds": int(timeout) + 1,
+                })
+                reply = interp.recv(timeout)
+            except (EOFError, OSError, ValueError):
+                self.stats["crashes"] += 1
+                try:
+                    returncode = interp.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    returncode = None
+                return subprocess.CompletedProcess(
+                    args, returncode if returncode is not None else -9, "",
+                    f"python worker exited with code {returncode}",
+                )
+            if reply is None:
+                self.stats["timeouts"] += 1
+                raise subprocess.TimeoutExpired(args, timeout)
+            healthy = True
+            interp.rss_kb = int(reply.get("rss_kb") or 0)
+            stdout, stderr = reply.get("stdout", ""), reply.get("stderr", "")
+            if reply.get("truncated"):
+                stdout += "\n[output truncated]"
+            return subprocess.CompletedProcess(args, int(reply.get("returncode", 0)), stdout, stderr)
+        finally:
+            self._release(interp, healthy)
@@ -0,0 +1,211 @@
+"""
+Warm interpreter worker for PythonInterpreterPool.
+
+Started as ``python python_worker.py <request_fd> <response_fd> <preload> <limits>``.
+It imports the preload modules once, then serves requests forever. Frames
+on both pipes are a 4-byte big-endian length followed by UTF-8 JSON.
+
+Request:  {"code", "cwd", "env", "max_output", "cpu_seconds"}
+Response: {"stdout", "stderr", "returncode", "truncated", "rss_kb"}
+
+Each snippet runs in a child forked from the warm worker, so it starts from
+the preloaded modules but nothing it changes (globals, sys.modules, patched
+stdlib functions, cwd, environment) survives it. The child gets temporary
+files as file descriptors 1 and 2, so output from os.system, subprocesses
+and C extensions is captured along with sys.stdout / sys.stderr. On exit it
+joins non-daemon threads, runs atexit handlers and flushes stdio as
+``python -c`` does, but skips module teardown, which would cost more than
+the snippet.
+
+This file must only import the standard library. It runs outside the
+package.
+"""
+
+import atexit
+import importlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import traceback
+import types
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+_HEADER = struct.Struct(">I")
+
+
+def _read_exact(fd, n):
+    chunks = []
+    while n:
+        chunk = os.read(fd, n)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv(fd):
+    header = _read_exact(fd, _HEADER.size)
+    if header is None:
+        return None
+    body = _read_exact(fd, _HEADER.unpack(header)[0])
+    return None if body is None else json.loads(body.decode("utf-8"))
+
+
+def _send(fd, payload):
+    body = json.dumps(payload).encode("utf-8")
+    data = _HEADER.pack(len(body)) + body
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _rss_kb():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _set_limit(which, value):
+    soft, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    try:
+        resource.setrlimit(which, (value, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _apply_limits(limits, cpu_seconds):
+    if resource is None:
+        return
+    # A forked child starts with no CPU time used, so the budget is absolute.
+    if cpu_seconds > 0:
+        _set_limit(resource.RLIMIT_CPU, int(cpu_seconds))
+    for key, which, scale in (
+        ("memory_mb", resource.RLIMIT_AS, 1024 * 1024),
+        ("open_files", resource.RLIMIT_NOFILE, 1),
+    ):
+        value = int(limits.get(key) or 0) * scale
+        if value > 0:
+            _set_limit(which, value)
+
+
+def _run_child(request, limits, out_fd, err_fd):
+    """Body of the forked child. Returns the value for ``sys.exit``."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    env = request.get("env")
+    if env is not None:
+        # Only touch what differs; putenv/unsetenv on every key costs more than the snippet.
+        for key in [k for k in os.environ if k not in env]:
+            del os.environ[key]
+        for key, value in env.items():
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+    if request.get("cwd"):
+        os.chdir(request["cwd"])
+    # Files may have been written since the worker started.
+    importlib.invalidate_caches()
+    _apply_limits(limits, int(request.get("cpu_seconds") or 0))
+
+    main = types.ModuleType("__main__")
+    main.__builtins__ = __builtins__
+    sys.modules["__main__"] = main
+    sys.argv = ["-c"]
+    try:
+        exec(compile(request.get("code") or "", "<string>", "exec"), main.__dict__)
+    except SystemExit as e:
+        return e.code
+    except BaseException as e:
+        tb = e.__traceback__.tb_next if e.__traceback__ is not None else None
+        sys.stderr.write("".join(traceback.format_exception(type(e), e, tb)))
+        return 1
+    return 0
+
+
+def _exit_child(code):
+    """Finish the child the way ``python -c`` exits with ``sys.exit(code)``."""
+    if code is None:
+        status = 0
+    elif isinstance(code, int):
+        status = code & 0xFF
+    else:
+        sys.stderr.write(f"{code}\n")
+        status = 1
+    threading = sys.modules.get("threading")
+    if threading is not None:
+        threading._shutdown()
+    atexit._run_exitfuncs()
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    os._exit(status)
+
+
+def _read_capped(f, limit):
+    size = os.fstat(f.fileno()).st_size
+    f.seek(0)
+    return f.read(limit).decode("utf-8", errors="replace"), size > limit
+
+
+def _execute(request, limits, channel_fds):
+    """Run one snippet in a forked child and return the reply."""
+    max_output = max(0, int(request.get("max_output") or 1024 * 1024))
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            for fd in channel_fds:
+                os.close(fd)
+            code = 1
+            try:
+                code = _run_child(request, limits, out.fileno(), err.fileno())
+            finally:
+                _exit_child(code)
+        _, status = os.waitpid(pid, 0)
+        stdout, out_truncated = _read_capped(out, max_output)
+        stderr, err_truncated = _read_capped(err, max_output)
+    return {
+        "stdout": stdout,
+        "stderr": stderr,
+        "returncode": os.waitstatus_to_exitcode(status),
+        "truncated": out_truncated or err_truncated,
+        "rss_kb": _rss_kb(),
+    }
+
+
+def main(argv):
+    request_fd, response_fd = int(argv[1]), int(argv[2])
+    # Match ``python -c``: the current directory, not this file's directory, heads sys.path.
+    sys.path[0] = ""
+    limits = json.loads(argv[4]) if len(argv) > 4 else {}
+    for name in filter(None, (argv[3] if len(argv) > 3 else "").split(",")):
+        try:
+            __import__(name.strip())
+        except Exception:
+            pass
+    _send(response_fd, {"ready": True, "rss_kb": _rss_kb()})
+    while True:
+        request = _recv(request_fd)
+        if request is None:
+            return 0
+        _send(response_fd, _execute(request, limits, (request_fd, response_fd)))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -20,18 +20,23 @@ SOURCES:
 
 import json
 import os
+import queue
+import sqlite3
 import sys
 import time
 import threading
 import hashlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple, Callable
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Callable
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 import random
 
 from core.nexus_logger import get_logger
+from core.state_engine import engine_for
 
 logger = get_logger(__name__)
 
@@ -44,6 +49,9 @@ except ImportError:
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "brain"
 
+# History rows are trimmed to the newest `keep` per kind every this many appends
+HISTORY_TRIM_EVERY = int(os.getenv("REACT_HISTORY_TRIM_EVERY", "50"))
+
 
 class AgentState(Enum):
     IDLE = "idle"
@@ -91,12 +99,24 @@ class Reflection:
     timestamp: str
 
 
+class _TaskStoppedError(Exception):
+    """Raised inside execute_task when its deadline passes or it is cancelled."""
+
+
 class ReActAgent:
     """
     ReAct Agent with Self-Reflection
     Implements: Thought → Action → Observation → Reflection
     """
 
+    # (row kind, attribute, entry class, entries kept)
+    HISTORY_KINDS = (
+        ("thought", "thoughts", Thought, 100),
+        ("action", "actions", Action, 100),
+        ("observation", "observations", Observation, 100),
+        ("reflection", "reflections", Reflection, 50),
+    )
+
     def __init__(self, brain=None):
         self.brain = brain
         self.data_dir = DATA_DIR
@@ -111,6 +131,8 @@ class ReActAgent:
         self.actions: List[Action] = []
         self.observations: List[Observation] = []
         self.reflections: List[Reflection] = []
+        self._saved_counts: Dict[str, int] = {}
+        self._appends_since_trim = 0
 
         # Available tools
         self.tools: Dict[str, Callable] = {
@@ -125,26 +147,51 @@ class ReActAgent:
 
         self._load()
 
+    def _history_store(self):
+        """State engine and namespace for history_file (one row per entry, indexed by kind)"""
+        engine, ns = engine_for(self.history_file)
+        engine.ensure_index("kind", "$.kind")
+        return engine, ns
+
     def _load(self):
-        """Load history"""
-        if self.history_file.exists():
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.thoughts = [Thought(**t) for t in data.get("thoughts", [])]
-                self.actions = [Action(**a) for a in data.get("actions", [])]
-                self.observations = [Observation(**o) for o in data.get("observations", [])]
-                self.reflections = [Reflection(**r) for r in data.get("reflections", [])]
+        """Load the most recent history entries (importing a legacy history file once)"""
+        try:
+            engine, ns = self._history_store()
+            engine.import_json_once(ns, self.history_file, self._legacy_history_rows)
+            for kind, attr, cls, keep in self.HISTORY_KINDS:
+                rows = engine.query(ns, {"kind": kind}, descending=True, limit=keep)
+                setattr(self, attr, [cls(**doc["entry"]) for _key, doc in reversed(rows)])
+        except (sqlite3.Error, OSError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to load react history: {e}")
+        self._saved_counts = {attr: len(getattr(self, attr)) for _kind, attr, _cls, _keep in self.HISTORY_KINDS}
+
+    @classmethod
+    def _legacy_history_rows(cls, data: Dict) -> List[Tuple[str, Dict]]:
+        return [
+            (f"{kind}:{uuid.uuid4().hex}", {"kind": kind, "entry": entry})
+            for kind, attr, _cls, _keep in cls.HISTORY_KINDS
+            for entry in data.get(attr, [])
+        ]
 
     def _save(self):
-        """Save history"""
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "thoughts": [vars(t) for t in self.thoughts[-100:]],
-                "actions": [vars(a) for a in self.actions[-100:]],
-                "observations": [vars(o) for o in self.observations[-100:]],
-                "reflections": [vars(r) for r in self.reflections[-50:]],
-                "last_updated": datetime.now().isoformat()
-            }, f, indent=2)
+        """Append entries added since the last save (agents running in parallel share the store)"""
+        rows = []
+        for kind, attr, _cls, _keep in self.HISTORY_KINDS:
+            entries = getattr(self, attr)
+            for entry in entries[self._saved_counts.get(attr, 0):]:
+                rows.append((f"{kind}:{uuid.uuid4().hex}", {"kind": kind, "entry": vars(entry)}))
+            self._saved_counts[attr] = len(entries)
+        if not rows:
+            return
+
+        engine, ns = self._history_store()
+        with engine.transaction():
+            engine.put_many(ns, rows)
+            self._appends_since_trim += len(rows)
+            if self._appends_since_trim >= HISTORY_TRIM_EVERY:
+                for kind, _attr, _cls, keep in self.HISTORY_KINDS:
+                    engine.trim(ns, keep, {"kind": kind})
+                self._appends_since_trim = 0
 
     # ==================== TOOLS ====================
 
@@ -440,7 +487,13 @@ class ReActAgent:
 
     # ==================== FULL CYCLE ====================
 
-    def execute_task(self, task: str, max_cycles: int = 10) -> Dict:
+    def execute_task(
+        self,
+        task: str,
+        max_cycles: int = 10,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict:
         """
         Execute a task using ReAct pattern with self-reflection
 
@@ -449,6 +502,9 @@ class ReActAgent:
         2. Think → Act → Observe (repeat as needed)
         3. Reflect on result
         4. Return or retry
+
+        Remaining cycles (and the reflection) are skipped once
+        ``deadline`` (time.monotonic()) passes or ``cancel_event`` is set.
         """
         self.current_task = task
         result = {
@@ -469,7 +525,11 @@ class ReActAgent:
             result["thoughts"].append(vars(thought))
 
             # Phase 2: ReAct cycles
+            stopped = None
             for i in range(max_cycles):
+                stopped = self._stop_reason(deadline, cancel_event)
+                if stopped:
+                    break
                 result["cycles"] = i + 1
 
                 # Decide action based on thought
@@ -491,6 +551,13 @@ class ReActAgent:
                 thought = self.think(f"Based on observation: {observation.content}")
                 result["thoughts"].append(vars(thought))
 
+            stopped = stopped or self._stop_reason(deadline, cancel_event)
+            if stopped:
+                result[stopped] = True
+                result["success"] = False
+                result["final_result"] = self._synthesize_result(result)
+                raise _TaskStoppedError(stopped)
+
             # Phase 3: Self-reflection
             reflection = self.reflect(f"Completed task: {task}")
             result["reflections"].append(vars(reflection))
@@ -501,6 +568,8 @@ class ReActAgent:
 
             self.state = AgentState.COMPLETED if result["success"] else AgentState.FAILED
 
+        except _TaskStoppedError as stop:
+            result["error"] = "deadline exceeded" if str(stop) == "timed_out" else "cancelled"
         except Exception as e:
             result["error"] = str(e)
             result["success"] = False
@@ -512,6 +581,14 @@ class ReActAgent:
 
         return result
 
+    @staticmethod
+    def _stop_reason(deadline: Optional[float], cancel_event: Optional[threading.Event]) -> Optional[str]:
+        if deadline is not None and time.monotonic() >= deadline:
+            return "timed_out"
+        if cancel_event is not None and cancel_event.is_set():
+            return "cancelled"
+        return None
+
     def _decide_action(self, thought: Thought) -> Tuple[str, str, Dict]:
         """Decide what action to take based on thought"""
         reasoning = thought.reasoning.lower()
@@ -564,12 +641,27 @@ class MultiAgentOrchestrator:
     """
     Multi-Agent Orchestration System
     Coordinates multiple specialized agents
+
+    parallel_execute runs each task on its own agent in a bounded thread
+    pool (REACT_MAX_PARALLEL workers). An agent runs one task at a time;
+    when every registered agent is busy, a transient agent is used. Each
+    task gets a deadline (REACT_TASK_TIMEOUT seconds from when it starts).
+    Past the deadline its result is reported as timed out, and its agent
+    stops before the next cycle.
     """
 
-    def __init__(self):
+    def __init__(self, max_parallel: Optional[int] = None, task_timeout_sec: Optional[float] = None):
         self.data_dir = DATA_DIR
         self.agents: Dict[str, ReActAgent] = {}
         self.task_history: List[Dict] = []
+        self.max_parallel = max(1, int(
+            max_parallel if max_parallel is not None else os.getenv("REACT_MAX_PARALLEL", "4")
+        ))
+        self.task_timeout_sec = float(
+            task_timeout_sec if task_timeout_sec is not None else os.getenv("REACT_TASK_TIMEOUT", "300")
+        )
+        self._lock = threading.Lock()
+        self._busy: set = set()
 
     def create_agent(self, name: str, specialization: str, brain=None) -> ReActAgent:
         """Create a specialized agent"""
@@ -586,7 +678,7 @@ class MultiAgentOrchestrator:
             agent = self._select_agent(task)
 
         result = agent.execute_task(task)
-        self.task_history.append(result)
+        self._record(result)
         return result
 
     def _select_agent(self, task: str) -> ReActAgent:
@@ -595,12 +687,121 @@ class MultiAgentOrchestrator:
             return ReActAgent()
         return list(self.agents.values())[0]
 
-    def parallel_execute(self, tasks: List[str]) -> List[Dict]:
-        """Execute multiple tasks in parallel"""
-        results = []
-        for task in tasks:
-            result = self.delegate_task(task)
-            results.append(result)
+    def _record(self, result: Dict) -> None:
+        with self._lock:
+            self.task_history.append(result)
+
+    def _lease_agent(self, agent_name: Optional[str]) -> Tuple[str, ReActAgent]:
+        """Reserve an idle agent (the named one if free), or make a transient one"""
+        with self._lock:
+            names = ([agent_name] if agent_name in self.agents else []) + list(self.agents)
+            for name in names:
+                if name not in self._busy:
+                    self._busy.add(name)
+                    return name, self.agents[name]
+        return "", ReActAgent()
+
+    def _release_agent(self, name: str) -> None:
+        if name:
+            with self._lock:
+                self._busy.discard(name)
+
+    def iter_parallel_execute(
+        self,
+        tasks: List[str],
+        max_parallel: Optional[int] = None,
+        timeout_sec: Optional[float] = None,
+        max_cycles: int = 10,
+        agent_names: Optional[List[Optional[str]]] = None,
+    ) -> Iterator[Dict]:
+        """
+        Run tasks concurrently and yield each result as soon as it is ready.
+
+        Results carry "index" (position in ``tasks``), "agent" and
+        "duration_ms". A task past its deadline is yielded as timed out
+        right away, without waiting for its current tool call to return.
+        """
+        if not tasks:
+            return
+        workers = max(1, min(len(tasks), max_parallel or self.max_parallel))
+        timeout = self.task_timeout_sec if timeout_sec is None else float(timeout_sec)
+        events: "queue.Queue[Tuple[str, int, Any]]" = queue.Queue()
+        cancels = [threading.Event() for _ in tasks]
+
+        def run(index: int, task: str) -> None:
+            started = time.monotonic()
+            events.put(("start", index, started))
+            if cancels[index].is_set():
+                return
+            name, agent = self._lease_agent(agent_names[index] if agent_names else None)
+            try:
+                result = agent.execute_task(
+                    task, max_cycles=max_cycles, deadline=started + timeout, cancel_event=cancels[index],
+                )
+            except Exception as e:  # execute_task handles its own errors; this is a last resort
+                result = {"task": task, "success": False, "error": str(e)}
+            finally:
+                self._release_agent(name)
+            result.update(index=index, agent=name or "transient",
+                          duration_ms=round((time.monotonic() - started) * 1000, 3))
+            events.put(("done", index, result))
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="react-task")
+        try:
+            for index, task in enumerate(tasks):
+                pool.submit(run, index, task)
+
+            deadlines: Dict[int, float] = {}
+            finished: set = set()
+            while len(finished) < len(tasks):
+                wait = None
+                if deadlines:
+                    wait = max(0.0, min(deadlines.values()) - time.monotonic())
+                try:
+                    kind, index, payload = events.get(timeout=wait)
+                except queue.Empty:
+                    now = time.monotonic()
+                    for index, due in list(deadlines.items()):
+                        if due <= now:
+                            del deadlines[index]
+                            finished.add(index)
+                            cancels[index].set()
+                            result = {
+                                "task": tasks[index], "index": index, "success": False,
+                                "timed_out": True, "error": "deadline exceeded",
+                                "duration_ms": round(timeout * 1000, 3),
+                            }
+                            self._record(result)
+                            yield result
+                    continue
+                if index in finished:
+                    continue  # late result of a task already reported as timed out
+                if kind == "start":
+                    deadlines[index] = payload + timeout
+                    continue
+                deadlines.pop(index, None)
+                finished.add(index)
+                self._record(payload)
+                yield payload
+        finally:
+            # Consumer stopped early or all done: stop remaining cycles, don't wait for them
+            for cancel in cancels:
+                cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def parallel_execute(self, tasks: List[str], **options) -> List[Dict]:
+        """
+        Execute multiple tasks in parallel; results are in task order.
+
+        Pass ``on_result`` to receive each result as it finishes. Other
+        options go to iter_parallel_execute.
+        """
+        on_result = options.pop("on_result", None)
+        results: List[Optional[Dict]] = [None] * len(tasks)
+        for result in self.iter_parallel_execute(tasks, **options):
+            results[result["index"]] = result
+            if on_result is not None:
+                on_result(result)
         return results
 
 
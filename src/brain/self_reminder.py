@@ -13,6 +13,14 @@ Integration:
     - Can be invoked manually via brain API
     - Generates reminder events on the event bus
     - Logs all reminder cycles for audit
+
+Scanning:
+    - A due source is stat'ed first; when (size, mtime_ns, inode) match the
+      last read and the mtime is not within the racy window, the file is
+      not read again and the previous hash and key points are reused
+    - Key points are parsed once per content hash (bounded LRU)
+    - Due sources are scanned in parallel outside the engine lock; only
+      claiming and committing results hold it
 """
 
 from __future__ import annotations
@@ -22,10 +30,12 @@ import json
 import os
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.nexus_logger import get_logger
 
@@ -34,6 +44,10 @@ logger = get_logger(__name__)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 REMINDER_LOG_PATH = PROJECT_ROOT / "data" / "brain" / "self_reminder_log.jsonl"
 
+# A file modified this recently may be rewritten again within the same
+# mtime tick, so its stat signature is not trusted yet (re-read instead).
+_RACY_WINDOW_SEC = 2.0
+
 
 @dataclass
 class PrincipleSource:
@@ -45,6 +59,9 @@ class PrincipleSource:
     category: str = "general"
     last_read_at: Optional[float] = None
     content_hash: Optional[str] = None
+    stat_signature: Optional[Tuple[int, int, int]] = None   # (size, mtime_ns, inode)
+    key_points_count: int = 0
+    in_flight: bool = False
 
 
 @dataclass
@@ -147,6 +164,14 @@ class SelfReminderEngine:
         # Event callback (optional - for event bus integration)
         self._event_callback: Optional[Any] = None
 
+        # Scan fast path: stat-first skip and key points cached per content hash
+        self._workers = max(1, int(os.getenv("SELF_REMINDER_WORKERS", "8")))
+        self._cache_lock = threading.Lock()
+        self._key_points_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._key_points_cache_size = max(16, int(os.getenv("SELF_REMINDER_KEYPOINT_CACHE", "1024")))
+        self._stat_hits = 0
+        self._reads = 0
+
     @property
     def enabled(self) -> bool:
         return self._enabled
@@ -186,40 +211,51 @@ class SelfReminderEngine:
         """
         if not self._enabled:
             return []
-
-        now = time.time()
-        results: List[Dict[str, Any]] = []
-
-        with self._lock:
-            for source in self._sources:
-                if not self._is_due(source, now):
-                    continue
-                result = self._process_source(source, now)
-                if result:
-                    results.append(result)
-
-            self._last_cycle_at = now
-            self._last_cycle_results = results
-
-        return results
+        return self._run_cycle(force=False)
 
     def force_remind_all(self) -> List[Dict[str, Any]]:
         """Force a reminder for all sources regardless of schedule."""
         if not self._enabled:
             return []
+        return self._run_cycle(force=True)
 
+    def _run_cycle(self, force: bool) -> List[Dict[str, Any]]:
+        """
+        Claim due sources under the lock, scan them outside it (in parallel
+        when there are several), then commit the results under the lock.
+        A source being scanned by another caller is not claimed twice.
+        """
         now = time.time()
-        results: List[Dict[str, Any]] = []
-
         with self._lock:
-            for source in self._sources:
-                result = self._process_source(source, now)
-                if result:
-                    results.append(result)
-
-            self._last_cycle_at = now
-            self._last_cycle_results = results
-
+            claimed = [
+                (source, source.stat_signature, source.content_hash)
+                for source in self._sources
+                if not source.in_flight and (force or self._is_due(source, now))
+            ]
+            for source, _sig, _hash in claimed:
+                source.in_flight = True
+
+        scans: List[Optional[Dict[str, Any]]] = []
+        try:
+            if len(claimed) > 1 and self._workers > 1:
+                with ThreadPoolExecutor(max_workers=min(self._workers, len(claimed))) as pool:
+                    scans = list(pool.map(lambda c: self._scan_source(*c), claimed))
+            else:
+                scans = [self._scan_source(*c) for c in claimed]
+        finally:
+            results: List[Dict[str, Any]] = []
+            with self._lock:
+                for (source, _sig, _hash), scan in zip(claimed, scans):
+                    if scan is not None:
+                        results.append(self._commit(source, scan, now))
+                for source, _sig, _hash in claimed:
+                    source.in_flight = False
+                self._last_cycle_at = now
+                self._last_cycle_results = results
+
+        self._write_log_batch(results)
+        for result in results:
+            self._emit(result)
         return results
 
     def get_status(self) -> Dict[str, Any]:
@@ -260,6 +296,8 @@ class SelfReminderEngine:
             "total_changes_detected": self._total_changes_detected,
             "last_cycle_at": self._last_cycle_at,
             "categories": list({s.category for s in self._sources}),
+            "stat_hits": self._stat_hits,
+            "reads": self._reads,
         }
 
     # ── Internal ───────────────────────────────────────────────
@@ -272,34 +310,89 @@ class SelfReminderEngine:
         return elapsed >= source.interval_sec
 
     def _process_source(self, source: PrincipleSource, now: float) -> Optional[Dict[str, Any]]:
-        """Read a source file and generate a reminder event."""
+        """Read a source file and generate a reminder event (single source, inline)."""
+        scan = self._scan_source(source, source.stat_signature, source.content_hash)
+        if scan is None:
+            return None
+        with self._lock:
+            result = self._commit(source, scan, now)
+        self._write_log(result)
+        self._emit(result)
+        return result
+
+    def _scan_source(
+        self,
+        source: PrincipleSource,
+        prev_signature: Optional[Tuple[int, int, int]],
+        prev_hash: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stat the file; read, hash and extract key points only if it may
+        have changed. Touches no shared engine state.
+        """
         full_path = PROJECT_ROOT / source.path
-        if not full_path.exists():
+        try:
+            st = os.stat(full_path)
+        except FileNotFoundError:
             logger.warning(f"Self-reminder source not found: {source.path}")
             return None
+        except OSError as exc:
+            logger.error(f"Failed to stat reminder source {source.path}: {exc}")
+            return None
+
+        signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+        racy = time.time() - st.st_mtime_ns / 1e9 < _RACY_WINDOW_SEC
+        if prev_hash is not None and signature == prev_signature and not racy:
+            return {"signature": signature, "hash": prev_hash, "key_points": None}
 
         try:
-            content = full_path.read_text(encoding="utf-8")
+            data = full_path.read_bytes()
+            content = data.decode("utf-8")
         except Exception as exc:
             logger.error(f"Failed to read reminder source {source.path}: {exc}")
             return None
 
         # Compute content hash
-        new_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        new_hash = hashlib.sha256(data).hexdigest()[:16]
+        return {"signature": signature, "hash": new_hash, "key_points": self._key_points(new_hash, content)}
+
+    def _key_points(self, content_hash: str, content: str) -> int:
+        """Key points per content hash, parsed once (LRU over recent hashes)."""
+        with self._cache_lock:
+            cached = self._key_points_cache.get(content_hash)
+            if cached is not None:
+                self._key_points_cache.move_to_end(content_hash)
+                return cached
+
+        # Extract key points (simple heuristic: count non-empty lines starting with -, * or #)
+        count = 0
+        for line in content.splitlines():
+            line = line.strip()
+            if line and line[0] in "-*#":
+                count += 1
+
+        with self._cache_lock:
+            self._key_points_cache[content_hash] = count
+            while len(self._key_points_cache) > self._key_points_cache_size:
+                self._key_points_cache.popitem(last=False)
+        return count
+
+    def _commit(self, source: PrincipleSource, scan: Dict[str, Any], now: float) -> Dict[str, Any]:
+        """Apply a scan to the source and counters. Caller holds the lock."""
+        new_hash = scan["hash"]
         changed = source.content_hash is not None and source.content_hash != new_hash
         elapsed_since_last = int(now - source.last_read_at) if source.last_read_at else 0
 
-        # Extract key points (simple heuristic: count non-empty lines starting with - or *)
-        key_points = [
-            line.strip()
-            for line in content.splitlines()
-            if line.strip() and (line.strip().startswith("-") or line.strip().startswith("*") or line.strip().startswith("#"))
-        ]
-
         # Update source state
         source.last_read_at = now
         old_hash = source.content_hash
         source.content_hash = new_hash
+        source.stat_signature = scan["signature"]
+        if scan["key_points"] is None:
+            self._stat_hits += 1
+        else:
+            self._reads += 1
+            source.key_points_count = scan["key_points"]
 
         if changed:
             self._total_changes_detected += 1
@@ -318,12 +411,23 @@ class SelfReminderEngine:
             category=source.category,
             priority=source.priority,
             content_hash=new_hash,
-            key_points_count=len(key_points),
+            key_points_count=source.key_points_count,
             changed_since_last=changed,
             elapsed_since_last_sec=elapsed_since_last,
         )
 
-        result = {
+        if changed:
+            logger.info(
+                f"[Self-Reminder] {source.name}: {source.key_points_count} key points, "
+                f"CONTENT CHANGED (priority {source.priority})"
+            )
+        else:
+            logger.debug(
+                f"[Self-Reminder] {source.name}: {source.key_points_count} key points, "
+                f"no changes (priority {source.priority})"
+            )
+
+        return {
             "source_name": event.source_name,
             "source_path": event.source_path,
             "category": event.category,
@@ -335,9 +439,7 @@ class SelfReminderEngine:
             "timestamp": event.timestamp,
         }
 
-        # Log
-        self._write_log(result)
-
+    def _emit(self, result: Dict[str, Any]) -> None:
         # Emit event if callback set
         if self._event_callback:
             try:
@@ -345,18 +447,15 @@ class SelfReminderEngine:
             except Exception as exc:
                 logger.debug(f"Event callback error: {exc}")
 
-        if changed:
-            logger.info(
-                f"[Self-Reminder] {source.name}: {len(key_points)} key points, "
-                f"CONTENT CHANGED (priority {source.priority})"
-            )
-        else:
-            logger.debug(
-                f"[Self-Reminder] {source.name}: {len(key_points)} key points, "
-                f"no changes (priority {source.priority})"
-            )
-
-        return result
+    def _write_log_batch(self, events: List[Dict[str, Any]]) -> None:
+        """Append a cycle's events to the reminder log in one write."""
+        if not events:
+            return
+        try:
+            with open(self._log_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+        except Exception as exc:
+            logger.debug(f"Failed to write reminder log: {exc}")
 
     def _write_log(self, event: Dict[str, Any]) -> None:
         """Append event to the reminder log file."""
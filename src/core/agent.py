@@ -21,6 +21,7 @@ import requests
 from src.core.message import AgentMessage, MessageType, Priority, TaskResult
 from src.core.model_router import ModelRouter, TaskType, TaskComplexity, MODELS, ModelConfig
 from src.core.routing_telemetry import record_routing_event
+from src.core.single_flight import get_async_group, request_key, single_flight_enabled
 from src.core.prompt_system import get_prompt_system
 from src.core.computer_controller import get_computer_controller
 
@@ -161,6 +162,8 @@ class AsyncAgent(ABC):
         """
         Call model API with adaptive fallback chain.
         Falls back on retryable errors (timeout, rate limit, quota, transient API errors).
+        Identical concurrent calls (same model, injected messages and params)
+        share one upstream call.
         """
         messages = self.prompt_system.inject_messages(
             messages=messages,
@@ -168,7 +171,43 @@ class AsyncAgent(ABC):
             role=self.role,
             importance=importance,
         )
+        params = dict(
+            tools=tools,
+            task_type=task_type,
+            complexity=complexity,
+            importance=importance,
+            prefer_speed=prefer_speed,
+            prefer_cost=prefer_cost,
+        )
+        if not single_flight_enabled():
+            return await self._call_api_routed(messages, **params)
+        key = request_key(self.model, messages, params, self._routing_config())
+        return await get_async_group().do(key, lambda: self._call_api_routed(messages, **params))
+
+    def _routing_config(self) -> Dict[str, Any]:
+        """Routing flags and endpoint that decide which upstream answers a call."""
+        return {
+            "api_base": self.api_base,
+            "smart_routing_enabled": self.smart_routing_enabled,
+            "subscription_primary_routing_enabled": self.subscription_primary_routing_enabled,
+            "auto_subscription_cost_routing": self.auto_subscription_cost_routing,
+            "subscription_primary_cost_only": self.subscription_primary_cost_only,
+            "keep_current_model_first": self.keep_current_model_first,
+            "subscription_fallback_enabled": self.subscription_fallback_enabled,
+            "subscription_critical_only": self.subscription_critical_only,
+            "subscription_first_for_critical": self.subscription_first_for_critical,
+        }
 
+    async def _call_api_routed(
+        self,
+        messages: List[Dict],
+        tools: List[Dict] = None,
+        task_type: Optional[TaskType] = None,
+        complexity: Optional[TaskComplexity] = None,
+        importance: str = "normal",
+        prefer_speed: bool = False,
+        prefer_cost: bool = False
+    ) -> Dict:
         call_started = datetime.now()
         importance = (importance or "normal").lower()
         task_type = task_type or self._infer_task_type()
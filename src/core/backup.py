@@ -5,24 +5,41 @@ NEXUS Data Backup & Restore
 Creates timestamped compressed backups of the brain data directory.
 Supports restore from any backup archive.
 
+Two modes:
+- tar (default): every backup is a full .tar.gz of the data files.
+- incremental: files are split into content-defined chunks. Each chunk is
+  stored once, compressed, in a content-addressed store
+  (``chunks/ab/<sha256>``). A snapshot is only a manifest of
+  (path, size, mtime, sha256, chunks). Files whose size and mtime are
+  unchanged reuse the previous manifest entry without being read. Appended
+  JSONL files only add chunks for their new tail.
+
 Usage:
     from core.backup import create_backup, restore_backup, list_backups
 
     path = create_backup()          # Returns path to backup .tar.gz
+    create_backup(mode="incremental")  # Returns path to a snapshot manifest
     list_backups()                   # Returns list of available backups
     restore_backup("2026-02-19_143000.tar.gz")  # Restore from backup
 
 Environment variables:
-    NEXUS_BACKUP_DIR  – directory for backups (default: data/backups)
-    NEXUS_MAX_BACKUPS – max backups to keep (default: 10, 0 = unlimited)
+    NEXUS_BACKUP_DIR     – directory for backups (default: data/backups)
+    NEXUS_MAX_BACKUPS    – max backups to keep (default: 10, 0 = unlimited)
+    NEXUS_BACKUP_MODE    – "tar" or "incremental" (default: tar)
+    NEXUS_BACKUP_WORKERS – compression threads for incremental mode (default: 4)
 """
 
+import hashlib
+import json
 import os
 import shutil
 import tarfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set
 
 from core.nexus_logger import get_logger
 
@@ -32,14 +49,33 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "brain"
 BACKUP_DIR = Path(os.getenv("NEXUS_BACKUP_DIR", str(PROJECT_ROOT / "data" / "backups")))
 MAX_BACKUPS = int(os.getenv("NEXUS_MAX_BACKUPS", "10"))
+BACKUP_MODE = os.getenv("NEXUS_BACKUP_MODE", "tar").strip().lower()
+BACKUP_WORKERS = max(1, int(os.getenv("NEXUS_BACKUP_WORKERS", "4")))
+
+BACKUP_SUFFIXES = (".json", ".jsonl", ".log", ".txt")
+
+# Content-defined chunking: a cut may follow any newline once a chunk is at
+# least MIN_CHUNK bytes. The cut is taken when the crc32 of the 64 bytes
+# ending at that newline falls under a threshold proportional to the line
+# length, which makes chunks average about AVG_CHUNK bytes. MAX_CHUNK forces
+# a cut for data without newlines.
+MIN_CHUNK = 16 * 1024
+AVG_CHUNK = 64 * 1024
+MAX_CHUNK = 1024 * 1024
+_READ_BLOCK = 1024 * 1024
 
+_incremental_lock = threading.Lock()
 
-def create_backup(tag: str = "") -> Dict:
+
+def create_backup(tag: str = "", mode: Optional[str] = None) -> Dict:
     """Create a compressed backup of the brain data directory.
 
     Returns:
         Dict with keys: path, size_bytes, files_count, timestamp
     """
+    if (mode or BACKUP_MODE) == "incremental":
+        return create_incremental_backup(tag)
+
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
@@ -55,7 +91,7 @@ def create_backup(tag: str = "") -> Dict:
     files_count = 0
     with tarfile.open(archive_path, "w:gz") as tar:
         for item in DATA_DIR.rglob("*"):
-            if item.is_file() and item.suffix in (".json", ".jsonl", ".log", ".txt"):
+            if item.is_file() and item.suffix in BACKUP_SUFFIXES:
                 tar.add(item, arcname=item.relative_to(DATA_DIR))
                 files_count += 1
 
@@ -83,6 +119,9 @@ def restore_backup(backup_name: str) -> Dict:
     Returns:
         Dict with keys: restored_files, timestamp
     """
+    if backup_name.startswith("nexus_snapshot_"):
+        return _restore_snapshot(backup_name)
+
     archive_path = BACKUP_DIR / backup_name
     if not archive_path.exists():
         return {"error": f"Backup not found: {backup_name}"}
@@ -121,6 +160,20 @@ def list_backups() -> List[Dict]:
             "size_bytes": f.stat().st_size,
             "created": datetime.fromtimestamp(f.stat().st_mtime).isoformat(),
         })
+    for f in _snapshot_paths(reverse=True):
+        manifest = _read_manifest(f)
+        if manifest is None:
+            continue
+        backups.append({
+            "name": f.name,
+            "kind": "incremental",
+            # Bytes this snapshot added to the chunk store; older chunks are shared.
+            "size_bytes": int(manifest.get("stored_bytes", 0)),
+            "logical_bytes": int(manifest.get("logical_bytes", 0)),
+            "files_count": len(manifest.get("files", {})),
+            "created": manifest.get("created_at") or datetime.fromtimestamp(f.stat().st_mtime).isoformat(),
+        })
+    backups.sort(key=lambda b: b["created"], reverse=True)
     return backups
 
 
@@ -130,3 +183,304 @@ def _prune_old_backups() -> None:
     for old in backups[MAX_BACKUPS:]:
         old.unlink()
         logger.info("Pruned old backup: %s", old.name)
+
+
+# ==================== INCREMENTAL SNAPSHOTS ====================
+
+def _snapshot_dir() -> Path:
+    return BACKUP_DIR / "snapshots"
+
+
+def _chunk_dir() -> Path:
+    return BACKUP_DIR / "chunks"
+
+
+def _chunk_path(digest: str) -> Path:
+    return _chunk_dir() / digest[:2] / digest
+
+
+def _snapshot_paths(reverse: bool = False) -> List[Path]:
+    directory = _snapshot_dir()
+    if not directory.exists():
+        return []
+    return sorted(directory.glob("nexus_snapshot_*.json"), reverse=reverse)
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) and isinstance(manifest.get("files"), dict) else None
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def iter_chunks(f) -> Iterator[bytes]:
+    """Split a binary stream into content-defined chunks.
+
+    Cut points depend only on the bytes since the previous cut. Chunking that
+    resumes at an earlier cut therefore yields the same chunks as a full pass.
+    """
+    current = bytearray()
+    line_len = 0
+    while True:
+        block = f.read(_READ_BLOCK)
+        if not block:
+            break
+        start = 0
+        while start < len(block):
+            nl = block.find(b"\n", start)
+            end = len(block) if nl < 0 else nl + 1
+            piece = block[start:end]
+            start = end
+            line_len += len(piece)
+            current += piece
+            while len(current) >= MAX_CHUNK:
+                yield bytes(current[:MAX_CHUNK])
+                del current[:MAX_CHUNK]
+            if nl < 0:
+                continue
+            if (
+                len(current) >= MIN_CHUNK
+                and zlib.crc32(current[-64:]) % AVG_CHUNK < min(line_len, len(current))
+            ):
+                yield bytes(current)
+                current.clear()
+            line_len = 0
+    if current:
+        yield bytes(current)
+
+
+class _ChunkWriter:
+    """Compresses and stores new chunks on a thread pool (zlib releases the GIL)."""
+
+    def __init__(self, workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backup-chunk")
+        self._max_pending = workers * 4
+        self._pending = []
+        self._seen: Set[str] = set()
+        self.new_chunks = 0
+        self.stored_bytes = 0
+
+    @staticmethod
+    def _store(path: Path, data: bytes) -> int:
+        compressed = zlib.compress(data, 6)
+        _write_atomic(path, compressed)
+        return len(compressed)
+
+    def put(self, digest: str, data: bytes) -> None:
+        if digest in self._seen:
+            return
+        self._seen.add(digest)
+        path = _chunk_path(digest)
+        if path.exists():
+            return
+        if len(self._pending) >= self._max_pending:
+            self._drain(keep=self._max_pending // 2)
+        self._pending.append(self._pool.submit(self._store, path, data))
+        self.new_chunks += 1
+
+    def _drain(self, keep: int = 0) -> None:
+        while len(self._pending) > keep:
+            self.stored_bytes += self._pending.pop(0).result()
+
+    def close(self) -> None:
+        try:
+            self._drain()
+        finally:
+            self._pool.shutdown(wait=True)
+
+
+def _snapshot_file(path: Path, st: os.stat_result, previous: Optional[Dict], writer: _ChunkWriter) -> Dict:
+    """Manifest entry for one changed file, reusing verified chunks of its previous version."""
+    file_hash = hashlib.sha256()
+    chunks: List[List[Any]] = []
+    with open(path, "rb") as f:
+        # Appends keep every earlier chunk intact. Verify them with sha256 in
+        # C and only re-chunk from the start of the previous last chunk.
+        prev_chunks = previous.get("chunks", []) if previous and st.st_size >= previous.get("size", 0) else []
+        for digest, length in prev_chunks[:-1]:
+            data = f.read(length)
+            if len(data) != length or hashlib.sha256(data).hexdigest() != digest:
+                f.seek(0)
+                file_hash = hashlib.sha256()
+                chunks = []
+                break
+            file_hash.update(data)
+            chunks.append([digest, length])
+        for data in iter_chunks(f):
+            digest = hashlib.sha256(data).hexdigest()
+            file_hash.update(data)
+            writer.put(digest, data)
+            chunks.append([digest, len(data)])
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": file_hash.hexdigest(),
+        "chunks": chunks,
+    }
+
+
+def create_incremental_backup(tag: str = "") -> Dict:
+    """Snapshot the brain data directory into the content-addressed chunk store.
+
+    Returns:
+        Dict with keys: path, size_bytes (new bytes stored), logical_bytes,
+        files_count, changed_files, new_chunks, timestamp
+    """
+    if not DATA_DIR.exists():
+        logger.warning("Data directory %s does not exist, nothing to backup", DATA_DIR)
+        return {"error": "no_data_dir", "path": str(DATA_DIR)}
+
+    with _incremental_lock:
+        now = datetime.now()
+        timestamp = now.strftime("%Y-%m-%d_%H%M%S")
+        name = f"nexus_snapshot_{now.strftime('%Y-%m-%d_%H%M%S_%f')}"
+        if tag:
+            name += f"_{tag}"
+        snapshot_path = _snapshot_dir() / f"{name}.json"
+
+        latest = _snapshot_paths(reverse=True)
+        prev_manifest = _read_manifest(latest[0]) if latest else None
+        prev_files = prev_manifest["files"] if prev_manifest else {}
+
+        files: Dict[str, Dict] = {}
+        changed = 0
+        logical_bytes = 0
+        writer = _ChunkWriter(BACKUP_WORKERS)
+        try:
+            for item in sorted(DATA_DIR.rglob("*")):
+                if not item.is_file() or item.suffix not in BACKUP_SUFFIXES:
+                    continue
+                rel = item.relative_to(DATA_DIR).as_posix()
+                try:
+                    st = item.stat()
+                    previous = prev_files.get(rel)
+                    if previous and previous.get("size") == st.st_size and previous.get("mtime_ns") == st.st_mtime_ns:
+                        files[rel] = previous
+                    else:
+                        files[rel] = _snapshot_file(item, st, previous, writer)
+                        changed += 1
+                except OSError as e:
+                    logger.warning("Skipping %s in snapshot: %s", rel, e)
+                    continue
+                logical_bytes += files[rel]["size"]
+        finally:
+            writer.close()
+
+        manifest = {
+            "version": 1,
+            "created_at": now.isoformat(),
+            "tag": tag,
+            "files": files,
+            "changed_files": changed,
+            "new_chunks": writer.new_chunks,
+            "stored_bytes": writer.stored_bytes,
+            "logical_bytes": logical_bytes,
+        }
+        _write_atomic(snapshot_path, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+
+        logger.info(
+            "Snapshot created: %s (%d files, %d changed, %d new chunks, %d bytes stored)",
+            snapshot_path.name, len(files), changed, writer.new_chunks, writer.stored_bytes,
+        )
+        if MAX_BACKUPS > 0:
+            _prune_old_snapshots()
+
+    return {
+        "path": str(snapshot_path),
+        "size_bytes": writer.stored_bytes,
+        "logical_bytes": logical_bytes,
+        "files_count": len(files),
+        "changed_files": changed,
+        "new_chunks": writer.new_chunks,
+        "timestamp": timestamp,
+    }
+
+
+def _restore_snapshot(backup_name: str) -> Dict:
+    snapshot_path = _snapshot_dir() / backup_name
+    manifest = _read_manifest(snapshot_path) if snapshot_path.exists() else None
+    if manifest is None:
+        return {"error": f"Backup not found: {backup_name}"}
+
+    # Safety: create a pre-restore backup first. Always a tarball: an incremental
+    # one could prune the snapshot being restored and GC its chunks.
+    pre_restore = create_backup(tag="pre_restore", mode="tar")
+    logger.info("Pre-restore backup: %s", pre_restore.get("path", "none"))
+
+    restored = 0
+    errors: List[str] = []
+    for rel, entry in manifest["files"].items():
+        if rel.startswith("/") or ".." in Path(rel).parts:
+            logger.warning("Skipping suspicious path in snapshot: %s", rel)
+            continue
+        target = DATA_DIR / rel
+        try:
+            _restore_file(target, entry)
+            restored += 1
+        except (OSError, ValueError, zlib.error) as e:
+            errors.append(f"{rel}: {e}")
+            logger.warning("Failed to restore %s: %s", rel, e)
+
+    logger.info("Restored %d files from %s", restored, backup_name)
+    result = {
+        "restored_files": restored,
+        "timestamp": datetime.now().isoformat(),
+        "source": backup_name,
+    }
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def _restore_file(target: Path, entry: Dict) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    file_hash = hashlib.sha256()
+    try:
+        with open(tmp, "wb") as out:
+            for digest, _length in entry.get("chunks", []):
+                with open(_chunk_path(digest), "rb") as f:
+                    data = zlib.decompress(f.read())
+                file_hash.update(data)
+                out.write(data)
+        if file_hash.hexdigest() != entry.get("sha256"):
+            raise ValueError("content hash mismatch")
+        os.replace(tmp, target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _prune_old_snapshots() -> None:
+    """Keep the N most recent snapshots and drop chunks no remaining snapshot references."""
+    snapshots = _snapshot_paths(reverse=True)
+    for old in snapshots[MAX_BACKUPS:]:
+        old.unlink()
+        logger.info("Pruned old snapshot: %s", old.name)
+    if len(snapshots) <= MAX_BACKUPS:
+        return
+    live: Set[str] = set()
+    for path in snapshots[:MAX_BACKUPS]:
+        manifest = _read_manifest(path)
+        if manifest is None:
+            # An unreadable manifest could reference anything; keep every chunk.
+            return
+        for entry in manifest["files"].values():
+            live.update(digest for digest, _length in entry.get("chunks", []))
+    removed = 0
+    for chunk in _chunk_dir().glob("*/*"):
+        if chunk.name not in live and not chunk.name.endswith(".tmp"):
+            chunk.unlink()
+            removed += 1
+    if removed:
+        logger.info("Removed %d unreferenced chunks", removed)
@@ -0,0 +1,323 @@
+"""
+File Watcher - stdlib-only change notifications for a project tree
+===================================================================
+
+Reports batches of changed paths (relative to the watched root) to a
+callback from a background thread.
+
+Backends:
+- inotify: Linux, through ctypes against libc. Directories created after
+  start are watched as they appear. A kernel queue overflow is reported
+  as the single path "." (meaning: rescan everything).
+- poll: everywhere else, or when inotify is unavailable or out of
+  watches. The tree is stat-walked every ``poll_interval_sec`` and
+  compared against the previous (size, mtime) signature.
+
+Usage:
+    from core.file_watcher import FileChangeWatcher
+
+    watcher = FileChangeWatcher("/path/to/project", on_paths)
+    watcher.start()
+    watcher.stop()
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.nexus_logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_IGNORE_DIRS = {
+    ".git", "__pycache__", "node_modules", ".venv", "venv",
+    ".tox", ".mypy_cache", ".pytest_cache", "dist", "build",
+    ".next", ".nuxt", "coverage", ".idea", ".vscode",
+    "env", ".env", "eggs",
+    # Runtime output (state stores, decision logs, log files), not project source.
+    "data", "logs",
+}
+IGNORE_SUFFIXES = (".pyc", ".pyo", ".so", ".class", ".swp", ".tmp")
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")
+
+RESCAN = "."
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileChangeWatcher:
+    """Watch a directory tree and report changed relative paths in batches."""
+
+    def __init__(
+        self,
+        root: str,
+        callback: Callable[[List[str]], None],
+        ignore_dirs: Optional[Iterable[str]] = None,
+        poll_interval_sec: float = 2.0,
+        backend: Optional[str] = None,
+        max_watches: int = 8192,
+    ):
+        self.root = Path(root).resolve()
+        self.callback = callback
+        self.ignore_dirs = set(ignore_dirs) if ignore_dirs is not None else set(DEFAULT_IGNORE_DIRS)
+        self.poll_interval_sec = max(0.05, float(poll_interval_sec))
+        self.requested_backend = (backend or os.getenv("NEXUS_FILE_WATCH_BACKEND", "auto")).strip().lower()
+        self.max_watches = max(1, int(max_watches))
+        self.backend = ""
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop_r: Optional[int] = None
+        self._stop_w: Optional[int] = None
+        self._libc = None
+        self._fd: Optional[int] = None
+        self._wd_paths: Dict[int, Path] = {}
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+
+        # Metrics
+        self.batches = 0
+        self.paths_reported = 0
+        self.overflows = 0
+
+    # ── Filtering ─────────────────────────────────────────────────
+
+    def _skip_dir(self, name: str) -> bool:
+        return name in self.ignore_dirs or name.startswith(".")
+
+    def _skip_file(self, name: str) -> bool:
+        return name.endswith(IGNORE_SUFFIXES) or name in (".DS_Store", "Thumbs.db")
+
+    def _walk(self):
+        for root, dirs, filenames in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not self._skip_dir(d)]
+            yield root, dirs, filenames
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return str(path.relative_to(self.root))
+        except ValueError:
+            return str(path)
+
+    def _emit(self, paths: Iterable[str]) -> None:
+        batch = sorted(set(paths))
+        if not batch:
+            return
+        self.batches += 1
+        self.paths_reported += len(batch)
+        try:
+            self.callback(batch)
+        except Exception as e:
+            logger.error(f"FileChangeWatcher callback error: {e}")
+
+    # ── inotify Backend ───────────────────────────────────────────
+
+    def _add_watch(self, directory: Path) -> bool:
+        if len(self._wd_paths) >= self.max_watches:
+            return False
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                return False
+            return True  # vanished or unreadable: nothing to watch, not fatal
+        self._wd_paths[wd] = directory
+        return True
+
+    def _watch_tree(self, top: Path, report: Optional[Set[str]] = None) -> bool:
+        for root, dirs, filenames in os.walk(top):
+            dirs[:] = [d for d in dirs if not self._skip_dir(d)]
+            if not self._add_watch(Path(root)):
+                return False
+            if report is not None:
+                # Files created before the watch existed would otherwise be missed.
+                report.update(self._relative(Path(root) / f) for f in filenames if not self._skip_file(f))
+        return True
+
+    def _start_inotify(self) -> bool:
+        self._libc = _load_inotify()
+        if self._libc is None:
+            return False
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return False
+        self._fd = fd
+        if not self._watch_tree(self.root):
+            logger.warning(f"inotify watch limit reached under {self.root}; falling back to polling")
+            self._close_inotify()
+            return False
+        return True
+
+    def _close_inotify(self) -> None:
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._wd_paths.clear()
+
+    def _decode(self, data: bytes) -> Set[str]:
+        changed: Set[str] = set()
+        pos = 0
+        while pos + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            name = data[pos + _EVENT.size:pos + _EVENT.size + length].split(b"\0", 1)[0]
+            pos += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                self.overflows += 1
+                changed.add(RESCAN)
+                continue
+            base = self._wd_paths.get(wd)
+            if mask & IN_IGNORED:
+                self._wd_paths.pop(wd, None)
+                continue
+            if base is None or not name:
+                continue
+            fname = os.fsdecode(name)
+            path = base / fname
+            if mask & IN_ISDIR:
+                if self._skip_dir(fname):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    if not self._watch_tree(path, report=changed):
+                        changed.add(RESCAN)
+                continue
+            if not self._skip_file(fname):
+                changed.add(self._relative(path))
+        return changed
+
+    def _inotify_loop(self) -> None:
+        while self._running:
+            try:
+                ready, _, _ = select.select([self._fd, self._stop_r], [], [])
+            except (OSError, ValueError):
+                break
+            if self._stop_r in ready:
+                break
+            chunks = []
+            while True:
+                try:
+                    chunk = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    break
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            self._emit(self._decode(b"".join(chunks)))
+        self._close_inotify()
+
+    # ── Polling Backend ───────────────────────────────────────────
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        signatures: Dict[str, Tuple[int, int]] = {}
+        for root, _dirs, filenames in self._walk():
+            for fname in filenames:
+                if self._skip_file(fname):
+                    continue
+                path = os.path.join(root, fname)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signatures[os.path.relpath(path, self.root)] = (st.st_size, st.st_mtime_ns)
+        return signatures
+
+    def _poll_loop(self) -> None:
+        while self._running:
+            ready, _, _ = select.select([self._stop_r], [], [], self.poll_interval_sec)
+            if ready:
+                break
+            current = self._snapshot()
+            previous = self._signatures
+            changed = [p for p, sig in current.items() if previous.get(p) != sig]
+            changed.extend(p for p in previous if p not in current)
+            self._signatures = current
+            self._emit(changed)
+
+    # ── Start / Stop ──────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start watching in a background thread."""
+        if self._running:
+            return
+        self._stop_r, self._stop_w = os.pipe()
+        if self.requested_backend != "poll" and self._start_inotify():
+            self.backend = "inotify"
+            target = self._inotify_loop
+        else:
+            self.backend = "poll"
+            self._signatures = self._snapshot()
+            target = self._poll_loop
+        self._running = True
+        self._thread = threading.Thread(target=target, daemon=True, name="file-watcher")
+        self._thread.start()
+        logger.info(f"FileChangeWatcher started ({self.backend}) on {self.root}")
+
+    def stop(self) -> None:
+        """Stop watching and release the notification descriptor."""
+        if not self._running:
+            return
+        self._running = False
+        try:
+            os.write(self._stop_w, b"x")
+        except OSError:
+            pass
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        for fd in (self._stop_r, self._stop_w):
+            try:
+                os.close(fd)
+            except (OSError, TypeError):
+                pass
+        self._stop_r = self._stop_w = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def get_status(self) -> Dict[str, object]:
+        return {
+            "running": self._running,
+            "backend": self.backend,
+            "watched_dirs": len(self._wd_paths) if self.backend == "inotify" else None,
+            "batches": self.batches,
+            "paths_reported": self.paths_reported,
+            "overflows": self.overflows,
+        }
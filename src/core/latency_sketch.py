@@ -0,0 +1,130 @@
+"""
+Latency Sketch - mergeable quantile summary with bounded relative error
+========================================================================
+
+Values are counted in logarithmic buckets: bucket k covers
+(gamma^(k-1), gamma^k] with gamma = (1 + a) / (1 - a). Any quantile is
+then returned within relative accuracy ``a`` (1% by default), using a few
+hundred integers however many samples were added. Two sketches with the
+same accuracy merge by adding bucket counts, so per-process or per-window
+sketches can be combined exactly.
+
+When more than ``max_buckets`` are in use, the lowest buckets are folded
+together. Accuracy is lost only at the fast end, never in the tail.
+
+Usage:
+    from core.latency_sketch import LatencySketch
+
+    sketch = LatencySketch()
+    sketch.add(12.5)
+    sketch.quantile(0.99)
+    LatencySketch.from_dict(sketch.to_dict())
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+
+class LatencySketch:
+    """Log-bucketed quantile sketch for non-negative values."""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(16, int(max_buckets))
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _key(self, value: float) -> int:
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _value(self, key: int) -> float:
+        return 2.0 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        value = float(value)
+        if count <= 0 or math.isnan(value) or value < 0:
+            return
+        if value == 0.0:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _collapse(self) -> None:
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets + 1
+        folded = sum(self.buckets.pop(k) for k in keys[:excess])
+        target = keys[excess]
+        self.buckets[target] += folded
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile q (0..1), or None when empty."""
+        if not self.count:
+            return None
+        q = max(0.0, min(1.0, float(q)))
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return max(self.min, min(self.max, self._value(key)))
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "accuracy": self.relative_accuracy,
+            "buckets": {str(k): n for k, n in self.buckets.items()},
+            "zero": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_buckets: int = 2048) -> "LatencySketch":
+        sketch = cls(float(data.get("accuracy", 0.01)), max_buckets=max_buckets)
+        sketch.buckets = {int(k): int(n) for k, n in (data.get("buckets") or {}).items()}
+        sketch.zero_count = int(data.get("zero", 0))
+        sketch.count = int(data.get("count", 0))
+        sketch.total = float(data.get("total", 0.0))
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        return sketch
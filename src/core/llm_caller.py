@@ -21,6 +21,21 @@ from typing import Optional, Dict, Any
 import requests
 from dotenv import load_dotenv
 
+try:
+    from .single_flight import (
+        get_single_flight_stats,
+        get_sync_group,
+        request_key,
+        single_flight_enabled,
+    )
+except ImportError:
+    from core.single_flight import (
+        get_single_flight_stats,
+        get_sync_group,
+        request_key,
+        single_flight_enabled,
+    )
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -277,11 +292,52 @@ def call_llm(
 
     Returns:
         Generated text from the first successful model call
+
+    Identical concurrent calls (same prompt, system prompt and params) are
+    coalesced: one upstream call runs and every caller gets its result or error.
     """
+    kwargs = dict(
+        task_type=task_type,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        system_prompt=system_prompt,
+        preferred_model=preferred_model,
+    )
+    if not single_flight_enabled():
+        return _call_llm_uncoalesced(prompt, **kwargs)
+    key = request_key(
+        preferred_model or task_type,
+        [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
+        {k: v for k, v in kwargs.items() if k != "system_prompt"},
+        _routing_config(task_type, preferred_model),
+    )
+    return get_sync_group().do(key, lambda: _call_llm_uncoalesced(prompt, **kwargs))
+
+
+def _model_order(task_type: str, preferred_model: Optional[str]) -> list:
+    default = _TASK_MODEL_PRIORITY.get(task_type, ["glm", "minimax", "codex_api"])
     if preferred_model and preferred_model in _MODEL_CALLERS:
-        order = [preferred_model] + [m for m in _TASK_MODEL_PRIORITY.get(task_type, ["glm", "minimax", "codex_api"]) if m != preferred_model]
-    else:
-        order = _TASK_MODEL_PRIORITY.get(task_type, ["glm", "minimax", "codex_api"])
+        return [preferred_model] + [m for m in default if m != preferred_model]
+    return default
+
+
+def _routing_config(task_type: str, preferred_model: Optional[str]) -> Dict[str, Any]:
+    """Fallback order and upstream models a call would be routed through."""
+    return {
+        "order": _model_order(task_type, preferred_model),
+        "models": {"glm": _GLM_DEFAULT_MODEL, "minimax": _MINIMAX_DEFAULT_MODEL, "codex_api": _CODEX_DEFAULT_MODEL},
+    }
+
+
+def _call_llm_uncoalesced(
+    prompt: str,
+    task_type: str = "general",
+    max_tokens: int = 2000,
+    temperature: float = 0.7,
+    system_prompt: str = "",
+    preferred_model: Optional[str] = None,
+) -> str:
+    order = _model_order(task_type, preferred_model)
 
     last_error = None
     for model_key in order:
@@ -404,6 +460,11 @@ def get_available_models() -> Dict[str, bool]:
     }
 
 
+def get_llm_coalescing_stats() -> Dict[str, Any]:
+    """Single-flight metrics: total calls, upstream calls, coalesced waiters and ratio."""
+    return get_single_flight_stats()
+
+
 _SYSTEM_HEALTH_CACHE_TTL_SECONDS = 60
 _system_health_cache_lock = Lock()
 _system_health_cache_expires_at = 0.0
@@ -6,20 +6,48 @@ Usage in any module:
     logger = get_logger(__name__)
     logger.info("Something happened")
 
+Log calls only enqueue the record. A background QueueListener formats it
+and writes it to the console/file handlers, so asyncio loops and request
+threads never block on I/O. The queue is bounded; when it is full the
+overflow policy decides what happens:
+    drop_new    – discard the incoming record (default)
+    drop_oldest – discard the oldest queued record to make room
+    block       – wait up to NEXUS_LOG_BLOCK_TIMEOUT seconds, then discard
+Discarded records are counted and reported by a WARNING once the queue
+drains.
+
 Environment variables:
-    NEXUS_LOG_LEVEL  – DEBUG / INFO / WARNING / ERROR  (default: INFO)
-    NEXUS_LOG_FILE   – optional path to append logs (default: None)
-    NEXUS_LOG_JSON   – set "1" for JSON-lines output   (default: 0)
+    NEXUS_LOG_LEVEL          – DEBUG / INFO / WARNING / ERROR  (default: INFO)
+    NEXUS_LOG_FILE           – optional path to append logs (default: None)
+    NEXUS_LOG_JSON           – set "1" for JSON-lines output   (default: 0)
+    NEXUS_LOG_ASYNC          – queue log records to a background thread (default: true)
+    NEXUS_LOG_QUEUE_SIZE     – bounded queue capacity (default: 10000)
+    NEXUS_LOG_OVERFLOW       – drop_new / drop_oldest / block (default: drop_new)
+    NEXUS_LOG_BLOCK_TIMEOUT  – seconds to wait under the block policy (default: 0.1)
+    NEXUS_LOG_MAX_BYTES      – rotate the log file at this size, 0 = never (default: 52428800)
+    NEXUS_LOG_ROTATE_WHEN    – time-based rotation instead, e.g. "midnight" or "H" (default: unset)
+    NEXUS_LOG_BACKUP_COUNT   – rotated files to keep, gzip-compressed in the background (default: 5)
+    NEXUS_LOG_DEBUG_RATE     – DEBUG records per second allowed per logger, 0 = unlimited (default: 50)
 """
 
+import atexit
+import gzip
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import shutil
 import sys
+import threading
+import time
 from datetime import datetime, timezone
+from typing import Dict, List, Optional
 
 
 _CONFIGURED = False
+_LISTENER: Optional[logging.handlers.QueueListener] = None
+_QUEUE_HANDLER: Optional["_BoundedQueueHandler"] = None
 
 # ---------------------------------------------------------------------------
 # JSON formatter for structured logging
@@ -30,13 +58,16 @@ class _JSONFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         entry = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            # Time the record was made, not when the listener thread formats it.
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
         }
         if record.exc_info and record.exc_info[0] is not None:
             entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
         return json.dumps(entry, default=str)
 
 
@@ -58,22 +89,266 @@ class _ConsoleFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         color = self.COLORS.get(record.levelname, "")
-        ts = datetime.now().strftime("%H:%M:%S")
+        ts = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
         name = record.name.rsplit(".", 1)[-1]  # short module name
         msg = record.getMessage()
         base = f"{color}[{ts}] {record.levelname:<7}{self.RESET} {name}: {msg}"
         if record.exc_info and record.exc_info[0] is not None:
             base += "\n" + self.formatException(record.exc_info)
+        elif record.exc_text:
+            base += "\n" + record.exc_text
         return base
 
 
+# ---------------------------------------------------------------------------
+# Queue pipeline
+# ---------------------------------------------------------------------------
+
+class _DebugRateLimitFilter(logging.Filter):
+    """Token bucket per logger for DEBUG records; runs in the caller before enqueueing.
+
+    The next DEBUG record let through from a throttled logger notes how many
+    records were suppressed in between.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = float(rate_per_sec)
+        self.burst = float(burst if burst is not None else max(1.0, self.rate))
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno > logging.DEBUG:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                # [tokens, last refill, suppressed since last pass]
+                bucket = self._buckets[record.name] = [self.burst, now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed_total += 1
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} (suppressed {suppressed} debug records)"
+            record.args = None
+        return True
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler over a bounded queue with an explicit overflow policy."""
+
+    POLICIES = ("drop_new", "drop_oldest", "block")
+
+    def __init__(self, capacity: int, policy: str = "drop_new", block_timeout: float = 0.1):
+        super().__init__(queue.Queue(maxsize=max(1, int(capacity))))
+        self.policy = policy if policy in self.POLICIES else "drop_new"
+        self.block_timeout = max(0.0, float(block_timeout))
+        self.dropped = 0
+        self._dropped_reported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now: both may not survive until the
+        # listener runs. Final formatting is left to the listener's handlers.
+        # The record is only ever seen by this handler, so it is updated in place.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def _put(self, record: logging.LogRecord) -> bool:
+        q = self.queue
+        try:
+            q.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+        if self.policy == "drop_oldest":
+            try:
+                q.get_nowait()
+                q.task_done()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                q.put_nowait(record)
+                return True
+            except queue.Full:
+                pass
+        elif self.policy == "block" and self.block_timeout > 0:
+            try:
+                q.put(record, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                pass
+        self.dropped += 1
+        return False
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._put(record):
+            unreported = self.dropped - self._dropped_reported
+            if unreported and self.queue.qsize() < self.queue.maxsize // 2:
+                self._dropped_reported = self.dropped
+                notice = logging.LogRecord(
+                    "nexus.logging", logging.WARNING, __file__, 0,
+                    f"Log queue overflow ({self.policy}): dropped {unreported} records", None, None,
+                )
+                self._put(notice)
+
+    def flush(self) -> None:
+        """Wait (bounded) until the listener has handled everything queued so far."""
+        q = self.queue
+        if _LISTENER is None or _LISTENER.queue is not q:
+            return
+        deadline = time.monotonic() + 5.0
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                q.all_tasks_done.wait(remaining)
+
+
+class _BackgroundCompressionMixin:
+    """Gzip rotated log files on a background thread instead of the writer thread."""
+
+    def _init_compression(self) -> None:
+        self._compressor: Optional[threading.Thread] = None
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._rotate_and_compress
+
+    def _wait_compression(self) -> None:
+        if self._compressor is not None:
+            self._compressor.join()
+            self._compressor = None
+
+    def _rotate_and_compress(self, source: str, dest: str) -> None:
+        pending = dest[:-3] + ".pending" if dest.endswith(".gz") else dest + ".pending"
+        os.replace(source, pending)
+
+        def compress():
+            tmp = dest + ".tmp"
+            try:
+                with open(pending, "rb") as src, gzip.open(tmp, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp, dest)
+                os.remove(pending)
+            except OSError:
+                pass
+
+        self._compressor = threading.Thread(target=compress, name="nexus-log-compress", daemon=True)
+        self._compressor.start()
+
+    def doRollover(self) -> None:  # noqa: N802 - logging.handlers API
+        # Earlier archives are renamed during rollover; let the last one finish first.
+        self._wait_compression()
+        super().doRollover()
+
+    def close(self) -> None:
+        self._wait_compression()
+        super().close()
+
+
+class _CompressingRotatingFileHandler(_BackgroundCompressionMixin, logging.handlers.RotatingFileHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_compression()
+
+
+class _CompressingTimedRotatingFileHandler(_BackgroundCompressionMixin, logging.handlers.TimedRotatingFileHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._init_compression()
+
+
+def _file_handler(log_file: str) -> logging.Handler:
+    backup_count = int(os.getenv("NEXUS_LOG_BACKUP_COUNT", "5"))
+    when = os.getenv("NEXUS_LOG_ROTATE_WHEN", "").strip()
+    max_bytes = int(os.getenv("NEXUS_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+    if when:
+        return _CompressingTimedRotatingFileHandler(log_file, when=when, backupCount=backup_count, encoding="utf-8")
+    if max_bytes > 0:
+        return _CompressingRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    return logging.FileHandler(log_file, encoding="utf-8")
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full; wait for room rather than failing to stop.
+        self.queue.put(self._sentinel, timeout=5.0)
+
+
+def _start_listener(handler: _BoundedQueueHandler, targets: List[logging.Handler]) -> None:
+    global _LISTENER
+    _LISTENER = _Listener(handler.queue, *targets, respect_handler_level=True)
+    _LISTENER.start()
+
+
+def _restart_after_fork() -> None:
+    # The listener thread does not survive fork; give the child its own queue and thread.
+    global _LISTENER
+    if _QUEUE_HANDLER is None or _LISTENER is None:
+        return
+    targets = list(_LISTENER.handlers)
+    _QUEUE_HANDLER.queue = queue.Queue(maxsize=_QUEUE_HANDLER.queue.maxsize)
+    _start_listener(_QUEUE_HANDLER, targets)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def shutdown_logging() -> None:
+    """Drain the queue and stop the background listener (registered with atexit)."""
+    global _LISTENER
+    listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        for h in listener.handlers:
+            try:
+                h.flush()
+                if isinstance(h, _BackgroundCompressionMixin):
+                    h._wait_compression()
+            except Exception:
+                pass
+
+
+def get_logging_stats() -> Dict[str, object]:
+    """Queue depth and how many records were dropped or rate limited."""
+    handler = _QUEUE_HANDLER
+    if handler is None:
+        return {"async": False}
+    limiter = next((f for f in handler.filters if isinstance(f, _DebugRateLimitFilter)), None)
+    return {
+        "async": _LISTENER is not None,
+        "queued": handler.queue.qsize(),
+        "capacity": handler.queue.maxsize,
+        "overflow_policy": handler.policy,
+        "dropped": handler.dropped,
+        "rate_limited": limiter.suppressed_total if limiter else 0,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 def setup_logging() -> None:
     """Configure the root NEXUS logger (idempotent)."""
-    global _CONFIGURED
+    global _CONFIGURED, _QUEUE_HANDLER
     if _CONFIGURED:
         return
     _CONFIGURED = True
@@ -82,6 +357,7 @@ def setup_logging() -> None:
     level = getattr(logging, level_name, logging.INFO)
     use_json = os.getenv("NEXUS_LOG_JSON", "0") == "1"
     log_file = os.getenv("NEXUS_LOG_FILE")
+    use_queue = os.getenv("NEXUS_LOG_ASYNC", "true").strip().lower() == "true"
 
     root = logging.getLogger("nexus")
     root.setLevel(level)
@@ -91,14 +367,36 @@ def setup_logging() -> None:
     ch = logging.StreamHandler(sys.stderr)
     ch.setLevel(level)
     ch.setFormatter(_JSONFormatter() if use_json else _ConsoleFormatter())
-    root.addHandler(ch)
+    targets: List[logging.Handler] = [ch]
 
     # Optional file handler
     if log_file:
-        fh = logging.FileHandler(log_file, encoding="utf-8")
+        fh = _file_handler(log_file)
         fh.setLevel(level)
         fh.setFormatter(_JSONFormatter())  # always JSON for files
-        root.addHandler(fh)
+        targets.append(fh)
+
+    if not use_queue:
+        for handler in targets:
+            root.addHandler(handler)
+        return
+
+    shutdown_logging()
+    qh = _BoundedQueueHandler(
+        capacity=int(os.getenv("NEXUS_LOG_QUEUE_SIZE", "10000")),
+        policy=os.getenv("NEXUS_LOG_OVERFLOW", "drop_new").strip().lower(),
+        block_timeout=float(os.getenv("NEXUS_LOG_BLOCK_TIMEOUT", "0.1")),
+    )
+    qh.setLevel(level)
+    debug_rate = float(os.getenv("NEXUS_LOG_DEBUG_RATE", "50"))
+    if debug_rate > 0:
+        qh.addFilter(_DebugRateLimitFilter(debug_rate))
+    root.addHandler(qh)
+    _QUEUE_HANDLER = qh
+    _start_listener(qh, targets)
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
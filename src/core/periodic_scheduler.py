@@ -0,0 +1,337 @@
+"""
+Periodic Scheduler - one timer thread for many recurring jobs
+==============================================================
+
+A single thread sleeps until the earliest due job (a heap ordered by
+due time). It then hands the job to a small, bounded pool of daemon
+worker threads. An idle scheduler wakes only when something is due, and
+stop() interrupts the wait at once instead of waiting out a sleep.
+
+Per job:
+- jitter: each due time is shifted by ±jitter × interval. The phase is
+  tracked without jitter, so it does not drift.
+- catch_up: when the scheduler fires late (process suspended, clock
+  jump, busy pool), missed slots are counted and handled by policy.
+  - "skip":  run once now, then continue on the original phase
+  - "all":   run once now plus up to max_catch_up replays, back to back
+  - "reset": run once now, then restart the interval from now
+- overlap prevention: a run is skipped (and counted) while the previous
+  run of the same job is still queued or executing.
+
+Usage:
+    from core.periodic_scheduler import PeriodicScheduler
+
+    scheduler = PeriodicScheduler(max_workers=2, name="brain")
+    scheduler.add_job("news_scan", 300, scan_news, jitter=0.05)
+    scheduler.start()
+    scheduler.stop(timeout=5)
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.nexus_logger import get_logger
+
+logger = get_logger(__name__)
+
+CATCH_UP_POLICIES = ("skip", "all", "reset")
+
+
+@dataclass
+class ScheduledJob:
+    """A recurring job and its run accounting."""
+    name: str
+    interval_sec: float
+    callback: Callable[[], Any]
+    jitter: float = 0.0
+    catch_up: str = "skip"
+    max_catch_up: int = 3
+    allow_overlap: bool = False
+
+    base_due: float = 0.0          # un-jittered slot the next run belongs to
+    due: float = 0.0               # base_due plus jitter
+    seq: int = 0                   # heap entry version; stale entries are skipped
+    active: int = 0                # queued or executing runs
+    pending_catch_up: int = 0
+
+    runs: int = 0
+    errors: int = 0
+    missed: int = 0
+    overlaps_skipped: int = 0
+    last_started: Optional[float] = None
+    last_duration_sec: Optional[float] = None
+    last_error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class PeriodicScheduler:
+    """Heap-driven timer thread plus a bounded worker pool."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        name: str = "scheduler",
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count(1)
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._work: "queue.Queue[Optional[ScheduledJob]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        # Bumped by stop(); workers of an older generation exit after their current job.
+        self._generation = 0
+
+        # Metrics
+        self.wakeups = 0
+        self.dispatched = 0
+
+    # ── Jobs ──────────────────────────────────────────────────────
+
+    def add_job(
+        self,
+        name: str,
+        interval_sec: float,
+        callback: Callable[[], Any],
+        *,
+        jitter: float = 0.0,
+        first_delay_sec: float = 0.0,
+        catch_up: str = "skip",
+        max_catch_up: int = 3,
+        allow_overlap: bool = False,
+    ) -> ScheduledJob:
+        """Register (or replace) a recurring job. The first run is after first_delay_sec."""
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be positive")
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {CATCH_UP_POLICIES}")
+        job = ScheduledJob(
+            name=name,
+            interval_sec=float(interval_sec),
+            callback=callback,
+            jitter=max(0.0, min(0.5, float(jitter))),
+            catch_up=catch_up,
+            max_catch_up=max(0, int(max_catch_up)),
+            allow_overlap=allow_overlap,
+        )
+        with self._cond:
+            job.base_due = self._clock() + max(0.0, first_delay_sec)
+            self._jobs[name] = job
+            self._push(job, job.base_due)
+            self._cond.notify()
+        return job
+
+    def remove_job(self, name: str) -> bool:
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job is not None:
+                job.seq = 0
+            return job is not None
+
+    def _push(self, job: ScheduledJob, due: float) -> None:
+        job.due = due
+        job.seq = next(self._seq)
+        heapq.heappush(self._heap, (due, job.seq, job.name))
+
+    def _jittered(self, job: ScheduledJob, base: float) -> float:
+        if not job.jitter:
+            return base
+        return base + self._rng.uniform(-job.jitter, job.jitter) * job.interval_sec
+
+    # ── Dispatch ──────────────────────────────────────────────────
+
+    def run_pending(self) -> List[str]:
+        """Dispatch every job that is due now; returns the names dispatched."""
+        self._ensure_workers()
+        with self._cond:
+            return self._dispatch_due(self._clock())
+
+    def _dispatch_due(self, now: float) -> List[str]:
+        fired: List[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            _due, seq, name = heapq.heappop(self._heap)
+            job = self._jobs.get(name)
+            if job is None or job.seq != seq:
+                continue
+            self._fire(job, now)
+            fired.append(name)
+        return fired
+
+    def _fire(self, job: ScheduledJob, now: float) -> None:
+        late_slots = int((now - job.base_due) // job.interval_sec) if now > job.base_due else 0
+        if job.catch_up == "reset":
+            job.base_due = now + job.interval_sec
+        else:
+            job.base_due += (late_slots + 1) * job.interval_sec
+
+        if late_slots:
+            replay = min(late_slots, job.max_catch_up) if job.catch_up == "all" else 0
+            job.missed += late_slots - replay
+            with job.lock:
+                job.pending_catch_up = min(job.max_catch_up, job.pending_catch_up + replay)
+            logger.debug(f"{self.name}: {job.name} was {late_slots} slot(s) late ({job.catch_up})")
+
+        self._submit(job)
+        self._push(job, self._jittered(job, job.base_due))
+
+    def _submit(self, job: ScheduledJob) -> None:
+        with job.lock:
+            if job.active and not job.allow_overlap:
+                job.overlaps_skipped += 1
+                return
+            job.active += 1
+        self.dispatched += 1
+        self._work.put(job)
+
+    def _ensure_workers(self) -> None:
+        """Top the pool up to ``max_workers`` live workers of the current generation."""
+        self._workers = [w for w in self._workers if w.is_alive()]
+        for i in range(len(self._workers), self.max_workers):
+            worker = threading.Thread(
+                target=self._worker_loop, args=(self._generation,), daemon=True, name=f"{self.name}-worker-{i}"
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _worker_loop(self, generation: int) -> None:
+        while generation == self._generation:
+            job = self._work.get()
+            if job is None:
+                return
+            if generation != self._generation:
+                self._work.put(job)  # belongs to the workers started after stop()
+                return
+            while True:
+                self._execute(job)
+                with job.lock:
+                    if generation != self._generation:
+                        return  # stop() already reset this job's accounting
+                    # Catch-up replays run back to back on this worker, never in parallel
+                    if job.pending_catch_up:
+                        job.pending_catch_up -= 1
+                        continue
+                    job.active -= 1
+                    break
+
+    def _execute(self, job: ScheduledJob) -> None:
+        started = self._clock()
+        job.last_started = started
+        try:
+            job.callback()
+            job.runs += 1
+        except Exception as e:
+            job.errors += 1
+            job.last_error = str(e)
+            logger.error(f"{self.name}: job {job.name} failed: {e}")
+        finally:
+            job.last_duration_sec = self._clock() - started
+
+    def _loop(self) -> None:
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    self.wakeups += 1
+                    continue
+                now = self._clock()
+                due = self._heap[0][0]
+                if due > now:
+                    self._cond.wait(due - now)
+                    self.wakeups += 1
+                    continue
+                self._dispatch_due(now)
+
+    # ── Start / Stop ──────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the timer thread and worker pool."""
+        if self._running:
+            return
+        self._ensure_workers()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True, name=f"{self.name}-timer")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """
+        Stop dispatching, then wait up to ``timeout`` seconds for running jobs.
+
+        Returns True when every worker finished in time. Workers are daemon
+        threads, so a job that overruns does not block interpreter exit; it
+        is left to finish on its own and the next start() forks a full pool.
+        Runs still queued are dropped and every job's run accounting is
+        reset, so no job stays marked as running across a restart.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            self._thread = None
+        for _ in self._workers:
+            self._work.put(None)
+        drained = True
+        for worker in self._workers:
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+            drained = drained and not worker.is_alive()
+        with self._cond:
+            self._generation += 1
+            self._workers = []
+            while True:
+                try:
+                    self._work.get_nowait()
+                except queue.Empty:
+                    break
+            for job in self._jobs.values():
+                with job.lock:
+                    job.active = 0
+                    job.pending_catch_up = 0
+        return drained
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._cond:
+            jobs = {
+                job.name: {
+                    "interval_sec": job.interval_sec,
+                    "next_run_in_sec": round(max(0.0, job.due - now), 3),
+                    "runs": job.runs,
+                    "errors": job.errors,
+                    "missed": job.missed,
+                    "overlaps_skipped": job.overlaps_skipped,
+                    "running": job.active > 0,
+                    "last_duration_sec": job.last_duration_sec,
+                    "last_error": job.last_error,
+                }
+                for job in self._jobs.values()
+            }
+        return {
+            "running": self._running,
+            "workers": self.max_workers,
+            "wakeups": self.wakeups,
+            "dispatched": self.dispatched,
+            "queued": self._work.qsize(),
+            "jobs": jobs,
+        }
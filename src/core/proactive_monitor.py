@@ -93,6 +93,8 @@ class ProactiveMonitor:
         # Callbacks
         self._recovery_handlers: Dict[str, Callable] = {}
         self._health_checkers: Dict[str, Callable] = {}
+        self._health_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._last_overall: Optional[str] = None
 
         # Metrics
         self.total_checks = 0
@@ -114,6 +116,20 @@ class ProactiveMonitor:
         """Register a recovery handler for an incident type."""
         self._recovery_handlers[incident_type] = handler
 
+    def on_health_change(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Register a callback fired when the overall status changes.
+
+        Called as ``callback(previous_overall, health)``; ``previous_overall``
+        is None for the first check.
+        """
+        if callback not in self._health_listeners:
+            self._health_listeners.append(callback)
+
+    def remove_health_listener(self, callback: Callable[[str, Dict[str, Any]], None]) -> None:
+        """Unregister a callback added with on_health_change."""
+        if callback in self._health_listeners:
+            self._health_listeners.remove(callback)
+
     def check_health(self) -> Dict[str, Any]:
         """Run all health checks and return status."""
         results: Dict[str, Any] = {
@@ -161,6 +177,14 @@ class ProactiveMonitor:
 
         self.total_checks += 1
         self._last_check_at = self._now()
+
+        previous, self._last_overall = self._last_overall, results["overall"]
+        if previous != results["overall"]:
+            for listener in list(self._health_listeners):
+                try:
+                    listener(previous, results)
+                except Exception as e:
+                    self._log(f"Health listener error: {e}")
         return results
 
     def detect_incident(self, health: Dict[str, Any]) -> Optional[Incident]:
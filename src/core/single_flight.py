@@ -0,0 +1,215 @@
+"""
+Single-flight coalescing for identical in-flight requests.
+
+When several callers issue the same request concurrently (same model, same
+normalised messages, same params), only the first one - the leader - runs the
+upstream call. Everyone else waits for it and receives a deep copy of its
+result, or the same exception, so no caller can mutate another's response.
+
+Usage:
+    from core.single_flight import request_key, get_sync_group
+
+    key = request_key("glm-5", [{"role": "user", "content": prompt}], {"max_tokens": 500})
+    text = get_sync_group().do(key, lambda: expensive_call(prompt))
+
+Environment variables:
+    LLM_SINGLE_FLIGHT_ENABLED – coalesce duplicate LLM calls (default: true)
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def single_flight_enabled() -> bool:
+    return os.getenv("LLM_SINGLE_FLIGHT_ENABLED", "true").strip().lower() == "true"
+
+
+def _normalise_messages(messages: Any) -> List[Dict[str, Any]]:
+    out = []
+    for msg in messages or []:
+        if isinstance(msg, dict):
+            content = msg.get("content", "")
+            if isinstance(content, str):
+                content = content.strip()
+            item = {k: v for k, v in msg.items() if k not in {"role", "content"}}
+            item["role"] = str(msg.get("role", "user")).strip().lower()
+            item["content"] = content
+            out.append(item)
+        else:
+            out.append({"role": "user", "content": str(msg).strip()})
+    return out
+
+
+def request_key(
+    model: Any,
+    messages: Any,
+    params: Optional[Dict[str, Any]] = None,
+    routing: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Stable hash of (model, messages, params, routing); whitespace and key order do not matter.
+
+    ``routing`` is the config that decides which upstream actually answers
+    (fallback order, routing flags, api base); two calls that would be routed
+    differently must not share a result.
+    """
+    payload = {
+        "model": str(model or "").strip().lower(),
+        "messages": _normalise_messages(messages),
+        "params": params or {},
+        "routing": routing or {},
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_waiters = 0
+
+    def record(self, leader: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            if leader:
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def record_waiters(self, waiters: int) -> None:
+        with self._lock:
+            self.max_waiters = max(self.max_waiters, waiters)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "upstream_calls": self.leaders,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "max_waiters": self.max_waiters,
+                "coalescing_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            }
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Thread-based single-flight group."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.stats = _Stats()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+                self.stats.record_waiters(call.waiters)
+        self.stats.record(leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            self.stats.record_error()
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """asyncio single-flight group.
+
+    The upstream coroutine runs as its own task and every caller awaits it
+    through ``asyncio.shield``, so cancelling one caller (even the first) does
+    not cancel the shared call for the others. Futures are loop-bound, so
+    in-flight calls are tracked per event loop.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[int, str], "asyncio.Future"] = {}
+        self.stats = _Stats()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        task = self._calls.get(slot)
+        leader = task is None or task.done()
+        if leader:
+            task = loop.create_task(factory())
+            self._calls[slot] = task
+
+            def _release(done_task, slot=slot):
+                if self._calls.get(slot) is done_task:
+                    del self._calls[slot]
+                if not done_task.cancelled() and done_task.exception() is not None:
+                    self.stats.record_error()
+
+            task.add_done_callback(_release)
+        self.stats.record(leader)
+        result = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+
+_sync_group = SingleFlight()
+_async_group = AsyncSingleFlight()
+
+
+def get_sync_group() -> SingleFlight:
+    return _sync_group
+
+
+def get_async_group() -> AsyncSingleFlight:
+    return _async_group
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    """Coalescing metrics for the shared sync (threads) and async (asyncio) groups."""
+    return {
+        "enabled": single_flight_enabled(),
+        "sync": _sync_group.stats.snapshot(),
+        "async": _async_group.stats.snapshot(),
+    }
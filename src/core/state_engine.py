@@ -0,0 +1,454 @@
+"""
+State Engine - shared SQLite store for small JSON state
+========================================================
+
+Several components keep a small JSON state file and rewrite all of it on
+every change. This engine gives them one embedded store instead:
+
+- WAL journal with synchronous=NORMAL: readers do not block the writer,
+  and a commit is an append to the WAL rather than a file rewrite
+- one connection per thread (thread-local pool), with a busy timeout
+  for writers in other threads or processes
+- batched transactions: ``with engine.transaction():`` groups writes
+  into one commit, and nested blocks join the outer one
+- documents: rows of (namespace, key, JSON doc) kept in insertion order;
+  ``ensure_index`` adds a typed generated column over a JSON path and
+  indexes it, so ``query`` filters and sorts without decoding every row
+
+Stores map a JSON file ``<dir>/<name>.json`` to namespace ``<name>`` in
+``<dir>/state.db`` (see ``engine_for``). ``import_json_once`` migrates
+an existing file into its namespace the first time the store opens.
+scripts/migrate_json_state.py runs the same imports offline.
+
+Stores that keep their state in memory and checkpoint it now and then
+append one row per change to a ``StateJournal`` (see ``journal_for``)
+instead of their own JSONL file, and replay it on load.
+
+Usage:
+    from core.state_engine import engine_for
+
+    engine, ns = engine_for(DATA_DIR / "skills.json")
+    with engine.transaction():
+        engine.put(ns, "deploy", {"level": 3})
+    engine.get(ns, "deploy")
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_DB_NAME = "state.db"
+INDEX_TYPES = ("TEXT", "INTEGER", "REAL")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    ns         TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    doc        TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (ns, key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ns  TEXT NOT NULL,
+    row TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_journal_ns ON journal (ns, seq);
+"""
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class StateEngine:
+    """SQLite document store with thread-local connections."""
+
+    def __init__(self, path: Path, busy_timeout_ms: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms if busy_timeout_ms is not None else int(
+            os.getenv("STATE_ENGINE_BUSY_TIMEOUT_MS", "5000")
+        )
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._indexes: Dict[str, str] = {}
+        self._closed = False
+
+        # Metrics
+        self.commits = 0
+        self.rows_written = 0
+
+        conn = self.connection()
+        conn.executescript(_SCHEMA)
+        for (column,) in conn.execute("SELECT name FROM pragma_table_xinfo('documents')"):
+            if column.startswith("ix_"):
+                self._indexes[column[3:]] = column
+
+    # ── Connections / transactions ────────────────────────────────
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (opened on first use)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._closed:
+                raise RuntimeError(f"state engine {self.path} is closed")
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._pool_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """One commit for every write in the block. Nested blocks join the outer one."""
+        conn = self.connection()
+        outer = self._local.depth == 0
+        if outer:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth -= 1
+            if outer:
+                conn.execute("ROLLBACK")
+            raise
+        self._local.depth -= 1
+        if outer:
+            conn.execute("COMMIT")
+            self.commits += 1
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._pool_lock:
+            self._closed = True
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+    # ── Documents ─────────────────────────────────────────────────
+
+    def put(self, ns: str, key: str, doc: Any) -> None:
+        self.put_many(ns, [(key, doc)])
+
+    def put_many(self, ns: str, items: Iterable[Tuple[str, Any]]) -> int:
+        """Insert or update documents in one transaction; existing rows keep their position."""
+        now = time.time()
+        rows = [(ns, str(key), json.dumps(doc, ensure_ascii=False, default=str), now) for key, doc in items]
+        if not rows:
+            return 0
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO documents (ns, key, doc, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(ns, key) DO UPDATE SET doc = excluded.doc, updated_at = excluded.updated_at",
+                rows,
+            )
+        self.rows_written += len(rows)
+        return len(rows)
+
+    def get(self, ns: str, key: str, default: Any = None) -> Any:
+        row = self.connection().execute(
+            "SELECT doc FROM documents WHERE ns = ? AND key = ?", (ns, str(key))
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def delete(self, ns: str, key: str) -> bool:
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM documents WHERE ns = ? AND key = ?", (ns, str(key))).rowcount > 0
+
+    def clear(self, ns: str) -> int:
+        with self.transaction() as conn:
+            return conn.execute("DELETE FROM documents WHERE ns = ?", (ns,)).rowcount
+
+    def count(self, ns: str) -> int:
+        return self.connection().execute("SELECT COUNT(*) FROM documents WHERE ns = ?", (ns,)).fetchone()[0]
+
+    def items(self, ns: str) -> List[Tuple[str, Any]]:
+        """All (key, doc) pairs of a namespace in insertion order."""
+        return [
+            (key, json.loads(doc))
+            for key, doc in self.connection().execute(
+                "SELECT key, doc FROM documents WHERE ns = ? ORDER BY seq", (ns,)
+            )
+        ]
+
+    # ── Generated-column indexes ──────────────────────────────────
+
+    def ensure_index(self, name: str, json_path: str, type_: str = "TEXT") -> None:
+        """
+        Index ``json_extract(doc, json_path)`` as a typed virtual column.
+
+        The column is computed by SQLite from the stored JSON, so writers
+        do not change. Queries refer to it by ``name``.
+        """
+        if name in self._indexes:
+            return
+        type_ = type_.upper()
+        if not _IDENT.match(name) or type_ not in INDEX_TYPES:
+            raise ValueError(f"invalid index {name!r} ({type_})")
+        column = f"ix_{name}"
+        with self.transaction() as conn:
+            existing = {r[0] for r in conn.execute("SELECT name FROM pragma_table_xinfo('documents')")}
+            if column not in existing:
+                conn.execute(
+                    f"ALTER TABLE documents ADD COLUMN {column} {type_} "
+                    f"GENERATED ALWAYS AS (json_extract(doc, {_sql_str(json_path)})) VIRTUAL"
+                )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_documents_{name} ON documents (ns, {column}, seq)")
+        self._indexes[name] = column
+
+    def query(
+        self,
+        ns: str,
+        where: Optional[Dict[str, Any]] = None,
+        order_by: str = "seq",
+        descending: bool = False,
+        limit: int = -1,
+    ) -> List[Tuple[str, Any]]:
+        """(key, doc) pairs filtered by equality on indexed fields, ordered by an index or ``seq``."""
+        clauses, params = ["ns = ?"], [ns]
+        for name, value in (where or {}).items():
+            clauses.append(f"{self._column(name)} = ?")
+            params.append(value)
+        direction = "DESC" if descending else "ASC"
+        order = f"seq {direction}" if order_by == "seq" else f"{self._column(order_by)} {direction}, seq"
+        params.append(limit)
+        rows = self.connection().execute(
+            f"SELECT key, doc FROM documents WHERE {' AND '.join(clauses)} ORDER BY {order} LIMIT ?", params
+        )
+        return [(key, json.loads(doc)) for key, doc in rows]
+
+    def trim(self, ns: str, keep: int, where: Optional[Dict[str, Any]] = None) -> int:
+        """Delete all but the newest ``keep`` rows of a namespace (optionally of one indexed value)."""
+        clauses, params = ["ns = ?"], [ns]
+        for name, value in (where or {}).items():
+            clauses.append(f"{self._column(name)} = ?")
+            params.append(value)
+        cond = " AND ".join(clauses)
+        with self.transaction() as conn:
+            return conn.execute(
+                f"DELETE FROM documents WHERE {cond} AND seq NOT IN "
+                f"(SELECT seq FROM documents WHERE {cond} ORDER BY seq DESC LIMIT ?)",
+                params + params + [max(0, int(keep))],
+            ).rowcount
+
+    def _column(self, name: str) -> str:
+        column = self._indexes.get(name)
+        if column is None:
+            raise KeyError(f"no index named {name!r}; call ensure_index first")
+        return column
+
+    # ── Meta / migration ──────────────────────────────────────────
+
+    def get_meta(self, name: str) -> Optional[str]:
+        row = self.connection().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value),
+            )
+
+    def import_json_once(
+        self,
+        ns: str,
+        path: Path,
+        to_items: Callable[[Any], Iterable[Tuple[str, Any]]],
+        rename: bool = True,
+    ) -> int:
+        """
+        Import a legacy JSON file into ``ns`` the first time it is seen.
+
+        ``to_items`` turns the parsed file into (key, doc) pairs. The file
+        is renamed to ``<name>.migrated`` afterwards so it is not imported
+        again. Unreadable files are left in place and imported nothing.
+        """
+        path = Path(path)
+        marker = f"imported:{ns}"
+        if self.get_meta(marker) is not None or not path.exists():
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            items = list(to_items(data))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Failed to import {path} into {ns}: {e}")
+            return 0
+        with self.transaction():
+            count = self.put_many(ns, items)
+            self.set_meta(marker, f"{path.name} {time.time():.0f} {count}")
+        if rename:
+            try:
+                os.replace(path, path.with_name(f"{path.name}.migrated"))
+            except OSError as e:
+                logger.warning(f"Imported {path} but could not rename it: {e}")
+        logger.info(f"Imported {count} rows from {path.name} into {self.path.name}:{ns}")
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        conn = self.connection()
+        namespaces = dict(conn.execute("SELECT ns, COUNT(*) FROM documents GROUP BY ns").fetchall())
+        journals = dict(conn.execute("SELECT ns, COUNT(*) FROM journal GROUP BY ns").fetchall())
+        return {
+            "path": str(self.path),
+            "namespaces": namespaces,
+            "journals": journals,
+            "indexes": sorted(self._indexes),
+            "connections": len(self._connections),
+            "commits": self.commits,
+            "rows_written": self.rows_written,
+        }
+
+
+class StateJournal:
+    """
+    Append-only change rows of one store, kept in the engine's journal table.
+
+    A store appends a row per change and replays the rows on load; once a
+    checkpoint covers them, ``clear`` drops them. Each append is one commit
+    (or joins an open transaction), so a crash never leaves a torn row.
+    """
+
+    def __init__(self, engine: StateEngine, ns: str):
+        self.engine = engine
+        self.ns = ns
+
+    def append(self, row: Any) -> None:
+        self.append_many([row])
+
+    def append_many(self, rows: Iterable[Any]) -> int:
+        values = [(self.ns, json.dumps(row, ensure_ascii=False, separators=(",", ":"))) for row in rows]
+        if not values:
+            return 0
+        with self.engine.transaction() as conn:
+            conn.executemany("INSERT INTO journal (ns, row) VALUES (?, ?)", values)
+        self.engine.rows_written += len(values)
+        return len(values)
+
+    def rows(self) -> List[Any]:
+        """Every row in append order."""
+        return [
+            json.loads(row)
+            for (row,) in self.engine.connection().execute(
+                "SELECT row FROM journal WHERE ns = ? ORDER BY seq", (self.ns,)
+            )
+        ]
+
+    def clear(self) -> int:
+        with self.engine.transaction() as conn:
+            return conn.execute("DELETE FROM journal WHERE ns = ?", (self.ns,)).rowcount
+
+    def __len__(self) -> int:
+        return self.engine.connection().execute(
+            "SELECT COUNT(*) FROM journal WHERE ns = ?", (self.ns,)
+        ).fetchone()[0]
+
+    def import_jsonl_once(self, path: Path, rename: bool = True) -> int:
+        """
+        Append the rows of a legacy JSONL journal the first time it is seen.
+
+        A torn trailing line (a crash mid-write) is skipped. The file is
+        renamed to ``<name>.migrated`` afterwards.
+        """
+        path = Path(path)
+        marker = f"imported:journal:{self.ns}"
+        if self.engine.get_meta(marker) is not None or not path.exists():
+            return 0
+        rows = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Failed to import journal {path} into {self.ns}: {e}")
+            return 0
+        with self.engine.transaction():
+            count = self.append_many(rows)
+            self.engine.set_meta(marker, f"{path.name} {time.time():.0f} {count}")
+        if rename:
+            try:
+                os.replace(path, path.with_name(f"{path.name}.migrated"))
+            except OSError as e:
+                logger.warning(f"Imported {path} but could not rename it: {e}")
+        if count:
+            logger.info(f"Imported {count} journal rows from {path.name} into {self.engine.path.name}:{self.ns}")
+        return count
+
+
+def _sql_str(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+_engines: Dict[str, StateEngine] = {}
+_engine_refs: Dict[str, int] = {}
+_engines_lock = threading.Lock()
+
+
+def get_state_engine(path: Path) -> StateEngine:
+    """Shared engine for a database file (one per resolved path).
+
+    Every call takes a reference; holders that close their store call
+    ``release_state_engine`` instead of ``StateEngine.close``.
+    """
+    key = str(Path(path).resolve())
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None or engine._closed:
+            engine = _engines[key] = StateEngine(Path(key))
+            _engine_refs[key] = 0
+        _engine_refs[key] += 1
+        return engine
+
+
+def release_state_engine(engine: StateEngine) -> None:
+    """Drop one reference to a shared engine; the last one closes it."""
+    key = str(engine.path)
+    with _engines_lock:
+        if _engines.get(key) is not engine:
+            return
+        _engine_refs[key] -= 1
+        if _engine_refs[key] > 0:
+            return
+        del _engines[key], _engine_refs[key]
+    engine.close()
+
+
+def engine_for(json_file: Path) -> Tuple[StateEngine, str]:
+    """Engine and namespace that replace ``<dir>/<name>.json``: ``<dir>/state.db``, namespace ``<name>``."""
+    json_file = Path(json_file)
+    return get_state_engine(json_file.parent / STATE_DB_NAME), json_file.stem
+
+
+def journal_for(jsonl_file: Path) -> StateJournal:
+    """Journal that replaces ``<dir>/<name>.jsonl``: namespace ``<name>`` in ``<dir>/state.db``."""
+    jsonl_file = Path(jsonl_file)
+    return StateJournal(get_state_engine(jsonl_file.parent / STATE_DB_NAME), jsonl_file.stem)
@@ -11,6 +11,16 @@ The central nervous system of NEXUS's 24/7 autonomous operation:
 - Health monitoring via ProactiveMonitor
 - Self-healing and recovery
 
+Event Loop:
+- File changes (FileChangeWatcher: inotify, or a stat-poll fallback),
+  terminal output (ScreenMonitor callbacks, ``notify_terminal_output``)
+  and health transitions (ProactiveMonitor.on_health_change) are posted
+  to one queue; the loop sleeps until an event or a timer is due.
+- Each trigger has a debounce window (bursts coalesce into one decision)
+  and a minimum interval between decisions (later events are deferred
+  and merged, never dropped).
+- SUPERVISOR_EVENT_DRIVEN=false restores the fixed-interval polling loop.
+
 Operating Modes:
 - OBSERVE: Watch only, no actions (logging + alerts)
 - ADVISE: Watch + suggest actions (but don't execute)
@@ -30,16 +40,19 @@ Usage:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import queue
 import signal
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from core.nexus_logger import get_logger
 
@@ -75,6 +88,67 @@ class SupervisorDecision:
     confidence: float = 0.0
 
 
+@dataclass
+class SupervisorEvent:
+    """Something observed that may need a decision."""
+    kind: str                 # files_changed | terminal_output | health_transition | scheduled_scan
+    payload: Dict[str, Any] = field(default_factory=dict)
+    detected_at: float = field(default_factory=time.monotonic)
+
+
+# kind -> (debounce_sec, min_interval_sec)
+DEFAULT_TRIGGER_POLICY: Dict[str, Tuple[float, float]] = {
+    "files_changed": (0.3, 2.0),
+    "terminal_output": (0.2, 2.0),
+    "health_transition": (0.0, 30.0),
+    "scheduled_scan": (0.0, 0.0),
+}
+
+_STOP = object()
+
+
+class _TriggerGate:
+    """Debounce plus minimum spacing for one trigger kind.
+
+    Events arriving while one is pending are merged into it. The pending
+    event fires once the trigger has been quiet for ``debounce`` seconds
+    (or has been pending for five debounce windows under a steady stream),
+    and never sooner than ``min_interval`` after the previous firing.
+    """
+
+    def __init__(self, debounce: float, min_interval: float):
+        self.debounce = max(0.0, debounce)
+        self.min_interval = max(0.0, min_interval)
+        self.pending: Optional[SupervisorEvent] = None
+        self.first_at = 0.0
+        self.last_at = 0.0
+        self.last_fired = float("-inf")
+        self.coalesced = 0
+
+    def offer(self, event: SupervisorEvent, now: float, merge: Callable[[Dict, Dict], Dict]) -> None:
+        if self.pending is None:
+            self.pending = event
+            self.first_at = now
+        else:
+            self.pending.payload = merge(self.pending.payload, event.payload)
+            self.coalesced += 1
+        self.last_at = now
+
+    def due_at(self) -> Optional[float]:
+        if self.pending is None:
+            return None
+        quiet = min(self.last_at + self.debounce, self.first_at + 5 * self.debounce)
+        return max(quiet, self.last_fired + self.min_interval)
+
+    def take(self, now: float) -> Optional[SupervisorEvent]:
+        due = self.due_at()
+        if due is None or due > now:
+            return None
+        event, self.pending = self.pending, None
+        self.last_fired = now
+        return event
+
+
 @dataclass
 class SupervisorState:
     """Current state of the supervisor daemon."""
@@ -110,6 +184,9 @@ class SupervisorDaemon:
         project_scan_interval_sec: float = 60.0,
         terminal_check_interval_sec: float = 5.0,
         decision_log_path: str = "data/supervisor/decisions.jsonl",
+        event_driven: Optional[bool] = None,
+        rescan_interval_sec: float = 900.0,
+        trigger_policy: Optional[Dict[str, Tuple[float, float]]] = None,
     ):
         self.project_path = Path(project_path).resolve()
         self.mode = SupervisorMode(mode.lower())
@@ -119,6 +196,12 @@ class SupervisorDaemon:
         self.terminal_check_interval_sec = terminal_check_interval_sec
         self.decision_log_path = Path(decision_log_path)
         self.decision_log_path.parent.mkdir(parents=True, exist_ok=True)
+        if event_driven is None:
+            event_driven = os.getenv("SUPERVISOR_EVENT_DRIVEN", "true").strip().lower() == "true"
+        self.event_driven = event_driven
+        self.rescan_interval_sec = rescan_interval_sec
+        self.trigger_policy = dict(DEFAULT_TRIGGER_POLICY)
+        self.trigger_policy.update(trigger_policy or {})
 
         # Components (lazy-initialized)
         self._screen_monitor = None
@@ -127,6 +210,7 @@ class SupervisorDaemon:
         self._action_executor = None
         self._proactive_monitor = None
         self._openclaw_bridge = None
+        self._file_watcher = None
 
         # State
         self._running = False
@@ -153,6 +237,15 @@ class SupervisorDaemon:
         self._recent_errors: List[str] = []
         self._active_app: str = ""
 
+        # Event loop
+        self._events: "queue.Queue[Any]" = queue.Queue()
+        self._gates: Dict[str, _TriggerGate] = {}
+        self._events_received = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._terminal_digest = ""
+        self._issue_key: Tuple = ()
+        self._event_loop_running = False
+
     # ── Component Initialization ──────────────────────────────────
 
     def _init_components(self) -> None:
@@ -220,6 +313,7 @@ class SupervisorDaemon:
                 state = event.screen_state
                 if state and state.terminal_content:
                     self._recent_terminal = state.terminal_content
+                    self.notify_terminal_output(state.terminal_content)
 
             if event.event_type == "app_switched":
                 self._active_app = event.details.get("active_app", "")
@@ -450,6 +544,13 @@ class SupervisorDaemon:
 
     def _supervisor_loop(self) -> None:
         """Main 24/7 supervisor loop."""
+        if self.event_driven:
+            self._event_loop()
+        else:
+            self._polling_loop()
+
+    def _polling_loop(self) -> None:
+        """Fixed-interval loop: poll terminal, project and health every cycle."""
         logger.info(
             f"SupervisorDaemon started | mode={self.mode.value} | "
             f"project={self.project_path} | cycle={self.cycle_interval_sec}s"
@@ -531,6 +632,227 @@ class SupervisorDaemon:
 
         logger.info("SupervisorDaemon stopped")
 
+    # ── Event-Driven Loop ─────────────────────────────────────────
+
+    def notify_terminal_output(self, content: str) -> None:
+        """Post new terminal output for analysis (callback entry point)."""
+        if content:
+            self._post("terminal_output", {"content": content})
+
+    def _post(self, kind: str, payload: Optional[Dict[str, Any]] = None) -> None:
+        # Only the event loop drains the queue; the polling loop reads its sources directly.
+        if self._event_loop_running:
+            self._events.put(SupervisorEvent(kind=kind, payload=payload or {}))
+
+    def _own_paths(self) -> Tuple[Path, List[Path]]:
+        """The decision log plus the directories under the project the supervisor writes to."""
+        log = self.decision_log_path.resolve()
+        dirs = [log.parent]
+        state_dir = getattr(self._project_supervisor, "state_dir", None)
+        if state_dir is not None:
+            dirs.append(Path(state_dir).resolve())
+        # A directory at or above the project root would swallow every change.
+        return log, [d for d in dirs if self.project_path in d.parents]
+
+    def _on_files_changed(self, paths: List[str]) -> None:
+        log, own_dirs = self._own_paths()
+        external = []
+        for rel in paths:
+            path = (self.project_path / rel).resolve()
+            if path == log or any(d == path or d in path.parents for d in own_dirs):
+                continue
+            external.append(rel)
+        if external:
+            self._post("files_changed", {"paths": external})
+
+    def _on_health_change(self, previous: Optional[str], health: Dict[str, Any]) -> None:
+        self._post("health_transition", {"previous": previous, "health": health})
+
+    @staticmethod
+    def _merge_payload(kind: str, old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+        if kind == "files_changed":
+            paths = list(dict.fromkeys(list(old.get("paths", [])) + list(new.get("paths", []))))
+            return {"paths": paths[-1000:]}
+        if kind == "health_transition":
+            return {"previous": old.get("previous"), "health": new.get("health", {})}
+        return new  # terminal output: the newest screen wins
+
+    def _gate(self, kind: str) -> _TriggerGate:
+        gate = self._gates.get(kind)
+        if gate is None:
+            debounce, min_interval = self.trigger_policy.get(kind, (0.0, 0.0))
+            gate = self._gates[kind] = _TriggerGate(debounce, min_interval)
+        return gate
+
+    def _offer(self, event: SupervisorEvent, now: float) -> None:
+        self._gate(event.kind).offer(event, now, lambda old, new: self._merge_payload(event.kind, old, new))
+
+    def _start_event_sources(self) -> None:
+        if self._project_supervisor and self._file_watcher is None:
+            try:
+                from core.file_watcher import FileChangeWatcher
+                self._file_watcher = FileChangeWatcher(str(self.project_path), self._on_files_changed)
+                self._file_watcher.start()
+            except Exception as e:
+                logger.warning(f"FileChangeWatcher unavailable, using periodic scans: {e}")
+                self._file_watcher = None
+        if self._proactive_monitor and hasattr(self._proactive_monitor, "on_health_change"):
+            self._proactive_monitor.on_health_change(self._on_health_change)
+
+    def _stop_event_sources(self) -> None:
+        if self._file_watcher:
+            self._file_watcher.stop()
+            self._file_watcher = None
+        if self._proactive_monitor and hasattr(self._proactive_monitor, "remove_health_listener"):
+            self._proactive_monitor.remove_health_listener(self._on_health_change)
+
+    def _event_loop(self) -> None:
+        """Sleep until an event or timer is due, then decide once per gated trigger."""
+        logger.info(
+            f"SupervisorDaemon started (event-driven) | mode={self.mode.value} | "
+            f"project={self.project_path}"
+        )
+        self._event_loop_running = True
+        self._start_event_sources()
+        if self._project_supervisor:
+            self._post("scheduled_scan")  # baseline snapshot and issue list
+
+        watching = self._file_watcher is not None and self._file_watcher.running
+        scan_every = self.rescan_interval_sec if watching else self.project_scan_interval_sec
+        poll_terminal = bool(self._openclaw_bridge) and not (
+            self._screen_monitor and self._screen_monitor.running
+        )
+        now = time.monotonic()
+        next_scan = now + scan_every
+        next_terminal = now if poll_terminal else float("inf")
+
+        while self._running:
+            now = time.monotonic()
+            deadlines = [next_scan, next_terminal]
+            deadlines.extend(d for d in (g.due_at() for g in self._gates.values()) if d is not None)
+            timeout = min(max(0.0, min(deadlines) - now), 60.0)
+            self._current_focus = "idle"
+
+            try:
+                item = self._events.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            batch = []
+            while item is not None:
+                if item is _STOP:
+                    self._finish_event_loop()
+                    return
+                batch.append(item)
+                try:
+                    item = self._events.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            try:
+                self._cycle_count += 1
+                now = time.monotonic()
+                for event in batch:
+                    self._events_received += 1
+                    self._offer(event, now)
+
+                if now >= next_scan and self._project_supervisor:
+                    next_scan = now + scan_every
+                    self._offer(SupervisorEvent("scheduled_scan"), now)
+
+                if now >= next_terminal:
+                    next_terminal = now + self.terminal_check_interval_sec
+                    try:
+                        content = self._openclaw_bridge.read_terminal()
+                    except Exception:
+                        content = ""
+                    if content:
+                        self._recent_terminal = content
+                        self._offer(SupervisorEvent("terminal_output", {"content": content}), now)
+
+                for kind, gate in list(self._gates.items()):
+                    event = gate.take(now)
+                    if event is not None:
+                        self._handle_event(event)
+            except Exception as e:
+                logger.error(f"Supervisor event error: {e}")
+                self._errors_detected += 1
+
+        self._finish_event_loop()
+
+    def _finish_event_loop(self) -> None:
+        self._event_loop_running = False
+        self._stop_event_sources()
+        logger.info("SupervisorDaemon stopped")
+
+    def _handle_event(self, event: SupervisorEvent) -> None:
+        """Turn one gated event into at most one decision."""
+        decision: Optional[SupervisorDecision] = None
+
+        if event.kind == "terminal_output":
+            content = event.payload.get("content", "")
+            digest = hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+            if not content or digest == self._terminal_digest or not self._project_supervisor:
+                return
+            self._terminal_digest = digest
+            self._current_focus = "analyzing_terminal"
+            analysis = self._project_supervisor.analyze_terminal_output(content)
+            if analysis["has_errors"]:
+                decision = self._make_decision("terminal_error", {
+                    "errors": analysis["error_lines"],
+                    "terminal": content[-500:],
+                })
+
+        elif event.kind in ("files_changed", "scheduled_scan"):
+            if not self._project_supervisor:
+                return
+            self._current_focus = "scanning_project"
+            snapshot = self._project_supervisor.scan()
+            issues = self._project_supervisor.analyze()
+            issue_key = tuple(sorted((i.severity, i.title) for i in issues))
+            if issues and (event.kind == "scheduled_scan" or issue_key != self._issue_key):
+                decision = self._make_decision("project_issue", {"issues": issues, "snapshot": snapshot})
+            elif event.kind == "scheduled_scan":
+                decision = self._make_decision("scheduled_scan", {})
+            # A file change that leaves the issue list as it was needs no decision.
+            self._issue_key = issue_key
+
+        elif event.kind == "health_transition":
+            health = event.payload.get("health", {})
+            overall = health.get("overall", "unknown")
+            if overall == "healthy":
+                logger.info(f"[Supervisor] Health recovered (was {event.payload.get('previous')})")
+                return
+            self._current_focus = "health_check"
+            decision = self._make_decision("health_degraded", {
+                "details": overall,
+                "issues": health.get("issues", []),
+            })
+
+        if decision is None:
+            return
+        latencies = self._latencies.setdefault(event.kind, deque(maxlen=500))
+        latencies.append(time.monotonic() - event.detected_at)
+        self._execute_decision(decision)
+
+    def get_event_stats(self) -> Dict[str, Any]:
+        """Event counters and detection-to-decision latency per trigger."""
+        latency = {}
+        for kind, values in self._latencies.items():
+            ordered = sorted(values)
+            if ordered:
+                latency[kind] = {
+                    "count": len(ordered),
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                    "max_ms": round(ordered[-1] * 1000, 1),
+                }
+        return {
+            "event_driven": self.event_driven,
+            "events_received": self._events_received,
+            "coalesced": {kind: gate.coalesced for kind, gate in self._gates.items()},
+            "latency": latency,
+            "file_watcher": self._file_watcher.get_status() if self._file_watcher else None,
+        }
+
     # ── Start / Stop ──────────────────────────────────────────────
 
     def start(self) -> None:
@@ -539,6 +861,9 @@ class SupervisorDaemon:
             logger.warning("SupervisorDaemon already running")
             return
 
+        self._events = queue.Queue()  # drop a stop marker left by a previous run
+        self._event_loop_running = self.event_driven
+
         # Initialize components
         self._init_components()
 
@@ -565,6 +890,7 @@ class SupervisorDaemon:
         """Stop the supervisor daemon gracefully."""
         logger.info("SupervisorDaemon shutting down...")
         self._running = False
+        self._events.put(_STOP)
 
         if self._screen_monitor:
             self._screen_monitor.stop()
@@ -633,6 +959,7 @@ class SupervisorDaemon:
             "screen_monitoring": state.screen_monitoring,
             "terminal_monitoring": state.terminal_monitoring,
         }
+        result["events"] = self.get_event_stats()
         # Add OpenClaw bridge status
         if self._openclaw_bridge:
             result["openclaw"] = self._openclaw_bridge.get_status()
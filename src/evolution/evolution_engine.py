@@ -33,6 +33,11 @@ from collections import defaultdict
 import hashlib
 import re
 
+try:
+    from .similarity_index import PersistentErrorIndex, normalize_error_tokens
+except ImportError:
+    from similarity_index import PersistentErrorIndex, normalize_error_tokens
+
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "evolution"
@@ -66,6 +71,7 @@ class Pattern:
     solution: str  # How to handle this pattern
     auto_fix: bool  # Can auto-fix?
     delegate_ready: bool  # Ready to delegate?
+    content: str = ""  # Full text of the first event (name is truncated); error patterns are indexed by it
 
 
 @dataclass
@@ -100,6 +106,7 @@ class EvolutionEngine:
         # Storage
         self.events_file = self.data_dir / "events.json"
         self.patterns_file = self.data_dir / "patterns.json"
+        self.error_index_file = self.data_dir / "patterns_lsh.jsonl"
         self.skills_file = self.data_dir / "skills.json"
         self.diagnostics_file = self.data_dir / "diagnostics.json"
         self.evolution_log = self.data_dir / "evolution.log"
@@ -109,6 +116,7 @@ class EvolutionEngine:
         self.patterns: Dict[str, Pattern] = {}
         self.skills: Dict[str, SkillLevel] = {}
         self.diagnostics: List[Dict] = []
+        self.error_index = PersistentErrorIndex(self.error_index_file)
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Background thread
@@ -136,6 +144,7 @@ class EvolutionEngine:
                         self.patterns[k] = Pattern(**v)
             except:
                 pass
+        self._sync_error_index()
 
         if self.skills_file.exists():
             try:
@@ -166,6 +175,36 @@ class EvolutionEngine:
                 "last_updated": datetime.now().isoformat()
             }, f, indent=2, default=str)
 
+    def _sync_error_index(self):
+        """Bring the LSH index in line with the loaded error patterns.
+
+        Entries are indexed by the pattern's full content, exactly like the
+        live path in _process_event, and re-indexed when the stored tokens
+        differ (e.g. entries built from the truncated name).
+        """
+        error_keys = {k for k in self.patterns if k.startswith("error:")}
+        for key in list(self.error_index.signatures):
+            if key not in error_keys:
+                self.error_index.remove(key)
+        recovered: Dict[str, str] = {}
+        if any(not self.patterns[k].content for k in error_keys):
+            # Patterns saved before content was stored: take the first matching event's text.
+            for event in self.events:
+                if event.type == "error":
+                    recovered.setdefault(self._extract_pattern_key(event) or "", event.content)
+        for key in error_keys:
+            pattern = self.patterns[key]
+            if not pattern.content:
+                pattern.content = recovered.get(key) or pattern.name.split(": ", 1)[-1]
+            tokens = normalize_error_tokens(pattern.content)
+            if self.error_index.token_sets.get(key) != tokens:
+                self.error_index.add_tokens(key, tokens)
+        if self.error_index.needs_compaction:
+            try:
+                self.error_index.compact()
+            except OSError:
+                pass
+
     def _log(self, message: str, level: str = "INFO"):
         """Log to evolution log"""
         timestamp = datetime.now().isoformat()
@@ -217,8 +256,9 @@ class EvolutionEngine:
         )
         self.events.append(event)
 
-        # Auto-diagnose
+        # Auto-diagnose (before indexing, so an error never matches itself)
         self._diagnose_error(error, context)
+        self._process_event(event)
 
         self._log(f"Captured error: {error[:100]}...", "ERROR")
 
@@ -286,8 +326,11 @@ class EvolutionEngine:
                     success_rate=1.0 if context.get("success", True) else 0.0,
                     solution="",
                     auto_fix=False,
-                    delegate_ready=False
+                    delegate_ready=False,
+                    content=event.content,
                 )
+                if pattern_key.startswith("error:"):
+                    self.error_index.add(pattern_key, event.content)
 
         event.processed = True
 
@@ -317,7 +360,7 @@ class EvolutionEngine:
                 r"cannot (\w+)",
             ]
             for pattern in error_patterns:
-                match = re.search(pattern, content)
+                match = re.search(pattern, content, re.IGNORECASE)
                 if match:
                     return f"error:{match.group(1)}"
 
@@ -460,15 +503,11 @@ class EvolutionEngine:
         return "No auto-fix available"
 
     def _find_similar_error(self, error: str) -> Optional[str]:
-        """Find similar past error"""
-        error_words = set(error.lower().split())
-
-        for pattern_key, pattern in self.patterns.items():
-            if pattern_key.startswith("error:"):
-                pattern_words = set(pattern.name.lower().split())
-                similarity = len(error_words & pattern_words) / max(len(error_words), 1)
-                if similarity > 0.5:
-                    return pattern.solution
+        """Find similar past error via the MinHash/LSH index (exact Jaccard >= 0.5)"""
+        for pattern_key, _score in self.error_index.query(error, threshold=0.5, top_k=5):
+            pattern = self.patterns.get(pattern_key)
+            if pattern is not None:
+                return pattern.solution
 
         return None
 
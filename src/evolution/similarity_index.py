@@ -0,0 +1,232 @@
+"""
+MinHash / LSH index for similar-error lookup.
+
+Error texts are normalised (numbers, paths, hex addresses and quoted values
+stripped) into token sets. Each set gets a MinHash signature that is split
+into bands; any stored error sharing at least one band bucket with the query
+becomes a candidate, and candidates are re-ranked by exact Jaccard
+similarity. With 20 bands of 3 rows, pairs at Jaccard 0.5 collide with
+probability ~0.93 while pairs at 0.15 collide with probability ~0.07.
+
+The index persists as an append-only JSONL file so adding one pattern costs
+one line rather than a rewrite.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_PATH_RE = re.compile(r"(?:[a-zA-Z]:)?(?:[\\/][\w.\-]+)+[\\/]?")
+_HEX_RE = re.compile(r"\b0x[0-9a-fA-F]+\b")
+_UUID_RE = re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.IGNORECASE)
+_QUOTED_RE = re.compile(r"(['\"])(?:(?!\1).){0,200}\1")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_TOKEN_RE = re.compile(r"[a-z_][a-z0-9_]*")
+
+
+def normalize_error_tokens(text: str) -> Set[str]:
+    """Lower-case word tokens with volatile parts (paths, numbers, addresses) removed."""
+    text = str(text or "")
+    text = _UUID_RE.sub(" ", text)
+    text = _HEX_RE.sub(" ", text)
+    text = _PATH_RE.sub(" ", text)
+    text = _QUOTED_RE.sub(" ", text)
+    text = _NUMBER_RE.sub(" ", text)
+    return {tok for tok in _TOKEN_RE.findall(text.lower()) if len(tok) > 1}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 0.0
+    inter = len(a & b)
+    return inter / float(len(a) + len(b) - inter)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MinHashLSHIndex:
+    """Banded MinHash LSH over token sets with exact Jaccard re-ranking."""
+
+    def __init__(self, num_perm: int = 60, bands: int = 20, seed: int = 1, token_cache_size: int = 100_000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = int(num_perm)
+        self.bands = int(bands)
+        self.rows = self.num_perm // self.bands
+        self.seed = int(seed)
+        # Deterministic permutation parameters so persisted signatures stay valid across processes.
+        params: List[Tuple[int, int]] = []
+        for i in range(self.num_perm):
+            digest = hashlib.blake2b(f"{self.seed}:{i}".encode("utf-8"), digest_size=16).digest()
+            a = int.from_bytes(digest[:8], "little") % (_MERSENNE_PRIME - 1) + 1
+            b = int.from_bytes(digest[8:], "little") % _MERSENNE_PRIME
+            params.append((a, b))
+        self._params = params
+        self._token_cache: Dict[str, List[int]] = {}
+        self._token_cache_size = max(0, int(token_cache_size))
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(self.bands)]
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.token_sets: Dict[str, frozenset] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.signatures
+
+    def _permuted(self, token: str) -> List[int]:
+        row = self._token_cache.get(token)
+        if row is None:
+            h = _token_hash(token)
+            row = [((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in self._params]
+            if len(self._token_cache) >= self._token_cache_size:
+                self._token_cache.clear()
+            if self._token_cache_size:
+                self._token_cache[token] = row
+        return row
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        rows = [self._permuted(tok) for tok in tokens]
+        if not rows:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(map(min, zip(*rows)))
+
+    def _band_keys(self, sig: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        r = self.rows
+        return [sig[i * r:(i + 1) * r] for i in range(self.bands)]
+
+    def add_tokens(self, key: str, tokens: Set[str], sig: Optional[Tuple[int, ...]] = None) -> None:
+        with self._lock:
+            if key in self.signatures:
+                self.remove(key)
+            sig = tuple(sig) if sig is not None else self.signature(tokens)
+            self.signatures[key] = sig
+            self.token_sets[key] = frozenset(tokens)
+            for band, band_key in zip(self._buckets, self._band_keys(sig)):
+                band.setdefault(band_key, set()).add(key)
+
+    def add(self, key: str, text: str) -> Set[str]:
+        tokens = normalize_error_tokens(text)
+        self.add_tokens(key, tokens)
+        return tokens
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            sig = self.signatures.pop(key, None)
+            self.token_sets.pop(key, None)
+            if sig is None:
+                return False
+            for band, band_key in zip(self._buckets, self._band_keys(sig)):
+                members = band.get(band_key)
+                if members is not None:
+                    members.discard(key)
+                    if not members:
+                        del band[band_key]
+            return True
+
+    def candidates(self, tokens: Set[str]) -> Set[str]:
+        sig = self.signature(tokens)
+        found: Set[str] = set()
+        with self._lock:
+            for band, band_key in zip(self._buckets, self._band_keys(sig)):
+                members = band.get(band_key)
+                if members:
+                    found.update(members)
+        return found
+
+    def query(self, text: str, threshold: float = 0.5, top_k: int = 5) -> List[Tuple[str, float]]:
+        """Keys whose exact Jaccard similarity to ``text`` is at least ``threshold``, best first."""
+        tokens = normalize_error_tokens(text)
+        if not tokens:
+            return []
+        scored: List[Tuple[str, float]] = []
+        for key in self.candidates(tokens):
+            score = jaccard(tokens, self.token_sets.get(key, frozenset()))
+            if score >= threshold:
+                scored.append((key, score))
+        scored.sort(key=lambda kv: (-kv[1], kv[0]))
+        return scored[: max(1, int(top_k))]
+
+
+class PersistentErrorIndex(MinHashLSHIndex):
+    """MinHashLSHIndex backed by an append-only JSONL log next to the patterns file."""
+
+    def __init__(self, path: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._log_rows = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._log_rows += 1
+                    key = str(row.get("key") or "")
+                    if not key:
+                        continue
+                    if row.get("removed"):
+                        MinHashLSHIndex.remove(self, key)
+                        continue
+                    sig = row.get("sig")
+                    if not isinstance(sig, list) or len(sig) != self.num_perm:
+                        sig = None
+                    MinHashLSHIndex.add_tokens(self, key, set(row.get("tokens") or []), sig=sig)
+        except OSError:
+            return
+
+    def _append(self, row: Dict) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._log_rows += 1
+        except OSError:
+            pass
+
+    def add_tokens(self, key: str, tokens: Set[str], sig: Optional[Tuple[int, ...]] = None) -> None:
+        with self._lock:
+            super().add_tokens(key, tokens, sig=sig)
+            self._append({"key": key, "tokens": sorted(tokens), "sig": list(self.signatures[key])})
+
+    def remove(self, key: str) -> bool:
+        with self._lock:
+            removed = super().remove(key)
+            if removed:
+                self._append({"key": key, "removed": True})
+            return removed
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per live key."""
+        with self._lock:
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for key, sig in self.signatures.items():
+                    f.write(json.dumps(
+                        {"key": key, "tokens": sorted(self.token_sets.get(key, ())), "sig": list(sig)},
+                        ensure_ascii=False,
+                    ) + "\n")
+            tmp.replace(self.path)
+            self._log_rows = len(self.signatures)
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._log_rows > 2 * max(1, len(self.signatures)) + 1000
@@ -257,6 +257,7 @@ from .storage_v2 import (
     LearningStorageV2,
     get_storage_v2,
     record_learning_event,
+    record_learning_events,
     list_learning_events,
 )
 
@@ -393,7 +394,7 @@ __all__ = [
     # Self-learning v2 pipeline
     "LearningEvent", "ImprovementProposalV2", "ExperimentRun", "OutcomeEvidence",
     "LearningStorageV2", "get_storage_v2",
-    "record_learning_event", "list_learning_events",
+    "record_learning_event", "record_learning_events", "list_learning_events",
     "ProposalEngineV2", "get_proposal_engine_v2", "generate_proposals_v2",
     "ExperimentExecutor", "get_experiment_executor", "execute_proposal",
     "OutcomeVerifier", "get_outcome_verifier", "verify_experiment",
@@ -13,6 +13,7 @@ Implements scientific learning methods:
 8. Dual Coding - Combine verbal and visual
 """
 
+import heapq
 import json
 import math
 import os
@@ -24,6 +25,9 @@ from enum import Enum
 import random
 import hashlib
 import logging
+import sqlite3
+
+from core.state_engine import journal_for
 
 
 logger = logging.getLogger(__name__)
@@ -436,6 +440,20 @@ class AdvancedLearningEngine:
     """
     Master orchestrator for all learning methods.
     Implements the daily learning ritual: Collect → Digest → Filter → Apply
+
+    Review scheduling uses a min-heap keyed by (next_review, -importance,
+    created). Entries are invalidated lazily through a per-item version,
+    so rescheduling is a push, not a re-sort. Items are indexed by their
+    (category, normalized content) fingerprint, the same hash that forms
+    the item id.
+
+    Item changes are appended as full item rows to the state engine journal
+    ``advanced_learning_state.journal`` (core.state_engine, ``state.db`` in
+    the data dir; a legacy ``.journal.jsonl`` file is imported on load).
+    The state file is rewritten (and the journal cleared) once the journal
+    holds ADVANCED_LEARNING_COMPACT_EVERY rows or as many rows as there are
+    items, whichever is larger. Replaying a row twice is harmless, so a
+    crash during compaction loses nothing.
     """
 
     def __init__(self, data_path: str = None):
@@ -461,8 +479,18 @@ class AdvancedLearningEngine:
         self.max_items = int(os.getenv("ADVANCED_LEARNING_MAX_ITEMS", "800"))
         self.max_sessions = int(os.getenv("ADVANCED_LEARNING_MAX_SESSIONS", "500"))
 
+        self.journal_path = self.data_path / "advanced_learning_state.journal.jsonl"
+        self.compact_every = max(1, int(os.getenv("ADVANCED_LEARNING_COMPACT_EVERY", "1000")))
+
         self.knowledge_items: List[KnowledgeItem] = []
         self.learning_sessions: List[LearningSession] = []
+        self._by_fingerprint: Dict[str, KnowledgeItem] = {}
+        self._by_id: Dict[str, KnowledgeItem] = {}
+        self._review_heap: List[Tuple[float, int, float, int, str]] = []
+        self._heap_version: Dict[str, int] = {}
+        self._heap_seq = 0
+        self._journal = journal_for(self.journal_path)
+        self._journal_rows = 0
         self._load_state()
 
     def _safe_parse_time(self, value: Optional[str]) -> Optional[datetime]:
@@ -542,6 +570,10 @@ class AdvancedLearningEngine:
             return None
 
     def _load_state(self) -> None:
+        self._load_snapshot()
+        self._replay_journal()
+
+    def _load_snapshot(self) -> None:
         if not self.state_path.exists():
             return
         try:
@@ -551,14 +583,12 @@ class AdvancedLearningEngine:
             logger.warning("Could not load advanced learning state: %s", exc)
             return
 
-        knowledge_items = []
         for raw in data.get("knowledge_items", []):
             if not isinstance(raw, dict):
                 continue
             item = self._deserialize_knowledge_item(raw)
             if item:
-                knowledge_items.append(item)
-        self.knowledge_items = knowledge_items
+                self._put_item(item)
 
         sessions = []
         for raw in data.get("learning_sessions", []):
@@ -569,7 +599,95 @@ class AdvancedLearningEngine:
                 sessions.append(session)
         self.learning_sessions = sessions
 
+    def _replay_journal(self) -> None:
+        self._journal.import_jsonl_once(self.journal_path)
+        for row in self._journal.rows():
+            if not isinstance(row, dict):
+                continue
+            self._journal_rows += 1
+            if row.get("op") == "delete":
+                existing = self._find_by_id(str(row.get("id", "")))
+                if existing:
+                    self._drop_item(existing)
+            elif isinstance(row.get("item"), dict):
+                item = self._deserialize_knowledge_item(row["item"])
+                if item:
+                    self._put_item(item)
+
+    # ==================== INDEXES ====================
+
+    @staticmethod
+    def _fingerprint(category: str, content: str) -> str:
+        normalized_content = " ".join((content or "").split()).lower()
+        normalized_category = (category or "general").strip().lower()
+        return hashlib.md5(f"{normalized_category}|{normalized_content}".encode("utf-8")).hexdigest()[:12]
+
+    def _find_by_id(self, item_id: str) -> Optional[KnowledgeItem]:
+        return self._by_id.get(item_id)
+
+    def _put_item(self, item: KnowledgeItem) -> None:
+        """Insert or replace an item (matched by fingerprint) and schedule it."""
+        key = self._fingerprint(item.category, item.content)
+        existing = self._by_fingerprint.get(key)
+        if existing is not None and existing is not item:
+            self.knowledge_items[self.knowledge_items.index(existing)] = item
+            self._by_id.pop(existing.id, None)
+            self._heap_version.pop(existing.id, None)
+        elif existing is None:
+            self.knowledge_items.append(item)
+        self._by_fingerprint[key] = item
+        self._by_id[item.id] = item
+        self._schedule(item)
+
+    def _drop_item(self, item: KnowledgeItem) -> None:
+        self._by_fingerprint.pop(self._fingerprint(item.category, item.content), None)
+        self._by_id.pop(item.id, None)
+        self._heap_version.pop(item.id, None)
+        try:
+            self.knowledge_items.remove(item)
+        except ValueError:
+            pass
+
+    def _schedule(self, item: KnowledgeItem) -> None:
+        """(Re)insert the item into the review heap; its older entries become stale."""
+        self._heap_seq += 1
+        version = self._heap_seq
+        self._heap_version[item.id] = version
+        heapq.heappush(self._review_heap, (
+            item.next_review.timestamp() if item.next_review else 0.0,
+            -int(item.importance),
+            item.created.timestamp(),
+            version,
+            item.id,
+        ))
+        if len(self._review_heap) > 2 * len(self._heap_version) + 64:
+            self._review_heap = [e for e in self._review_heap if self._heap_version.get(e[4]) == e[3]]
+            heapq.heapify(self._review_heap)
+
+    def reschedule(self, item: KnowledgeItem) -> None:
+        """Re-index and persist an item whose fields were changed directly."""
+        self._schedule(item)
+        self._journal_item(item)
+
+    # ==================== PERSISTENCE ====================
+
+    def _journal_item(self, item: KnowledgeItem) -> None:
+        self._append_journal({"op": "upsert", "item": self._serialize_knowledge_item(item)})
+
+    def _append_journal(self, row: Dict) -> None:
+        try:
+            self._journal.append(row)
+            self._journal_rows += 1
+        except sqlite3.Error as exc:
+            logger.warning("Could not append advanced learning journal: %s", exc)
+            self._save_state()
+            return
+        # Rewriting n items every n rows keeps compaction O(1) per change.
+        if self._journal_rows >= max(self.compact_every, len(self.knowledge_items)):
+            self._save_state()
+
     def _save_state(self) -> None:
+        """Rewrite the full state file and truncate the journal (compaction)."""
         try:
             self.data_path.mkdir(parents=True, exist_ok=True)
             payload = {
@@ -581,6 +699,8 @@ class AdvancedLearningEngine:
             with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(payload, f, indent=2, ensure_ascii=False)
             os.replace(tmp_path, self.state_path)
+            self._journal.clear()
+            self._journal_rows = 0
         except Exception as exc:
             logger.warning("Could not persist advanced learning state: %s", exc)
 
@@ -717,24 +837,51 @@ class AdvancedLearningEngine:
 
     # ==================== SPACED REPETITION ====================
 
-    def get_items_for_review(self) -> List[KnowledgeItem]:
+    def get_items_for_review(self, limit: Optional[int] = None, now: Optional[datetime] = None) -> List[KnowledgeItem]:
         """
-        Get items that are due for review.
+        Get items that are due for review, most overdue first.
+
+        Costs O(k log n) for k returned items: due entries are popped off
+        the review heap and pushed back.
         """
-        now = datetime.now()
-        due_items = [
-            item for item in self.knowledge_items
-            if item.next_review is None or item.next_review <= now
-        ]
-        due_items.sort(
-            key=lambda item: (
-                item.next_review.timestamp() if item.next_review else 0,
-                -item.importance,
-                item.created.timestamp(),
-            )
-        )
+        now_ts = (now or datetime.now()).timestamp()
+        heap = self._review_heap
+        due_items: List[KnowledgeItem] = []
+        kept = []
+        while heap and (limit is None or len(due_items) < limit):
+            entry = heap[0]
+            if entry[0] > now_ts:
+                break
+            heapq.heappop(heap)
+            if self._heap_version.get(entry[4]) != entry[3]:
+                continue  # stale: the item was rescheduled or removed
+            item = self._find_by_id(entry[4])
+            if item is None:
+                continue
+            due_items.append(item)
+            kept.append(entry)
+        for entry in kept:
+            heapq.heappush(heap, entry)
         return due_items
 
+    def count_items_for_review(self, now: Optional[datetime] = None) -> int:
+        """Number of due items; only the due part of the heap is visited."""
+        now_ts = (now or datetime.now()).timestamp()
+        heap = self._review_heap
+        count = 0
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            entry = heap[i]
+            if entry[0] > now_ts:
+                continue
+            if self._heap_version.get(entry[4]) == entry[3]:
+                count += 1
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    stack.append(child)
+        return count
+
     def review_item(self, item: KnowledgeItem, quality: int) -> Dict:
         """
         Review an item and update its schedule.
@@ -754,7 +901,8 @@ class AdvancedLearningEngine:
         elif quality <= 2:
             item.mastery_level = max(0, item.mastery_level - 20)
 
-        self._save_state()
+        self._schedule(item)
+        self._journal_item(item)
 
         return {
             "item_id": item.id,
@@ -786,20 +934,18 @@ class AdvancedLearningEngine:
         normalized_content = " ".join((content or "").split())
         normalized_category = (category or "general").strip().lower()
         normalized_tags = sorted(set(tags or []))
+        fingerprint = self._fingerprint(normalized_category, normalized_content)
+
+        existing = self._by_fingerprint.get(fingerprint)
+        if existing is not None:
+            importance_before = existing.importance
+            existing.importance = max(existing.importance, int(importance))
+            existing.tags = sorted(set(existing.tags) | set(normalized_tags))
+            if existing.importance != importance_before:
+                self._schedule(existing)
+            self._journal_item(existing)
+            return existing
 
-        for existing in self.knowledge_items:
-            if (
-                existing.content.strip().lower() == normalized_content.lower()
-                and existing.category.strip().lower() == normalized_category
-            ):
-                existing.importance = max(existing.importance, int(importance))
-                existing.tags = sorted(set(existing.tags) | set(normalized_tags))
-                self._save_state()
-                return existing
-
-        fingerprint = hashlib.md5(
-            f"{normalized_category}|{normalized_content.lower()}".encode("utf-8")
-        ).hexdigest()[:12]
         item = KnowledgeItem(
             id=f"kn_{fingerprint}",
             content=normalized_content,
@@ -808,17 +954,17 @@ class AdvancedLearningEngine:
             created=datetime.now(),
             tags=normalized_tags
         )
-        self.knowledge_items.append(item)
+        self._put_item(item)
+        self._journal_item(item)
 
-        if self.max_items > 0 and len(self.knowledge_items) > self.max_items:
-            self.knowledge_items.sort(
+        while self.max_items > 0 and len(self.knowledge_items) > self.max_items:
+            weakest = min(
+                self.knowledge_items,
                 key=lambda x: (x.importance, x.mastery_level, x.created.timestamp()),
-                reverse=True,
             )
-            self.knowledge_items = self.knowledge_items[:self.max_items]
-            self.knowledge_items.sort(key=lambda x: x.created.timestamp())
+            self._drop_item(weakest)
+            self._append_journal({"op": "delete", "id": weakest.id})
 
-        self._save_state()
         return item
 
     def get_learning_stats(self) -> Dict:
@@ -1,11 +1,26 @@
-"""Confidence-Aware Feedback Ensemble (CAFE) scoring for self-learning."""
+"""Confidence-Aware Feedback Ensemble (CAFE) scoring for self-learning.
+
+``score_event`` scores one learning event. ``score_events`` scores a
+batch column-wise (NumPy when installed, plain Python lists otherwise)
+and returns the same dicts; use it wherever events are recorded,
+replayed or re-scored in bulk. Model-name to confidence-bias lookups go
+through an LRU cache that ``set_model_conf_bias`` invalidates.
+"""
 
 from __future__ import annotations
 
+import functools
 import os
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 
 def _env_float(name: str, default: float) -> float:
@@ -54,8 +69,19 @@ class CAFEScorer:
         self.weight_helpful = _env_float("CAFE_WEIGHT_HELPFUL", 0.5)
         self.weight_harmless = _env_float("CAFE_WEIGHT_HARMLESS", 0.3)
         self.weight_reliability = _env_float("CAFE_WEIGHT_RELIABILITY", 0.2)
+        cache_size = max(16, int(_env_float("CAFE_MODEL_BIAS_CACHE", 4096)))
+        self._resolve_bias = functools.lru_cache(maxsize=cache_size)(self._resolve_model_bias)
         self.model_conf_bias = self._load_model_conf_bias()
 
+    @property
+    def model_conf_bias(self) -> Dict[str, float]:
+        return self._model_conf_bias
+
+    @model_conf_bias.setter
+    def model_conf_bias(self, bias: Dict[str, float]) -> None:
+        self._model_conf_bias = bias
+        self._resolve_bias.cache_clear()
+
     def _state_path(self) -> Path:
         try:
             project_root = Path(__file__).parent.parent.parent
@@ -115,6 +141,10 @@ class CAFEScorer:
     def _model_bias(self, model_name: str) -> float:
         if not model_name:
             return 0.0
+        return self._resolve_bias(model_name)
+
+    def _resolve_model_bias(self, model_name: str) -> float:
+        """Exact match, else the first configured key contained in the name (memoized)."""
         name = model_name.strip().lower()
         if name in self.model_conf_bias:
             return self.model_conf_bias[name]
@@ -197,6 +227,170 @@ class CAFEScorer:
             },
         }
 
+    def score_events(self, events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch of events; element i equals ``score_event(events[i])``."""
+        events = events if isinstance(events, list) else list(events)
+        if not self.enabled:
+            return [{"enabled": False} for _ in events]
+        if not events:
+            return []
+
+        names = [self._extract_model_name(event) for event in events]
+        bias_by_name = {name: _clamp(self._model_bias(name), lo=-0.2, hi=0.2) for name in set(names)}
+        biases = [bias_by_name[name] for name in names]
+        columns = self.score_columns(
+            [_clamp(event.get("value_score", 0.0)) for event in events],
+            [_clamp(event.get("novelty_score", 0.0)) for event in events],
+            [_clamp(event.get("confidence", 0.0)) for event in events],
+            [_clamp(event.get("risk_score", 0.0)) for event in events],
+            biases,
+        )
+
+        conf_min, helpful_min, harmless_min = self.conf_min, self.helpful_min, self.harmless_min
+        weights = (self.weight_helpful, self.weight_harmless, self.weight_reliability)
+        results: List[Dict[str, Any]] = []
+        for score, conf, helpful, harmless, reliability, name, bias in zip(
+            columns["score"], columns["confidence"], columns["helpful"], columns["harmless"],
+            columns["reliability"], names, biases,
+        ):
+            reasons: List[str] = []
+            if conf < conf_min:
+                reasons.append("low_confidence")
+            if helpful < helpful_min:
+                reasons.append("low_helpfulness")
+            if harmless < harmless_min:
+                reasons.append("low_harmlessness")
+            results.append({
+                "enabled": True,
+                "score": score,
+                "confidence": conf,
+                "helpful": helpful,
+                "harmless": harmless,
+                "reliability": reliability,
+                "blocked": conf < conf_min and harmless < harmless_min,
+                "reasons": reasons,
+                "model": name or None,
+                "model_conf_bias": bias,
+                "weights": {"helpful": weights[0], "harmless": weights[1], "reliability": weights[2]},
+            })
+        return results
+
+    def score_columns(
+        self,
+        value: Sequence[float],
+        novelty: Sequence[float],
+        confidence: Sequence[float],
+        risk: Sequence[float],
+        model_bias: Sequence[float],
+    ) -> Dict[str, List[float]]:
+        """
+        Column-wise core of ``score_event`` over already clamped inputs.
+        Returns lists of score, confidence, helpful, harmless and
+        reliability with the same floating-point results per element.
+        """
+        if NUMPY_AVAILABLE:
+            return self._score_columns_numpy(value, novelty, confidence, risk, model_bias)
+        return self._score_columns_python(value, novelty, confidence, risk, model_bias)
+
+    def _score_columns_numpy(self, value, novelty, confidence, risk, model_bias) -> Dict[str, List[float]]:
+        v = np.asarray(value, dtype=np.float64)
+        n = np.asarray(novelty, dtype=np.float64)
+        c = np.asarray(confidence, dtype=np.float64)
+        r = np.asarray(risk, dtype=np.float64)
+        bias = np.asarray(model_bias, dtype=np.float64)
+
+        def clip(x):
+            return np.clip(x, 0.0, 1.0)
+
+        def mean3(a, b, x):
+            return (a + b + x) / 3
+
+        def var3(a, b, x):
+            avg = mean3(a, b, x)
+            return ((a - avg) ** 2 + (b - avg) ** 2 + (x - avg) ** 2) / 3
+
+        h1, h2, h3 = v, clip((v + n) / 2.0), clip(v * 0.7 + c * 0.3)
+        s1, s2, s3 = clip(1.0 - r), clip(1.0 - (r * 1.1)), clip((1.0 - r) * 0.8 + 0.2)
+        r1, r2, r3 = c, clip((c + (1.0 - r)) / 2.0), clip(1.0 - np.abs(v - r))
+        helpful = clip(mean3(h1, h2, h3))
+        harmless = clip(mean3(s1, s2, s3))
+        reliability = clip(mean3(r1, r2, r3))
+        variance = mean3(var3(h1, h2, h3), var3(s1, s2, s3), var3(r1, r2, r3))
+        combined = clip((c + clip(1.0 - (variance * 2.0))) / 2.0)
+        # Adding a zero bias leaves an already clamped value unchanged.
+        combined = clip(combined + bias)
+        score = clip(
+            (self.weight_helpful * helpful)
+            + (self.weight_harmless * harmless)
+            + (self.weight_reliability * reliability)
+        )
+        return {
+            "score": score.tolist(),
+            "confidence": combined.tolist(),
+            "helpful": helpful.tolist(),
+            "harmless": harmless.tolist(),
+            "reliability": reliability.tolist(),
+        }
+
+    def _score_columns_python(self, value, novelty, confidence, risk, model_bias) -> Dict[str, List[float]]:
+        # Same arithmetic as score_event, with _clamp inlined (x < 0 -> 0, x > 1 -> 1).
+        w_help, w_harm, w_rel = self.weight_helpful, self.weight_harmless, self.weight_reliability
+        out_score: List[float] = []
+        out_conf: List[float] = []
+        out_help: List[float] = []
+        out_harm: List[float] = []
+        out_rel: List[float] = []
+        for v, n, c, r, bias in zip(value, novelty, confidence, risk, model_bias):
+            h2 = (v + n) / 2.0
+            h2 = 0.0 if h2 < 0.0 else (1.0 if h2 > 1.0 else h2)
+            h3 = v * 0.7 + c * 0.3
+            h3 = 0.0 if h3 < 0.0 else (1.0 if h3 > 1.0 else h3)
+            s1 = 1.0 - r
+            s1 = 0.0 if s1 < 0.0 else (1.0 if s1 > 1.0 else s1)
+            s2 = 1.0 - (r * 1.1)
+            s2 = 0.0 if s2 < 0.0 else (1.0 if s2 > 1.0 else s2)
+            s3 = (1.0 - r) * 0.8 + 0.2
+            s3 = 0.0 if s3 < 0.0 else (1.0 if s3 > 1.0 else s3)
+            r2 = (c + (1.0 - r)) / 2.0
+            r2 = 0.0 if r2 < 0.0 else (1.0 if r2 > 1.0 else r2)
+            r3 = 1.0 - abs(v - r)
+            r3 = 0.0 if r3 < 0.0 else (1.0 if r3 > 1.0 else r3)
+
+            mh = (v + h2 + h3) / 3
+            ms = (s1 + s2 + s3) / 3
+            mr = (c + r2 + r3) / 3
+            variance = (
+                ((v - mh) ** 2 + (h2 - mh) ** 2 + (h3 - mh) ** 2) / 3
+                + ((s1 - ms) ** 2 + (s2 - ms) ** 2 + (s3 - ms) ** 2) / 3
+                + ((c - mr) ** 2 + (r2 - mr) ** 2 + (r3 - mr) ** 2) / 3
+            ) / 3
+            helpful = 0.0 if mh < 0.0 else (1.0 if mh > 1.0 else mh)
+            harmless = 0.0 if ms < 0.0 else (1.0 if ms > 1.0 else ms)
+            reliability = 0.0 if mr < 0.0 else (1.0 if mr > 1.0 else mr)
+
+            ensemble = 1.0 - (variance * 2.0)
+            ensemble = 0.0 if ensemble < 0.0 else (1.0 if ensemble > 1.0 else ensemble)
+            conf = (c + ensemble) / 2.0
+            conf = 0.0 if conf < 0.0 else (1.0 if conf > 1.0 else conf)
+            if bias:
+                conf = conf + bias
+                conf = 0.0 if conf < 0.0 else (1.0 if conf > 1.0 else conf)
+            score = (w_help * helpful) + (w_harm * harmless) + (w_rel * reliability)
+            score = 0.0 if score < 0.0 else (1.0 if score > 1.0 else score)
+
+            out_score.append(score)
+            out_conf.append(conf)
+            out_help.append(helpful)
+            out_harm.append(harmless)
+            out_rel.append(reliability)
+        return {
+            "score": out_score,
+            "confidence": out_conf,
+            "helpful": out_help,
+            "harmless": out_harm,
+            "reliability": out_rel,
+        }
+
     def score_evidence(self, evidence: Dict[str, Any]) -> Dict[str, Any]:
         if not self.enabled:
             return {"enabled": False}
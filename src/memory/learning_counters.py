@@ -0,0 +1,347 @@
+"""Time-bucketed counters for the self-learning v2 funnel.
+
+LearningStorageV2 bumps these counters on every write so status pages can
+answer "how many events / proposals / wins in the last N hours" by summing a
+handful of hour or day buckets instead of scanning every stored row.
+
+Several processes share one counters file. Each keeps the increments it has
+not flushed yet as deltas; a flush takes an OS file lock, re-reads the file,
+adds the deltas and atomically replaces it, so no process overwrites
+another's counts. Reads reload the file whenever its mtime/size changed.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only (macOS/Linux)
+except ImportError:  # pragma: no cover - fallback for non-POSIX runtime (e.g., Windows)
+    fcntl = None
+
+HOUR_KEY_FORMAT = "%Y-%m-%dT%H"
+DAY_KEY_FORMAT = "%Y-%m-%d"
+
+# Proposal statuses that count towards each funnel stage (cohort by created_at).
+PROPOSAL_STAGES = {
+    "approved": {"approved", "executed", "verified"},
+    "executed": {"executed", "verified"},
+    "verified": {"verified"},
+}
+VERDICTS = ("win", "loss", "inconclusive")
+
+
+def parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def proposal_metrics(status: Any) -> List[str]:
+    """Counter metrics a proposal contributes to its creation bucket."""
+    status = str(status or "").strip().lower()
+    metrics = ["proposals.created"]
+    for stage, statuses in PROPOSAL_STAGES.items():
+        if status in statuses:
+            metrics.append(f"proposals.{stage}")
+    return metrics
+
+
+def event_stream(event: Dict[str, Any]) -> str:
+    stream = str(event.get("stream", "")).strip().lower()
+    if stream not in {"production", "non_production"}:
+        stream = "non_production" if bool(event.get("is_non_production", False)) else "production"
+    return stream
+
+
+def _add(bucket: Dict[str, Any], metric: str, amount: int) -> None:
+    value = int(bucket.get(metric, 0)) + int(amount)
+    if value:
+        bucket[metric] = value
+    else:
+        bucket.pop(metric, None)
+
+
+class LearningCounterStore:
+    """Hour and day bucketed counters plus a few untimed totals.
+
+    Buckets are kept as ``{bucket_key: {metric: count}}``. Hour buckets are
+    retained for ``hour_retention_hours`` and day buckets for
+    ``day_retention_days``; window rollups pick whichever granularity covers
+    the requested span. A store without a ``path`` is memory-only.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        hour_retention_hours: int = 24 * 8,
+        day_retention_days: int = 400,
+        flush_interval_sec: float = 5.0,
+    ):
+        self.path = Path(path) if path else None
+        self.hour_retention_hours = max(1, int(hour_retention_hours))
+        self.day_retention_days = max(1, int(day_retention_days))
+        self.flush_interval_sec = max(0.0, float(flush_interval_sec))
+        self._lock = threading.RLock()
+        self.hours: Dict[str, Dict[str, int]] = {}
+        self.days: Dict[str, Dict[str, int]] = {}
+        self.totals: Dict[str, int] = {}
+        self.last_reconciled_at: Optional[str] = None
+        # Increments not yet written to the file, merged in by the next flush.
+        self._pending: Dict[str, Dict[str, Any]] = {"hours": {}, "days": {}, "totals": {}}
+        # Set by replace(): the next flush writes the in-memory counts as-is.
+        self._absolute = False
+        self._file_sig: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        self._last_flush = 0.0
+        self.loaded = self._load()
+
+    # ==================== PERSISTENCE ====================
+
+    def _stat_sig(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_file(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    @staticmethod
+    def _section(data: Dict[str, Any], name: str) -> Dict[str, Any]:
+        value = data.get(name)
+        return value if isinstance(value, dict) else {}
+
+    def _load(self) -> bool:
+        if self.path is None:
+            return False
+        sig = self._stat_sig()
+        data = self._read_file() if sig is not None else None
+        if data is None:
+            return False
+        self.hours = self._section(data, "hours")
+        self.days = self._section(data, "days")
+        self.totals = self._section(data, "totals")
+        self.last_reconciled_at = data.get("last_reconciled_at")
+        self._file_sig = sig
+        return True
+
+    def _refresh(self) -> None:
+        """Reload the file if another process changed it; unflushed deltas are re-applied."""
+        if self.path is None or self._absolute:
+            return
+        sig = self._stat_sig()
+        if sig is None or sig == self._file_sig:
+            return
+        if self._load():
+            self._apply_pending(self.hours, self.days, self.totals)
+
+    def _apply_pending(
+        self, hours: Dict[str, Any], days: Dict[str, Any], totals: Dict[str, Any]
+    ) -> None:
+        for buckets, pending in ((hours, self._pending["hours"]), (days, self._pending["days"])):
+            for key, deltas in pending.items():
+                bucket = buckets.setdefault(key, {})
+                for metric, amount in deltas.items():
+                    _add(bucket, metric, amount)
+        for metric, amount in self._pending["totals"].items():
+            _add(totals, metric, amount)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serialize read-merge-replace of the counters file across processes."""
+        if fcntl is None:
+            yield
+            return
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        with open(lock_path, "a", encoding="utf-8") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def flush(self, force: bool = True) -> bool:
+        if self.path is None:
+            return True
+        with self._lock:
+            if not self._dirty:
+                return True
+            if not force and time.monotonic() - self._last_flush < self.flush_interval_sec:
+                return True
+            try:
+                with self._file_lock():
+                    if self._absolute:
+                        hours, days, totals = self.hours, self.days, self.totals
+                        reconciled = self.last_reconciled_at
+                    else:
+                        data = self._read_file() or {}
+                        hours = self._section(data, "hours")
+                        days = self._section(data, "days")
+                        totals = self._section(data, "totals")
+                        self._apply_pending(hours, days, totals)
+                        stamps = (data.get("last_reconciled_at"), self.last_reconciled_at)
+                        reconciled = max((v for v in stamps if v), default=None)
+                    self.hours, self.days, self.totals = hours, days, totals
+                    self._prune()
+                    payload = {
+                        "hours": self.hours,
+                        "days": self.days,
+                        "totals": self.totals,
+                        "last_reconciled_at": reconciled,
+                        "updated_at": datetime.now().isoformat(),
+                    }
+                    tmp = self.path.with_name(
+                        f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    )
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        json.dump(payload, f, ensure_ascii=False)
+                    os.replace(tmp, self.path)
+                    self._file_sig = self._stat_sig()
+            except OSError:
+                return False
+            self.last_reconciled_at = reconciled
+            self._pending = {"hours": {}, "days": {}, "totals": {}}
+            self._absolute = False
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            return True
+
+    # ==================== WRITES ====================
+
+    def incr(self, metric: str, ts: Any = None, amount: int = 1) -> None:
+        """Add ``amount`` to ``metric`` in the hour and day bucket of ``ts``."""
+        if not amount:
+            return
+        when = parse_ts(ts) or datetime.now()
+        hour_key = when.strftime(HOUR_KEY_FORMAT)
+        day_key = when.strftime(DAY_KEY_FORMAT)
+        with self._lock:
+            new_bucket = hour_key not in self.hours
+            targets = (("hours", self.hours, hour_key), ("days", self.days, day_key))
+            for name, buckets, key in targets:
+                _add(buckets.setdefault(key, {}), metric, amount)
+                _add(self._pending[name].setdefault(key, {}), metric, amount)
+            if new_bucket:
+                self._prune()
+            self._dirty = True
+        self.flush(force=False)
+
+    def incr_total(self, metric: str, amount: int = 1) -> None:
+        if not amount:
+            return
+        with self._lock:
+            _add(self.totals, metric, amount)
+            _add(self._pending["totals"], metric, amount)
+            self._dirty = True
+        self.flush(force=False)
+
+    def _prune(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now()
+        hour_floor = (now - timedelta(hours=self.hour_retention_hours)).strftime(HOUR_KEY_FORMAT)
+        day_floor = (now - timedelta(days=self.day_retention_days)).strftime(DAY_KEY_FORMAT)
+        for key in [k for k in self.hours if k < hour_floor]:
+            del self.hours[key]
+        for key in [k for k in self.days if k < day_floor]:
+            del self.days[key]
+
+    # ==================== READS ====================
+
+    def window(
+        self,
+        seconds: float,
+        metrics: Optional[Iterable[str]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """Sum counters over the last ``seconds``, at hour (or day) resolution."""
+        now = now or datetime.now()
+        start = now - timedelta(seconds=max(0.0, float(seconds)))
+        wanted = set(metrics) if metrics is not None else None
+        use_hours = seconds <= self.hour_retention_hours * 3600
+        floor = start.strftime(HOUR_KEY_FORMAT if use_hours else DAY_KEY_FORMAT)
+        out: Dict[str, int] = {m: 0 for m in wanted} if wanted is not None else {}
+        with self._lock:
+            self._refresh()
+            buckets = self.hours if use_hours else self.days
+            for key, bucket in buckets.items():
+                if key < floor:
+                    continue
+                for metric, value in bucket.items():
+                    if wanted is None or metric in wanted:
+                        out[metric] = out.get(metric, 0) + int(value)
+        return out
+
+    def total(self, metric: str) -> int:
+        with self._lock:
+            self._refresh()
+            return int(self.totals.get(metric, 0))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            return {
+                "hours": {k: dict(v) for k, v in self.hours.items()},
+                "days": {k: dict(v) for k, v in self.days.items()},
+                "totals": dict(self.totals),
+                "last_reconciled_at": self.last_reconciled_at,
+            }
+
+    # ==================== RECONCILIATION ====================
+
+    def replace(self, other: "LearningCounterStore") -> None:
+        with self._lock:
+            snap = other.snapshot()
+            self.hours = snap["hours"]
+            self.days = snap["days"]
+            self.totals = snap["totals"]
+            self._pending = {"hours": {}, "days": {}, "totals": {}}
+            self._absolute = True
+            self._dirty = True
+
+    def diff(self, other: "LearningCounterStore") -> List[Dict[str, Any]]:
+        """List every (granularity, bucket, metric) whose count differs from ``other``."""
+        drift: List[Dict[str, Any]] = []
+        mine = self.snapshot()
+        theirs = other.snapshot()
+        for granularity in ("hours", "days"):
+            keys = set(mine[granularity]) | set(theirs[granularity])
+            for key in sorted(keys):
+                a = mine[granularity].get(key, {})
+                b = theirs[granularity].get(key, {})
+                for metric in sorted(set(a) | set(b)):
+                    counted, actual = int(a.get(metric, 0)), int(b.get(metric, 0))
+                    if counted != actual:
+                        drift.append({
+                            "granularity": granularity,
+                            "bucket": key,
+                            "metric": metric,
+                            "counted": counted,
+                            "actual": actual,
+                        })
+        for metric in sorted(set(mine["totals"]) | set(theirs["totals"])):
+            counted, actual = int(mine["totals"].get(metric, 0)), int(theirs["totals"].get(metric, 0))
+            if counted != actual:
+                drift.append({
+                    "granularity": "totals",
+                    "bucket": None,
+                    "metric": metric,
+                    "counted": counted,
+                    "actual": actual,
+                })
+        return drift
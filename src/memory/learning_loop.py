@@ -41,6 +41,7 @@ from .learning_policy import (
     apply_policy_drift_guard,
 )
 from .memory_governor import get_memory_governor
+from .retention import RetentionEngine
 from .migrate_proposals_v1_to_v2 import migrate_once as migrate_proposals_v1_to_v2
 from core.nexus_logger import get_logger
 
@@ -82,6 +83,8 @@ class LearningLoop:
         "deep_analysis": 86400,  # Daily deep analysis
         "daily_self_learning": 86400,  # Daily autonomous self-learning cycle
         "advanced_review": 21600,  # Every 6 hours
+        "counter_reconcile": 21600,  # Rebuild funnel counters from raw rows every 6 hours
+        "retention_compaction": 86400,  # Daily TTL compaction of the v2 stores
         "cleanup": 604800,       # Weekly cleanup
     }
     FOCUS_AREAS = [
@@ -119,6 +122,8 @@ class LearningLoop:
         self.last_analysis = None
         self.last_cleanup = None
         self.last_advanced_review = None
+        self.last_counter_reconcile = None
+        self.last_retention_compaction = None
         self.last_daily_self_learning = None
         self.applied_proposals = set()
         self.auto_approve_threshold = float(os.getenv("AUTO_APPROVE_PROPOSAL_SCORE", "8.5"))
@@ -175,6 +180,7 @@ class LearningLoop:
         self.verifier_v2 = get_outcome_verifier()
         self.governor = get_memory_governor()
         self.enable_proposal_v2 = os.getenv("ENABLE_PROPOSAL_V2", "true").strip().lower() == "true"
+        self.enable_retention_compaction = os.getenv("ENABLE_RETENTION_COMPACTION", "true").strip().lower() == "true"
         self.enable_experiment_executor = os.getenv("ENABLE_EXPERIMENT_EXECUTOR", "true").strip().lower() == "true"
         self.execution_mode_default = str(os.getenv("EXECUTION_MODE_DEFAULT", "safe")).strip().lower() or "safe"
         self.enable_policy_bandit = os.getenv("ENABLE_POLICY_BANDIT", "true").strip().lower() == "true"
@@ -191,6 +197,10 @@ class LearningLoop:
         self.last_stagnation_force_scan_at: Optional[str] = None
         self.verification_retry_interval_sec = int(os.getenv("VERIFICATION_RETRY_INTERVAL_SECONDS", "300"))
         self.verification_retry_max_attempts = int(os.getenv("VERIFICATION_RETRY_MAX_ATTEMPTS", "3"))
+        self.enable_async_verification = os.getenv("VERIFICATION_ASYNC_ENABLED", "true").strip().lower() == "true"
+        self.completed_verifications: List[Dict] = []
+        # Completion hooks run on whichever thread polls the verifier.
+        self._completed_verifications_lock = threading.Lock()
         self.enable_cafe_calibration = os.getenv("ENABLE_CAFE_CALIBRATION", "true").strip().lower() == "true"
         self.cafe_calibration_interval_sec = int(os.getenv("CAFE_CALIBRATION_INTERVAL_SECONDS", "21600"))
         self.last_cafe_calibration: Optional[str] = None
@@ -267,6 +277,8 @@ class LearningLoop:
 
         # Load previous state
         self._load_state()
+        self.governor_snapshot_path = self.base_path / "memory_governor_dedup.json"
+        self.governor.load_snapshot(self.governor_snapshot_path)
 
     def _load_state(self):
         """Load previous learning state."""
@@ -291,6 +303,8 @@ class LearningLoop:
                 self.last_analysis = data.get("last_analysis")
                 self.last_cleanup = data.get("last_cleanup")
                 self.last_advanced_review = data.get("last_advanced_review")
+                self.last_counter_reconcile = data.get("last_counter_reconcile")
+                self.last_retention_compaction = data.get("last_retention_compaction")
                 self.last_daily_self_learning = data.get("last_daily_self_learning")
                 self.applied_proposals = set(data.get("applied_proposals", []))
                 self.no_improvement_streak = int(data.get("no_improvement_streak", 0))
@@ -355,6 +369,8 @@ class LearningLoop:
             "last_analysis": self.last_analysis,
             "last_cleanup": self.last_cleanup,
             "last_advanced_review": self.last_advanced_review,
+            "last_counter_reconcile": self.last_counter_reconcile,
+            "last_retention_compaction": self.last_retention_compaction,
             "last_daily_self_learning": self.last_daily_self_learning,
             "applied_proposals": sorted(list(self.applied_proposals))[-500:],
             "no_improvement_streak": self.no_improvement_streak,
@@ -387,6 +403,7 @@ class LearningLoop:
         with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2)
         os.replace(tmp_path, state_path)
+        self.governor.save_snapshot(self.governor_snapshot_path)
 
     # ==================== LEARNING ACTIONS ====================
 
@@ -2288,6 +2305,9 @@ class LearningLoop:
         }
         if not self.enable_proposal_v2:
             return summary
+        summary["verification_scheduled"] = 0
+        self.poll_verifications()
+        summary.update(self._fold_completed_verifications(summary))
 
         selected_policy = {}
         if self.enable_policy_bandit:
@@ -2343,27 +2363,30 @@ class LearningLoop:
             run_id = exec_result.get("run_id")
             verdict = "inconclusive"
             if run_id:
-                verify = self.verifier_v2.verify_experiment(run_id)
-                if verify.get("ok"):
-                    if not bool(verify.get("pending_recheck", False)):
-                        summary["verified"] += 1
-                    evidence = verify.get("evidence", {})
-                    verdict = evidence.get("verdict", "inconclusive")
-                    if verdict == "win":
-                        summary["wins"] += 1
-                    elif verdict == "loss":
-                        summary["losses"] += 1
+                on_complete = self._verification_callback(
+                    run_mode=run_mode,
+                    proposal_id=str(proposal.get("id")),
+                    selected_policy=selected_policy,
+                )
+                if self.enable_async_verification:
+                    scheduled = self.verifier_v2.schedule_verification(run_id, on_complete=on_complete)
+                    if bool(scheduled.get("scheduled", False)):
+                        # Counted separately; the verdict arrives with a later fold.
+                        summary["verification_scheduled"] += 1
+                        verdict = None
                     else:
-                        summary["inconclusive"] += 1
-                    if run_mode == "normal":
-                        self._record_normal_mode_outcome(verdict=verdict, proposal_id=str(proposal.get("id")))
-                    if self.enable_policy_bandit:
-                        update_learning_policy({"verdict": verdict, "selected": selected_policy})
+                        verdict = str((scheduled.get("evidence") or {}).get("verdict", "inconclusive"))
+                else:
+                    verify = self.verifier_v2.verify_experiment(run_id)
+                    on_complete(verify)
+                    verdict = str((verify.get("evidence") or {}).get("verdict", "inconclusive"))
+                summary.update(self._fold_completed_verifications(summary))
             summary["runs"].append(
                 {
                     "proposal_id": proposal.get("id"),
                     "run_id": run_id,
                     "verdict": verdict,
+                    "verification_scheduled": verdict is None,
                     "mode": run_mode,
                     "canary_reason": run_reason,
                 }
@@ -2380,6 +2403,62 @@ class LearningLoop:
 
         return summary
 
+    def _verification_callback(self, run_mode: str, proposal_id: str, selected_policy: Dict):
+        """Build the completion hook that applies a verdict once sampling finishes."""
+
+        def _on_complete(verify: Dict) -> None:
+            if not verify.get("ok"):
+                return
+            evidence = verify.get("evidence", {}) if isinstance(verify.get("evidence"), dict) else {}
+            verdict = str(evidence.get("verdict", "inconclusive") or "inconclusive")
+            if run_mode == "normal":
+                self._record_normal_mode_outcome(verdict=verdict, proposal_id=proposal_id)
+            if self.enable_policy_bandit and run_mode != "recheck":
+                update_learning_policy({"verdict": verdict, "selected": selected_policy})
+            with self._completed_verifications_lock:
+                self.completed_verifications.append(
+                    {
+                        "verdict": verdict,
+                        "pending_recheck": bool(verify.get("pending_recheck", False)),
+                    }
+                )
+
+        return _on_complete
+
+    def _fold_completed_verifications(self, summary: Dict) -> Dict:
+        """Move verdicts finished since the last call into the cycle summary counters."""
+        with self._completed_verifications_lock:
+            completed, self.completed_verifications = self.completed_verifications, []
+        folded = {key: int(summary.get(key, 0) or 0) for key in ("verified", "wins", "losses", "inconclusive")}
+        buckets = {"win": "wins", "loss": "losses", "inconclusive": "inconclusive"}
+        for row in completed:
+            bucket = buckets.get(str(row.get("verdict", "")).strip().lower())
+            if bucket is None:
+                continue
+            if not row.get("pending_recheck"):
+                folded["verified"] += 1
+            folded[bucket] += 1
+        return folded
+
+    def poll_verifications(self) -> int:
+        """Advance scheduled verification sampling; returns how many verdicts completed."""
+        try:
+            return len(self.verifier_v2.poll_verifications())
+        except Exception as e:
+            track_error("SYSTEM", "verification_poll_error", str(e), context={"iteration": self.iteration}, recoverable=True)
+            return 0
+
+    def _idle_wait(self, seconds: float) -> None:
+        """Sleep until the next iteration while servicing due verification samples."""
+        deadline = time.monotonic() + max(0.0, float(seconds))
+        while self.running:
+            self.poll_verifications()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            due_in = self.verifier_v2.next_verification_due_in()
+            time.sleep(remaining if due_in is None else max(0.0, min(remaining, due_in)))
+
     def _retry_pending_verifications(self, limit: int = 3) -> Dict:
         if not self.enable_proposal_v2:
             return {
@@ -2410,6 +2489,8 @@ class LearningLoop:
             verification = run.get("verification", {}) if isinstance(run.get("verification"), dict) else {}
             if not bool(verification.get("pending_recheck", False)):
                 continue
+            if self.verifier_v2.is_verification_pending(run_id):
+                continue
             attempts = int(verification.get("attempts", 0) or 0)
             if attempts >= max_attempts:
                 finalized_at = datetime.now().isoformat()
@@ -2449,6 +2530,14 @@ class LearningLoop:
             if last_verified_at and (now - last_verified_at).total_seconds() < max(10, self.verification_retry_interval_sec):
                 continue
 
+            if self.enable_async_verification:
+                # Verdicts arrive through the completion hook and are folded into a later summary.
+                self.verifier_v2.schedule_verification(
+                    run_id,
+                    on_complete=self._verification_callback("recheck", str(run.get("proposal_id", "")), {}),
+                )
+                attempted += 1
+                continue
             recheck = self.verifier_v2.verify_experiment(run_id)
             attempted += 1
             if not recheck.get("ok"):
@@ -2512,8 +2601,8 @@ class LearningLoop:
         if not self.learning_engine:
             return {"enabled": False}
 
-        due_items = self.learning_engine.get_items_for_review()
-        selected = due_items[: max(1, self.advanced_review_limit)]
+        due_count = self.learning_engine.count_items_for_review()
+        selected = self.learning_engine.get_items_for_review(limit=max(1, self.advanced_review_limit))
         results = []
 
         for item in selected:
@@ -2528,7 +2617,7 @@ class LearningLoop:
         self.last_advanced_review = datetime.now().isoformat()
         summary = {
             "enabled": True,
-            "due_items": len(due_items),
+            "due_items": due_count,
             "reviewed_items": len(results),
             "review_results": results[:10],
             "timestamp": self.last_advanced_review,
@@ -2565,6 +2654,46 @@ class LearningLoop:
         )
         return {"removed_entries": removed, "timestamp": self.last_cleanup}
 
+    def _should_run_counter_reconcile(self) -> bool:
+        last_run = self._parse_time(self.last_counter_reconcile)
+        if not last_run:
+            return True
+        return datetime.now() - last_run > timedelta(seconds=self.INTERVALS["counter_reconcile"])
+
+    def _run_counter_reconcile(self) -> Dict:
+        """Rebuild v2 funnel counters from raw stores and record any drift found."""
+        summary = self.storage_v2.reconcile_counters(apply=True)
+        self.last_counter_reconcile = datetime.now().isoformat()
+        summary["timestamp"] = self.last_counter_reconcile
+        if int(summary.get("drift_count", 0) or 0) > 0:
+            self._append_rnd_note(
+                note_type="counter_drift_repaired",
+                severity="warning",
+                message=f"Funnel counters drifted in {summary.get('drift_count')} bucket(s); rebuilt from raw data",
+                context={"drift": summary.get("drift", [])[:10], "rows_scanned": summary.get("rows_scanned", 0)},
+            )
+        return summary
+
+    def _should_run_retention_compaction(self) -> bool:
+        if not self.enable_retention_compaction:
+            return False
+        last_run = self._parse_time(self.last_retention_compaction)
+        if not last_run:
+            return True
+        return datetime.now() - last_run > timedelta(seconds=self.INTERVALS["retention_compaction"])
+
+    def _run_retention_compaction(self) -> Dict:
+        """Apply category TTLs to events, proposals, evidence and routing telemetry in one pass."""
+        summary = RetentionEngine(storage=self.storage_v2, governor=self.governor).run()
+        self.last_retention_compaction = datetime.now().isoformat()
+        summary["timestamp"] = self.last_retention_compaction
+        logger.info(
+            "Retention compaction reclaimed %s bytes in %sms",
+            summary.get("bytes_reclaimed", 0),
+            summary.get("duration_ms", 0),
+        )
+        return summary
+
     def _acquire_operation_lock(self, operation_name: str, lock_path: str):
         """Acquire non-blocking process lock for a short critical operation."""
         guard = ProcessSingleton(name=operation_name, lock_path=lock_path)
@@ -2801,6 +2930,36 @@ class LearningLoop:
                 track_error("SYSTEM", "cleanup_error", str(e), context={"iteration": self.iteration}, recoverable=True)
                 results["errors"].append({"step": "cleanup", "error": str(e)})
 
+        # 5b. Funnel counter reconciliation
+        if self._should_run_counter_reconcile():
+            try:
+                results["counter_reconcile"] = self._run_counter_reconcile()
+                results["actions"].append("counter_reconcile")
+            except Exception as e:
+                track_error(
+                    "SYSTEM",
+                    "counter_reconcile_error",
+                    str(e),
+                    context={"iteration": self.iteration},
+                    recoverable=True,
+                )
+                results["errors"].append({"step": "counter_reconcile", "error": str(e)})
+
+        # 5c. Retention compaction
+        if self._should_run_retention_compaction():
+            try:
+                results["retention_compaction"] = self._run_retention_compaction()
+                results["actions"].append("retention_compaction")
+            except Exception as e:
+                track_error(
+                    "SYSTEM",
+                    "retention_compaction_error",
+                    str(e),
+                    context={"iteration": self.iteration},
+                    recoverable=True,
+                )
+                results["errors"].append({"step": "retention_compaction", "error": str(e)})
+
         # 6. Persist daily R&D notes for errors/issues/improvements.
         for err in results["errors"]:
             self._append_rnd_note(
@@ -3028,8 +3187,8 @@ class LearningLoop:
                 logger.info("Actions: %s", ', '.join(results['actions']))
                 logger.info("Duration: %.2fs", results['duration_seconds'])
 
-                # Wait for next iteration
-                time.sleep(interval_seconds)
+                # Wait for next iteration (servicing scheduled verification samples)
+                self._idle_wait(interval_seconds)
 
         except KeyboardInterrupt:
             logger.info("Learning Loop Stopped by user")
@@ -3087,7 +3246,7 @@ class LearningLoop:
                     logger.info("Health: %s/100", results['health']['health_score'])
                     logger.info("Actions: %s", ', '.join(results['actions']))
                     logger.info("Duration: %.2fs", results['duration_seconds'])
-                    time.sleep(interval_seconds)
+                    self._idle_wait(interval_seconds)
                 except KeyboardInterrupt:
                     raise
                 except Exception as e:
@@ -3185,7 +3344,7 @@ class LearningLoop:
         if self.learning_engine:
             advanced_stats = self.learning_engine.get_learning_stats()
             advanced_stats["knowledge_items"] = len(self.learning_engine.knowledge_items)
-            advanced_stats["due_for_review"] = len(self.learning_engine.get_items_for_review())
+            advanced_stats["due_for_review"] = self.learning_engine.count_items_for_review()
             advanced_stats["last_review"] = self.last_advanced_review
 
         today_notes_all = self.get_today_rnd_notes(limit=10000)
@@ -3227,22 +3386,17 @@ class LearningLoop:
             latest_summary = daily_self_learning_recent[0].get("summary", {})
             if isinstance(latest_summary, dict):
                 latest_rotation = latest_summary.get("portfolio_rotation", {})
-        proposals_v2 = self.storage_v2.get_proposals_v2()
-        v2_rows = proposals_v2.get("proposals", []) if isinstance(proposals_v2.get("proposals"), list) else []
-        status_counts: Dict[str, int] = {}
-        for row in v2_rows:
-            status = str(row.get("status", "unknown"))
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Funnel numbers come from the incrementally maintained counters, not a row scan.
+        status_counts = self.storage_v2.get_proposal_status_counts()
 
         proposal_funnel = {
-            "created": len(v2_rows),
+            "created": self.storage_v2.get_proposal_total(),
             "pending_approval": status_counts.get("pending_approval", 0),
             "approved": status_counts.get("approved", 0),
             "executed": status_counts.get("executed", 0),
             "verified": status_counts.get("verified", 0),
             "rejected": status_counts.get("rejected", 0),
         }
-        now_dt = datetime.now()
 
         def _safe_ratio(num: int, den: int) -> float:
             return round(float(num) / float(den), 4) if den > 0 else 0.0
@@ -3260,46 +3414,18 @@ class LearningLoop:
             "verified_from_created_rate": _safe_ratio(proposal_funnel["verified"], proposal_funnel["created"]),
         }
 
-        def _window_funnel(hours: int) -> Dict:
-            window_seconds = max(1, int(hours)) * 3600
-            cohort: List[Dict] = []
-            for row in v2_rows:
-                created_at = self._parse_time(row.get("created_at"))
-                if not created_at:
-                    continue
-                if (now_dt - created_at).total_seconds() <= window_seconds:
-                    cohort.append(row)
-            created = len(cohort)
-            approved = 0
-            executed = 0
-            verified_window = 0
-            for row in cohort:
-                status = str(row.get("status", "")).strip().lower()
-                if status in {"approved", "executed", "verified"}:
-                    approved += 1
-                if status in {"executed", "verified"}:
-                    executed += 1
-                if status == "verified":
-                    verified_window += 1
-            return {
-                "created": created,
-                "approved": approved,
-                "executed": executed,
-                "verified": verified_window,
-                "approval_rate": _safe_ratio(approved, created),
-                "execution_rate": _safe_ratio(executed, approved),
-                "verification_rate": _safe_ratio(verified_window, executed),
-                "verified_from_created_rate": _safe_ratio(verified_window, created),
-            }
-
-        proposal_funnel["window_24h"] = _window_funnel(24)
-        proposal_funnel["window_7d"] = _window_funnel(24 * 7)
+        funnel_24h = self.storage_v2.get_funnel_window(24)
+        funnel_7d = self.storage_v2.get_funnel_window(24 * 7)
+        proposal_funnel["window_24h"] = funnel_24h
+        proposal_funnel["window_7d"] = funnel_7d
+        proposal_funnel["counters_last_reconciled_at"] = self.storage_v2.counters.last_reconciled_at
 
         runs = self.storage_v2.get_experiment_runs(limit=500)
         verdict_counts = {"win": 0, "loss": 0, "inconclusive": 0}
         for run in runs:
             verification = run.get("verification", {}) if isinstance(run.get("verification"), dict) else {}
-            if bool(verification.get("holdout_pending", False)):
+            if bool(verification.get("holdout_pending", False)) or bool(verification.get("scheduled", False)):
+                # Scheduled runs only carry a marker (and maybe a stale verdict) until sampling ends.
                 continue
             verdict = str(verification.get("verdict", "")).strip().lower()
             if verdict in verdict_counts:
@@ -3309,16 +3435,19 @@ class LearningLoop:
         pending_recheck_runs = 0
         retry_exhausted_runs = 0
         holdout_pending_runs = 0
+        scheduled_verification_runs = 0
         for run in runs:
             verification = run.get("verification", {}) if isinstance(run.get("verification"), dict) else {}
-            if bool(verification.get("pending_recheck", False)):
+            if bool(verification.get("scheduled", False)):
+                scheduled_verification_runs += 1
+            elif bool(verification.get("pending_recheck", False)):
                 pending_recheck_runs += 1
             if bool(verification.get("holdout_pending", False)):
                 holdout_pending_runs += 1
             if bool(verification.get("retry_exhausted", False)):
                 retry_exhausted_runs += 1
-        trend_24h = {"win": 0, "loss": 0, "inconclusive": 0}
-        trend_7d = {"win": 0, "loss": 0, "inconclusive": 0}
+        trend_24h = dict(funnel_24h.get("verdicts", {}))
+        trend_7d = dict(funnel_7d.get("verdicts", {}))
         confidence_values = []
         delta_health_values = []
         delta_error_values = []
@@ -3328,20 +3457,6 @@ class LearningLoop:
         for evd in evidence_rows:
             if not isinstance(evd, dict):
                 continue
-            verdict = str(evd.get("verdict", "")).strip().lower()
-            ts = evd.get("ts")
-            ts_dt = None
-            if ts:
-                try:
-                    ts_dt = datetime.fromisoformat(str(ts))
-                except Exception:
-                    ts_dt = None
-            if verdict in trend_24h and ts_dt and not bool(evd.get("holdout_pending", False)):
-                age_sec = (now_dt - ts_dt).total_seconds()
-                if age_sec <= 24 * 3600:
-                    trend_24h[verdict] += 1
-                if age_sec <= 7 * 24 * 3600:
-                    trend_7d[verdict] += 1
             try:
                 confidence_values.append(float(evd.get("confidence", 0.0) or 0.0))
             except (TypeError, ValueError):
@@ -3387,14 +3502,15 @@ class LearningLoop:
             "evidence_samples": len(evidence_rows),
             "pending_recheck_runs": pending_recheck_runs,
             "holdout_pending_runs": holdout_pending_runs,
+            "scheduled_verification_runs": scheduled_verification_runs,
             "retry_exhausted_runs": retry_exhausted_runs,
             "trend_24h": trend_24h,
             "trend_7d": trend_7d,
         }
         events = self.storage_v2.list_learning_events(limit=1000)
         stream_counts = {"production": 0, "non_production": 0, "unknown": 0}
-        stream_trend_24h = {"production": 0, "non_production": 0}
-        stream_trend_7d = {"production": 0, "non_production": 0}
+        stream_trend_24h = dict(funnel_24h.get("events", {}))
+        stream_trend_7d = dict(funnel_7d.get("events", {}))
         source_counts: Dict[str, int] = {}
         for event in events:
             if not isinstance(event, dict):
@@ -3405,13 +3521,6 @@ class LearningLoop:
             stream_counts[stream] = stream_counts.get(stream, 0) + 1
             source = str(event.get("source", "")).strip() or "unknown"
             source_counts[source] = source_counts.get(source, 0) + 1
-            ts_dt = self._parse_time(event.get("ts"))
-            if ts_dt:
-                age_sec = (now_dt - ts_dt).total_seconds()
-                if age_sec <= 24 * 3600:
-                    stream_trend_24h[stream] = stream_trend_24h.get(stream, 0) + 1
-                if age_sec <= 7 * 24 * 3600:
-                    stream_trend_7d[stream] = stream_trend_7d.get(stream, 0) + 1
 
         total_events = sum(stream_counts.values())
         production_events = stream_counts.get("production", 0)
@@ -1,19 +1,88 @@
 """Memory governance utilities for long-running learning."""
 
 import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Signatures are 16 hex chars (64 bits) of md5.
+_SIGNATURE_BITS = 64
+
+
+class TTLSignatureCache:
+    """Capacity-bounded LRU of ``signature -> expires_at`` (epoch seconds).
+
+    Every sighting refreshes the entry and moves it to the back, so the front
+    of the ordered dict always holds the entry that expires first. Expired
+    entries are dropped from the front lazily; once ``capacity`` is reached
+    the least recently seen signature is evicted.
+    """
+
+    def __init__(self, window_seconds: float, capacity: int):
+        self.window_seconds = max(1.0, float(window_seconds))
+        self.capacity = max(1, int(capacity))
+        self.entries: "OrderedDict[str, float]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _expire(self, now: float) -> None:
+        entries = self.entries
+        while entries:
+            sig, expires_at = next(iter(entries.items()))
+            if expires_at > now:
+                break
+            entries.popitem(last=False)
+            self.expirations += 1
+
+    def seen(self, sig: str, now: float) -> bool:
+        """Record a sighting; True when ``sig`` was already seen inside the window."""
+        self._expire(now)
+        entries = self.entries
+        duplicate = sig in entries
+        if duplicate:
+            entries.move_to_end(sig)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[sig] = now + self.window_seconds
+        return duplicate
+
+    def load(self, rows: List[List[Any]], now: float) -> None:
+        """Replace entries from ``[[sig, expires_at], ...]``, keeping the latest ``capacity`` live rows."""
+        live = sorted(
+            ((str(sig), float(exp)) for sig, exp in rows if float(exp) > now),
+            key=lambda item: item[1],
+        )[-self.capacity:]
+        self.entries = OrderedDict(live)
 
 
 class MemoryGovernor:
-    def __init__(self):
-        self.recent_signatures: Dict[str, str] = {}
+    def __init__(self, dedup_capacity: Optional[int] = None):
         self.ttl_days_by_category = {
             "learning_event": 30,
             "proposal": 60,
             "evidence": 180,
+            "routing_telemetry": 30,
             "default": 90,
         }
+        # Dedup windows default to the category TTL; set a value here to override.
+        self.dedup_window_seconds_by_category: Dict[str, float] = {}
+        self.dedup_capacity = max(1, int(
+            dedup_capacity if dedup_capacity is not None
+            else os.getenv("MEMORY_GOVERNOR_DEDUP_CAPACITY", "50000")
+        ))
+        self._dedup: Dict[str, TTLSignatureCache] = {}
+        self._lock = threading.Lock()
+        self.dedup_stats = {"checked": 0, "duplicates": 0, "kept": 0}
+        self._saved_checked: Optional[int] = None
 
     def signature(self, payload: Dict[str, Any]) -> str:
         base = "|".join([
@@ -23,33 +92,133 @@ class MemoryGovernor:
         ]).lower()
         return hashlib.md5(base.encode("utf-8")).hexdigest()[:16]
 
+    def dedup_window_seconds(self, category: str = "default") -> float:
+        override = self.dedup_window_seconds_by_category.get(category)
+        if override is not None:
+            return float(override)
+        ttl_days = self.ttl_days_by_category.get(category, self.ttl_days_by_category["default"])
+        return float(ttl_days) * 86400.0
+
+    def _cache(self, category: str) -> TTLSignatureCache:
+        cache = self._dedup.get(category)
+        if cache is None:
+            cache = TTLSignatureCache(self.dedup_window_seconds(category), self.dedup_capacity)
+            self._dedup[category] = cache
+        return cache
+
     def should_keep(self, payload: Dict[str, Any], category: str = "default") -> bool:
         sig = self.signature(payload)
-        now = datetime.now().isoformat()
-        prev = self.recent_signatures.get(sig)
-        self.recent_signatures[sig] = now
-        # Deduplicate immediate repeats
-        if prev and payload.get("dedup_strict", True):
+        with self._lock:
+            duplicate = self._cache(category).seen(sig, time.time())
+            self.dedup_stats["checked"] += 1
+            # Deduplicate repeats seen inside the category window
+            if duplicate and payload.get("dedup_strict", True):
+                self.dedup_stats["duplicates"] += 1
+                return False
+            self.dedup_stats["kept"] += 1
+        return True
+
+    def get_dedup_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            categories = {}
+            for name, cache in self._dedup.items():
+                size = len(cache)
+                categories[name] = {
+                    "size": size,
+                    "capacity": cache.capacity,
+                    "window_seconds": cache.window_seconds,
+                    "evictions": cache.evictions,
+                    "expirations": cache.expirations,
+                    # Chance that a brand-new payload collides with a live signature.
+                    "false_positive_rate": size / float(2 ** _SIGNATURE_BITS),
+                }
+            return {**self.dedup_stats, "categories": categories}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": 1,
+                "saved_at": time.time(),
+                "categories": {
+                    name: [[sig, exp] for sig, exp in cache.entries.items()]
+                    for name, cache in self._dedup.items()
+                },
+                "stats": dict(self.dedup_stats),
+            }
+
+    def restore(self, data: Dict[str, Any]) -> int:
+        """Load dedup state from ``snapshot()`` output; returns live signatures restored."""
+        if not isinstance(data, dict) or not isinstance(data.get("categories"), dict):
+            return 0
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for name, rows in data["categories"].items():
+                if not isinstance(rows, list):
+                    continue
+                cache = self._cache(str(name))
+                try:
+                    cache.load(rows, now)
+                except (TypeError, ValueError):
+                    continue
+                restored += len(cache)
+            stats = data.get("stats")
+            if isinstance(stats, dict):
+                for key in self.dedup_stats:
+                    self.dedup_stats[key] = int(stats.get(key, self.dedup_stats[key]) or 0)
+        return restored
+
+    def save_snapshot(self, path: Path, force: bool = False) -> bool:
+        """Persist dedup state atomically; skipped when nothing was checked since the last save."""
+        if not force and self._saved_checked == self.dedup_stats["checked"]:
+            return True
+        path = Path(path)
+        checked = self.dedup_stats["checked"]
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, path)
+        except OSError:
             return False
+        self._saved_checked = checked
         return True
 
-    def prune_by_ttl(self, rows: List[Dict[str, Any]], category: str = "default") -> List[Dict[str, Any]]:
+    def load_snapshot(self, path: Path) -> int:
+        path = Path(path)
+        if not path.exists():
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                restored = self.restore(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            return 0
+        self._saved_checked = self.dedup_stats["checked"]
+        return restored
+
+    def retention_cutoff(self, category: str = "default", now: Optional[datetime] = None) -> datetime:
         ttl_days = int(self.ttl_days_by_category.get(category, self.ttl_days_by_category["default"]))
-        cutoff = datetime.now() - timedelta(days=ttl_days)
-        out: List[Dict[str, Any]] = []
+        return (now or datetime.now()) - timedelta(days=ttl_days)
+
+    def iter_prune_by_ttl(self, rows: Iterable[Dict[str, Any]], category: str = "default") -> Iterator[Dict[str, Any]]:
+        """Streaming form of prune_by_ttl: yields rows inside the category TTL (or without a timestamp)."""
+        cutoff = self.retention_cutoff(category)
         for row in rows:
             ts = row.get("ts") or row.get("timestamp") or row.get("created_at")
             if not ts:
-                out.append(row)
+                yield row
                 continue
             try:
                 dt = datetime.fromisoformat(str(ts))
             except (ValueError, TypeError):
-                out.append(row)
+                yield row
                 continue
             if dt >= cutoff:
-                out.append(row)
-        return out
+                yield row
+
+    def prune_by_ttl(self, rows: List[Dict[str, Any]], category: str = "default") -> List[Dict[str, Any]]:
+        return list(self.iter_prune_by_ttl(rows, category))
 
 
 _governor = MemoryGovernor()
@@ -2,12 +2,13 @@
 
 from datetime import datetime, timedelta
 from time import sleep
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 import os
 
 from .proposal_engine import get_proposal_engine_v2
 from .self_debugger import health_check
 from .storage_v2 import get_storage_v2
+from .verification_scheduler import SamplingPlan, VerificationScheduler
 
 
 DEFAULT_VERIFICATION_THRESHOLDS: Dict[str, float] = {
@@ -61,6 +62,10 @@ class OutcomeVerifier:
             0.0,
             min(30.0, float(os.getenv("VERIFICATION_MULTI_SAMPLE_INTERVAL_SECONDS", "0") or 0.0)),
         )
+        self.scheduler = VerificationScheduler(
+            sampler=lambda: health_check(),
+            finalize=self._finish_scheduled,
+        )
 
     def _resolve_thresholds(self, raw: Any) -> Dict[str, float]:
         source = raw if isinstance(raw, dict) else {}
@@ -82,9 +87,7 @@ class OutcomeVerifier:
         return self._resolve_thresholds({})
 
     def _collect_after_snapshot(self) -> Dict[str, Any]:
-        sample_target = self.multi_sample_count if self.multi_sample_enabled else 1
-        sample_target = max(1, int(sample_target))
-        interval = max(0.0, float(self.multi_sample_interval_seconds))
+        sample_target, interval = self._sampling_plan()
 
         samples: List[Dict[str, Any]] = []
         for idx in range(sample_target):
@@ -93,7 +96,13 @@ class OutcomeVerifier:
                 samples.append(sample)
             if idx < sample_target - 1 and interval > 0:
                 sleep(interval)
+        return self._aggregate_samples(samples, sample_target, interval)
+
+    def _sampling_plan(self) -> tuple[int, float]:
+        sample_target = self.multi_sample_count if self.multi_sample_enabled else 1
+        return max(1, int(sample_target)), max(0.0, float(self.multi_sample_interval_seconds))
 
+    def _aggregate_samples(self, samples: List[Dict[str, Any]], sample_target: int, interval: float) -> Dict[str, Any]:
         if not samples:
             return {
                 "after": {},
@@ -253,15 +262,88 @@ class OutcomeVerifier:
         }
 
     def verify_experiment(self, experiment_id: str) -> Dict[str, Any]:
-        runs = self.storage.get_experiment_runs(limit=1000)
-        target = None
-        for run in runs:
-            if run.get("id") == experiment_id:
-                target = run
-                break
+        """Verify a run now, taking every health sample inline."""
+        started = self._begin_verification(experiment_id)
+        if "result" in started:
+            return started["result"]
+        return self._finish_verification(started["context"], self._collect_after_snapshot())
+
+    def schedule_verification(
+        self,
+        experiment_id: str,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Register a run's sampling plan on the scheduler instead of sleeping between samples.
+
+        Runs that finish without sampling (missing run, holdout window) complete
+        immediately. Otherwise the verdict is produced by ``poll_verifications``
+        once the plan has all its samples, and ``on_complete`` receives it.
+        """
+        if self.scheduler.is_pending(experiment_id):
+            return {"ok": True, "scheduled": True, "already_pending": True, "experiment_id": experiment_id}
+        started = self._begin_verification(experiment_id)
+        if "result" in started:
+            result = started["result"]
+            if on_complete:
+                on_complete(result)
+            return result
+        sample_target, interval = self._sampling_plan()
+        context = started["context"]
+        self.scheduler.register(
+            SamplingPlan(
+                key=experiment_id,
+                sample_target=sample_target,
+                interval_seconds=interval,
+                context=context,
+                on_complete=on_complete,
+            )
+        )
+        # Leave a pending marker so the retry path picks the run up if this process dies mid-plan.
+        target = context.get("target", {})
+        marker = dict(target.get("verification", {})) if isinstance(target.get("verification"), dict) else {}
+        marker.update({
+            "pending_recheck": True,
+            "attempts": int(context.get("previous_attempts", 0) or 0),
+            "verified_at": datetime.now().isoformat(),
+            "scheduled": True,
+            "sampling": {
+                "sample_count": 0,
+                "requested_sample_count": sample_target,
+                "sample_interval_seconds": interval,
+                "aggregation": "scheduled",
+            },
+        })
+        self.storage.update_experiment_run(experiment_id, {"verification": marker})
+        return {
+            "ok": True,
+            "scheduled": True,
+            "experiment_id": experiment_id,
+            "requested_sample_count": sample_target,
+            "sample_interval_seconds": interval,
+        }
+
+    def _finish_scheduled(self, plan: SamplingPlan) -> Dict[str, Any]:
+        snapshot = self._aggregate_samples(plan.samples, plan.sample_target, plan.interval_seconds)
+        return self._finish_verification(plan.context, snapshot)
+
+    def poll_verifications(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Collect due samples and return verdicts for plans that completed."""
+        return self.scheduler.poll(now)
+
+    def pending_verifications(self) -> int:
+        return self.scheduler.pending_count()
+
+    def is_verification_pending(self, experiment_id: str) -> bool:
+        return self.scheduler.is_pending(experiment_id)
+
+    def next_verification_due_in(self) -> Optional[float]:
+        return self.scheduler.next_due_in()
+
+    def _begin_verification(self, experiment_id: str) -> Dict[str, Any]:
+        target = self.storage.get_experiment_run(experiment_id)
 
         if not target:
-            return {"ok": False, "error": "run_not_found", "experiment_id": experiment_id}
+            return {"result": {"ok": False, "error": "run_not_found", "experiment_id": experiment_id}}
 
         run_artifacts = target.get("artifacts", {}) if isinstance(target.get("artifacts"), dict) else {}
         finished_at = target.get("finished_at") or run_artifacts.get("finished_at")
@@ -370,13 +452,34 @@ class OutcomeVerifier:
                         evidence_id=evidence_id,
                     )
                 return {
-                    "ok": True,
-                    "evidence": evidence,
-                    "evidence_id": evidence_id,
-                    "pending_recheck": True,
+                    "result": {
+                        "ok": True,
+                        "evidence": evidence,
+                        "evidence_id": evidence_id,
+                        "pending_recheck": True,
+                    }
                 }
 
-        after_snapshot = self._collect_after_snapshot()
+        return {
+            "context": {
+                "experiment_id": experiment_id,
+                "target": target,
+                "before": before,
+                "thresholds": thresholds,
+                "previous_attempts": previous_attempts,
+                "before_throughput": before_throughput,
+                "after_throughput": after_throughput,
+            }
+        }
+
+    def _finish_verification(self, context: Dict[str, Any], after_snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        experiment_id = context["experiment_id"]
+        target = context["target"]
+        before = context["before"]
+        thresholds = context["thresholds"]
+        previous_attempts = context["previous_attempts"]
+        before_throughput = context["before_throughput"]
+        after_throughput = context["after_throughput"]
         after = after_snapshot.get("after", {}) if isinstance(after_snapshot.get("after"), dict) else {}
         sample_meta = after_snapshot.get("meta", {}) if isinstance(after_snapshot.get("meta"), dict) else {}
         if not after:
@@ -0,0 +1,319 @@
+"""
+Per-member segmented interaction logs for TeamPersonaStore.
+
+The shared ``team_persona_events.jsonl`` stays the source of truth. Every
+row is also appended to ``<segments>/<member_id>.jsonl``. A fixed-width
+offset index sits beside it: ``<member_id>.idx`` holds 16 bytes per row,
+(offset in the shared log, offset in the segment).
+
+The last ``limit`` rows of a member therefore cost one seek into the index
+and one read of the segment tail, no matter how large the shared log is.
+
+Segments are derived data. ``catch_up`` folds shared-log rows past the
+recorded high-water mark into the segments. It skips rows a member index
+already covers, so a crash between the shared append and the segment
+append never duplicates rows. Deleting the segments directory rebuilds it
+from scratch.
+
+Several processes may share one log. Writers hold ``locked()`` (a thread
+lock plus an flock on ``<segments>/_lock``) across the shared append and
+``append``; ``append`` and ``tail`` catch up first, so rows other processes
+wrote are folded in log order before the caller's own.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only (macOS/Linux)
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+_ENTRY = struct.Struct("<QQ")
+_META_FILE = "_index.json"
+_LOCK_FILE = "_lock"
+# Bump when the way rows map to segments changes; older segments are rebuilt.
+_META_VERSION = 2
+
+
+def iter_lines_reverse(path: Path, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Yield non-empty lines of ``path`` newest first."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            remainder = b""
+            while pos > 0:
+                step = min(chunk_size, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + remainder).split(b"\n")
+                remainder = lines.pop(0)
+                for raw in reversed(lines):
+                    raw = raw.strip()
+                    if raw:
+                        yield raw.decode("utf-8", errors="replace")
+            remainder = remainder.strip()
+            if remainder:
+                yield remainder.decode("utf-8", errors="replace")
+    except OSError:
+        return
+
+
+def _raw_member_id(value: Any) -> str:
+    return str(value or "")
+
+
+def _member_of(raw: bytes, key: Callable[[Any], str] = _raw_member_id) -> str:
+    try:
+        row = json.loads(raw)
+    except ValueError:
+        return ""
+    return key(row.get("member_id")) if isinstance(row, dict) else ""
+
+
+class MemberSegmentLog:
+    """Per-member append-only segments plus offset indexes derived from a shared JSONL log."""
+
+    def __init__(
+        self,
+        shared_path: Path,
+        root: Optional[Path] = None,
+        max_open: int = 64,
+        key: Optional[Callable[[Any], str]] = None,
+    ):
+        self.shared_path = Path(shared_path)
+        self.root = Path(root) if root else self.shared_path.with_name(f"{self.shared_path.stem}_members")
+        self.max_open = max(1, int(max_open))
+        # Maps a row's member_id to its segment name; readers must look up with the same key.
+        self.key = key or _raw_member_id
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._handles: "OrderedDict[str, Any]" = OrderedDict()
+        self.indexed_offset = 0
+        self._stale = False
+        self._load_meta()
+
+    # ==================== FILES ====================
+
+    def _segment_path(self, member_id: str) -> Path:
+        return self.root / f"{member_id}.jsonl"
+
+    def _index_path(self, member_id: str) -> Path:
+        return self.root / f"{member_id}.idx"
+
+    def _load_meta(self) -> None:
+        self.indexed_offset = 0
+        self._stale = False
+        try:
+            with open(self.root / _META_FILE, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if int(meta.get("version", 1)) != _META_VERSION:
+                self._stale = True
+                return
+            self.indexed_offset = int(meta.get("indexed_offset", 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            self._stale = self.root.exists()
+
+    def save_meta(self) -> None:
+        with self.locked():
+            path = self.root / _META_FILE
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": _META_VERSION, "indexed_offset": self.indexed_offset}, f)
+            os.replace(tmp, path)
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the thread lock and the cross-process flock on the segment directory (reentrant)."""
+        with self._lock:
+            if self._lock_depth == 0:
+                self.root.mkdir(parents=True, exist_ok=True)
+                if fcntl is not None:
+                    if self._lock_file is None:
+                        self._lock_file = open(self.root / _LOCK_FILE, "a+b")
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_file is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _handles_for(self, member_id: str):
+        handles = self._handles.get(member_id)
+        if handles is not None:
+            self._handles.move_to_end(member_id)
+            return handles
+        handles = (
+            open(self._segment_path(member_id), "ab"),
+            open(self._index_path(member_id), "a+b"),
+        )
+        self._handles[member_id] = handles
+        while len(self._handles) > self.max_open:
+            _, (seg, idx) = self._handles.popitem(last=False)
+            seg.close()
+            idx.close()
+        return handles
+
+    @staticmethod
+    def _last_source_offset(idx) -> int:
+        # Read from the file every time: other processes append to the same index.
+        size = os.fstat(idx.fileno()).st_size
+        size -= size % _ENTRY.size
+        if not size:
+            return -1
+        idx.seek(size - _ENTRY.size)
+        return _ENTRY.unpack(idx.read(_ENTRY.size))[0]
+
+    def _close_handles(self) -> None:
+        for seg, idx in self._handles.values():
+            seg.close()
+            idx.close()
+        self._handles.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_handles()
+            if self._lock_file is not None and self._lock_depth == 0:
+                self._lock_file.close()
+                self._lock_file = None
+
+    # ==================== WRITES ====================
+
+    def append(self, member_id: str, line: bytes, source_offset: int) -> None:
+        """Add one encoded row (ending in a newline) that sits at ``source_offset`` in the shared log.
+
+        Callers hold ``locked()`` across writing the row to the shared log and
+        this call, so no other writer can slip a row in between.
+        """
+        with self.locked():
+            if source_offset != self.indexed_offset or self._stale:
+                # Rows this process has not indexed sit before this one; fold
+                # everything (this row included) in log order.
+                self.catch_up()
+                return
+            member_id = self.key(member_id)
+            if member_id:
+                self._write_rows(member_id, [(source_offset, line)])
+            self.indexed_offset = source_offset + len(line)
+
+    def _write_rows(self, member_id: str, rows: List[Tuple[int, bytes]]) -> None:
+        seg, idx = self._handles_for(member_id)
+        last = self._last_source_offset(idx)
+        rows = [(src, raw) for src, raw in rows if src > last]
+        if not rows:
+            return
+        # Other processes append to the same segment, so our position may be behind.
+        offset = seg.seek(0, os.SEEK_END)
+        entries = []
+        for src, raw in rows:
+            entries.append(_ENTRY.pack(src, offset))
+            offset += len(raw)
+        seg.write(b"".join(raw for _, raw in rows))
+        seg.flush()
+        idx.write(b"".join(entries))
+        idx.flush()
+
+    def catch_up(self, batch_bytes: int = 32 * 1024 * 1024) -> int:
+        """Index shared-log rows appended since the last recorded offset.
+
+        Rows are grouped per member and written in batches, so rebuilding a
+        large log costs one write per member per batch rather than per row.
+        When nothing was appended this is one stat.
+        """
+        try:
+            if self.shared_path.stat().st_size == self.indexed_offset and not self._stale:
+                return 0
+        except OSError:
+            return 0
+        with self.locked():
+            try:
+                size = self.shared_path.stat().st_size
+            except OSError:
+                return 0
+            if self._stale:
+                # Another process may have rebuilt the segments since we read the meta.
+                self._load_meta()
+            if size < self.indexed_offset or self._stale:
+                # The shared log was truncated or replaced, or the segments were
+                # built by an older layout: rebuild everything.
+                self._close_handles()
+                for path in list(self.root.glob("*.jsonl")) + list(self.root.glob("*.idx")):
+                    path.unlink()
+                self.indexed_offset = 0
+                self._stale = False
+            if size == self.indexed_offset:
+                return 0
+            folded = 0
+            pending: Dict[str, List[Tuple[int, bytes]]] = {}
+            pending_bytes = 0
+            with open(self.shared_path, "rb") as f:
+                f.seek(self.indexed_offset)
+                offset = self.indexed_offset
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    member_id = _member_of(raw, self.key)
+                    if member_id:
+                        pending.setdefault(member_id, []).append((offset, raw))
+                        pending_bytes += len(raw)
+                        folded += 1
+                    offset += len(raw)
+                    if pending_bytes >= batch_bytes:
+                        self._drain(pending)
+                        pending_bytes = 0
+                        self.indexed_offset = offset
+                self._drain(pending)
+                self.indexed_offset = offset
+            self.save_meta()
+            return folded
+
+    def _drain(self, pending: Dict[str, List[Tuple[int, bytes]]]) -> None:
+        for member_id, rows in pending.items():
+            self._write_rows(member_id, rows)
+        pending.clear()
+
+    # ==================== READS ====================
+
+    def count(self, member_id: str) -> int:
+        try:
+            return self._index_path(self.key(member_id)).stat().st_size // _ENTRY.size
+        except OSError:
+            return 0
+
+    def tail(self, member_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Newest ``limit`` rows of one member, newest first."""
+        member_id = self.key(member_id)
+        with self.locked():
+            self.catch_up()
+            total = self.count(member_id)
+            if total == 0 or limit <= 0:
+                return []
+            take = min(int(limit), total)
+            with open(self._index_path(member_id), "rb") as f:
+                f.seek((total - take) * _ENTRY.size)
+                start = _ENTRY.unpack(f.read(_ENTRY.size))[1]
+            with open(self._segment_path(member_id), "rb") as f:
+                f.seek(start)
+                raw_lines = f.read().split(b"\n")
+        rows: List[Dict[str, Any]] = []
+        for raw in raw_lines[:take]:
+            try:
+                item = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(item, dict):
+                rows.append(item)
+        rows.reverse()
+        return rows
@@ -1,10 +1,38 @@
-"""Lightweight Thompson Sampling policy tuner for learning loop."""
+"""Lightweight Thompson Sampling policy tuner for learning loop.
 
+Persistence:
+- Beta parameters live in memory. Each selection, verdict update and
+  drift-guard adjustment is appended to the state engine journal
+  ``learning_policy_state.journal`` (core.state_engine, in the storage
+  state dir's state.db) as one compact row (the arms touched, reward,
+  weight and discount), never the whole state.
+- The policy state file is rewritten only at checkpoints: every
+  POLICY_CHECKPOINT_EVERY journal rows, POLICY_CHECKPOINT_INTERVAL
+  seconds, or at exit. It records the journal seq it covers, so a
+  restart replays exactly the rows written after it.
+- Update history is kept out of the state file, in the journal
+  ``learning_policy_history``: a ring of the last POLICY_HISTORY_MAX
+  entries, compacted when it doubles. A decision's journal and history
+  rows go out in one commit.
+- Legacy ``.jsonl`` journal and history files are imported on first load.
+
+Discounting: with POLICY_BANDIT_DISCOUNT below 1.0, every update first
+decays all arms of the family toward the (1, 1) prior by that factor,
+so old evidence fades and the bandit follows rewards that drift.
+"""
+
+import atexit
 import copy
+import os
+import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import random
 
+from core.state_engine import journal_for
+
 from .storage_v2 import get_storage_v2
 
 
@@ -35,36 +63,191 @@ class PolicyBandit:
         "history": [],
     }
 
+    POLICY_FAMILIES = ("approve_threshold", "scan_min_score", "focus_policy")
+
     def __init__(self):
         self.storage = get_storage_v2()
+        self.journal_file = self.storage.policy_state_file.with_name("learning_policy_state.journal.jsonl")
+        self.history_file = self.storage.policy_state_file.with_name("learning_policy_history.jsonl")
+        self.checkpoint_every = max(1, int(os.getenv("POLICY_CHECKPOINT_EVERY", "200")))
+        self.checkpoint_interval = max(0.0, float(os.getenv("POLICY_CHECKPOINT_INTERVAL", "60")))
+        self.history_max = max(1, int(os.getenv("POLICY_HISTORY_MAX", "1000")))
+        self.discount = min(1.0, max(0.5, float(os.getenv("POLICY_BANDIT_DISCOUNT", "1.0"))))
+
+        self._journal = journal_for(self.journal_file)
+        self._history = journal_for(self.history_file)
+        self._engine = self._journal.engine
+
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._checkpointed_seq = 0
+        self._last_checkpoint = time.monotonic()
+        self._history_lines = 0
+
+        self._load()
+        atexit.register(self.flush)
+
+    # ==================== LOAD / REPLAY ====================
+
+    def _load(self) -> None:
+        """Load the last checkpoint, replay the journal past it, then read the history ring."""
         stored_state = self.storage.get_policy_state()
         self.state = stored_state if isinstance(stored_state, dict) else {}
         if "arms" not in self.state:
             self.state = copy.deepcopy(self.DEFAULT_STATE)
+        try:
+            checkpoint_seq = int(self.state.pop("journal_seq", 0) or 0)
+        except (TypeError, ValueError):
+            checkpoint_seq = 0
+        legacy_history = self.state.get("history") if isinstance(self.state.get("history"), list) else []
 
-    def _sample_arm(self, family: str) -> str:
+        self._journal.import_jsonl_once(self.journal_file)
+        self._history.import_jsonl_once(self.history_file)
+        self._seq = self._checkpointed_seq = checkpoint_seq
+        self._seq = max(self._seq, self._replay_journal(checkpoint_seq))
+        self.state["history"] = self._load_history(legacy_history)
+
+    def _replay_journal(self, after_seq: int) -> int:
+        """Apply journal rows newer than the checkpoint. Returns the last seq seen."""
+        last = 0
+        for row in self._journal.rows():
+            if not isinstance(row, dict):
+                continue
+            seq = int(row.get("seq", 0) or 0)
+            last = max(last, seq)
+            if seq <= after_seq:
+                continue
+            op = row.get("op")
+            if op == "select" and isinstance(row.get("selected"), dict):
+                self.state["selected"] = row["selected"]
+                self.state["selected_at"] = row.get("at")
+            elif op == "update" and isinstance(row.get("selected"), dict):
+                self._apply_update(
+                    row["selected"],
+                    float(row.get("reward", 0.0)),
+                    float(row.get("weight", 1.0)),
+                    float(row.get("discount", 1.0)),
+                )
+            elif op == "drift_guard" and isinstance(row.get("arms"), dict):
+                self._apply_arm_values(row["arms"])
+        return last
+
+    def _load_history(self, legacy_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        history = [entry for entry in self._history.rows() if isinstance(entry, dict)]
+        if history:
+            self._history_lines = len(history)
+            return history[-self.history_max:]
+        if legacy_history:
+            # History used to live inside the state file; move it to the ring.
+            history = legacy_history[-self.history_max:]
+            self._rewrite_history(history)
+        return history
+
+    # ==================== JOURNAL / CHECKPOINT ====================
+
+    def _append(self, row: Dict[str, Any]) -> None:
+        self._seq += 1
+        try:
+            self._journal.append({"seq": self._seq, **row})
+        except sqlite3.Error:
+            # Without a journal the change only survives through a checkpoint.
+            self._checkpoint()
+
+    def _maybe_checkpoint(self) -> None:
+        pending = self._seq - self._checkpointed_seq
+        if pending >= self.checkpoint_every or (
+            pending and time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+        ):
+            self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        """Rewrite the state file at the current journal seq, then truncate the journal."""
+        with self._lock:
+            seq = self._seq
+            payload = {k: v for k, v in self.state.items() if k != "history"}
+            payload["journal_seq"] = seq
+            if not self.storage.save_policy_state(payload):
+                return
+            # The state file now covers the journal, so it can start over.
+            self._journal.clear()
+            self._checkpointed_seq = seq
+            self._last_checkpoint = time.monotonic()
+
+    def flush(self) -> None:
+        """Checkpoint outstanding journal rows."""
+        with self._lock:
+            if self._seq > self._checkpointed_seq:
+                self._checkpoint()
+
+    def _record_history(self, entry: Dict[str, Any]) -> None:
+        history = self.state.setdefault("history", [])
+        history.append(entry)
+        if len(history) > self.history_max:
+            del history[: len(history) - self.history_max]
+        if self._history_lines + 1 >= 2 * self.history_max:
+            self._rewrite_history(history)
+            return
+        try:
+            self._history.append(entry)
+            self._history_lines += 1
+        except sqlite3.Error:
+            pass
+
+    def _rewrite_history(self, history: List[Dict[str, Any]]) -> None:
+        """Compact the ring down to the in-memory history."""
+        try:
+            with self._engine.transaction():
+                self._history.clear()
+                self._history.append_many(history)
+            self._history_lines = len(history)
+        except sqlite3.Error:
+            pass
+
+    # ==================== SAMPLING ====================
+
+    def _posteriors(self, family: str) -> List[Tuple[str, float, float]]:
         family_state = self.state.get("arms", {}).get(family, {})
+        return [
+            (arm, max(1e-6, float(beta.get("a", 1.0))), max(1e-6, float(beta.get("b", 1.0))))
+            for arm, beta in family_state.items()
+        ]
+
+    @staticmethod
+    def _draw(posteriors: List[Tuple[str, float, float]]) -> str:
         best_arm = None
         best_sample = -1.0
-        for arm, beta in family_state.items():
-            a = max(1e-6, float(beta.get("a", 1.0)))
-            b = max(1e-6, float(beta.get("b", 1.0)))
+        for arm, a, b in posteriors:
             sample = random.betavariate(a, b)
             if sample > best_sample:
                 best_sample = sample
                 best_arm = arm
         return str(best_arm)
 
+    def _sample_arm(self, family: str) -> str:
+        return self._draw(self._posteriors(family))
+
     def select_policy(self) -> Dict[str, str]:
-        selected = {
-            "approve_threshold": self._sample_arm("approve_threshold"),
-            "scan_min_score": self._sample_arm("scan_min_score"),
-            "focus_policy": self._sample_arm("focus_policy"),
-        }
-        self.state["selected"] = selected
-        self.state["selected_at"] = datetime.now().isoformat()
-        self.storage.save_policy_state(self.state)
-        return selected
+        return self.select_policies(1)[0]
+
+    def select_policies(self, count: int) -> List[Dict[str, str]]:
+        """
+        Batched Thompson sampling: ``count`` independent draws from the
+        current posteriors, for decisions made concurrently. The batch
+        takes the lock once and writes one journal row.
+        """
+        count = max(1, int(count))
+        with self._lock:
+            families = [(family, self._posteriors(family)) for family in self.POLICY_FAMILIES]
+            selections = [
+                {family: self._draw(posteriors) for family, posteriors in families}
+                for _ in range(count)
+            ]
+            selected = selections[-1]
+            self.state["selected"] = selected
+            self.state["selected_at"] = datetime.now().isoformat()
+            self._append({"op": "select", "selected": selected, "count": count, "at": self.state["selected_at"]})
+            self._maybe_checkpoint()
+        return selections
 
     def update(
         self,
@@ -88,28 +271,52 @@ class PolicyBandit:
             update_weight = 1.0
         update_weight = max(0.1, min(4.0, update_weight))
 
-        for family, arm in sanitized_chosen.items():
-            family_state = self.state.get("arms", {}).get(family, {})
+        with self._lock, self._engine.transaction():
+            self._append({
+                "op": "update",
+                "selected": sanitized_chosen,
+                "reward": reward,
+                "weight": update_weight,
+                "discount": self.discount,
+            })
+            self._apply_update(sanitized_chosen, reward, update_weight, self.discount)
+            self._record_history(
+                {
+                    "ts": datetime.now().isoformat(),
+                    "selected": sanitized_chosen,
+                    "verdict": verdict,
+                    "weight": round(update_weight, 4),
+                    "metadata": metadata if isinstance(metadata, dict) else {},
+                }
+            )
+        with self._lock:
+            self._maybe_checkpoint()
+        return self.state
+
+    def _apply_update(self, chosen: Dict[str, str], reward: float, weight: float, discount: float) -> None:
+        arms = self.state.get("arms", {})
+        for family, arm in chosen.items():
+            family_state = arms.get(family, {})
             if arm not in family_state:
                 continue
+            if discount < 1.0:
+                # Fade old evidence toward the (1, 1) prior before adding the new reward.
+                for beta in family_state.values():
+                    beta["a"] = 1.0 + (float(beta.get("a", 1.0)) - 1.0) * discount
+                    beta["b"] = 1.0 + (float(beta.get("b", 1.0)) - 1.0) * discount
             if reward >= 1.0:
-                family_state[arm]["a"] = float(family_state[arm].get("a", 1.0)) + update_weight
+                family_state[arm]["a"] = float(family_state[arm].get("a", 1.0)) + weight
             else:
-                family_state[arm]["b"] = float(family_state[arm].get("b", 1.0)) + update_weight
+                family_state[arm]["b"] = float(family_state[arm].get("b", 1.0)) + weight
 
-        history = self.state.get("history", [])
-        history.append(
-            {
-                "ts": datetime.now().isoformat(),
-                "selected": sanitized_chosen,
-                "verdict": verdict,
-                "weight": round(update_weight, 4),
-                "metadata": metadata if isinstance(metadata, dict) else {},
-            }
-        )
-        self.state["history"] = history[-1000:]
-        self.storage.save_policy_state(self.state)
-        return self.state
+    def _apply_arm_values(self, values: Dict[str, Dict[str, List[float]]]) -> None:
+        arms = self.state.get("arms", {})
+        for family, family_values in values.items():
+            family_state = arms.get(family, {})
+            for arm, (a, b) in family_values.items():
+                if arm in family_state:
+                    family_state[arm]["a"] = float(a)
+                    family_state[arm]["b"] = float(b)
 
     def get_state(self) -> Dict[str, Any]:
         return self.state
@@ -146,6 +353,7 @@ class PolicyBandit:
         families_adjusted = 0
         arms_adjusted = 0
         detail: Dict[str, int] = {}
+        adjusted_values: Dict[str, Dict[str, List[float]]] = {}
         arms_state = self.state.get("arms", {}) if isinstance(self.state.get("arms"), dict) else {}
         for family, family_state in arms_state.items():
             if not isinstance(family_state, dict):
@@ -167,31 +375,33 @@ class PolicyBandit:
                 # Shrink evidence toward weak prior (1,1) while preserving direction.
                 beta["a"] = max(1.0, 1.0 + (a - 1.0) * (1.0 - shrink))
                 beta["b"] = max(1.0, 1.0 + (b - 1.0) * (1.0 - shrink))
+                adjusted_values.setdefault(str(family), {})[str(arm)] = [beta["a"], beta["b"]]
             if family_adjusted > 0:
                 families_adjusted += 1
                 detail[str(family)] = family_adjusted
 
         if arms_adjusted > 0 and not dry_run:
-            history = self.state.get("history", [])
-            history.append(
-                {
-                    "ts": datetime.now().isoformat(),
-                    "selected": self.state.get("selected", {}),
-                    "verdict": "drift_guard",
-                    "weight": 0.0,
-                    "metadata": {
-                        "families_adjusted": families_adjusted,
-                        "arms_adjusted": arms_adjusted,
-                        "detail": detail,
-                        "max_posterior_total": total_cap,
-                        "min_mean": lo,
-                        "max_mean": hi,
-                        "shrink_ratio": shrink,
-                    },
-                }
-            )
-            self.state["history"] = history[-1000:]
-            self.storage.save_policy_state(self.state)
+            with self._lock, self._engine.transaction():
+                self._append({"op": "drift_guard", "arms": adjusted_values})
+                self._record_history(
+                    {
+                        "ts": datetime.now().isoformat(),
+                        "selected": self.state.get("selected", {}),
+                        "verdict": "drift_guard",
+                        "weight": 0.0,
+                        "metadata": {
+                            "families_adjusted": families_adjusted,
+                            "arms_adjusted": arms_adjusted,
+                            "detail": detail,
+                            "max_posterior_total": total_cap,
+                            "min_mean": lo,
+                            "max_mean": hi,
+                            "shrink_ratio": shrink,
+                        },
+                    }
+                )
+            with self._lock:
+                self._maybe_checkpoint()
 
         return {
             "families_adjusted": families_adjusted,
@@ -0,0 +1,342 @@
+"""Time-partitioned retention for the self-learning stores.
+
+Append-only JSONL stores (learning events, outcome evidence) keep a small
+active file that writers append to. The compaction job seals the active
+file into day partitions (``partitions/<store>/YYYY-MM-DD.jsonl``) and then
+applies the category TTL from MemoryGovernor:
+
+* partitions whose whole day is older than the cutoff are unlinked without
+  being read;
+* the single partition that straddles the cutoff is filtered with a
+  streaming pass (one row in memory at a time);
+* newer partitions are not touched.
+
+Routing telemetry is already written as one file per day and gets the same
+treatment. The proposals store is a single JSON document owned by the
+proposal engine, so terminal proposals past their TTL are dropped in place.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .learning_counters import parse_ts
+
+PARTITION_DATE_FORMAT = "%Y-%m-%d"
+TIMESTAMP_FIELDS = ("ts", "timestamp", "created_at")
+TERMINAL_PROPOSAL_STATUSES = {"verified", "rejected", "rolled_back", "failed", "expired", "cancelled"}
+
+
+def row_time(row: Dict[str, Any], fields: Tuple[str, ...] = TIMESTAMP_FIELDS) -> Optional[datetime]:
+    """Naive local datetime of a row, or None when it has no parseable timestamp."""
+    for field in fields:
+        value = row.get(field)
+        if value:
+            dt = parse_ts(value)
+            if dt is not None:
+                if dt.tzinfo is not None:
+                    dt = dt.astimezone().replace(tzinfo=None)
+                return dt
+    return None
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+# ==================== PARTITION LAYOUT ====================
+
+def partition_dir(active_path: Path) -> Path:
+    active_path = Path(active_path)
+    return active_path.parent / "partitions" / active_path.stem
+
+
+def list_partitions(active_path: Path) -> List[Tuple[date, Path]]:
+    """Day partitions of a store, oldest first."""
+    directory = partition_dir(active_path)
+    if not directory.is_dir():
+        return []
+    out: List[Tuple[date, Path]] = []
+    for path in directory.glob("*.jsonl"):
+        try:
+            out.append((datetime.strptime(path.stem, PARTITION_DATE_FORMAT).date(), path))
+        except ValueError:
+            continue
+    out.sort(key=lambda item: item[0])
+    return out
+
+
+def iter_jsonl_rows(path: Path) -> Iterator[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(row, dict):
+                    yield row
+    except OSError:
+        return
+
+
+def iter_store_rows(active_path: Path) -> Iterator[Dict[str, Any]]:
+    """Every row of a partitioned store in write order: sealed partitions, then the active file."""
+    for _day, path in list_partitions(active_path):
+        yield from iter_jsonl_rows(path)
+    if Path(active_path).exists():
+        yield from iter_jsonl_rows(Path(active_path))
+
+
+def seal_active_file(active_path: Path) -> Dict[str, Any]:
+    """Move every row of the active file into its day partition; the active file starts empty.
+
+    The active file is renamed first so concurrent appends land in a fresh
+    file, then the renamed file is streamed into partitions. Rows without a
+    timestamp go to today's partition.
+    """
+    active_path = Path(active_path)
+    stats = {"sealed_rows": 0, "partitions_touched": 0}
+    sealing = active_path.with_name(active_path.name + ".sealing")
+    if not sealing.exists():
+        # A leftover .sealing file is a sealing pass interrupted mid-way; finish that one first.
+        if not active_path.exists() or _file_size(active_path) == 0:
+            return stats
+        os.replace(active_path, sealing)
+    directory = partition_dir(active_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    today = date.today()
+    touched = set()
+    current_day: Optional[date] = None
+    handle = None
+    try:
+        with open(sealing, "r", encoding="utf-8") as src:
+            for line in src:
+                text = line.strip()
+                if not text:
+                    continue
+                try:
+                    row = json.loads(text)
+                except json.JSONDecodeError:
+                    continue
+                dt = row_time(row) if isinstance(row, dict) else None
+                day = dt.date() if dt else today
+                if day != current_day:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(directory / f"{day.strftime(PARTITION_DATE_FORMAT)}.jsonl", "a", encoding="utf-8")
+                    current_day = day
+                    touched.add(day)
+                handle.write(text + "\n")
+                stats["sealed_rows"] += 1
+    finally:
+        if handle is not None:
+            handle.close()
+    sealing.unlink()
+    stats["partitions_touched"] = len(touched)
+    return stats
+
+
+# ==================== PRUNING ====================
+
+def stream_prune_file(path: Path, cutoff: datetime, fields: Tuple[str, ...] = TIMESTAMP_FIELDS) -> Dict[str, int]:
+    """Drop rows older than ``cutoff`` from one JSONL file without loading it.
+
+    Rows without a parseable timestamp are kept, matching
+    MemoryGovernor.prune_by_ttl.
+    """
+    stats = {"rows_kept": 0, "rows_dropped": 0}
+    tmp = _tmp_path(path)
+    with open(path, "r", encoding="utf-8") as src, open(tmp, "w", encoding="utf-8") as dst:
+        for line in src:
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                row = json.loads(text)
+            except json.JSONDecodeError:
+                row = None
+            dt = row_time(row, fields) if isinstance(row, dict) else None
+            if dt is not None and dt < cutoff:
+                stats["rows_dropped"] += 1
+                continue
+            dst.write(text + "\n")
+            stats["rows_kept"] += 1
+    if stats["rows_kept"]:
+        os.replace(tmp, path)
+    else:
+        tmp.unlink()
+        path.unlink()
+    return stats
+
+
+def prune_day_partitions(
+    partitions: List[Tuple[date, Path]],
+    cutoff: datetime,
+    fields: Tuple[str, ...] = TIMESTAMP_FIELDS,
+) -> Dict[str, Any]:
+    """Unlink partitions entirely before ``cutoff`` and stream-prune the one containing it."""
+    stats = {"partitions_deleted": 0, "boundary_pruned": 0, "rows_dropped": 0, "bytes_reclaimed": 0}
+    cutoff_day = cutoff.date()
+    for day, path in partitions:
+        if day < cutoff_day:
+            size = _file_size(path)
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            stats["partitions_deleted"] += 1
+            stats["bytes_reclaimed"] += size
+        elif day == cutoff_day:
+            before = _file_size(path)
+            try:
+                result = stream_prune_file(path, cutoff, fields)
+            except OSError:
+                continue
+            stats["boundary_pruned"] += 1
+            stats["rows_dropped"] += result["rows_dropped"]
+            stats["bytes_reclaimed"] += before - _file_size(path)
+    return stats
+
+
+# ==================== ENGINE ====================
+
+class RetentionEngine:
+    """One compaction pass over the learning events, proposals, evidence and routing telemetry stores."""
+
+    def __init__(self, storage=None, governor=None, routing_dir: Optional[Path] = None):
+        self._storage = storage
+        self._governor = governor
+        self.routing_dir = Path(routing_dir) if routing_dir else None
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from .storage_v2 import get_storage_v2
+            self._storage = get_storage_v2()
+        return self._storage
+
+    @property
+    def governor(self):
+        if self._governor is None:
+            from .memory_governor import get_memory_governor
+            self._governor = get_memory_governor()
+        return self._governor
+
+    def cutoff(self, category: str, now: datetime) -> datetime:
+        return self.governor.retention_cutoff(category, now)
+
+    def _compact_jsonl_store(self, active_path: Path, category: str, now: datetime) -> Dict[str, Any]:
+        storage = self.storage
+        with storage._lock:
+            sealed = seal_active_file(active_path)
+            result = prune_day_partitions(list_partitions(active_path), self.cutoff(category, now))
+        result.update(sealed)
+        return result
+
+    def _compact_proposals(self, now: datetime) -> Dict[str, Any]:
+        storage = self.storage
+        cutoff = self.cutoff("proposal", now)
+        with storage._lock:
+            before = _file_size(storage.proposals_v2_file)
+            data = storage.get_proposals_v2()
+            proposals = data.get("proposals") if isinstance(data.get("proposals"), list) else []
+            kept = []
+            for row in proposals:
+                if not isinstance(row, dict):
+                    continue
+                status = str(row.get("status", "")).strip().lower()
+                dt = row_time(row, ("updated_at", "created_at", "ts"))
+                if status in TERMINAL_PROPOSAL_STATUSES and dt is not None and dt < cutoff:
+                    continue
+                kept.append(row)
+            dropped = len(proposals) - len(kept)
+            if dropped:
+                data["proposals"] = kept
+                storage.save_proposals_v2(data)
+            after = _file_size(storage.proposals_v2_file)
+        return {"rows_dropped": dropped, "bytes_reclaimed": max(0, before - after)}
+
+    def _routing_partitions(self) -> List[Tuple[date, Path]]:
+        if self.routing_dir is not None:
+            directory = self.routing_dir
+        else:
+            directory = Path(os.getenv("ROUTER_STATE_DIR", "data/state"))
+        if not directory.is_dir():
+            return []
+        out = []
+        for path in directory.glob("routing_events_*.jsonl"):
+            try:
+                out.append((datetime.strptime(path.stem[len("routing_events_"):], "%Y%m%d").date(), path))
+            except ValueError:
+                continue
+        out.sort(key=lambda item: item[0])
+        return out
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        now = now or datetime.now()
+        storage = self.storage
+        stores: Dict[str, Dict[str, Any]] = {}
+        errors: List[Dict[str, str]] = []
+
+        jobs = [
+            ("learning_events", lambda: self._compact_jsonl_store(storage.learning_events_file, "learning_event", now)),
+            ("proposals", lambda: self._compact_proposals(now)),
+            ("evidence", lambda: self._compact_jsonl_store(storage.outcome_evidence_file, "evidence", now)),
+            ("routing_telemetry", lambda: prune_day_partitions(
+                self._routing_partitions(), self.cutoff("routing_telemetry", now), ("timestamp", "ts"),
+            )),
+        ]
+        for name, job in jobs:
+            job_started = time.perf_counter()
+            try:
+                stores[name] = job()
+            except Exception as e:
+                errors.append({"store": name, "error": str(e)})
+                stores[name] = {"rows_dropped": 0, "bytes_reclaimed": 0}
+            stores[name]["duration_ms"] = round((time.perf_counter() - job_started) * 1000, 2)
+
+        # Funnel counters are derived from these stores; bring them back in line.
+        counters_dropped = sum(
+            int(stores[name].get("rows_dropped", 0)) + int(stores[name].get("partitions_deleted", 0))
+            for name in ("learning_events", "proposals", "evidence")
+        )
+        if counters_dropped:
+            try:
+                storage.reconcile_counters(apply=True, max_drift_rows=0)
+            except Exception as e:
+                errors.append({"store": "counters", "error": str(e)})
+
+        return {
+            "ok": not errors,
+            "ran_at": now.isoformat(),
+            "bytes_reclaimed": sum(int(s.get("bytes_reclaimed", 0)) for s in stores.values()),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "stores": stores,
+            "errors": errors,
+        }
+
+
+_engine: Optional[RetentionEngine] = None
+
+
+def get_retention_engine() -> RetentionEngine:
+    global _engine
+    if _engine is None:
+        _engine = RetentionEngine()
+    return _engine
@@ -1,11 +1,240 @@
 """File storage helpers for self-learning v2."""
 
+import atexit
 import json
 import os
 import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only (macOS/Linux)
+except ImportError:  # pragma: no cover - fallback for non-POSIX runtime (e.g., Windows)
+    fcntl = None
+
+from .learning_counters import (
+    VERDICTS,
+    LearningCounterStore,
+    event_stream,
+    parse_ts,
+    proposal_metrics,
+)
+from .retention import iter_store_rows, list_partitions
+
+
+def read_tail_lines(path: Path, limit: int = 100, chunk_size: int = 64 * 1024) -> List[str]:
+    """Return the last ``limit`` non-empty lines of ``path`` by seeking backwards.
+
+    Cost is proportional to the bytes in the returned lines, not the file size.
+    """
+    limit = max(1, int(limit))
+    chunk_size = max(1024, int(chunk_size))
+    found: List[bytes] = []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        carry = b""
+        while pos > 0 and len(found) < limit:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            parts = (f.read(step) + carry).split(b"\n")
+            # The first piece may be the tail of an earlier line; keep it for the next chunk.
+            carry = parts[0]
+            for part in reversed(parts[1:]):
+                if part.strip():
+                    found.append(part)
+                    if len(found) >= limit:
+                        break
+        if pos == 0 and len(found) < limit and carry.strip():
+            found.append(carry)
+    return [line.decode("utf-8", errors="replace").strip() for line in reversed(found)]
+
+
+class ExperimentRunLog:
+    """Append-only JSONL log of experiment runs with an in-memory id -> offset index.
+
+    Every add or update appends the full row; the newest row for an id wins.
+    Superseded rows are dropped by an occasional compaction rewrite.
+    """
+
+    def __init__(self, path: Path, max_runs: int = 3000, lock: Optional[threading.RLock] = None):
+        self.path = Path(path)
+        self.max_runs = max(1, int(max_runs))
+        self._lock = lock or threading.RLock()
+        self._offsets: Dict[str, int] = {}
+        self._order: List[str] = []
+        self._rows_in_file = 0
+        self._end = 0
+        self._torn_tail = False
+        self._inode: Optional[int] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        offsets: Dict[str, int] = {}
+        order: List[str] = []
+        rows = 0
+        torn = False
+        with open(self.path, "rb") as f:
+            while True:
+                offset = f.tell()
+                raw = f.readline()
+                if not raw:
+                    break
+                if not raw.endswith(b"\n"):
+                    # Torn trailing write; ignore it and let the next append start on a fresh line.
+                    torn = True
+                    break
+                try:
+                    row = json.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                run_id = str(row.get("id") or "") if isinstance(row, dict) else ""
+                if not run_id:
+                    continue
+                rows += 1
+                if run_id not in offsets:
+                    order.append(run_id)
+                offsets[run_id] = offset
+            self._end = f.tell()
+        if len(order) > self.max_runs:
+            for run_id in order[: len(order) - self.max_runs]:
+                offsets.pop(run_id, None)
+            order = order[-self.max_runs :]
+        self._offsets = offsets
+        self._order = order
+        self._rows_in_file = rows
+        self._torn_tail = torn
+        self._inode = self._stat_inode()
+
+    def _stat_inode(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_ino
+        except OSError:
+            return None
+
+    def _sync_with_disk(self) -> None:
+        """Reload the index if another process appended to or compacted the log."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self.path.touch(exist_ok=True)
+            self._rebuild_index()
+            return
+        if st.st_ino != self._inode or st.st_size != self._end:
+            self._rebuild_index()
+
+    def _read_at(self, offset: int) -> Optional[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            raw = f.readline()
+        try:
+            row = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return row if isinstance(row, dict) else None
+
+    def _append(self, row: Dict[str, Any]) -> int:
+        line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            if self._torn_tail:
+                f.write(b"\n")
+                self._torn_tail = False
+            offset = f.tell()
+            f.write(line)
+        self._end = offset + len(line)
+        self._rows_in_file += 1
+        return offset
+
+    def add(self, run: Dict[str, Any]) -> bool:
+        run_id = str(run.get("id") or "")
+        if not run_id:
+            return False
+        with self._lock:
+            self._sync_with_disk()
+            offset = self._append(run)
+            if run_id not in self._offsets:
+                self._order.append(run_id)
+            self._offsets[run_id] = offset
+            if len(self._order) > self.max_runs:
+                for old_id in self._order[: len(self._order) - self.max_runs]:
+                    self._offsets.pop(old_id, None)
+                self._order = self._order[-self.max_runs :]
+            self._maybe_compact()
+        return True
+
+    def update(self, run_id: str, updates: Dict[str, Any]) -> bool:
+        run_id = str(run_id or "")
+        with self._lock:
+            self._sync_with_disk()
+            offset = self._offsets.get(run_id)
+            if offset is None:
+                return False
+            row = self._read_at(offset)
+            if row is None:
+                return False
+            row.update(updates)
+            row["id"] = run_id
+            self._offsets[run_id] = self._append(row)
+            self._maybe_compact()
+        return True
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._sync_with_disk()
+            offset = self._offsets.get(str(run_id or ""))
+            return self._read_at(offset) if offset is not None else None
+
+    def recent(self, limit: int = 200) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._sync_with_disk()
+            ids = self._order[-max(1, int(limit)) :]
+            offsets = [self._offsets[run_id] for run_id in ids]
+            out: List[Dict[str, Any]] = []
+            with open(self.path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    try:
+                        row = json.loads(f.readline())
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if isinstance(row, dict):
+                        out.append(row)
+            return out
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _maybe_compact(self) -> None:
+        live = len(self._order)
+        if self._rows_in_file > max(2 * live, live + 1000):
+            self.compact()
+
+    def compact(self) -> int:
+        """Rewrite the log keeping only the newest row of each live run."""
+        with self._lock:
+            rows = self.recent(limit=self.max_runs)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+            dropped = self._rows_in_file - len(rows)
+            self._rebuild_index()
+            return max(0, dropped)
+
+    def import_rows(self, runs: List[Dict[str, Any]]) -> int:
+        imported = 0
+        with self._lock:
+            for run in runs[-self.max_runs :]:
+                if isinstance(run, dict) and self.add(run):
+                    imported += 1
+        return imported
 
 
 class LearningStorageV2:
@@ -40,19 +269,25 @@ class LearningStorageV2:
 
         self.learning_events_file = self.memory_path / "learning_events.jsonl"
         self.proposals_v2_file = self.memory_path / "improvement_proposals_v2.json"
-        self.experiment_runs_file = self.experiments_path / "experiment_runs_v2.json"
+        self.experiment_runs_legacy_file = self.experiments_path / "experiment_runs_v2.json"
+        self.experiment_runs_file = self.experiments_path / "experiment_runs_v2.jsonl"
         self.outcome_evidence_file = self.memory_path / "outcome_evidence.jsonl"
         self.policy_state_file = self.state_path / "learning_policy_state.json"
+        self.counters_file = self.state_path / "learning_counters.json"
 
         self._lock = threading.RLock()
         self._init_files()
+        self.experiment_runs = ExperimentRunLog(self.experiment_runs_file, max_runs=3000, lock=self._lock)
+        self.migrate_experiment_runs()
+        self.counters = LearningCounterStore(self.counters_file)
+        atexit.register(self.counters.flush)
+        if not self.counters.loaded:
+            self.reconcile_counters(apply=True)
         self._initialized = True
 
     def _init_files(self) -> None:
         if not self.proposals_v2_file.exists():
             self._save_json(self.proposals_v2_file, {"proposals": [], "pending": [], "updated_at": datetime.now().isoformat()})
-        if not self.experiment_runs_file.exists():
-            self._save_json(self.experiment_runs_file, {"runs": [], "updated_at": datetime.now().isoformat()})
         if not self.policy_state_file.exists():
             self._save_json(self.policy_state_file, {})
 
@@ -89,14 +324,17 @@ class LearningStorageV2:
             return False
 
     def tail_jsonl(self, path: Path, limit: int = 100) -> List[Dict[str, Any]]:
-        if not path.exists():
-            return []
+        """Last ``limit`` rows, reaching back into sealed day partitions when the active file is short."""
         try:
             with self._lock:
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = [x.strip() for x in f.readlines() if x.strip()]
+                lines = read_tail_lines(path, limit=limit) if path.exists() else []
+                if len(lines) < limit:
+                    for _day, part in reversed(list_partitions(path)):
+                        lines = read_tail_lines(part, limit=limit - len(lines)) + lines
+                        if len(lines) >= limit:
+                            break
             out: List[Dict[str, Any]] = []
-            for line in lines[-max(1, limit) :]:
+            for line in lines:
                 try:
                     out.append(json.loads(line))
                 except json.JSONDecodeError:
@@ -123,7 +361,7 @@ class LearningStorageV2:
         prefixes = ("test_", "unit_", "manual_", "debug_", "demo_")
         return any(src.startswith(p) for p in prefixes)
 
-    def record_learning_event(self, event: Dict[str, Any]) -> str:
+    def _prepare_learning_event(self, event: Dict[str, Any], score: bool = True) -> Dict[str, Any]:
         event_id = str(event.get("id") or f"evt_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
         payload = dict(event)
         payload["id"] = event_id
@@ -134,14 +372,42 @@ class LearningStorageV2:
             stream = "non_production" if self._is_non_production_source(source) else "production"
         payload["stream"] = stream
         payload["is_non_production"] = bool(stream == "non_production")
-        if "cafe" not in payload:
+        if score and "cafe" not in payload:
             try:
                 from .cafe_loop import get_cafe_scorer
                 payload["cafe"] = get_cafe_scorer().score_event(payload)
             except Exception:
                 pass
-        self.append_jsonl(self.learning_events_file, payload)
-        return event_id
+        return payload
+
+    def record_learning_event(self, event: Dict[str, Any]) -> str:
+        payload = self._prepare_learning_event(event)
+        if self.append_jsonl(self.learning_events_file, payload):
+            self.counters.incr(f"events.{payload['stream']}", payload.get("ts"))
+        return payload["id"]
+
+    def record_learning_events(self, events: List[Dict[str, Any]]) -> List[str]:
+        """Record several events with one append to the events log."""
+        payloads = [self._prepare_learning_event(event, score=False) for event in events]
+        if not payloads:
+            return []
+        unscored = [p for p in payloads if "cafe" not in p]
+        if unscored:
+            try:
+                from .cafe_loop import get_cafe_scorer
+                for payload, cafe in zip(unscored, get_cafe_scorer().score_events(unscored)):
+                    payload["cafe"] = cafe
+            except Exception:
+                pass
+        try:
+            with self._lock:
+                with open(self.learning_events_file, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(p, ensure_ascii=False) + "\n" for p in payloads))
+        except Exception:
+            return [p["id"] for p in payloads]
+        for payload in payloads:
+            self.counters.incr(f"events.{payload['stream']}", payload.get("ts"))
+        return [p["id"] for p in payloads]
 
     def list_learning_events(self, limit: int = 100) -> List[Dict[str, Any]]:
         return self.tail_jsonl(self.learning_events_file, limit=limit)
@@ -149,48 +415,192 @@ class LearningStorageV2:
     def get_proposals_v2(self) -> Dict[str, Any]:
         return self._load_json(self.proposals_v2_file, {"proposals": [], "pending": []})
 
+    @contextmanager
+    def _file_lock(self, path: Path) -> Iterator[None]:
+        """Serialize read-modify-replace of ``path`` across processes."""
+        if fcntl is None:
+            yield
+            return
+        lock_path = path.with_name(path.name + ".lock")
+        with open(lock_path, "a", encoding="utf-8") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
     def save_proposals_v2(self, data: Dict[str, Any]) -> bool:
         data = dict(data)
         data["updated_at"] = datetime.now().isoformat()
-        return self._save_json(self.proposals_v2_file, data)
+        with self._lock, self._file_lock(self.proposals_v2_file):
+            # Diff against the file as it is now, not as this process last saw it:
+            # other instances (or processes) may have saved in between.
+            old = self._proposal_stage_index(self.get_proposals_v2().get("proposals"))
+            saved = self._save_json(self.proposals_v2_file, data)
+            if saved:
+                self._count_proposal_changes(old, data.get("proposals"))
+        return saved
+
+    @staticmethod
+    def _proposal_stage_index(rows: Any) -> Dict[str, Tuple[Any, str]]:
+        index: Dict[str, Tuple[Any, str]] = {}
+        for row in rows if isinstance(rows, list) else []:
+            if isinstance(row, dict) and row.get("id"):
+                status = str(row.get("status", "unknown")).strip().lower() or "unknown"
+                index[str(row.get("id"))] = (row.get("created_at"), status)
+        return index
+
+    def _count_proposal(self, created_at: Any, status: str, sign: int, counters: LearningCounterStore) -> None:
+        counters.incr_total("proposals.total", sign)
+        counters.incr_total(f"status.{status}", sign)
+        if parse_ts(created_at) is None:
+            return
+        for metric in proposal_metrics(status):
+            counters.incr(metric, created_at, sign)
+
+    def _count_proposal_changes(self, old: Dict[str, Tuple[Any, str]], rows: Any) -> None:
+        """Move changed proposals between funnel stages in their creation bucket."""
+        new = self._proposal_stage_index(rows)
+        for proposal_id in set(old) | set(new):
+            before, after = old.get(proposal_id), new.get(proposal_id)
+            if before == after:
+                continue
+            if before is not None:
+                self._count_proposal(before[0], before[1], -1, self.counters)
+            if after is not None:
+                self._count_proposal(after[0], after[1], 1, self.counters)
+
+    def migrate_experiment_runs(self) -> Dict[str, Any]:
+        """Import runs from the legacy whole-file JSON store into the append-only log."""
+        legacy = self.experiment_runs_legacy_file
+        if not legacy.exists():
+            return {"ok": True, "migrated": 0, "reason": "legacy_not_found"}
+        with self._lock:
+            data = self._load_json(legacy, {"runs": []})
+            runs = data.get("runs", []) if isinstance(data.get("runs"), list) else []
+            migrated = self.experiment_runs.import_rows(runs) if len(self.experiment_runs) == 0 else 0
+            try:
+                os.replace(legacy, legacy.with_name(f"{legacy.name}.migrated"))
+            except OSError:
+                return {"ok": False, "migrated": migrated, "reason": "rename_failed"}
+        return {"ok": True, "migrated": migrated}
 
     def add_experiment_run(self, run: Dict[str, Any]) -> bool:
-        data = self._load_json(self.experiment_runs_file, {"runs": []})
-        runs = data.get("runs", []) if isinstance(data.get("runs"), list) else []
-        runs.append(run)
-        data["runs"] = runs[-3000:]
-        data["updated_at"] = datetime.now().isoformat()
-        return self._save_json(self.experiment_runs_file, data)
+        try:
+            return self.experiment_runs.add(run)
+        except Exception:
+            return False
 
     def update_experiment_run(self, run_id: str, updates: Dict[str, Any]) -> bool:
-        data = self._load_json(self.experiment_runs_file, {"runs": []})
-        runs = data.get("runs", []) if isinstance(data.get("runs"), list) else []
-        changed = False
-        for run in runs:
-            if run.get("id") == run_id:
-                run.update(updates)
-                changed = True
-                break
-        data["runs"] = runs
-        data["updated_at"] = datetime.now().isoformat()
-        return self._save_json(self.experiment_runs_file, data) if changed else False
+        try:
+            return self.experiment_runs.update(run_id, updates)
+        except Exception:
+            return False
+
+    def get_experiment_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.experiment_runs.get(run_id)
+        except Exception:
+            return None
 
     def get_experiment_runs(self, limit: int = 200) -> List[Dict[str, Any]]:
-        data = self._load_json(self.experiment_runs_file, {"runs": []})
-        runs = data.get("runs", []) if isinstance(data.get("runs"), list) else []
-        return runs[-max(1, limit) :]
+        try:
+            return self.experiment_runs.recent(limit=limit)
+        except Exception:
+            return []
 
     def record_outcome_evidence(self, evidence: Dict[str, Any]) -> str:
         evidence_id = str(evidence.get("id") or f"evd_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
         payload = dict(evidence)
         payload["id"] = evidence_id
         payload.setdefault("ts", datetime.now().isoformat())
-        self.append_jsonl(self.outcome_evidence_file, payload)
+        if self.append_jsonl(self.outcome_evidence_file, payload):
+            verdict = str(payload.get("verdict", "")).strip().lower()
+            if verdict in VERDICTS and not bool(payload.get("holdout_pending", False)):
+                self.counters.incr(f"evidence.{verdict}", payload.get("ts"))
         return evidence_id
 
     def list_outcome_evidence(self, limit: int = 100) -> List[Dict[str, Any]]:
         return self.tail_jsonl(self.outcome_evidence_file, limit=limit)
 
+    def _iter_jsonl(self, path: Path):
+        yield from iter_store_rows(path)
+
+    def rebuild_counters(self) -> Tuple[LearningCounterStore, Dict[str, Tuple[Any, str]], int]:
+        """Recount every funnel counter from the raw stores (a full scan)."""
+        fresh = LearningCounterStore(
+            None,
+            hour_retention_hours=self.counters.hour_retention_hours,
+            day_retention_days=self.counters.day_retention_days,
+        )
+        rows = 0
+        for event in self._iter_jsonl(self.learning_events_file):
+            fresh.incr(f"events.{event_stream(event)}", event.get("ts"))
+            rows += 1
+        for evidence in self._iter_jsonl(self.outcome_evidence_file):
+            verdict = str(evidence.get("verdict", "")).strip().lower()
+            if verdict in VERDICTS and not bool(evidence.get("holdout_pending", False)):
+                fresh.incr(f"evidence.{verdict}", evidence.get("ts"))
+            rows += 1
+        stages = self._proposal_stage_index(self.get_proposals_v2().get("proposals"))
+        for created_at, status in stages.values():
+            self._count_proposal(created_at, status, 1, fresh)
+        rows += len(stages)
+        return fresh, stages, rows
+
+    def reconcile_counters(self, apply: bool = True, max_drift_rows: int = 50) -> Dict[str, Any]:
+        """Rebuild counters from raw data, report drift against the live counters, optionally fix it."""
+        started = time.perf_counter()
+        with self._lock:
+            fresh, _, rows = self.rebuild_counters()
+            drift = self.counters.diff(fresh)
+            if apply:
+                self.counters.replace(fresh)
+                self.counters.last_reconciled_at = datetime.now().isoformat()
+                self.counters.flush()
+        return {
+            "ok": True,
+            "applied": bool(apply),
+            "rows_scanned": rows,
+            "drift_count": len(drift),
+            "drift": drift[: max(0, int(max_drift_rows))],
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def get_funnel_window(self, hours: float) -> Dict[str, Any]:
+        """Events -> proposals -> approved -> executed -> verified -> wins over the last ``hours``."""
+        counts = self.counters.window(float(hours) * 3600)
+
+        def _ratio(num: int, den: int) -> float:
+            return round(float(num) / float(den), 4) if den > 0 else 0.0
+
+        created = int(counts.get("proposals.created", 0))
+        approved = int(counts.get("proposals.approved", 0))
+        executed = int(counts.get("proposals.executed", 0))
+        verified = int(counts.get("proposals.verified", 0))
+        return {
+            "events": {
+                "production": int(counts.get("events.production", 0)),
+                "non_production": int(counts.get("events.non_production", 0)),
+            },
+            "created": created,
+            "approved": approved,
+            "executed": executed,
+            "verified": verified,
+            "verdicts": {v: int(counts.get(f"evidence.{v}", 0)) for v in VERDICTS},
+            "approval_rate": _ratio(approved, created),
+            "execution_rate": _ratio(executed, approved),
+            "verification_rate": _ratio(verified, executed),
+            "verified_from_created_rate": _ratio(verified, created),
+        }
+
+    def get_proposal_status_counts(self) -> Dict[str, int]:
+        totals = self.counters.snapshot().get("totals", {})
+        return {k[len("status."):]: int(v) for k, v in totals.items() if k.startswith("status.") and int(v)}
+
+    def get_proposal_total(self) -> int:
+        return self.counters.total("proposals.total")
+
     def get_policy_state(self) -> Dict[str, Any]:
         return self._load_json(self.policy_state_file, {})
 
@@ -214,5 +624,9 @@ def record_learning_event(event: Dict[str, Any]) -> str:
     return get_storage_v2().record_learning_event(event)
 
 
+def record_learning_events(events: List[Dict[str, Any]]) -> List[str]:
+    return get_storage_v2().record_learning_events(events)
+
+
 def list_learning_events(limit: int = 100) -> List[Dict[str, Any]]:
     return get_storage_v2().list_learning_events(limit)
@@ -1,16 +1,45 @@
 """
 Team persona memory and lightweight self-learning for collaborator-specific behavior adaptation.
+
+Persistence:
+- Persona state lives in memory. Changed members are written behind as
+  delta rows to the state engine journal ``team_personas.deltas``
+  (core.state_engine, ``state.db`` next to the snapshot; a legacy
+  ``team_personas.deltas.jsonl`` is imported on load), coalesced per
+  member and committed together. A
+  background thread flushes pending deltas after TEAM_PERSONA_FLUSH_INTERVAL
+  seconds even if no further write arrives; it exits once nothing is
+  pending. The full snapshot (``team_personas.json``) is only rewritten
+  when the delta log is compacted.
+- Interaction events go to the shared events JSONL and to per-member
+  segments with an offset index (see persona_segments), so a member's
+  history reads cost O(limit).
+- Per-member feature aggregates (signal ratios, average length) and the
+  adaptation profile are updated when a member changes. recommend_adaptation
+  only reads them.
+
+Environment variables:
+    TEAM_PERSONA_FLUSH_EVERY     – pending member deltas before a flush (default: 32)
+    TEAM_PERSONA_FLUSH_INTERVAL  – max seconds a delta stays unflushed (default: 2)
+    TEAM_PERSONA_COMPACT_EVERY   – delta rows before the snapshot is rewritten (default: 5000)
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import re
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from core.state_engine import journal_for
+
+from .persona_segments import MemberSegmentLog, iter_lines_reverse
+
 _STORE_LOCK = threading.RLock()
 _STORE_SINGLETON: Optional["TeamPersonaStore"] = None
 
@@ -156,18 +185,30 @@ def _signal_from_text(message: str, intent: str = "") -> Dict[str, bool]:
     }
 
 
-def _derive_style(member: Dict[str, Any]) -> Dict[str, str]:
+def _member_features(member: Dict[str, Any]) -> Dict[str, float]:
+    """Signal ratios and average message length from the member's running counters."""
     learning = _safe_dict(member.get("learning"))
     signals = _safe_dict(member.get("signals"))
     interactions = max(1, int(learning.get("interaction_count") or 0))
-    avg_len = float(learning.get("avg_message_length") or 0.0)
+    features = {
+        f"{name}_ratio": float(signals.get(name, 0) or 0) / interactions
+        for name in ("direct", "collaborative", "urgent", "detailed", "autonomy", "safety")
+    }
+    features["avg_message_length"] = float(learning.get("avg_message_length") or 0.0)
+    features["interaction_count"] = float(learning.get("interaction_count") or 0)
+    return features
 
-    direct_ratio = float(signals.get("direct", 0) or 0) / interactions
-    collaborative_ratio = float(signals.get("collaborative", 0) or 0) / interactions
-    urgent_ratio = float(signals.get("urgent", 0) or 0) / interactions
-    detail_ratio = float(signals.get("detailed", 0) or 0) / interactions
-    autonomy_ratio = float(signals.get("autonomy", 0) or 0) / interactions
-    safety_ratio = float(signals.get("safety", 0) or 0) / interactions
+
+def _derive_style(member: Dict[str, Any], features: Optional[Dict[str, float]] = None) -> Dict[str, str]:
+    features = features if features is not None else _member_features(member)
+    avg_len = features["avg_message_length"]
+
+    direct_ratio = features["direct_ratio"]
+    collaborative_ratio = features["collaborative_ratio"]
+    urgent_ratio = features["urgent_ratio"]
+    detail_ratio = features["detailed_ratio"]
+    autonomy_ratio = features["autonomy_ratio"]
+    safety_ratio = features["safety_ratio"]
 
     tone = "balanced"
     if direct_ratio >= 0.45 and direct_ratio >= collaborative_ratio:
@@ -206,12 +247,63 @@ def _derive_style(member: Dict[str, Any]) -> Dict[str, str]:
     }
 
 
+def _adaptation_profile(member: Dict[str, Any]) -> Dict[str, Any]:
+    style = _safe_dict(member.get("derived_style"))
+    persona = _safe_dict(member.get("persona"))
+    work_style = _safe_dict(member.get("work_style"))
+    tone = str(persona.get("tone", style.get("tone", "balanced")))
+    detail = str(persona.get("detail_level", style.get("detail_level", "balanced")))
+    autonomy = str(work_style.get("autonomy_preference", style.get("autonomy_preference", "balanced")))
+    risk = str(persona.get("risk_posture", style.get("risk_posture", "balanced")))
+    pace = str(persona.get("pace", style.get("pace", "balanced")))
+    response_structure = str(
+        _safe_dict(member.get("preferences")).get("response_structure", "bullets")
+    ) or "bullets"
+
+    autonomy_mode = "balanced"
+    if autonomy == "high" and risk in {"balanced", "aggressive"}:
+        autonomy_mode = "full_auto"
+    elif autonomy == "guarded" or risk == "careful":
+        autonomy_mode = "safe"
+
+    return {
+        "communication": {
+            "tone": tone,
+            "detail_level": detail,
+            "pace": pace,
+            "response_structure": response_structure,
+        },
+        "orchestration": {
+            "autonomy_mode": autonomy_mode,
+            "risk_policy": risk,
+            "escalate_when": "high_or_critical" if autonomy_mode == "safe" else "critical_only",
+        },
+        "hints": [
+            f"Tone={tone}, detail={detail}, pace={pace}.",
+            f"Autonomy={autonomy_mode}, risk_policy={risk}.",
+        ],
+    }
+
+
 class TeamPersonaStore:
     def __init__(self, state_path: Optional[Path] = None, events_path: Optional[Path] = None):
         self.state_path = Path(state_path) if state_path else _default_state_path()
         self.events_path = Path(events_path) if events_path else _default_events_path()
+        self.deltas_path = self.state_path.with_name(f"{self.state_path.stem}.deltas.jsonl")
+        self._deltas = journal_for(self.deltas_path)
+        self.flush_every = max(1, int(os.getenv("TEAM_PERSONA_FLUSH_EVERY", "32")))
+        self.flush_interval_sec = max(0.0, float(os.getenv("TEAM_PERSONA_FLUSH_INTERVAL", "2")))
+        self.compact_every = max(1, int(os.getenv("TEAM_PERSONA_COMPACT_EVERY", "5000")))
         self._lock = threading.RLock()
+        self._dirty: Dict[str, bool] = {}
+        self._delta_rows = 0
+        self._last_flush = time.monotonic()
+        self._flusher: Optional[threading.Thread] = None
+        # member_id -> {"features": ..., "profile": ...}, refreshed whenever the member changes
+        self._aggregates: Dict[str, Dict[str, Any]] = {}
+        self._segments = MemberSegmentLog(self.events_path, key=normalize_member_id)
         self._state = self._load_state()
+        atexit.register(self.flush)
 
     def _default_state(self) -> Dict[str, Any]:
         return {
@@ -244,21 +336,22 @@ class TeamPersonaStore:
         return normalized
 
     def _load_state(self) -> Dict[str, Any]:
-        if not self.state_path.exists():
-            state = self._default_state()
-            self._save_state(state)
-            return state
-        try:
-            with open(self.state_path, "r", encoding="utf-8") as handle:
-                raw = json.load(handle)
-            if not isinstance(raw, dict):
-                raise ValueError("invalid team persona state")
-        except Exception:
-            state = self._default_state()
-            self._save_state(state)
-            return state
+        raw: Dict[str, Any] = {}
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as handle:
+                    raw = json.load(handle)
+                if not isinstance(raw, dict):
+                    raise ValueError("invalid team persona state")
+            except Exception:
+                raw = {}
+        if not raw:
+            raw = self._default_state()
+            self._save_state(raw)
 
         members = raw.get("members") if isinstance(raw.get("members"), dict) else {}
+        members = dict(members)
+        members.update(self._read_deltas())
         normalized_members: Dict[str, Dict[str, Any]] = {}
         for raw_member_id, payload in members.items():
             member_id = normalize_member_id(raw_member_id)
@@ -271,24 +364,93 @@ class TeamPersonaStore:
             "members": normalized_members,
         }
 
+    def _read_deltas(self) -> Dict[str, Dict[str, Any]]:
+        """Latest delta row per member; later rows win."""
+        latest: Dict[str, Dict[str, Any]] = {}
+        self._deltas.import_jsonl_once(self.deltas_path)
+        rows = self._deltas.rows()
+        for item in rows:
+            if isinstance(item, dict) and isinstance(item.get("member"), dict):
+                latest[str(item.get("member_id") or "")] = item["member"]
+        self._delta_rows = len(rows)
+        latest.pop("", None)
+        return latest
+
     def _save_state(self, state: Dict[str, Any]) -> None:
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.state_path.with_name(f"{self.state_path.name}.{threading.get_ident()}.tmp")
+        tmp = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
         with open(tmp, "w", encoding="utf-8") as handle:
-            json.dump(state, handle, indent=2, ensure_ascii=False)
+            json.dump(state, handle, ensure_ascii=False, separators=(",", ":"))
         tmp.replace(self.state_path)
 
     def _append_event(self, row: Dict[str, Any]) -> None:
+        line = (json.dumps(row, ensure_ascii=True) + "\n").encode("utf-8")
         try:
-            self.events_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.events_path, "a", encoding="utf-8") as handle:
-                handle.write(json.dumps(row, ensure_ascii=True) + "\n")
+            # The segment lock is held across both appends, so writers in other
+            # processes cannot interleave rows between the log and the segments.
+            with self._lock, self._segments.locked():
+                self._segments.catch_up()
+                self.events_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.events_path, "ab") as handle:
+                    offset = handle.seek(0, os.SEEK_END)
+                    handle.write(line)
+                self._segments.append(row.get("member_id"), line, offset)
         except Exception:
             return
 
-    def _commit(self) -> None:
+    def _refresh_aggregates(self, member_id: str, member: Dict[str, Any], features: Optional[Dict[str, float]] = None) -> None:
+        self._aggregates[member_id] = {
+            "features": features if features is not None else _member_features(member),
+            "profile": _adaptation_profile(member),
+        }
+
+    def _commit(self, member_id: str) -> None:
+        """Queue a member delta; the write happens in flush() (write-behind)."""
         self._state["updated_at"] = _now_iso()
-        self._save_state(self._state)
+        self._dirty[member_id] = True
+        if len(self._dirty) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval_sec:
+            self.flush()
+        elif self._flusher is None and self.flush_interval_sec > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="team-persona-flush")
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """Flush deltas that no later write would push out; exit when idle."""
+        while True:
+            time.sleep(self.flush_interval_sec)
+            with self._lock:
+                if not self._dirty:
+                    self._flusher = None
+                    return
+                self.flush()
+
+    def flush(self) -> None:
+        """Append pending member deltas; compact into a full snapshot when the delta log grows."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self._dirty:
+                members = self._state.get("members", {})
+                rows = []
+                for member_id in self._dirty:
+                    row = members.get(member_id)
+                    if isinstance(row, dict):
+                        rows.append({"member_id": member_id, "member": row})
+                self._dirty = {}
+                self._delta_rows += self._deltas.append_many(rows)
+            if self._delta_rows >= self.compact_every:
+                self.compact()
+            if self._segments.indexed_offset:
+                try:
+                    self._segments.save_meta()
+                except OSError:
+                    pass
+
+    def compact(self) -> None:
+        """Rewrite the full snapshot and start a fresh delta log."""
+        with self._lock:
+            self._save_state(self._state)
+            self._deltas.clear()
+            self._delta_rows = 0
 
     def list_members(self, limit: int = 120) -> List[Dict[str, Any]]:
         cap = max(1, min(500, int(limit)))
@@ -340,7 +502,8 @@ class TeamPersonaStore:
 
             current["updated_at"] = _now_iso()
             members[key] = self._normalize_member(key, current)
-            self._commit()
+            self._refresh_aggregates(key, members[key])
+            self._commit(key)
             row = _json_copy(members[key])
 
         self._append_event(
@@ -377,8 +540,9 @@ class TeamPersonaStore:
 
         with self._lock:
             members = self._state.setdefault("members", {})
-            current = members.get(key) if isinstance(members.get(key), dict) else _default_member(key)
-            current = self._normalize_member(key, current)
+            current = members.get(key)
+            if not isinstance(current, dict):
+                current = self._normalize_member(key, _default_member(key))
 
             signals = _safe_dict(current.get("signals"))
             learning = _safe_dict(current.get("learning"))
@@ -399,10 +563,12 @@ class TeamPersonaStore:
             learning["channels"] = channels
             current["learning"] = learning
 
-            current["derived_style"] = _derive_style(current)
+            features = _member_features(current)
+            current["derived_style"] = _derive_style(current, features)
             current["updated_at"] = _now_iso()
             members[key] = self._normalize_member(key, current)
-            self._commit()
+            self._refresh_aggregates(key, members[key], features)
+            self._commit(key)
             updated = _json_copy(members[key])
 
         event = {
@@ -429,28 +595,24 @@ class TeamPersonaStore:
     def list_interactions(self, member_id: Any = "", limit: int = 120) -> List[Dict[str, Any]]:
         cap = max(1, min(600, int(limit)))
         target = normalize_member_id(member_id)
-        rows: List[Dict[str, Any]] = []
         if not self.events_path.exists():
-            return rows
+            return []
         try:
-            with open(self.events_path, "r", encoding="utf-8") as handle:
-                for line in handle:
-                    text = str(line or "").strip()
-                    if not text:
-                        continue
-                    try:
-                        item = json.loads(text)
-                    except Exception:
-                        continue
-                    if not isinstance(item, dict):
-                        continue
-                    if target and normalize_member_id(item.get("member_id")) != target:
-                        continue
+            if target:
+                return self._segments.tail(target, cap)
+            rows: List[Dict[str, Any]] = []
+            for text in iter_lines_reverse(self.events_path):
+                try:
+                    item = json.loads(text)
+                except Exception:
+                    continue
+                if isinstance(item, dict):
                     rows.append(item)
+                    if len(rows) >= cap:
+                        break
+            return rows
         except Exception:
             return []
-        rows.sort(key=lambda row: str(row.get("timestamp", "")), reverse=True)
-        return rows[:cap]
 
     def recommend_adaptation(self, member_id: Any, intent: str = "") -> Dict[str, Any]:
         key = normalize_member_id(member_id)
@@ -489,46 +651,25 @@ class TeamPersonaStore:
                 "hints": [f"Member {key} is not configured yet."],
             }
 
-        style = _safe_dict(member.get("derived_style"))
-        persona = _safe_dict(member.get("persona"))
-        work_style = _safe_dict(member.get("work_style"))
-        tone = str(persona.get("tone", style.get("tone", "balanced")))
-        detail = str(persona.get("detail_level", style.get("detail_level", "balanced")))
-        autonomy = str(work_style.get("autonomy_preference", style.get("autonomy_preference", "balanced")))
-        risk = str(persona.get("risk_posture", style.get("risk_posture", "balanced")))
-        pace = str(persona.get("pace", style.get("pace", "balanced")))
-        response_structure = str(
-            _safe_dict(member.get("preferences")).get("response_structure", "bullets")
-        ) or "bullets"
-
-        autonomy_mode = "balanced"
-        if autonomy == "high" and risk in {"balanced", "aggressive"}:
-            autonomy_mode = "full_auto"
-        elif autonomy == "guarded" or risk == "careful":
-            autonomy_mode = "safe"
-
-        hints = [
-            f"Tone={tone}, detail={detail}, pace={pace}.",
-            f"Autonomy={autonomy_mode}, risk_policy={risk}.",
-        ]
+        with self._lock:
+            aggregates = self._aggregates.get(key)
+            if aggregates is None:
+                self._refresh_aggregates(key, self._state["members"][key])
+                aggregates = self._aggregates[key]
+            profile = aggregates["profile"]
+            features = dict(aggregates["features"])
+
+        hints = list(profile["hints"])
         if intent:
             hints.append(f"Intent context: {intent[:90]}")
 
         return {
             "member_id": key,
             "known_member": True,
-            "communication": {
-                "tone": tone,
-                "detail_level": detail,
-                "pace": pace,
-                "response_structure": response_structure,
-            },
-            "orchestration": {
-                "autonomy_mode": autonomy_mode,
-                "risk_policy": risk,
-                "escalate_when": "high_or_critical" if autonomy_mode == "safe" else "critical_only",
-            },
+            "communication": dict(profile["communication"]),
+            "orchestration": dict(profile["orchestration"]),
             "hints": hints,
+            "features": features,
             "member": member,
         }
 
@@ -4,16 +4,81 @@ Tracks user preferences, corrections, approvals and learns from explicit/implici
 
 THE CORE PRINCIPLE:
 "Every user interaction is a learning opportunity."
+
+Persistence:
+- Every change is appended to the state engine journal
+  ``user_feedback.journal`` (core.state_engine, ``state.db`` next to the
+  files; one row, one commit) and applied in memory. A legacy
+  ``user_feedback.journal.jsonl`` is imported on first load.
+- The full files (feedback, preferences, learning rules) are rewritten
+  only at checkpoints: every FEEDBACK_CHECKPOINT_EVERY changes,
+  FEEDBACK_CHECKPOINT_INTERVAL seconds, or at exit. Each file records
+  the journal sequence it includes, so a crash at any point replays
+  exactly the missing changes.
+- Learning events are sent to storage_v2 in batches of
+  FEEDBACK_EVENT_BATCH, or after FEEDBACK_EVENT_INTERVAL seconds.
+- Both intervals are also enforced by a background thread while events
+  or changes are pending, so a quiet manager does not hold them until the
+  next write. The thread exits once nothing is pending.
 """
 
+import atexit
 import json
 import os
+import re
+import sqlite3
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 from collections import defaultdict
 import threading
-from .storage_v2 import record_learning_event
+
+from core.state_engine import journal_for
+
+from .storage_v2 import record_learning_events
+
+_SPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCT = " \t\n\"'`.,;:!?()[]{}"
+
+
+def normalize_feedback_key(text: Any, max_len: int = 100) -> str:
+    """Case-fold, collapse whitespace and trim edge punctuation/quotes."""
+    value = _SPACE_RE.sub(" ", str(text or "")).strip(_EDGE_PUNCT).casefold()
+    return value[:max_len]
+
+
+class _RankedIndex:
+    """Rule keys ordered by count (descending), kept sorted as counts grow.
+
+    Counts only ever increase by small steps, so a bumped key is moved
+    forward past the keys it now outranks instead of re-sorting. Keys with
+    equal counts keep the order in which they reached that count.
+    """
+
+    def __init__(self):
+        self._order: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._count: Dict[str, int] = {}
+
+    def bump(self, key: str, count: int) -> None:
+        if key not in self._pos:
+            self._pos[key] = len(self._order)
+            self._order.append(key)
+        self._count[key] = count
+        i = self._pos[key]
+        while i > 0 and self._count[self._order[i - 1]] < count:
+            prev = self._order[i - 1]
+            self._order[i - 1], self._order[i] = key, prev
+            self._pos[prev] = i
+            i -= 1
+        self._pos[key] = i
+
+    def keys(self) -> List[str]:
+        return list(self._order)
+
+    def __len__(self) -> int:
+        return len(self._order)
 
 
 class UserFeedbackManager:
@@ -35,6 +100,15 @@ class UserFeedbackManager:
     SOURCE_INTERACTION = "interaction"
     SOURCE_AUTO = "auto"
 
+    _STAT_FOR_TYPE = {
+        FEEDBACK_EXPLICIT: "explicit_feedback",
+        FEEDBACK_CORRECTION: "corrections",
+        FEEDBACK_APPROVAL: "approvals",
+        FEEDBACK_DENIAL: "denials",
+        FEEDBACK_IMPLICIT: "implicit_feedback",
+    }
+    _RULE_PREFIXES = ("correction", "approval", "denial")
+
     def __init__(self, base_path: str = None):
         # Data path
         if base_path:
@@ -50,6 +124,7 @@ class UserFeedbackManager:
         self.feedback_file = self.base_path / "user_feedback.json"
         self.preferences_file = self.base_path / "user_preferences.json"
         self.learning_file = self.base_path / "feedback_learning.json"
+        self.journal_file = self.base_path / "user_feedback.journal.jsonl"
 
         # In-memory state
         self.feedback_history: List[Dict] = []
@@ -69,91 +144,283 @@ class UserFeedbackManager:
             "preferences_adjusted": 0,
         }
 
+        # Write-behind journal / checkpoint settings
+        self.checkpoint_every = max(1, int(os.getenv("FEEDBACK_CHECKPOINT_EVERY", "200")))
+        self.checkpoint_interval = max(0.0, float(os.getenv("FEEDBACK_CHECKPOINT_INTERVAL", "30")))
+        self.event_batch = max(1, int(os.getenv("FEEDBACK_EVENT_BATCH", "50")))
+        self.event_interval = max(0.0, float(os.getenv("FEEDBACK_EVENT_INTERVAL", "5")))
+        self._seq = 0
+        self._checkpointed_seq = 0
+        self._last_checkpoint = time.monotonic()
+        self._pending_events: List[Dict[str, Any]] = []
+        self._last_event_flush = time.monotonic()
+        self._journal = journal_for(self.journal_file)
+        self._flusher: Optional[threading.Thread] = None
+        self._ranked: Dict[str, _RankedIndex] = {prefix: _RankedIndex() for prefix in self._RULE_PREFIXES}
+
         # Thread safety
         self._lock = threading.RLock()
 
         # Load existing data
         self._load()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
 
     def _load(self):
-        """Load feedback history and preferences."""
+        """Load the last checkpoint, then replay the journal past it."""
+        feedback_seq = prefs_seq = learning_seq = 0
+
         # Load feedback history
-        if self.feedback_file.exists():
-            try:
-                with open(self.feedback_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.feedback_history = data.get("history", [])
-                    stats = data.get("stats", {})
-                    if isinstance(stats, dict):
-                        self.stats.update(stats)
-            except Exception:
-                pass
+        data = self._read_json(self.feedback_file)
+        if isinstance(data, dict):
+            self.feedback_history = data.get("history", [])
+            stats = data.get("stats", {})
+            if isinstance(stats, dict):
+                self.stats.update(stats)
+            feedback_seq = int(data.get("journal_seq", 0) or 0)
 
         # Load user preferences
-        if self.preferences_file.exists():
-            try:
-                with open(self.preferences_file, 'r', encoding='utf-8') as f:
-                    self.user_preferences = json.load(f)
-            except Exception:
-                pass
+        data = self._read_json(self.preferences_file)
+        if isinstance(data, dict):
+            prefs_seq = int(data.pop("__journal_seq__", 0) or 0)
+            self.user_preferences = data
 
         # Load learning rules
-        if self.learning_file.exists():
-            try:
-                with open(self.learning_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and ("rules" in data or "patterns" in data):
-                        rules = data.get("rules", {})
-                        patterns = data.get("patterns", {})
-                        self.learning_rules = rules if isinstance(rules, dict) else {}
-                        self.preference_patterns = patterns if isinstance(patterns, dict) else {}
-                    elif isinstance(data, dict):
-                        # Backward-compatible legacy shape where rules were stored directly.
-                        self.learning_rules = data
-            except Exception:
-                pass
-
+        data = self._read_json(self.learning_file)
+        if isinstance(data, dict) and ("rules" in data or "patterns" in data):
+            rules = data.get("rules", {})
+            patterns = data.get("patterns", {})
+            self.learning_rules = rules if isinstance(rules, dict) else {}
+            self.preference_patterns = patterns if isinstance(patterns, dict) else {}
+            learning_seq = int(data.get("journal_seq", 0) or 0)
+        elif isinstance(data, dict):
+            # Backward-compatible legacy shape where rules were stored directly.
+            self.learning_rules = data
+
+        self._normalize_rule_keys()
+        self._journal.import_jsonl_once(self.journal_file)
+        self._seq = self._checkpointed_seq = min(feedback_seq, prefs_seq, learning_seq)
+        replayed = self._replay_journal(feedback_seq, prefs_seq, learning_seq)
+        self._seq = max(self._seq, feedback_seq, prefs_seq, learning_seq, replayed)
         self.stats["patterns_learned"] = len(self.preference_patterns)
 
+    def _normalize_rule_keys(self) -> None:
+        """Re-key rules by normalized text, merging near-identical entries, and build the ranked index."""
+        merged: Dict[str, Any] = {}
+        text_field = {"correction": "original", "approval": "action", "denial": "action"}
+        for key, rule in self.learning_rules.items():
+            prefix = key.split(":", 1)[0]
+            if prefix not in text_field or not isinstance(rule, dict):
+                merged[key] = rule
+                continue
+            new_key = self._rule_key(prefix, rule.get(text_field[prefix]) or key.split(":", 1)[-1])
+            current = merged.get(new_key)
+            if current is None:
+                merged[new_key] = rule
+                continue
+            newer, older = (rule, current) if self._rule_time(rule) >= self._rule_time(current) else (current, rule)
+            combined = dict(newer)
+            combined["count"] = int(current.get("count", 0)) + int(rule.get("count", 0))
+            if prefix == "denial":
+                combined["reasons"] = (list(older.get("reasons", [])) + list(newer.get("reasons", [])))[-10:]
+            merged[new_key] = combined
+        self.learning_rules = merged
+        self._ranked = {prefix: _RankedIndex() for prefix in self._RULE_PREFIXES}
+        for key, rule in sorted(
+            self.learning_rules.items(),
+            key=lambda kv: kv[1].get("count", 0) if isinstance(kv[1], dict) else 0,
+            reverse=True,
+        ):
+            self._index_rule(key)
+
+    @staticmethod
+    def _rule_time(rule: Dict) -> str:
+        return str(rule.get("last_seen") or rule.get("last_approved") or rule.get("last_denied") or "")
+
+    def _rule_key(self, prefix: str, text: Any) -> str:
+        return f"{prefix}:{normalize_feedback_key(text)}"
+
+    def _index_rule(self, key: str) -> None:
+        prefix = key.split(":", 1)[0]
+        index = self._ranked.get(prefix)
+        rule = self.learning_rules.get(key)
+        if index is not None and isinstance(rule, dict):
+            index.bump(key, int(rule.get("count", 0)))
+
+    def _replay_journal(self, feedback_seq: int, prefs_seq: int, learning_seq: int) -> int:
+        """Apply journal rows newer than each file's checkpoint. Returns the last seq seen."""
+        last = 0
+        for row in self._journal.rows():
+            if not isinstance(row, dict):
+                continue
+            seq = int(row.get("seq", 0) or 0)
+            last = max(last, seq)
+            if row.get("op") == "preference":
+                if seq > prefs_seq:
+                    self._apply_preference(row.get("key", ""), row.get("value"), row.get("updated_at"))
+                if seq > feedback_seq:
+                    self.stats["preferences_adjusted"] += 1
+            elif row.get("op") == "feedback" and isinstance(row.get("entry"), dict):
+                self._apply_entry(row["entry"], history=seq > feedback_seq, learn=seq > learning_seq)
+        return last
+
+    # ==================== WRITE-BEHIND ====================
+
+    def _apply_entry(self, entry: Dict, history: bool = True, learn: bool = True) -> None:
+        if history:
+            self.feedback_history.append(entry)
+            self.stats["total_feedback"] += 1
+            stat = self._STAT_FOR_TYPE.get(entry.get("type"))
+            if stat:
+                self.stats[stat] += 1
+        if learn:
+            kind = entry.get("type")
+            if kind == self.FEEDBACK_CORRECTION:
+                self._learn_correction(entry)
+            elif kind == self.FEEDBACK_APPROVAL:
+                self._learn_approval(entry)
+            elif kind == self.FEEDBACK_DENIAL:
+                self._learn_denial(entry)
+            else:
+                self._learn_from_feedback(entry)
+
+    def _apply_preference(self, key: str, value: Any, updated_at: Optional[str] = None) -> None:
+        self.user_preferences[key] = {
+            "value": value,
+            "updated_at": updated_at or datetime.now().isoformat(),
+        }
+
+    def _append(self, row: Dict[str, Any]) -> None:
+        self._seq += 1
+        try:
+            self._journal.append({"seq": self._seq, **row})
+        except sqlite3.Error:
+            # Without a journal the change only survives through a checkpoint.
+            self._checkpoint()
+
+    def _commit(self, entry: Dict, event: Dict[str, Any]) -> Dict:
+        """Journal and apply one feedback entry, queue its learning event."""
+        self._append({"op": "feedback", "entry": entry})
+        self._apply_entry(entry)
+        self._queue_learning_event(**event)
+        self._maybe_checkpoint()
+        return entry
+
+    def _maybe_checkpoint(self) -> None:
+        now = time.monotonic()
+        if (
+            len(self._pending_events) >= self.event_batch
+            or (self._pending_events and now - self._last_event_flush >= self.event_interval)
+        ):
+            self._flush_learning_events()
+        if (
+            self._seq - self._checkpointed_seq >= self.checkpoint_every
+            or (self._seq > self._checkpointed_seq and now - self._last_checkpoint >= self.checkpoint_interval)
+        ):
+            self._checkpoint()
+        if self._flusher is None and self._has_pending():
+            intervals = [t for t in (self.event_interval, self.checkpoint_interval) if t > 0]
+            if intervals:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, args=(max(0.05, min(intervals)),), daemon=True, name="feedback-flush"
+                )
+                self._flusher.start()
+
+    def _has_pending(self) -> bool:
+        return bool(self._pending_events) or self._seq > self._checkpointed_seq
+
+    def _flush_loop(self, tick: float) -> None:
+        """Apply the time-based flushes when no write comes along to trigger them."""
+        while True:
+            time.sleep(tick)
+            with self._lock:
+                if not self._has_pending():
+                    self._flusher = None
+                    return
+                self._maybe_checkpoint()
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
     def _save(self):
-        """Save feedback data to disk."""
+        """Save feedback data to disk (a full checkpoint)."""
         with self._lock:
-            # Save feedback history
-            with open(self.feedback_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "history": self.feedback_history[-5000:],  # Keep last 5000
-                    "stats": self.stats,
-                    "last_updated": datetime.now().isoformat()
-                }, f, indent=2, ensure_ascii=False)
-            # Save preferences
-            with open(self.preferences_file, 'w', encoding='utf-8') as f:
-                json.dump(self.user_preferences, f, indent=2, ensure_ascii=False)
-            # Save learning rules
-            with open(self.learning_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "rules": self.learning_rules,
-                    "patterns": self.preference_patterns,
-                    "last_updated": datetime.now().isoformat()
-                }, f, indent=2, ensure_ascii=False)
+            self._checkpoint()
 
-    def _emit_learning_event(self, event_type: str, content: str, value: float, risk: float, context: Optional[Dict] = None):
+    def _checkpoint(self) -> None:
+        """Rewrite the three files at the current journal seq, then truncate the journal."""
+        with self._lock:
+            seq = self._seq
+            now = datetime.now().isoformat()
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            # Save learning rules
+            self._write_json(self.learning_file, {
+                "rules": self.learning_rules,
+                "patterns": self.preference_patterns,
+                "journal_seq": seq,
+                "last_updated": now,
+            })
+            # Save preferences
+            self._write_json(self.preferences_file, {**self.user_preferences, "__journal_seq__": seq})
+            # Save feedback history
+            self._write_json(self.feedback_file, {
+                "history": self.feedback_history[-5000:],  # Keep last 5000
+                "stats": self.stats,
+                "journal_seq": seq,
+                "last_updated": now,
+            })
+            # Every file now covers the journal, so it can start over.
+            self._journal.clear()
+            self._checkpointed_seq = seq
+            self._last_checkpoint = time.monotonic()
+
+    def flush(self) -> None:
+        """Send pending learning events and checkpoint outstanding changes."""
+        with self._lock:
+            self._flush_learning_events()
+            if self._seq > self._checkpointed_seq:
+                self._checkpoint()
+
+    def _queue_learning_event(self, event_type: str, content: str, value: float, risk: float, context: Optional[Dict] = None):
+        self._pending_events.append({
+            "ts": datetime.now().isoformat(),
+            "source": "user_feedback",
+            "event_type": event_type,
+            "content": str(content)[:500],
+            "context": context or {},
+            "novelty_score": 0.5,
+            "value_score": max(0.0, min(1.0, float(value))),
+            "risk_score": max(0.0, min(1.0, float(risk))),
+            "confidence": 0.85,
+        })
+
+    def _flush_learning_events(self) -> None:
+        events, self._pending_events = self._pending_events, []
+        self._last_event_flush = time.monotonic()
+        if not events:
+            return
         try:
-            record_learning_event(
-                {
-                    "ts": datetime.now().isoformat(),
-                    "source": "user_feedback",
-                    "event_type": event_type,
-                    "content": str(content)[:500],
-                    "context": context or {},
-                    "novelty_score": 0.5,
-                    "value_score": max(0.0, min(1.0, float(value))),
-                    "risk_score": max(0.0, min(1.0, float(risk))),
-                    "confidence": 0.85,
-                }
-            )
+            record_learning_events(events)
         except Exception:
             return
 
+    def _emit_learning_event(self, event_type: str, content: str, value: float, risk: float, context: Optional[Dict] = None):
+        with self._lock:
+            self._queue_learning_event(event_type, content, value, risk, context)
+            self._maybe_checkpoint()
+
     # ==================== FEEDBACK COLLECTION ====================
 
     def record_explicit_feedback(
@@ -182,22 +449,13 @@ class UserFeedbackManager:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.feedback_history.append(entry)
-            self.stats["total_feedback"] += 1
-            self.stats["explicit_feedback"] += 1
-
-            # Learn from this feedback
-            self._learn_from_feedback(entry)
-            self._emit_learning_event(
+            return self._commit(entry, dict(
                 event_type=f"explicit_{feedback_type}",
                 content=target,
                 value=0.8 if value > 0 else 0.6,
                 risk=0.2 if value > 0 else 0.35,
                 context=context,
-            )
-
-            self._save()
-            return entry
+            ))
 
     def record_correction(
         self,
@@ -222,22 +480,13 @@ class UserFeedbackManager:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.feedback_history.append(entry)
-            self.stats["total_feedback"] += 1
-            self.stats["corrections"] += 1
-
-            # Learn correction pattern
-            self._learn_correction(entry)
-            self._emit_learning_event(
+            return self._commit(entry, dict(
                 event_type="user_correction",
                 content=f"{original[:120]} -> {corrected[:120]}",
                 value=0.95,
                 risk=0.25,
                 context=context,
-            )
-
-            self._save()
-            return entry
+            ))
 
     def record_approval(
         self,
@@ -256,22 +505,13 @@ class UserFeedbackManager:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.feedback_history.append(entry)
-            self.stats["total_feedback"] += 1
-            self.stats["approvals"] += 1
-
-            # Learn approval pattern
-            self._learn_approval(entry)
-            self._emit_learning_event(
+            return self._commit(entry, dict(
                 event_type="user_approval",
                 content=action,
                 value=0.85,
                 risk=0.2,
                 context=details,
-            )
-
-            self._save()
-            return entry
+            ))
 
     def record_denial(
         self,
@@ -292,22 +532,13 @@ class UserFeedbackManager:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.feedback_history.append(entry)
-            self.stats["total_feedback"] += 1
-            self.stats["denials"] += 1
-
-            # Learn denial pattern
-            self._learn_denial(entry)
-            self._emit_learning_event(
+            return self._commit(entry, dict(
                 event_type="user_denial",
                 content=action,
                 value=0.75,
                 risk=0.4,
                 context={"reason": reason, **(details or {})},
-            )
-
-            self._save()
-            return entry
+            ))
 
     def record_implicit_feedback(
         self,
@@ -341,22 +572,13 @@ class UserFeedbackManager:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.feedback_history.append(entry)
-            self.stats["total_feedback"] += 1
-            self.stats["implicit_feedback"] += 1
-
-            # Learn implicit pattern
-            self._learn_from_feedback(entry)
-            self._emit_learning_event(
+            return self._commit(entry, dict(
                 event_type=f"implicit_{signal}",
                 content=target,
                 value=0.65 if entry.get("value", 0) > 0 else 0.45,
                 risk=0.3,
                 context=context,
-            )
-
-            self._save()
-            return entry
+            ))
 
     # ==================== LEARNING ====================
 
@@ -384,13 +606,14 @@ class UserFeedbackManager:
             return
 
         # Store correction rule
-        correction_key = f"correction:{original[:100]}"
+        correction_key = self._rule_key("correction", original)
         self.learning_rules[correction_key] = {
             "original": original,
             "corrected": corrected,
             "count": self.learning_rules.get(correction_key, {}).get("count", 0) + 1,
             "last_seen": entry["timestamp"],
         }
+        self._index_rule(correction_key)
 
     def _learn_approval(self, entry: Dict):
         """Learn from user approvals."""
@@ -400,13 +623,14 @@ class UserFeedbackManager:
             return
 
         # Update approval count for this action type
-        approval_key = f"approval:{action}"
+        approval_key = self._rule_key("approval", action)
         current = self.learning_rules.get(approval_key, {})
         self.learning_rules[approval_key] = {
             "action": action,
             "count": current.get("count", 0) + 1,
             "last_approved": entry["timestamp"],
         }
+        self._index_rule(approval_key)
 
     def _learn_denial(self, entry: Dict):
         """Learn from user denials."""
@@ -417,9 +641,9 @@ class UserFeedbackManager:
             return
 
         # Store denial pattern
-        denial_key = f"denial:{action}"
+        denial_key = self._rule_key("denial", action)
         current = self.learning_rules.get(denial_key, {})
-        reasons = current.get("reasons", [])
+        reasons = list(current.get("reasons", []))
         if reason:
             reasons.append(reason)
         self.learning_rules[denial_key] = {
@@ -428,6 +652,7 @@ class UserFeedbackManager:
             "last_denied": entry["timestamp"],
             "reasons": reasons[-10:],  # Keep last 10 reasons
         }
+        self._index_rule(denial_key)
 
     # ==================== PREFERENCE QUERIES ====================
 
@@ -435,49 +660,49 @@ class UserFeedbackManager:
         """Get preference value for a target (-1 to 1)."""
         return self.preference_patterns.get(target, 0)
 
-    def get_preferred_actions(self) -> List[Dict]:
+    def _ranked_rules(self, prefix: str, limit: Optional[int] = None) -> List[Dict]:
+        with self._lock:
+            keys = self._ranked[prefix].keys()
+            if limit is not None:
+                keys = keys[:max(0, int(limit))]
+            return [self.learning_rules[key] for key in keys if key in self.learning_rules]
+
+    def get_preferred_actions(self, limit: Optional[int] = None) -> List[Dict]:
         """Get list of actions the user prefers, sorted by preference."""
-        approvals = []
-        for key, value in self.learning_rules.items():
-            if key.startswith("approval:"):
-                approvals.append({
-                    "action": value.get("action"),
-                    "count": value.get("count", 0),
-                    "last_approved": value.get("last_approved"),
-                })
-        return sorted(approvals, key=lambda x: x["count"], reverse=True)
-
-    def get_disliked_actions(self) -> List[Dict]:
+        return [
+            {
+                "action": value.get("action"),
+                "count": value.get("count", 0),
+                "last_approved": value.get("last_approved"),
+            }
+            for value in self._ranked_rules("approval", limit)
+        ]
+
+    def get_disliked_actions(self, limit: Optional[int] = None) -> List[Dict]:
         """Get list of actions the user dislikes."""
-        denials = []
-        for key, value in self.learning_rules.items():
-            if key.startswith("denial:"):
-                denials.append({
-                    "action": value.get("action"),
-                    "count": value.get("count", 0),
-                    "reasons": value.get("reasons", []),
-                })
-        return sorted(denials, key=lambda x: x["count"], reverse=True)
-
-    def get_corrections(self) -> List[Dict]:
-        """Get list of corrections made by user."""
-        corrections = []
-        for key, value in self.learning_rules.items():
-            if key.startswith("correction:"):
-                corrections.append(value)
-        return sorted(corrections, key=lambda x: x.get("count", 0), reverse=True)
+        return [
+            {
+                "action": value.get("action"),
+                "count": value.get("count", 0),
+                "reasons": value.get("reasons", []),
+            }
+            for value in self._ranked_rules("denial", limit)
+        ]
+
+    def get_corrections(self, limit: Optional[int] = None) -> List[Dict]:
+        """Get list of corrections made by user, most frequent first."""
+        return self._ranked_rules("correction", limit)
 
     def get_correction_for(self, original: str) -> Optional[str]:
         """Get correction for a specific original text."""
-        correction_key = f"correction:{original[:100]}"
-        rule = self.learning_rules.get(correction_key)
+        rule = self.learning_rules.get(self._rule_key("correction", original))
         if rule:
             return rule.get("corrected")
         return None
 
     def should_auto_approve(self, action: str) -> bool:
         """Check if action should be auto-approved based on history."""
-        approval_key = f"approval:{action}"
+        approval_key = self._rule_key("approval", action)
         rule = self.learning_rules.get(approval_key, {})
         count = rule.get("count", 0)
         # Auto-approve if user approved 3+ times
@@ -485,7 +710,7 @@ class UserFeedbackManager:
 
     def should_auto_deny(self, action: str) -> bool:
         """Check if action should be auto-denied based on history."""
-        denial_key = f"denial:{action}"
+        denial_key = self._rule_key("denial", action)
         rule = self.learning_rules.get(denial_key, {})
         count = rule.get("count", 0)
         # Auto-deny if user denied 3+ times
@@ -496,12 +721,11 @@ class UserFeedbackManager:
     def set_preference(self, key: str, value: Any):
         """Set a user preference explicitly."""
         with self._lock:
-            self.user_preferences[key] = {
-                "value": value,
-                "updated_at": datetime.now().isoformat(),
-            }
+            updated_at = datetime.now().isoformat()
+            self._append({"op": "preference", "key": key, "value": value, "updated_at": updated_at})
+            self._apply_preference(key, value, updated_at)
             self.stats["preferences_adjusted"] += 1
-            self._save()
+            self._maybe_checkpoint()
 
     def get_preference_setting(self, key: str, default: Any = None) -> Any:
         """Get a user preference setting."""
@@ -568,7 +792,7 @@ class UserFeedbackManager:
         ]
 
         # Add top preferred actions
-        preferred = self.get_preferred_actions()[:5]
+        preferred = self.get_preferred_actions(limit=5)
         if preferred:
             lines.append("## Top Preferred Actions")
             for p in preferred:
@@ -576,7 +800,7 @@ class UserFeedbackManager:
             lines.append("")
 
         # Add top disliked actions
-        disliked = self.get_disliked_actions()[:5]
+        disliked = self.get_disliked_actions(limit=5)
         if disliked:
             lines.append("## Top Disliked Actions")
             for d in disliked:
@@ -0,0 +1,193 @@
+"""Cooperative timer-wheel scheduler for multi-sample outcome verification.
+
+Verifications register a sampling plan (N health samples, fixed interval)
+instead of sleeping between samples. The owner of the scheduler (normally the
+learning loop thread) calls ``poll()`` whenever it is idle; every due plan gets
+the same health sample for that tick, and plans that reach their sample count
+are handed to their completion callback. No threads are created, so any
+number of verifications can be in flight at once.
+
+Registration and polling may come from different threads (the loop, API
+handlers); the wheel and pending map are guarded by one lock, while samples,
+finalizers and completion callbacks run outside it.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+class TimerWheel:
+    """Hashed timing wheel with ``slots`` buckets of ``tick_seconds`` each.
+
+    Items are hashed by their absolute deadline tick; an item further out than
+    one revolution simply stays in its slot until its tick has passed.
+    """
+
+    def __init__(self, tick_seconds: float = 0.25, slots: int = 512, clock: Callable[[], float] = time.monotonic):
+        self.tick_seconds = max(0.001, float(tick_seconds))
+        self.slots = max(1, int(slots))
+        self.clock = clock
+        self._wheel: List[List[tuple]] = [[] for _ in range(self.slots)]
+        self._origin = self.clock()
+        self._current_tick = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _tick_of(self, when: float) -> int:
+        return int(math.floor((when - self._origin) / self.tick_seconds))
+
+    def schedule(self, when: float, item: Any) -> None:
+        target = max(self._current_tick, self._tick_of(when))
+        self._wheel[target % self.slots].append((target, item))
+        self._size += 1
+
+    def advance(self, now: Optional[float] = None) -> List[Any]:
+        """Return every item due at or before ``now``, in tick order."""
+        now = self.clock() if now is None else now
+        last_tick = self._tick_of(now)
+        due: List[Any] = []
+        if self._size == 0:
+            self._current_tick = max(self._current_tick, last_tick)
+            return due
+        # Never walk more than one full revolution: past that every slot has been visited.
+        start = self._current_tick
+        stop = min(last_tick, start + self.slots - 1)
+        for tick in range(start, stop + 1):
+            bucket = self._wheel[tick % self.slots]
+            if not bucket:
+                continue
+            keep = []
+            for entry in bucket:
+                if entry[0] <= last_tick:
+                    due.append(entry[1])
+                else:
+                    keep.append(entry)
+            self._wheel[tick % self.slots] = keep
+        self._size -= len(due)
+        self._current_tick = max(self._current_tick, last_tick)
+        return due
+
+    def next_due(self) -> Optional[float]:
+        """Clock time of the earliest scheduled item, or None when empty."""
+        if self._size == 0:
+            return None
+        earliest = min(entry[0] for bucket in self._wheel for entry in bucket)
+        return self._origin + earliest * self.tick_seconds
+
+
+@dataclass
+class SamplingPlan:
+    key: str
+    sample_target: int
+    interval_seconds: float
+    context: Dict[str, Any]
+    on_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+    registered_at: float = 0.0
+
+
+class VerificationScheduler:
+    """Drive many sampling plans from one cooperative timer wheel."""
+
+    def __init__(
+        self,
+        sampler: Callable[[], Dict[str, Any]],
+        finalize: Callable[[SamplingPlan], Dict[str, Any]],
+        tick_seconds: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.sampler = sampler
+        self.finalize = finalize
+        self.clock = clock
+        self.wheel = TimerWheel(tick_seconds=tick_seconds, clock=clock)
+        self.pending: Dict[str, SamplingPlan] = {}
+        self.stats = {"registered": 0, "completed": 0, "samples_taken": 0, "shared_samples": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def register(self, plan: SamplingPlan) -> bool:
+        with self._lock:
+            if plan.key in self.pending:
+                return False
+            plan.registered_at = self.clock()
+            self.pending[plan.key] = plan
+            self.wheel.schedule(plan.registered_at, plan.key)
+            self.stats["registered"] += 1
+            return True
+
+    def is_pending(self, key: str) -> bool:
+        with self._lock:
+            return key in self.pending
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self.pending)
+
+    def next_due_in(self) -> Optional[float]:
+        with self._lock:
+            due = self.wheel.next_due()
+        if due is None:
+            return None
+        return max(0.0, due - self.clock())
+
+    def poll(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Take one shared sample per due tick and finalize plans that are complete."""
+        now = self.clock() if now is None else now
+        completed: List[Dict[str, Any]] = []
+        while True:
+            with self._lock:
+                due_keys = [key for key in self.wheel.advance(now) if key in self.pending]
+            if not due_keys:
+                return completed
+            try:
+                sample = self.sampler()
+            except Exception:
+                sample = None
+
+            finished: List[SamplingPlan] = []
+            with self._lock:
+                self.stats["samples_taken"] += 1
+                self.stats["shared_samples"] += max(0, len(due_keys) - 1)
+                for key in due_keys:
+                    plan = self.pending.get(key)
+                    if plan is None:
+                        continue
+                    if isinstance(sample, dict):
+                        plan.samples.append(sample)
+                    if len(plan.samples) < plan.sample_target and isinstance(sample, dict):
+                        self.wheel.schedule(now + plan.interval_seconds, key)
+                        continue
+                    del self.pending[key]
+                    finished.append(plan)
+
+            for plan in finished:
+                errors = 0
+                try:
+                    result = self.finalize(plan)
+                except Exception as e:
+                    errors += 1
+                    result = {"ok": False, "error": str(e), "experiment_id": plan.key}
+                if plan.on_complete:
+                    try:
+                        plan.on_complete(result)
+                    except Exception:
+                        errors += 1
+                with self._lock:
+                    self.stats["completed"] += 1
+                    self.stats["errors"] += errors
+                completed.append(result)
+
+    def drain(self, timeout_seconds: float = 60.0, sleep: Callable[[float], None] = time.sleep) -> List[Dict[str, Any]]:
+        """Block until every pending plan completes (or the timeout passes)."""
+        deadline = self.clock() + max(0.0, float(timeout_seconds))
+        completed: List[Dict[str, Any]] = []
+        while self.pending_count() and self.clock() < deadline:
+            completed.extend(self.poll())
+            wait = self.next_due_in()
+            if wait:
+                sleep(min(wait, max(0.0, deadline - self.clock())))
+        return completed
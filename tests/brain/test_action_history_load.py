@@ -30,3 +30,89 @@ def test_action_history_load_parses_status_strings(monkeypatch, tmp_path):
     executor = ae.ActionExecutor()
     assert len(executor.history) == 1
     assert executor.history[0].status == ae.ActionStatus.SUCCESS
+
+
+def _row(i, action_type="read_file", status="success", failure_code=None, duration_ms=5.0):
+    return {
+        "action_id": f"a{i}",
+        "action_type": action_type,
+        "status": status,
+        "output": "",
+        "error": None,
+        "data": {},
+        "started_at": "2026-01-01T00:00:00",
+        "completed_at": "2026-01-01T00:00:01",
+        "duration_ms": duration_ms,
+        "objective_success": status == "success",
+        "failure_code": failure_code,
+        "policy_blocked": False,
+        "verification": {},
+    }
+
+
+def _executor(monkeypatch, tmp_path, rows, limit="10"):
+    data_dir = tmp_path / "data" / "brain"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    history_file = data_dir / "action_history.jsonl"
+    with open(history_file, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    monkeypatch.setattr(ae, "DATA_DIR", data_dir)
+    monkeypatch.setattr(ae, "WORKSPACE_DIR", tmp_path / "workspace")
+    monkeypatch.setenv("NEXUS_ACTION_HISTORY_LIMIT", limit)
+    return ae.ActionExecutor()
+
+
+def test_history_ring_is_bounded_and_stats_cover_everything(monkeypatch, tmp_path):
+    rows = [_row(i) for i in range(40)]
+    rows += [_row(100 + i, "run_shell", "timeout", "timeout", 70000.0) for i in range(5)]
+    executor = _executor(monkeypatch, tmp_path, rows)
+
+    assert len(executor.history) == 10
+    assert [r.action_id for r in executor.history[-2:]] == ["a103", "a104"]
+
+    stats = executor.get_stats()
+    assert stats["total"] == 45 and stats["success"] == 40 and stats["timeout"] == 5
+    assert stats["by_failure_code"] == {"timeout": 5}
+    shell = stats["by_type"]["run_shell"]
+    assert shell["statuses"] == {"timeout": 5}
+    assert shell["duration_histogram"] == {">60000": 5}
+    assert stats["by_type"]["read_file"]["duration_histogram"] == {"<=10": 40}
+
+
+def test_stats_snapshot_catches_up_on_appended_rows(monkeypatch, tmp_path):
+    executor = _executor(monkeypatch, tmp_path, [_row(i) for i in range(3)])
+    result = executor.execute("definitely_not_an_action_xyz", {})
+    assert result.status == ae.ActionStatus.FAILED
+    executor.stats.flush()
+    assert executor.get_stats()["total"] == 4
+
+    # Rows written by another process after the snapshot are folded in on start-up.
+    reopened = _executor(monkeypatch, tmp_path, [_row(50, status="failed", failure_code="handler_error")])
+    stats = reopened.get_stats()
+    assert stats["total"] == 5
+    assert stats["by_failure_code"]["handler_error"] == 1
+
+
+def test_read_history_serves_rows_older_than_the_ring(monkeypatch, tmp_path):
+    rows = [_row(i, "read_file" if i % 2 else "write_file") for i in range(30)]
+    executor = _executor(monkeypatch, tmp_path, rows, limit="5")
+
+    older = executor.read_history(limit=3, skip=5)
+    assert [r.action_id for r in older] == ["a24", "a23", "a22"]
+    writes = executor.read_history(limit=2, action_type="write_file")
+    assert [r.action_id for r in writes] == ["a28", "a26"]
+    assert executor.read_history(limit=100)[-1].action_id == "a0"
+
+
+def test_local_append_folds_rows_other_processes_appended(monkeypatch, tmp_path):
+    executor = _executor(monkeypatch, tmp_path, [_row(i) for i in range(2)])
+    # Another process appends between our writes.
+    with open(executor.history_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_row(60, "run_shell", "failed", "handler_error")) + "\n")
+    executor.execute("definitely_not_an_action_xyz", {})
+
+    stats = executor.get_stats()
+    assert stats["total"] == 4
+    assert stats["by_type"]["run_shell"]["statuses"] == {"failed": 1}
+    assert executor.stats.history_offset == executor.history_file.stat().st_size
@@ -0,0 +1,142 @@
+"""Process-pool backend for ActionExecutor: hard-killed timeouts, rlimits, warm reuse."""
+
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+import src.brain.action_executor as ae_mod
+from src.brain.action_executor import ActionExecutor, ActionStatus
+from src.brain.action_workers import ProcessWorkerPool, fork_available
+
+pytestmark = pytest.mark.skipif(not fork_available(), reason="process backend needs fork")
+
+
+def _spin(params):
+    while True:
+        pass
+
+
+def _echo(params):
+    return f"pid={os.getpid()}", {"value": params.get("value")}
+
+
+def _rlimit_cpu(params):
+    import resource
+    return "", {"cpu": resource.getrlimit(resource.RLIMIT_CPU)[0]}
+
+
+_HANDLERS = {"spin": _spin, "echo": _echo, "rlimit_cpu": _rlimit_cpu}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.fixture()
+def pool():
+    p = ProcessWorkerPool(_HANDLERS.__getitem__, size=1)
+    yield p
+    p.shutdown()
+
+
+@pytest.fixture()
+def executor(tmp_path, monkeypatch):
+    ws = tmp_path / "workspace"
+    ws.mkdir()
+    data = tmp_path / "data" / "brain"
+    data.mkdir(parents=True)
+    monkeypatch.setattr(ae_mod, "WORKSPACE_DIR", ws)
+    monkeypatch.setattr(ae_mod, "DATA_DIR", data)
+    monkeypatch.setattr(ae_mod, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(ae_mod, "_LLM_AVAILABLE", False)
+    monkeypatch.setenv("NEXUS_ACTION_BACKEND", "process")
+    ex = ActionExecutor()
+    ex.workspace = ws
+    ex.history_file = data / "action_history.jsonl"
+    ex.allowed_roots = [ws, data, tmp_path / "src"]
+    yield ex
+    ex.shutdown_workers()
+
+
+def test_infinite_loop_handler_is_killed_and_replaced(pool):
+    pool.prestart()
+    [stuck_pid] = pool.worker_pids()
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run("spin", {}, timeout=0.2)
+    assert not _pid_alive(stuck_pid)
+
+    output, data, error = pool.run("echo", {"value": 7}, timeout=5)
+    assert error is None and data == {"value": 7}
+    assert output != f"pid={stuck_pid}"
+    assert pool.stats["timeouts"] == 1 and pool.stats["killed"] == 1
+
+
+def test_warm_worker_is_reused_for_cheap_actions(pool):
+    pids = {pool.run("echo", {"value": i}, timeout=5)[0] for i in range(20)}
+    assert len(pids) == 1
+    assert pool.stats["spawned"] == 1
+
+
+def test_handler_exception_comes_back_without_killing_the_worker(pool):
+    pool.run("echo", {}, timeout=5)
+    output, data, error = pool.run("missing", {}, timeout=5)
+    assert isinstance(error, KeyError)
+    assert pool.stats["spawned"] == 1
+
+
+def test_cpu_rlimit_is_applied_per_action(pool):
+    _, data, _ = pool.run("rlimit_cpu", {}, timeout=5, limits={"cpu_seconds": 3})
+    assert 3 <= data["cpu"] <= 3 + 60
+
+
+def test_thread_count_is_stable_across_timeouts(pool):
+    n = int(os.getenv("ACTION_WORKER_TIMEOUT_SOAK_N", "50"))
+    pool.run("echo", {}, timeout=5)
+    baseline = threading.active_count()
+    for _ in range(n):
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.run("spin", {}, timeout=0.01)
+    assert threading.active_count() == baseline
+    assert pool.stats["timeouts"] == n
+    assert pool.run("echo", {"value": 1}, timeout=5)[1] == {"value": 1}
+
+
+def test_executor_timeout_reclaims_worker(executor):
+    executor.handlers["spin"] = _spin
+    before = threading.active_count()
+    started = time.monotonic()
+    result = executor.execute("spin", {}, timeout=1)
+    assert result.status == ActionStatus.TIMEOUT
+    assert result.failure_code == "timeout"
+    assert time.monotonic() - started < 10
+    assert threading.active_count() == before
+    assert executor.execute("write_file", {"path": "workspace/a.txt", "content": "x"}).status == ActionStatus.SUCCESS
+
+
+def test_executor_workers_follow_config_changes(executor):
+    executor.execute("write_file", {"path": "workspace/a.txt", "content": "x"})
+    executor.execution_mode = "SAFE"
+    result = executor.execute("read_file", {"path": "/tmp/outside_file.txt"})
+    assert result.status == ActionStatus.FAILED
+    assert result.policy_blocked is True
+
+
+def test_thread_backend_is_still_available(executor):
+    executor.backend = "thread"
+    result = executor.execute("write_file", {"path": "workspace/t.txt", "content": "x"})
+    assert result.status == ActionStatus.SUCCESS
+    assert executor._worker_pool is None
+
+
+def test_process_backend_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(ae_mod, "WORKSPACE_DIR", tmp_path / "workspace")
+    monkeypatch.setattr(ae_mod, "DATA_DIR", tmp_path / "data")
+    monkeypatch.delenv("NEXUS_ACTION_BACKEND", raising=False)
+    assert ActionExecutor().backend == "thread"
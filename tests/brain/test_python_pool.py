@@ -0,0 +1,144 @@
+"""Warm interpreter pool behind the run_python action."""
+
+import os
+import subprocess
+
+import pytest
+
+from src.brain.python_pool import PythonInterpreterPool
+
+
+@pytest.fixture()
+def pool():
+    p = PythonInterpreterPool(size=1, max_executions=50)
+    yield p
+    p.shutdown()
+
+
+def test_matches_python_dash_c_semantics(pool, tmp_path):
+    result = pool.run(
+        "import sys, os\nprint(__name__, sys.argv, os.getcwd())\nx = 1\n",
+        cwd=str(tmp_path),
+    )
+    assert result.returncode == 0
+    assert result.stdout.split() == ["__main__", "['-c']", str(tmp_path)]
+    assert result.stderr == ""
+
+
+def test_snippets_do_not_share_globals_but_reuse_the_interpreter(pool):
+    pool.run("leak = 42")
+    result = pool.run("print('leak' in globals())")
+    assert result.stdout.strip() == "False"
+    assert pool.stats["spawned"] == 1
+
+
+def test_errors_and_exit_codes(pool):
+    boom = pool.run("raise ValueError('boom')")
+    assert boom.returncode == 1
+    assert "ValueError: boom" in boom.stderr
+    assert 'File "<string>", line 1' in boom.stderr
+    assert pool.run("import sys; sys.exit(3)").returncode == 3
+    assert pool.run("import os; os._exit(5)").returncode == 5
+    assert pool.run("print('after crash')").stdout.strip() == "after crash"
+
+
+def test_rewritten_module_is_reimported(pool, tmp_path):
+    module = tmp_path / "pool_reload_mod.py"
+    module.write_text("V = 1\n")
+    assert pool.run("import pool_reload_mod; print(pool_reload_mod.V)", cwd=str(tmp_path)).stdout.strip() == "1"
+    module.write_text("V = 2\n")
+    # Same size in the same second would let python -c reuse the stale .pyc too.
+    stat = module.stat()
+    os.utime(module, (stat.st_atime + 5, stat.st_mtime + 5))
+    assert pool.run("import pool_reload_mod; print(pool_reload_mod.V)", cwd=str(tmp_path)).stdout.strip() == "2"
+    assert pool.stats["spawned"] == 1
+
+
+def test_snippet_state_changes_are_undone(pool, tmp_path):
+    pool.run(
+        "import os, sys\nsys.path.insert(0, '/nonexistent')\nos.environ['POOL_LEAK'] = '1'\nos.chdir('/')",
+        cwd=str(tmp_path),
+    )
+    result = pool.run("import os, sys\nprint('/nonexistent' in sys.path, 'POOL_LEAK' in os.environ)")
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_patched_json_does_not_break_the_protocol(pool):
+    result = pool.run("import json, os\njson.dumps = json.loads = None\nos.write = None\nprint('patched')")
+    assert result.returncode == 0
+    assert result.stdout.strip() == "patched"
+    assert pool.run("print('still alive')").stdout.strip() == "still alive"
+    assert pool.stats["spawned"] == 1
+
+
+def test_output_written_to_file_descriptors_is_captured(pool):
+    result = pool.run(
+        "import os, subprocess, sys\n"
+        "print('py', flush=True)\n"
+        "os.system('echo from_child')\n"
+        "subprocess.run(['echo', 'sub'])\n"
+        "os.system('echo to_err >&2')\n"
+    )
+    assert result.returncode == 0
+    assert result.stdout.split() == ["py", "from_child", "sub"]
+    assert result.stderr.strip() == "to_err"
+
+
+def test_patched_stdlib_does_not_leak_into_the_next_snippet(pool):
+    pool.run("import json\njson.dumps = lambda *a, **k: 'HACKED'")
+    result = pool.run("import json\nprint(json.dumps({'a': 1}))")
+    assert result.stdout.strip() == '{"a": 1}'
+    assert pool.stats["spawned"] == 1
+
+
+def test_timeout_kills_the_interpreter(pool):
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run("while True: pass", timeout=0.3)
+    assert pool.stats["timeouts"] == 1
+    assert pool.run("print(1)").stdout.strip() == "1"
+    assert pool.stats["spawned"] == 2
+
+
+def test_output_is_capped():
+    p = PythonInterpreterPool(size=1, max_output=100)
+    try:
+        result = p.run("print('x' * 10000)")
+    finally:
+        p.shutdown()
+    assert result.stdout.startswith("x" * 100)
+    assert result.stdout.endswith("[output truncated]")
+    assert len(result.stdout) < 200
+
+
+def test_recycled_after_max_executions_and_on_memory_growth():
+    p = PythonInterpreterPool(size=1, max_executions=3, max_rss_mb=10_000)
+    try:
+        for _ in range(7):
+            p.run("pass")
+        assert p.stats["spawned"] == 3
+        p.max_rss_mb = 1
+        p.run("pass")
+        p.run("pass")
+        assert p.stats["recycled"] >= 3
+    finally:
+        p.shutdown()
+
+
+def test_run_python_action_uses_the_pool(tmp_path, monkeypatch):
+    import src.brain.action_executor as ae_mod
+
+    (tmp_path / "data").mkdir()
+    monkeypatch.setattr(ae_mod, "WORKSPACE_DIR", tmp_path)
+    monkeypatch.setattr(ae_mod, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(ae_mod, "_LLM_AVAILABLE", False)
+    monkeypatch.setenv("NEXUS_ACTION_BACKEND", "thread")
+    ex = ae_mod.ActionExecutor()
+    ex.history_file = tmp_path / "data" / "action_history.jsonl"
+    try:
+        ok = ex.execute("run_python", {"code": "print(6 * 7)"})
+        bad = ex.execute("run_python", {"code": "1/0"})
+        assert ok.output.strip() == "42"
+        assert "ZeroDivisionError" in bad.error
+        assert ex._python_pool.stats["executions"] == 2
+    finally:
+        ex.shutdown_workers()
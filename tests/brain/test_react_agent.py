@@ -2,12 +2,15 @@
 
 import json
 import tempfile
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from src.brain.react_agent import (
+    MultiAgentOrchestrator,
     ReActAgent,
     AgentState,
     Thought,
@@ -166,6 +169,111 @@ class TestPersistence:
         agent._load()  # Should not crash
         assert len(agent.thoughts) == 0
 
+    def test_history_trimmed_to_newest_per_kind(self, agent, monkeypatch):
+        import src.brain.react_agent as _mod
+        monkeypatch.setattr(_mod, "HISTORY_TRIM_EVERY", 10)
+        for i in range(130):
+            agent.think(f"thought {i}")
+        agent.reflect("done")
+
+        engine, ns = agent._history_store()
+        assert engine.count(ns) <= 100 + 10 + 1
+        with patch("src.brain.react_agent.DATA_DIR", agent.data_dir):
+            agent2 = ReActAgent(brain=None)
+        assert len(agent2.thoughts) == 100
+        assert agent2.thoughts[-1].content.endswith("thought 129")
+        assert len(agent2.reflections) == 1
+
+    def test_legacy_history_file_imported_once(self, tmp_path):
+        (tmp_path / "react_history.json").write_text(json.dumps({
+            "thoughts": [{"content": "old", "timestamp": "2026-01-01T00:00:00", "reasoning": "r"}],
+            "actions": [{"type": "search", "target": "x", "params": {}, "timestamp": "2026-01-01T00:00:00",
+                         "result": "ok"}],
+        }), encoding="utf-8")
+        with patch("src.brain.react_agent.DATA_DIR", tmp_path):
+            first = ReActAgent(brain=None)
+            second = ReActAgent(brain=None)
+        assert [t.content for t in first.thoughts] == ["old"]
+        assert len(second.actions) == 1
+        assert (tmp_path / "react_history.json.migrated").exists()
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator with three agents whose tools sleep (LLM disabled)."""
+    import src.brain.react_agent as _mod
+    monkeypatch.setattr(_mod, "_LLM_AVAILABLE", False)
+    monkeypatch.setattr(_mod, "DATA_DIR", tmp_path)
+    orch = MultiAgentOrchestrator(max_parallel=3)
+
+    def slow_tool(target, **kwargs):
+        seconds = float(target.split("sleep=")[1].split()[0])
+        time.sleep(seconds)
+        if "forever" in target:
+            return "still waiting"  # short, so the task never completes
+        return f"Found a detailed, conclusive answer for {target} after {seconds}s of work."
+
+    for name in ("a", "b", "c"):
+        agent = orch.create_agent(name, "general")
+        agent.tools = {tool: slow_tool for tool in agent.tools}
+    return orch
+
+
+class TestParallelExecute:
+    def test_wall_time_tracks_slowest_task(self, orchestrator):
+        tasks = ["find sleep=0.3 x", "find sleep=0.2 y", "find sleep=0.1 z"]
+        start = time.monotonic()
+        results = orchestrator.parallel_execute(tasks, timeout_sec=5)
+        wall = time.monotonic() - start
+
+        assert [r["task"] for r in results] == tasks
+        assert all(r["cycles"] == 1 and r["observations"] for r in results)
+        assert wall < 0.5  # sequential would take the 0.6s sum
+        assert len(orchestrator.task_history) == 3
+
+    def test_results_stream_in_completion_order(self, orchestrator):
+        tasks = ["find sleep=0.3 slow", "find sleep=0.05 fast"]
+        seen = []
+        orchestrator.parallel_execute(tasks, on_result=lambda r: seen.append(r["index"]))
+        assert seen == [1, 0]
+
+    def test_concurrency_cap_and_transient_agents(self, orchestrator):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def counting_tool(target, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return "Found a detailed, conclusive answer that is long enough to complete the task."
+
+        for agent in orchestrator.agents.values():
+            agent.tools = {tool: counting_tool for tool in agent.tools}
+        results = orchestrator.parallel_execute([f"find item {i}" for i in range(6)], max_parallel=2)
+        assert peak[0] == 2
+        assert all(r["cycles"] == 1 for r in results)
+
+    def test_deadline_reports_timeout_and_stops_remaining_cycles(self, orchestrator):
+        tasks = ["find sleep=0.1 forever", "find sleep=0.05 quick"]
+        start = time.monotonic()
+        results = orchestrator.parallel_execute(tasks, timeout_sec=0.25)
+        elapsed = time.monotonic() - start
+
+        assert results[0]["timed_out"] is True and results[0]["success"] is False
+        assert results[1]["cycles"] == 1
+        assert elapsed < 0.6
+
+        agent = orchestrator.create_agent("direct", "general")
+        agent.tools = dict(orchestrator.agents["a"].tools)
+        deadline = time.monotonic() + 0.25
+        direct = agent.execute_task("find sleep=0.1 forever", max_cycles=10, deadline=deadline)
+        assert direct["timed_out"] is True
+        assert direct["cycles"] < 10
+        assert direct["reflections"] == []
+
 
 class TestDataclasses:
     def test_thought_fields(self):
@@ -5,6 +5,7 @@ interval scheduling, and event emission.
 """
 
 import json
+import os
 import time
 import threading
 import pytest
@@ -175,6 +176,99 @@ class TestChangeDetection:
         assert r2[0]["changed"] is False
 
 
+class TestStatFastPath:
+    """Unchanged files are answered from stat; changed ones are re-read."""
+
+    @staticmethod
+    def _age(path: Path, seconds: float = 60) -> None:
+        old = time.time() - seconds
+        os.utime(path, (old, old))
+
+    def test_unchanged_file_not_reread(self, principle_dir, monkeypatch):
+        monkeypatch.setattr("src.brain.self_reminder.PROJECT_ROOT", principle_dir)
+        for f in (principle_dir / "docs" / "memory").iterdir():
+            self._age(f)
+        sources = _make_sources(principle_dir, intervals={"guardrails": 0, "learning": 9999, "operations": 9999})
+        engine = SelfReminderEngine(sources=sources, log_path=principle_dir / "log.jsonl")
+
+        r1 = engine.check_and_remind()
+        assert engine.get_stats()["reads"] == 3
+
+        r2 = engine.check_and_remind()
+        stats = engine.get_stats()
+        assert stats["reads"] == 3
+        assert stats["stat_hits"] == 1
+        assert r2[0]["changed"] is False
+        assert r2[0]["content_hash"] == r1[0]["content_hash"]
+        assert r2[0]["key_points_count"] == r1[0]["key_points_count"]
+
+    def test_same_size_edit_detected(self, principle_dir, monkeypatch):
+        monkeypatch.setattr("src.brain.self_reminder.PROJECT_ROOT", principle_dir)
+        gf = principle_dir / "docs" / "memory" / "guardrails.md"
+        self._age(gf, 120)
+        sources = _make_sources(principle_dir, intervals={"guardrails": 0, "learning": 9999, "operations": 9999})
+        engine = SelfReminderEngine(sources=sources, log_path=principle_dir / "log.jsonl")
+        engine.check_and_remind()
+
+        original = gf.read_text(encoding="utf-8")
+        gf.write_text(original.replace("Rule 1", "Rule X"), encoding="utf-8")
+        self._age(gf, 60)
+
+        r2 = engine.check_and_remind()
+        assert r2[0]["changed"] is True
+
+    def test_recently_modified_file_is_reread(self, principle_dir, monkeypatch):
+        monkeypatch.setattr("src.brain.self_reminder.PROJECT_ROOT", principle_dir)
+        sources = _make_sources(principle_dir, intervals={"guardrails": 0, "learning": 9999, "operations": 9999})
+        engine = SelfReminderEngine(sources=sources, log_path=principle_dir / "log.jsonl")
+
+        engine.check_and_remind()
+        engine.check_and_remind()
+        # Just written: the stat signature is not trusted inside the racy window
+        assert engine.get_stats()["stat_hits"] == 0
+        assert engine.get_stats()["reads"] == 4
+
+    def test_key_points_cached_per_content_hash(self, principle_dir, monkeypatch):
+        monkeypatch.setattr("src.brain.self_reminder.PROJECT_ROOT", principle_dir)
+        mem = principle_dir / "docs" / "memory"
+        (mem / "copy.md").write_text((mem / "guardrails.md").read_text(encoding="utf-8"), encoding="utf-8")
+        sources = [
+            {"path": "docs/memory/guardrails.md", "name": "A", "priority": 5, "interval_sec": 0, "category": "a"},
+            {"path": "docs/memory/copy.md", "name": "B", "priority": 5, "interval_sec": 0, "category": "b"},
+        ]
+        engine = SelfReminderEngine(sources=sources, log_path=principle_dir / "log.jsonl")
+
+        results = engine.check_and_remind()
+        assert results[0]["content_hash"] == results[1]["content_hash"]
+        assert results[0]["key_points_count"] == results[1]["key_points_count"] == 3
+        assert len(engine._key_points_cache) == 1
+
+    def test_status_not_blocked_by_slow_scan(self, principle_dir, monkeypatch):
+        monkeypatch.setattr("src.brain.self_reminder.PROJECT_ROOT", principle_dir)
+        engine = SelfReminderEngine(sources=_make_sources(principle_dir), log_path=principle_dir / "log.jsonl")
+        entered = threading.Event()
+        release = threading.Event()
+        original = engine._scan_source
+
+        def slow_scan(*args):
+            entered.set()
+            release.wait(5)
+            return original(*args)
+
+        engine._scan_source = slow_scan
+        cycle = threading.Thread(target=engine.check_and_remind)
+        cycle.start()
+        try:
+            assert entered.wait(5)
+            assert engine.get_status()["total_sources"] == 3
+            # Sources being scanned are not claimed by a second caller
+            assert engine.check_and_remind() == []
+        finally:
+            release.set()
+            cycle.join(5)
+        assert engine.get_stats()["total_reminders"] == 3
+
+
 class TestEventCallback:
     """Test event bus integration."""
 
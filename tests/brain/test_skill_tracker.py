@@ -0,0 +1,100 @@
+"""SkillTracker write-behind flushing and tail-aware recommendations."""
+
+import json
+
+import pytest
+
+from core.state_engine import engine_for
+from src.brain import nexus_brain
+from src.brain.nexus_brain import SkillTracker
+
+
+class FakeBrain:
+    def log(self, msg, level="INFO"):
+        pass
+
+
+@pytest.fixture
+def tracker_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(nexus_brain, "DATA_DIR", tmp_path)
+
+    def make(**env):
+        for key, value in env.items():
+            monkeypatch.setenv(key, str(value))
+        return SkillTracker(FakeBrain())
+
+    return make
+
+
+def test_records_are_written_behind_and_flushed(tracker_factory, tmp_path):
+    tracker = tracker_factory(SKILL_FLUSH_EVERY=10, SKILL_FLUSH_INTERVAL=3600)
+    engine, ns = engine_for(tmp_path / "skills.json")
+    for i in range(9):
+        tracker.record_execution("deploy", 100.0 + i, True)
+    assert engine.get(ns, "deploy") is None
+
+    tracker.record_execution("deploy", 500.0, False)
+    saved = engine.get(ns, "deploy")
+    assert saved["total_executions"] == 10
+    assert saved["recent_outcomes"][-1] == 0
+
+    tracker.record_execution("deploy", 120.0, True)
+    tracker.flush()
+    reloaded = tracker_factory()
+    assert reloaded.skills["deploy"]["total_executions"] == 11
+    assert reloaded.get_telemetry("deploy")["p50_ms"] == pytest.approx(105.0, rel=0.02)
+    assert reloaded._sketches["deploy"].max == 500.0
+
+
+def test_only_changed_skills_written_and_legacy_json_imported(tracker_factory, tmp_path):
+    (tmp_path / "skills.json").write_text(json.dumps({
+        "legacy": {"level": 4, "total_executions": 30, "total_failures": 3, "total_time_ms": 3000,
+                   "best_time_ms": 80, "avg_time_ms": 100, "mastered": False, "can_delegate": False,
+                   "first_execution": None, "last_execution": None, "level_history": []},
+    }), encoding="utf-8")
+    tracker = tracker_factory(SKILL_FLUSH_EVERY=1000, SKILL_FLUSH_INTERVAL=3600)
+    assert tracker.skills["legacy"]["total_executions"] == 30
+    assert not (tmp_path / "skills.json").exists()
+    assert (tmp_path / "skills.json.migrated").exists()
+
+    engine, ns = engine_for(tmp_path / "skills.json")
+    before = engine.rows_written
+    tracker.record_execution("deploy", 100.0, True)
+    tracker.record_execution("deploy", 110.0, True)
+    tracker.flush()
+    assert engine.rows_written - before == 1
+    assert [key for key, _ in engine.items(ns)] == ["legacy", "deploy"]
+
+
+def test_recommendation_uses_recent_window_and_tail(tracker_factory):
+    tracker = tracker_factory(SKILL_WINDOW=20, SKILL_FLUSH_INTERVAL=3600, SKILL_FLUSH_EVERY=1000)
+    for _ in range(60):
+        tracker.record_execution("steady", 100.0, True)
+        tracker.record_execution("spiky", 100.0, True)
+    for _ in range(3):
+        tracker.record_execution("spiky", 5000.0, True)
+    for _ in range(20):
+        tracker.record_execution("steady_now_failing", 100.0, True)
+    for _ in range(15):
+        tracker.record_execution("steady_now_failing", 100.0, False)
+
+    steady = tracker.get_skill_recommendation("steady")
+    spiky = tracker.get_skill_recommendation("spiky")
+    failing = tracker.get_skill_recommendation("steady_now_failing")
+
+    assert spiky["p99_ms"] > 10 * steady["p99_ms"]
+    assert spiky["confidence"] < steady["confidence"]
+    assert failing["recent_success_rate"] == pytest.approx(0.25)
+    assert failing["confidence"] < steady["confidence"]
+
+
+def test_best_skill_prefers_lower_tail_latency(tracker_factory):
+    tracker = tracker_factory(SKILL_FLUSH_INTERVAL=3600, SKILL_FLUSH_EVERY=1000)
+    for i in range(40):
+        tracker.record_execution("code_review", 100.0, True)
+        tracker.record_execution("review_code", 20.0 if i % 10 else 25.0, True)
+        tracker.record_execution("code_review_slow", 4000.0 if i % 5 == 0 else 100.0, True)
+
+    assert tracker.get_best_skill_for_task("review the code") == "review_code"
+    report = tracker.get_skill_report()
+    assert report["code_review_slow"]["p99_ms"] > report["code_review"]["p99_ms"]
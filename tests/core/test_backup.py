@@ -96,3 +96,109 @@ class TestPruning:
             _mod.create_backup()
         backups = _mod.list_backups()
         assert len(backups) <= 3  # MAX_BACKUPS = 3
+
+
+def _write_events(path, start, count):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({"id": i, "event": "learning", "content": f"observation {i} " + "x" * (i % 97)}) + "\n")
+
+
+class TestIncrementalBackup:
+    def test_snapshot_restores_exact_content(self, _isolate):
+        data_dir, _ = _isolate
+        _write_events(data_dir / "events.jsonl", 0, 2000)
+        (data_dir / "nested").mkdir()
+        (data_dir / "nested" / "state.json").write_text('{"k": 1}', encoding="utf-8")
+        (data_dir / "skip.png").write_bytes(b"\x89PNG")
+        original = (data_dir / "events.jsonl").read_bytes()
+
+        first = _mod.create_backup(mode="incremental")
+        assert first["files_count"] == 2
+        _write_events(data_dir / "events.jsonl", 2000, 10)
+        (data_dir / "nested" / "state.json").unlink()
+        _mod.create_backup(mode="incremental")
+
+        result = _mod.restore_backup(first["path"].split("/")[-1])
+        assert result["restored_files"] == 2
+        assert (data_dir / "events.jsonl").read_bytes() == original
+        assert json.loads((data_dir / "nested" / "state.json").read_text(encoding="utf-8")) == {"k": 1}
+
+    def test_unchanged_files_are_not_stored_again(self, _isolate):
+        data_dir, _ = _isolate
+        (data_dir / "a.json").write_text('{"a": 1}', encoding="utf-8")
+        _mod.create_backup(mode="incremental")
+        second = _mod.create_backup(mode="incremental")
+        assert second["changed_files"] == 0
+        assert second["new_chunks"] == 0
+
+    def test_appended_jsonl_stores_only_the_tail(self, _isolate):
+        data_dir, _ = _isolate
+        _write_events(data_dir / "events.jsonl", 0, 20000)
+        first = _mod.create_backup(mode="incremental")
+        _write_events(data_dir / "events.jsonl", 20000, 20)
+        second = _mod.create_backup(mode="incremental")
+        assert first["new_chunks"] > 10
+        assert second["changed_files"] == 1
+        assert second["new_chunks"] <= 2
+        assert second["size_bytes"] < first["size_bytes"] / 5
+
+    def test_chunks_match_a_full_rechunk(self, tmp_path):
+        import io
+        data = b"".join(json.dumps({"i": i, "pad": "y" * (i % 300)}).encode() + b"\n" for i in range(30000))
+        data += b"z" * (3 * _mod.MAX_CHUNK)  # one very long line forces MAX_CHUNK cuts
+        full = list(_mod.iter_chunks(io.BytesIO(data)))
+        assert b"".join(full) == data
+        assert max(len(c) for c in full) <= _mod.MAX_CHUNK
+        cut = sum(len(c) for c in full[:3])
+        assert list(_mod.iter_chunks(io.BytesIO(data[cut:]))) == full[3:]
+
+    def test_pruning_drops_unreferenced_chunks(self, _isolate):
+        data_dir, backup_dir = _isolate
+        for i in range(5):
+            (data_dir / "state.json").write_text(json.dumps({"v": i, "pad": "p" * 50000}), encoding="utf-8")
+            _mod.create_backup(mode="incremental")
+        snapshots = [b for b in _mod.list_backups() if b.get("kind") == "incremental"]
+        assert len(snapshots) == 3
+        assert len(list((backup_dir / "chunks").glob("*/*"))) == 3
+        assert _mod.restore_backup(snapshots[-1]["name"])["restored_files"] == 1
+
+    def test_restore_oldest_snapshot_at_retention_limit(self, _isolate, monkeypatch):
+        data_dir, backup_dir = _isolate
+        monkeypatch.setattr(_mod, "BACKUP_MODE", "incremental")
+        contents = []
+        for i in range(3):
+            contents.append(json.dumps({"v": i, "pad": "q" * 40000}))
+            (data_dir / "state.json").write_text(contents[-1], encoding="utf-8")
+            _mod.create_backup()
+        oldest = [b for b in _mod.list_backups() if b.get("kind") == "incremental"][-1]["name"]
+
+        result = _mod.restore_backup(oldest)
+        assert "errors" not in result
+        assert result["restored_files"] == 1
+        assert (data_dir / "state.json").read_text(encoding="utf-8") == contents[0]
+        assert len(list(backup_dir.glob("nexus_backup_*_pre_restore.tar.gz"))) == 1
+        assert (backup_dir / "snapshots" / oldest).exists()
+
+    def test_small_change_is_cheaper_than_a_tarball(self, _isolate, monkeypatch):
+        import time
+        data_dir, _ = _isolate
+        monkeypatch.setattr(_mod, "MAX_BACKUPS", 0)
+        _write_events(data_dir / "events.jsonl", 0, 60000)
+        for i in range(20):
+            (data_dir / f"store_{i}.json").write_text(json.dumps({"rows": list(range(2000 + i))}), encoding="utf-8")
+        _mod.create_backup(mode="incremental")
+
+        _write_events(data_dir / "events.jsonl", 60000, 50)
+        (data_dir / "store_0.json").write_text(json.dumps({"rows": [1]}), encoding="utf-8")
+
+        started = time.perf_counter()
+        tar = _mod.create_backup(mode="tar")
+        tar_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        inc = _mod.create_backup(mode="incremental")
+        inc_seconds = time.perf_counter() - started
+
+        assert inc["changed_files"] == 2
+        assert inc["size_bytes"] * 10 < tar["size_bytes"]
+        assert inc_seconds < tar_seconds
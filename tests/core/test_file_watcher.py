@@ -0,0 +1,76 @@
+"""Tests for FileChangeWatcher (inotify and polling backends)."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.file_watcher import FileChangeWatcher
+
+
+def _collect(tmp_path, backend):
+    batches = []
+    watcher = FileChangeWatcher(str(tmp_path), batches.append, backend=backend, poll_interval_sec=0.05)
+    return watcher, batches
+
+
+def _seen(batches):
+    return {p for batch in batches for p in batch}
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.parametrize("backend", ["auto", "poll"])
+def test_reports_created_modified_and_deleted_files(tmp_path, backend):
+    (tmp_path / "old.py").write_text("a")
+    watcher, batches = _collect(tmp_path, backend)
+    watcher.start()
+    try:
+        (tmp_path / "new.py").write_text("b")
+        (tmp_path / "old.py").unlink()
+        assert _wait_for(lambda: {"new.py", "old.py"} <= _seen(batches))
+    finally:
+        watcher.stop()
+    assert not watcher.running
+
+
+def test_ignored_dirs_and_suffixes_are_skipped(tmp_path):
+    (tmp_path / "__pycache__").mkdir()
+    watcher, batches = _collect(tmp_path, "auto")
+    watcher.start()
+    try:
+        (tmp_path / "__pycache__" / "x.py").write_text("a")
+        (tmp_path / "mod.pyc").write_bytes(b"a")
+        (tmp_path / "keep.py").write_text("a")
+        assert _wait_for(lambda: "keep.py" in _seen(batches))
+        time.sleep(0.1)
+    finally:
+        watcher.stop()
+    assert _seen(batches) == {"keep.py"}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_new_directories_are_watched(tmp_path):
+    watcher, batches = _collect(tmp_path, "auto")
+    watcher.start()
+    try:
+        assert watcher.backend == "inotify"
+        os.makedirs(tmp_path / "pkg" / "sub")
+        (tmp_path / "pkg" / "sub" / "a.py").write_text("a")
+        assert _wait_for(lambda: os.path.join("pkg", "sub", "a.py") in _seen(batches))
+        (tmp_path / "pkg" / "sub" / "a.py").write_text("b")
+        time.sleep(0.1)
+    finally:
+        watcher.stop()
+    assert watcher.get_status()["batches"] >= 1
@@ -0,0 +1,48 @@
+"""Tests for LatencySketch (accuracy, merge, serialization)."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.latency_sketch import LatencySketch
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(4, 1.2) for _ in range(20000)]
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for v in values:
+        sketch.add(v)
+    for q in (0.5, 0.95, 0.99):
+        assert abs(sketch.quantile(q) - _exact(values, q)) <= 0.011 * _exact(values, q)
+    assert sketch.count == len(values)
+
+
+def test_merge_equals_single_sketch_and_round_trips():
+    rng = random.Random(4)
+    values = [rng.expovariate(1 / 80) for _ in range(5000)] + [0.0] * 10
+    whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for i, v in enumerate(values):
+        whole.add(v)
+        (left if i % 2 else right).add(v)
+    left.merge(right)
+    restored = LatencySketch.from_dict(left.to_dict())
+    for q in (0.0, 0.5, 0.99, 1.0):
+        assert restored.quantile(q) == whole.quantile(q)
+    assert restored.min == 0.0 and restored.max == max(values)
+
+
+def test_bucket_cap_keeps_tail_accurate():
+    sketch = LatencySketch(max_buckets=16)
+    for v in range(1, 10001):
+        sketch.add(float(v))
+    assert len(sketch.buckets) <= 16
+    assert abs(sketch.quantile(0.99) - 9900) <= 0.011 * 9900
+    assert LatencySketch().quantile(0.5) is None
@@ -0,0 +1,61 @@
+"""call_llm coalesces identical concurrent prompts through the single-flight group."""
+
+import threading
+import time
+
+import src.core.llm_caller as llm_caller
+
+
+def test_concurrent_identical_prompts_hit_provider_once(monkeypatch):
+    hits = []
+
+    def stub(prompt, max_tokens, temperature, system_prompt):
+        hits.append(prompt)
+        time.sleep(0.1)
+        return f"ok:{prompt}"
+
+    monkeypatch.setenv("LLM_SINGLE_FLIGHT_ENABLED", "true")
+    monkeypatch.setattr(llm_caller, "_MODEL_CALLERS", {"glm": stub})
+    monkeypatch.setattr(llm_caller, "_breakers", {})
+    before = llm_caller.get_llm_coalescing_stats()["sync"]
+
+    barrier = threading.Barrier(6)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(llm_caller.call_llm("status summary", preferred_model="glm"))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    after = llm_caller.get_llm_coalescing_stats()["sync"]
+    assert hits == ["status summary"]
+    assert results == ["ok:status summary"] * 6
+    assert after["coalesced"] - before["coalesced"] == 5
+
+
+def test_different_params_are_not_coalesced(monkeypatch):
+    hits = []
+
+    def stub(prompt, max_tokens, temperature, system_prompt):
+        hits.append(max_tokens)
+        time.sleep(0.05)
+        return "ok"
+
+    monkeypatch.setattr(llm_caller, "_MODEL_CALLERS", {"glm": stub})
+    monkeypatch.setattr(llm_caller, "_breakers", {})
+
+    threads = [
+        threading.Thread(target=llm_caller.call_llm, args=("digest",), kwargs={"preferred_model": "glm", "max_tokens": n})
+        for n in (100, 200)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(hits) == [100, 200]
@@ -2,6 +2,7 @@
 
 import json
 import logging
+import logging.handlers
 import os
 
 import pytest
@@ -75,6 +76,15 @@ class TestJSONFormatter:
         assert data["msg"] == "warning msg"
         assert "ts" in data
 
+    def test_timestamp_is_record_creation_time(self):
+        record = logging.LogRecord(
+            name="test", level=logging.INFO, pathname="", lineno=0,
+            msg="queued earlier", args=(), exc_info=None,
+        )
+        record.created = 1_700_000_000.25
+        data = json.loads(_mod._JSONFormatter().format(record))
+        assert data["ts"] == "2023-11-14T22:13:20.250000+00:00"
+
     def test_format_with_exception(self):
         fmt = _mod._JSONFormatter()
         try:
@@ -122,3 +132,114 @@ class TestLogLevel:
         _mod.setup_logging()
         root = logging.getLogger("nexus")
         assert root.level == logging.DEBUG
+
+
+def _record(msg, level=logging.INFO, name="nexus.test", args=()):
+    return logging.LogRecord(name=name, level=level, pathname="", lineno=0, msg=msg, args=args, exc_info=None)
+
+
+class TestQueuePipeline:
+    def test_log_calls_do_not_wait_for_slow_handlers(self):
+        import time
+
+        class _Slow(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.seen = []
+
+            def emit(self, record):
+                time.sleep(0.01)
+                self.seen.append(record.getMessage())
+
+        slow = _Slow()
+        qh = _mod._BoundedQueueHandler(capacity=1000)
+        listener = logging.handlers.QueueListener(qh.queue, slow)
+        listener.start()
+        try:
+            started = time.perf_counter()
+            for i in range(50):
+                qh.handle(_record("msg %d", args=(i,)))
+            elapsed = time.perf_counter() - started
+        finally:
+            listener.stop()
+        assert elapsed < 0.25  # 50 synchronous emits would take >= 0.5s
+        assert slow.seen == [f"msg {i}" for i in range(50)]
+
+    def test_drop_new_counts_overflow(self):
+        qh = _mod._BoundedQueueHandler(capacity=3, policy="drop_new")
+        for i in range(10):
+            qh.handle(_record(f"m{i}"))
+        assert qh.dropped == 7
+        assert [qh.queue.get_nowait().msg for _ in range(3)] == ["m0", "m1", "m2"]
+
+    def test_drop_oldest_keeps_newest(self):
+        qh = _mod._BoundedQueueHandler(capacity=3, policy="drop_oldest")
+        for i in range(10):
+            qh.handle(_record(f"m{i}"))
+        assert qh.dropped == 7
+        assert [qh.queue.get_nowait().msg for _ in range(3)] == ["m7", "m8", "m9"]
+
+    def test_exception_text_survives_the_queue(self):
+        qh = _mod._BoundedQueueHandler(capacity=10)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+            record = _record("failed")
+            record.exc_info = sys.exc_info()
+        qh.handle(record)
+        queued = qh.queue.get_nowait()
+        assert queued.exc_info is None
+        assert "ValueError: boom" in json.loads(_mod._JSONFormatter().format(queued))["exc"]
+
+    def test_debug_rate_limit_per_logger(self):
+        limiter = _mod._DebugRateLimitFilter(rate_per_sec=5, burst=5)
+        noisy = [limiter.filter(_record("tick", logging.DEBUG, "nexus.noisy")) for _ in range(100)]
+        quiet = limiter.filter(_record("once", logging.DEBUG, "nexus.quiet"))
+        info = limiter.filter(_record("info", logging.INFO, "nexus.noisy"))
+        assert sum(noisy) == 5
+        assert quiet and info
+        assert limiter.suppressed_total == 95
+
+    def test_debug_rate_limit_is_thread_safe(self):
+        import threading
+
+        limiter = _mod._DebugRateLimitFilter(rate_per_sec=0.001, burst=10)
+        passed = []
+
+        def worker():
+            passed.append(sum(limiter.filter(_record("tick", logging.DEBUG, "nexus.shared")) for _ in range(500)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sum(passed) == 10
+        assert limiter.suppressed_total == 8 * 500 - 10
+
+    def test_file_rotation_compresses_in_background(self, tmp_path, monkeypatch):
+        import gzip
+
+        log_file = tmp_path / "nexus.log"
+        monkeypatch.setenv("NEXUS_LOG_FILE", str(log_file))
+        monkeypatch.setenv("NEXUS_LOG_MAX_BYTES", "4000")
+        monkeypatch.setenv("NEXUS_LOG_BACKUP_COUNT", "3")
+        _mod.setup_logging()
+        lg = _mod.get_logger("rotation_test")
+        for i in range(200):
+            lg.warning("rotation line %d %s", i, "x" * 40)
+        _mod.shutdown_logging()
+
+        archives = sorted(tmp_path.glob("nexus.log.*.gz"))
+        assert 1 <= len(archives) <= 3
+        lines = gzip.decompress(archives[0].read_bytes()).decode("utf-8").splitlines()
+        assert all(json.loads(line)["msg"].startswith("rotation line") for line in lines)
+        assert not list(tmp_path.glob("*.pending"))
+        assert "rotation line 199" in log_file.read_text(encoding="utf-8")
+
+    def test_stats_reported(self):
+        _mod.setup_logging()
+        stats = _mod.get_logging_stats()
+        assert stats["async"] is True
+        assert stats["capacity"] > 0
@@ -0,0 +1,105 @@
+import asyncio
+
+from src.core.orion_factory import OrionDomain, OrionFactory
+
+
+class _SlowFactory(OrionFactory):
+    def __init__(self, delay: float = 0.01, **kwargs):
+        self.delay = delay
+        self.peak = {}
+        self._running_now = {}
+        super().__init__(**kwargs)
+
+    async def _execute_with_orion(self, orion, task):
+        domain = orion.domain
+        self._running_now[domain] = self._running_now.get(domain, 0) + 1
+        self.peak[domain] = max(self.peak.get(domain, 0), self._running_now[domain])
+        try:
+            await asyncio.sleep(task.get("sleep", self.delay))
+        finally:
+            self._running_now[domain] -= 1
+        return {"orion": orion.name, "status": "completed"}
+
+
+async def _run(factory, tasks):
+    loop = asyncio.create_task(factory.run_autonomous_loop())
+    futures = [factory.submit_task(task) for task in tasks]
+    results = await asyncio.gather(*futures)
+    factory.shutdown()
+    await loop
+    return results
+
+
+def test_dispatcher_runs_tasks_concurrently_within_domain_limits():
+    factory = _SlowFactory(delay=0.02, concurrency_per_orion=3, maintenance_interval_sec=60)
+    tasks = [{"type": kind, "description": f"t{i}"} for i, kind in enumerate(["code", "ui"] * 30)]
+
+    results = asyncio.run(_run(factory, tasks))
+
+    assert all(r["status"] == "completed" for r in results)
+    assert factory.peak[OrionDomain.CODE] == 3
+    assert factory.peak[OrionDomain.UI_UX] == 3
+    stats = factory.get_dispatch_stats()
+    assert stats["completed"] == 60 and stats["failed"] == 0
+    assert stats["latency_p99_ms"] is not None
+    assert stats["status_counts"] == {"idle": len(factory.instances)}
+
+
+def test_raw_queue_items_are_still_dispatched():
+    factory = _SlowFactory(delay=0, maintenance_interval_sec=60)
+
+    async def main():
+        loop = asyncio.create_task(factory.run_autonomous_loop())
+        for i in range(5):
+            await factory.task_queue.put({"type": "test", "description": f"raw {i}"})
+        await factory.task_queue.join()
+        factory.shutdown()
+        await loop
+
+    asyncio.run(main())
+    assert factory.completed == 5
+
+
+def test_backlog_scales_domain_and_widens_its_gate(monkeypatch):
+    monkeypatch.setenv("ORION_SCALE_BACKLOG", "2")
+    factory = _SlowFactory(delay=0.05, concurrency_per_orion=1, maintenance_interval_sec=0.01)
+
+    asyncio.run(_run(factory, [{"type": "code"} for _ in range(20)]))
+
+    assert factory.scaled_up >= 1
+    assert len(factory._domain_instances[OrionDomain.CODE]) >= 2
+    assert factory.peak[OrionDomain.CODE] >= 2
+
+
+def test_stuck_orion_is_reclaimed_from_heartbeat():
+    factory = _SlowFactory(stuck_timeout_sec=0.05, maintenance_interval_sec=0.01)
+
+    results = asyncio.run(_run(factory, [{"type": "code", "sleep": 30}, {"type": "ui", "sleep": 0}]))
+
+    assert "error" in results[0]
+    assert results[1]["status"] == "completed"
+    assert factory.reclaimed == 1 and factory.failed == 1
+    assert all(o.status == "idle" and o.active_tasks == 0 for o in factory.instances.values())
+
+
+def test_idle_surplus_orion_is_retired(monkeypatch):
+    monkeypatch.setenv("ORION_IDLE_RETIRE_SEC", "0")
+    factory = OrionFactory()
+    factory.spawn_orion(OrionDomain.CODE)
+
+    asyncio.run(factory._auto_scale())
+
+    assert factory.retired == 1
+    assert len(factory._domain_instances[OrionDomain.CODE]) == 1
+    assert factory.get_dispatch_stats()["status_counts"] == {"idle": len(factory.instances)}
+    assert len(factory.instances) == 3
+
+
+def test_full_factory_waits_to_repurpose_instead_of_failing():
+    factory = _SlowFactory(delay=0.02, max_orions=3, maintenance_interval_sec=60)
+    tasks = [{"type": kind} for kind in ["deploy", "security", "research", "monitor", "test"] * 4]
+
+    results = asyncio.run(_run(factory, tasks))
+
+    assert all(r["status"] == "completed" for r in results)
+    assert len(factory.instances) == 3 and factory.failed == 0
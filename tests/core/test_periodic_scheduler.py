@@ -0,0 +1,129 @@
+"""Tests for PeriodicScheduler (timing, overlap, catch-up, jitter)."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.periodic_scheduler import PeriodicScheduler
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_jobs_run_on_interval_and_stop_is_prompt():
+    scheduler = PeriodicScheduler(max_workers=2)
+    runs = []
+    scheduler.add_job("fast", 0.05, lambda: runs.append(time.monotonic()))
+    scheduler.add_job("slow", 3600, lambda: None, first_delay_sec=3600)
+    scheduler.start()
+
+    assert _wait_for(lambda: len(runs) >= 4)
+    started = time.monotonic()
+    assert scheduler.stop(timeout=2) is True
+    assert time.monotonic() - started < 0.5
+    assert scheduler.get_stats()["jobs"]["slow"]["runs"] == 0
+
+
+def test_idle_scheduler_does_not_poll():
+    scheduler = PeriodicScheduler()
+    scheduler.add_job("hourly", 3600, lambda: None, first_delay_sec=3600)
+    scheduler.start()
+    time.sleep(0.3)
+    wakeups = scheduler.wakeups
+    scheduler.stop()
+    assert wakeups == 0
+
+
+def test_overlapping_run_is_skipped():
+    clock = _Clock()
+    scheduler = PeriodicScheduler(max_workers=2, clock=clock)
+    release = threading.Event()
+    scheduler.add_job("blocking", 10, release.wait)
+
+    assert scheduler.run_pending() == ["blocking"]
+    clock.now += 10
+    assert scheduler.run_pending() == ["blocking"]
+    stats = scheduler.get_stats()["jobs"]["blocking"]
+    assert stats["overlaps_skipped"] == 1 and stats["running"] is True
+
+    release.set()
+    assert _wait_for(lambda: scheduler.get_stats()["jobs"]["blocking"]["runs"] == 1)
+    scheduler.stop()
+
+
+def test_catch_up_policies_account_for_missed_slots():
+    clock = _Clock()
+    scheduler = PeriodicScheduler(max_workers=1, clock=clock)
+    counts = {"skip": 0, "all": 0, "reset": 0}
+    for policy in counts:
+        scheduler.add_job(policy, 10, lambda p=policy: counts.__setitem__(p, counts[p] + 1),
+                          catch_up=policy, max_catch_up=2)
+    scheduler.run_pending()
+    assert _wait_for(lambda: sum(counts.values()) == 3)
+
+    clock.now += 55  # slots at +10..+50 are due; four of them were missed
+    scheduler.run_pending()
+    assert _wait_for(lambda: counts == {"skip": 2, "all": 4, "reset": 2})
+    jobs = scheduler.get_stats()["jobs"]
+    assert jobs["skip"]["missed"] == 4
+    assert jobs["all"]["missed"] == 2  # two replayed, two dropped
+    assert jobs["reset"]["missed"] == 4
+    assert jobs["skip"]["next_run_in_sec"] == 5.0  # stays on the original phase
+    assert jobs["reset"]["next_run_in_sec"] == 10.0
+    scheduler.stop()
+
+
+def test_jitter_keeps_phase_and_errors_are_counted():
+    clock = _Clock()
+    scheduler = PeriodicScheduler(clock=clock)
+    job = scheduler.add_job("flaky", 100, lambda: 1 / 0, jitter=0.1)
+    for _ in range(20):
+        clock.now = job.due
+        scheduler.run_pending()
+        assert abs(job.due - job.base_due) <= 10.0
+    assert job.missed == 0
+    assert job.base_due == 1000.0 + 20 * 100
+    assert _wait_for(lambda: job.errors >= 1)
+    scheduler.stop()
+
+
+def test_restart_after_a_stuck_job_resets_accounting_and_refills_the_pool():
+    clock = _Clock()
+    scheduler = PeriodicScheduler(max_workers=2, clock=clock)
+    release = threading.Event()
+    runs = []
+    scheduler.add_job("stuck", 10, release.wait)
+    scheduler.add_job("quick", 10, lambda: runs.append(1))
+    scheduler.run_pending()
+    assert _wait_for(lambda: runs == [1])
+    assert scheduler.get_stats()["jobs"]["stuck"]["running"] is True
+
+    assert scheduler.stop(timeout=0.2) is False
+    assert scheduler.get_stats()["jobs"]["stuck"]["running"] is False
+
+    scheduler.start()
+    assert len([w for w in scheduler._workers if w.is_alive()]) == 2
+    clock.now += 10
+    scheduler.run_pending()
+    assert _wait_for(lambda: runs == [1, 1])
+    assert scheduler.get_stats()["jobs"]["stuck"]["overlaps_skipped"] == 0
+
+    release.set()
+    assert scheduler.stop(timeout=2) is True
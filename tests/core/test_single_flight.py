@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.core.single_flight import AsyncSingleFlight, SingleFlight, request_key
+
+
+class _StubProvider:
+    """Local provider that counts upstream hits."""
+
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self._lock:
+            self.hits += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("upstream boom")
+        return f"answer:{prompt}"
+
+    async def acall(self, prompt: str) -> str:
+        self.hits += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ValueError("upstream boom")
+        return f"answer:{prompt}"
+
+
+def test_request_key_normalises_whitespace_role_case_and_param_order():
+    a = request_key("GLM-5", [{"role": "User", "content": "  status?  "}], {"max_tokens": 10, "temperature": 0.2})
+    b = request_key("glm-5", [{"role": "user", "content": "status?"}], {"temperature": 0.2, "max_tokens": 10})
+    c = request_key("glm-5", [{"role": "user", "content": "status?"}], {"temperature": 0.3, "max_tokens": 10})
+    assert a == b
+    assert a != c
+
+
+def test_sync_duplicates_share_one_upstream_call():
+    group = SingleFlight()
+    provider = _StubProvider(delay=0.1)
+    key = request_key("glm", [{"role": "user", "content": "digest"}])
+    barrier = threading.Barrier(8)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(group.do(key, lambda: provider("digest")))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert provider.hits == 1
+    assert results == ["answer:digest"] * 8
+    stats = group.stats.snapshot()
+    assert stats["calls"] == 8 and stats["upstream_calls"] == 1
+    assert stats["coalescing_ratio"] == pytest.approx(7 / 8)
+    assert group.in_flight() == 0
+
+    # Once the flight has landed the next call goes upstream again.
+    group.do(key, lambda: provider("digest"))
+    assert provider.hits == 2
+
+
+def test_sync_error_is_shared_with_waiters():
+    group = SingleFlight()
+    provider = _StubProvider(delay=0.1, fail=True)
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def worker():
+        barrier.wait()
+        try:
+            group.do("k", lambda: provider("x"))
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert provider.hits == 1
+    assert errors == ["upstream boom"] * 4
+    assert group.stats.snapshot()["errors"] == 1
+
+
+def test_async_duplicates_share_one_upstream_call_and_survive_leader_cancel():
+    group = AsyncSingleFlight()
+    provider = _StubProvider(delay=0.05)
+
+    async def scenario():
+        leader = asyncio.ensure_future(group.do("k", lambda: provider.acall("s")))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(group.do("k", lambda: provider.acall("s"))) for _ in range(5)]
+        other = asyncio.ensure_future(group.do("other", lambda: provider.acall("o")))
+        leader.cancel()
+        return await asyncio.gather(*followers, other)
+
+    results = asyncio.run(scenario())
+    assert results == ["answer:s"] * 5 + ["answer:o"]
+    assert provider.hits == 2
+    stats = group.stats.snapshot()
+    assert stats["calls"] == 7 and stats["coalesced"] == 5
+    assert group.in_flight() == 0
+
+
+def test_async_error_is_shared():
+    group = AsyncSingleFlight()
+    provider = _StubProvider(delay=0.02, fail=True)
+
+    async def scenario():
+        return await asyncio.gather(
+            *[group.do("k", lambda: provider.acall("x")) for _ in range(3)],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert provider.hits == 1
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_request_key_includes_routing_config():
+    messages = [{"role": "user", "content": "status?"}]
+    assert request_key("glm-5", messages, routing={"order": ["glm", "minimax"]}) != request_key(
+        "glm-5", messages, routing={"order": ["minimax", "glm"]}
+    )
+
+
+def test_waiters_get_their_own_copy_of_the_result():
+    group = SingleFlight()
+    gate = threading.Event()
+    results = []
+
+    def leader_fn():
+        gate.wait(2)
+        return {"content": "ok", "usage": {"tokens": 3}}
+
+    def worker():
+        results.append(group.do("k", leader_fn))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while group._calls.get("k") is None or group._calls["k"].waiters < 2:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    results[0]["usage"]["tokens"] = 99
+    assert [r["usage"]["tokens"] for r in results[1:]] == [3, 3]
+    assert len({id(r) for r in results}) == 3
+
+
+def test_async_waiters_get_their_own_copy_of_the_result():
+    group = AsyncSingleFlight()
+
+    async def upstream():
+        await asyncio.sleep(0.05)
+        return {"content": "ok"}
+
+    async def run():
+        return await asyncio.gather(*(group.do("k", upstream) for _ in range(3)))
+
+    results = asyncio.run(run())
+    results[0]["content"] = "mutated"
+    assert [r["content"] for r in results[1:]] == ["ok", "ok"]
@@ -0,0 +1,122 @@
+"""Tests for StateEngine (documents, indexes, transactions, legacy import)."""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from core.state_engine import StateEngine, engine_for, get_state_engine, journal_for
+
+
+@pytest.fixture
+def engine(tmp_path):
+    e = StateEngine(tmp_path / "state.db")
+    yield e
+    e.close()
+
+
+def test_put_get_update_keeps_insertion_order(engine):
+    engine.put_many("ns", [("a", {"v": 1}), ("b", {"v": 2}), ("c", {"v": 3})])
+    engine.put("ns", "a", {"v": 10})
+    assert engine.get("ns", "a") == {"v": 10}
+    assert engine.get("ns", "missing", "d") == "d"
+    assert [k for k, _ in engine.items("ns")] == ["a", "b", "c"]
+    assert engine.delete("ns", "b") and not engine.delete("ns", "b")
+    assert engine.count("ns") == 2
+    assert engine.count("other") == 0
+
+
+def test_generated_column_index_query_and_trim(engine, tmp_path):
+    engine.put_many("h", [(f"k{i}", {"kind": "even" if i % 2 == 0 else "odd", "n": i}) for i in range(20)])
+    engine.ensure_index("kind", "$.kind")
+    engine.ensure_index("n", "$.n", "INTEGER")
+
+    top = engine.query("h", {"kind": "odd"}, order_by="n", descending=True, limit=3)
+    assert [d["n"] for _, d in top] == [19, 17, 15]
+    with pytest.raises(KeyError):
+        engine.query("h", {"unknown": 1})
+
+    assert engine.trim("h", 2, {"kind": "even"}) == 8
+    assert [d["n"] for _, d in engine.query("h", {"kind": "even"})] == [16, 18]
+    assert engine.count("h") == 12
+
+    # Indexes are rediscovered when the database is reopened
+    reopened = StateEngine(tmp_path / "state.db")
+    assert [d["n"] for _, d in reopened.query("h", {"kind": "odd"}, limit=1)] == [1]
+    reopened.close()
+
+
+def test_transaction_batches_and_rolls_back(engine):
+    with engine.transaction():
+        engine.put("ns", "a", 1)
+        with engine.transaction():
+            engine.put("ns", "b", 2)
+    assert engine.commits == 1
+
+    with pytest.raises(RuntimeError):
+        with engine.transaction():
+            engine.put("ns", "c", 3)
+            raise RuntimeError("boom")
+    assert engine.get("ns", "c") is None
+    assert engine.count("ns") == 2
+
+
+def test_concurrent_writers_use_own_connections(engine):
+    def worker(t):
+        for i in range(50):
+            engine.put("ns", f"{t}-{i}", {"t": t})
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(6)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert engine.count("ns") == 300
+    assert engine.get_stats()["connections"] >= 6
+
+
+def test_import_json_once_and_engine_for(tmp_path):
+    legacy = tmp_path / "skills.json"
+    legacy.write_text(json.dumps({"deploy": {"level": 2}, "review": {"level": 5}}), encoding="utf-8")
+
+    engine, ns = engine_for(legacy)
+    assert ns == "skills"
+    assert engine is get_state_engine(tmp_path / "state.db")
+    assert engine.import_json_once(ns, legacy, lambda d: d.items()) == 2
+    assert not legacy.exists() and (tmp_path / "skills.json.migrated").exists()
+
+    legacy.write_text(json.dumps({"other": {}}), encoding="utf-8")
+    assert engine.import_json_once(ns, legacy, lambda d: d.items()) == 0
+    assert dict(engine.items(ns)) == {"deploy": {"level": 2}, "review": {"level": 5}}
+
+
+def test_unreadable_legacy_file_is_left_in_place(engine, tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json", encoding="utf-8")
+    assert engine.import_json_once("broken", broken, lambda d: d.items()) == 0
+    assert broken.exists()
+    assert engine.get_meta("imported:broken") is None
+
+
+def test_journal_appends_clears_and_imports_legacy_jsonl(tmp_path):
+    legacy = tmp_path / "store.journal.jsonl"
+    legacy.write_text('{"seq": 1}\n{"seq": 2}\n{"seq": 3, "op', encoding="utf-8")
+
+    journal = journal_for(legacy)
+    assert journal.ns == "store.journal"
+    assert journal.import_jsonl_once(legacy) == 2
+    assert not legacy.exists() and (tmp_path / "store.journal.jsonl.migrated").exists()
+    legacy.write_text('{"seq": 9}\n', encoding="utf-8")
+    assert journal.import_jsonl_once(legacy) == 0
+
+    with journal.engine.transaction():
+        journal.append({"seq": 3})
+        journal.append_many([{"seq": 4}, {"seq": 5}])
+    assert [r["seq"] for r in journal.rows()] == [1, 2, 3, 4, 5]
+    assert journal.engine.get_stats()["journals"] == {"store.journal": 5}
+    assert journal.clear() == 5
+    assert len(journal) == 0 and journal.rows() == []
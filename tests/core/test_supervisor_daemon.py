@@ -327,3 +327,177 @@ class TestSupervisorDaemonDecisionLog:
             daemon._log_decision(decision)
 
         assert len(daemon._decisions) <= 200
+
+
+class TestTriggerGate:
+    def test_burst_coalesces_into_one_event(self):
+        from core.supervisor_daemon import SupervisorEvent, _TriggerGate
+
+        gate = _TriggerGate(debounce=0.5, min_interval=0.0)
+
+        def merge(old, new):
+            return {"paths": old["paths"] + new["paths"]}
+
+        for i in range(5):
+            gate.offer(SupervisorEvent("files_changed", {"paths": [f"f{i}"]}), 10.0 + i * 0.1, merge)
+        assert gate.take(10.5) is None          # still inside the quiet window
+        event = gate.take(10.9)
+        assert event.payload["paths"] == ["f0", "f1", "f2", "f3", "f4"]
+        assert gate.coalesced == 4
+
+    def test_min_interval_defers_instead_of_dropping(self):
+        from core.supervisor_daemon import SupervisorEvent, _TriggerGate
+
+        gate = _TriggerGate(debounce=0.0, min_interval=5.0)
+
+        def keep_new(old, new):
+            return new
+
+        gate.offer(SupervisorEvent("terminal_output", {"content": "a"}), 0.0, keep_new)
+        assert gate.take(0.0).payload["content"] == "a"
+        gate.offer(SupervisorEvent("terminal_output", {"content": "b"}), 1.0, keep_new)
+        gate.offer(SupervisorEvent("terminal_output", {"content": "c"}), 2.0, keep_new)
+        assert gate.take(4.9) is None
+        assert gate.due_at() == 5.0
+        assert gate.take(5.0).payload["content"] == "c"
+
+
+def _event_daemon(tmp_path, **kwargs):
+    from brain.project_supervisor import ProjectSupervisor
+
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "README.md").write_text("# demo\n")
+    daemon = SupervisorDaemon(
+        project_path=str(project),
+        mode="OBSERVE",
+        decision_log_path=str(tmp_path / "decisions.jsonl"),
+        event_driven=True,
+        trigger_policy={"files_changed": (0.05, 0.0), "terminal_output": (0.0, 0.0)},
+        **kwargs,
+    )
+
+    def init_components():
+        daemon._project_supervisor = ProjectSupervisor(str(project), state_dir=str(tmp_path / "state"))
+
+    daemon._init_components = init_components
+    return daemon, project
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestSupervisorDaemonEventLoop:
+    def test_file_change_reaches_a_decision_without_a_cycle_wait(self, tmp_path):
+        daemon, project = _event_daemon(tmp_path, project_scan_interval_sec=3600)
+        decisions = []
+        daemon.on_decision(decisions.append)
+        daemon.start()
+        try:
+            assert _wait_for(lambda: daemon._file_watcher is not None and len(decisions) >= 1)
+            baseline = len(decisions)
+            # Emptying the README changes the issue list ("Missing README").
+            for i in range(5):
+                (project / f"mod_{i}.py").write_text("x = 1\n")
+            (project / "README.md").write_text("")
+            assert _wait_for(lambda: len(decisions) > baseline)
+            time.sleep(0.2)
+            followups = decisions[baseline:]
+            assert len(followups) == 1  # the burst coalesced into one decision
+            assert followups[0].trigger == "project_issue"
+            stats = daemon.get_event_stats()
+            assert stats["latency"]["files_changed"]["count"] == 1
+            assert stats["latency"]["files_changed"]["p50_ms"] < 2000
+        finally:
+            started = time.monotonic()
+            daemon.stop()
+        assert time.monotonic() - started < 2
+        assert daemon._file_watcher is None
+
+    def test_repeated_terminal_output_is_analyzed_once(self, tmp_path):
+        daemon, _ = _event_daemon(tmp_path)
+        decisions = []
+        daemon.on_decision(decisions.append)
+        daemon.start()
+        try:
+            assert _wait_for(lambda: len(decisions) >= 1)
+            for _ in range(3):
+                daemon.notify_terminal_output("Traceback (most recent call last):\nNameError: x")
+                time.sleep(0.05)
+            assert _wait_for(lambda: any(d.trigger == "terminal_error" for d in decisions))
+            time.sleep(0.2)
+            assert sum(d.trigger == "terminal_error" for d in decisions) == 1
+        finally:
+            daemon.stop()
+
+    def test_health_transitions_are_reported_once_per_change(self):
+        from core.proactive_monitor import HealthCheck, ProactiveMonitor
+
+        monitor = ProactiveMonitor(state_path="/nonexistent/proactive.json")
+        status = {"value": "healthy"}
+        monitor.register_health_checker("db", lambda: HealthCheck(
+            component="db", status=status["value"], last_check="", message="",
+        ))
+        seen = []
+        monitor.on_health_change(lambda previous, health: seen.append((previous, health["overall"])))
+        monitor.check_health()
+        monitor.check_health()
+        status["value"] = "degraded"
+        monitor.check_health()
+        monitor.check_health()
+        assert seen == [(None, "healthy"), ("healthy", "degraded")]
+
+    def test_polling_loop_still_available(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("SUPERVISOR_EVENT_DRIVEN", "false")
+        daemon = SupervisorDaemon(project_path=str(tmp_path))
+        assert daemon.event_driven is False
+
+    def test_changes_without_new_issues_and_own_writes_log_nothing(self, tmp_path):
+        daemon, project = _event_daemon(tmp_path, project_scan_interval_sec=3600)
+        daemon.decision_log_path = project / "data" / "supervisor" / "decisions.jsonl"
+        daemon.decision_log_path.parent.mkdir(parents=True)
+        decisions = []
+        daemon.on_decision(decisions.append)
+        daemon.start()
+        try:
+            assert _wait_for(lambda: daemon._file_watcher is not None and len(decisions) >= 1)
+            baseline = len(decisions)
+            (project / "mod.py").write_text("x = 1\n")
+            assert _wait_for(lambda: daemon.get_event_stats()["events_received"] >= 2)
+            time.sleep(0.3)
+            assert len(decisions) == baseline
+
+            received = daemon.get_event_stats()["events_received"]
+            daemon._on_files_changed(["data/supervisor/decisions.jsonl"])
+            time.sleep(0.2)
+            assert daemon.get_event_stats()["events_received"] == received
+        finally:
+            daemon.stop()
+
+    def test_polling_mode_does_not_queue_events(self, tmp_path):
+        daemon = SupervisorDaemon(
+            project_path=str(tmp_path),
+            decision_log_path=str(tmp_path / "decisions.jsonl"),
+            event_driven=False,
+        )
+        for _ in range(100):
+            daemon.notify_terminal_output("some output")
+        assert daemon._events.qsize() == 0
+
+    def test_health_listener_is_registered_once_across_restarts(self, tmp_path):
+        from core.proactive_monitor import ProactiveMonitor
+
+        daemon, _ = _event_daemon(tmp_path)
+        monitor = ProactiveMonitor()
+        daemon._proactive_monitor = monitor
+        for _ in range(3):
+            daemon._start_event_sources()
+        assert len(monitor._health_listeners) == 1
+        daemon._stop_event_sources()
+        assert monitor._health_listeners == []
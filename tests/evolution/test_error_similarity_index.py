@@ -0,0 +1,103 @@
+import json
+
+import src.evolution.evolution_engine as ee
+from src.evolution.similarity_index import (
+    MinHashLSHIndex,
+    PersistentErrorIndex,
+    jaccard,
+    normalize_error_tokens,
+)
+
+
+def test_normalize_strips_numbers_paths_and_addresses():
+    tokens = normalize_error_tokens(
+        "KeyError at 0x7f3a2c in /srv/app/worker.py line 42: 'user_id' missing"
+    )
+    assert tokens == {"keyerror", "at", "in", "line", "missing"}
+
+
+def test_query_reranks_candidates_by_exact_jaccard():
+    index = MinHashLSHIndex()
+    index.add("a", "ConnectionError: connection refused by upstream payment gateway")
+    index.add("b", "ConnectionError: connection refused by upstream search gateway")
+    index.add("c", "ValueError: invalid literal for int with base ten")
+
+    results = index.query("ConnectionError: connection refused by upstream payment gateway on retry 3")
+    assert [key for key, _ in results][:2] == ["a", "b"]
+    assert all(score >= 0.5 for _, score in results)
+    assert index.query("totally unrelated permission problem") == []
+
+
+def test_lsh_recall_on_near_duplicates():
+    index = MinHashLSHIndex()
+    base = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+    for i in range(200):
+        index.add(f"k{i}", " ".join(f"{w}{i}" for w in base))
+    hits = 0
+    for i in range(200):
+        # Drop two of ten tokens: Jaccard 0.8 with the stored entry.
+        query = " ".join(f"{w}{i}" for w in base[:8])
+        if index.query(query) and index.query(query)[0][0] == f"k{i}":
+            hits += 1
+    assert hits >= 195
+    # Only a small share of the corpus is ever looked at per query.
+    assert len(index.candidates(normalize_error_tokens(query))) < 20
+
+
+def test_persistent_index_replays_adds_and_removes(tmp_path):
+    path = tmp_path / "patterns_lsh.jsonl"
+    index = PersistentErrorIndex(path)
+    index.add("error:a", "TimeoutError: request to inventory service timed out")
+    index.add("error:b", "PermissionError: permission denied writing cache")
+    index.remove("error:b")
+
+    reloaded = PersistentErrorIndex(path)
+    assert "error:a" in reloaded and "error:b" not in reloaded
+    assert reloaded.signatures["error:a"] == index.signatures["error:a"]
+
+    reloaded.compact()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    assert jaccard({"a", "b"}, {"b", "c"}) == 1 / 3
+
+
+def test_engine_finds_solution_for_similar_error(monkeypatch, tmp_path):
+    monkeypatch.setattr(ee, "DATA_DIR", tmp_path / "evolution")
+    engine = ee.EvolutionEngine()
+    engine.capture_error("ConnectionError: connection refused by upstream payment gateway")
+    key = next(k for k in engine.patterns if k.startswith("error:"))
+    engine.patterns[key].solution = "restart gateway"
+    engine._save()
+
+    reloaded = ee.EvolutionEngine()
+    assert key in reloaded.error_index
+    assert reloaded._find_similar_error(
+        "ConnectionError: connection refused by upstream payment gateway (attempt 7)"
+    ) == "restart gateway"
+    assert reloaded._find_similar_error("SyntaxError: unexpected indent") is None
+
+
+def test_rebuilt_index_matches_live_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(ee, "DATA_DIR", tmp_path / "evolution")
+    engine = ee.EvolutionEngine()
+    long_error = (
+        "TimeoutError: upstream inventory service did not answer within the deadline "
+        "while reserving stock for warehouse shard replica"
+    )
+    engine.capture_error(long_error)
+    key = next(k for k in engine.patterns if k.startswith("error:"))
+    live_tokens = engine.error_index.token_sets[key]
+    assert live_tokens == normalize_error_tokens(long_error)
+    engine._save()
+
+    # Rebuild from scratch, and once more from a patterns file written before content was stored.
+    engine.error_index_file.unlink()
+    assert ee.EvolutionEngine().error_index.token_sets[key] == live_tokens
+
+    data = json.loads(engine.patterns_file.read_text(encoding="utf-8"))
+    for pattern in data["patterns"].values():
+        pattern.pop("content")
+    engine.patterns_file.write_text(json.dumps(data), encoding="utf-8")
+    engine.error_index_file.unlink()
+    rebuilt = ee.EvolutionEngine()
+    assert rebuilt.error_index.token_sets[key] == live_tokens
+    assert rebuilt._find_similar_error(long_error + " (retry 2)") is not None
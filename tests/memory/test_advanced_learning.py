@@ -0,0 +1,97 @@
+"""Review heap, fingerprint index and journal of AdvancedLearningEngine."""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+from src.memory.advanced_learning import AdvancedLearningEngine
+
+
+def _engine(tmp_path, monkeypatch, **env):
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    return AdvancedLearningEngine(str(tmp_path))
+
+
+def _brute_force_due(engine, now):
+    due = [i for i in engine.knowledge_items if i.next_review is None or i.next_review <= now]
+    due.sort(key=lambda i: (i.next_review.timestamp() if i.next_review else 0, -i.importance, i.created.timestamp()))
+    return [i.id for i in due]
+
+
+def test_due_items_match_a_full_sort(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, ADVANCED_LEARNING_MAX_ITEMS="0")
+    rng = random.Random(9)
+    for n in range(300):
+        engine.add_knowledge(f"fact number {n}", rng.choice(["a", "b", "c"]), importance=rng.randint(1, 10))
+    for item in rng.sample(engine.knowledge_items, 150):
+        engine.review_item(item, rng.randint(0, 5))
+
+    later = datetime.now() + timedelta(days=3)
+    expected = _brute_force_due(engine, later)
+    assert [i.id for i in engine.get_items_for_review(now=later)] == expected
+    assert [i.id for i in engine.get_items_for_review(limit=7, now=later)] == expected[:7]
+    assert engine.count_items_for_review(now=later) == len(expected)
+    # Peeking does not consume: the same items are still due.
+    assert [i.id for i in engine.get_items_for_review(limit=7, now=later)] == expected[:7]
+
+
+def test_add_knowledge_dedups_through_the_fingerprint_index(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch)
+    first = engine.add_knowledge("Spaced   repetition works", "Learning", importance=3, tags=["a"])
+    again = engine.add_knowledge("spaced repetition WORKS", "learning ", importance=8, tags=["b"])
+    assert again is first
+    assert first.importance == 8 and first.tags == ["a", "b"]
+    assert len(engine.knowledge_items) == 1
+    assert engine.get_items_for_review()[0] is first
+
+
+def test_reviews_are_journaled_and_replayed(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, ADVANCED_LEARNING_COMPACT_EVERY="1000")
+    items = [engine.add_knowledge(f"item {n}", "general") for n in range(5)]
+    state_before = engine.state_path.exists()
+    for item in items[:3]:
+        engine.review_item(item, 5)
+    assert engine.state_path.exists() == state_before  # no full rewrite per review
+
+    reopened = AdvancedLearningEngine(str(tmp_path))
+    assert {i.id: i.review_count for i in reopened.knowledge_items} == {i.id: i.review_count for i in items}
+    assert [i.id for i in reopened.get_items_for_review()] == [i.id for i in items[3:]]
+
+
+def test_compaction_rewrites_state_and_truncates_journal(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, ADVANCED_LEARNING_COMPACT_EVERY="4")
+    for n in range(6):
+        engine.add_knowledge(f"item {n}", "general")
+    saved = json.loads(engine.state_path.read_text(encoding="utf-8"))
+    assert len(saved["knowledge_items"]) == 4
+    assert len(engine._journal) == 2
+    assert len(AdvancedLearningEngine(str(tmp_path)).knowledge_items) == 6
+
+
+def test_legacy_jsonl_journal_is_imported(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, ADVANCED_LEARNING_COMPACT_EVERY="1000")
+    item = engine.add_knowledge("legacy item", "general")
+    row = {"op": "upsert", "item": engine._serialize_knowledge_item(item)}
+    engine._journal.clear()
+    engine.journal_path.write_text(
+        json.dumps(row) + "\n" + '{"op": "upsert", "item": {"id"', encoding="utf-8"
+    )
+
+    reopened = AdvancedLearningEngine(str(tmp_path))
+    assert [i.id for i in reopened.knowledge_items] == [item.id]
+    assert len(reopened._journal) == 1
+    assert not engine.journal_path.exists()
+
+
+def test_capacity_evicts_the_weakest_item(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, monkeypatch, ADVANCED_LEARNING_MAX_ITEMS="3")
+    engine.add_knowledge("keep high", "x", importance=9)
+    engine.add_knowledge("drop low", "x", importance=1)
+    engine.add_knowledge("keep mid", "x", importance=5)
+    engine.add_knowledge("keep new", "x", importance=4)
+    contents = sorted(i.content for i in engine.knowledge_items)
+    assert contents == ["keep high", "keep mid", "keep new"]
+    assert all(i.content != "drop low" for i in engine.get_items_for_review())
+    reopened = AdvancedLearningEngine(str(tmp_path))
+    assert sorted(i.content for i in reopened.knowledge_items) == contents
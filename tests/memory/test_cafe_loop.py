@@ -0,0 +1,86 @@
+"""Batch scoring and memoized model-bias lookups of CAFEScorer."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import src.memory.cafe_loop as cafe_loop
+import src.memory.storage_v2 as storage_v2_module
+from src.memory.cafe_loop import CAFEScorer
+
+MODELS = ["gpt-4o", "GPT-4o-mini ", "claude-3-haiku", "llama-3-70b", "mistral", ""]
+
+
+@pytest.fixture()
+def scorer(monkeypatch):
+    monkeypatch.setenv("CAFE_MODEL_CONF_BIAS_JSON", '{"gpt-4o": 0.15, "llama": -0.3, "haiku": 0.05}')
+    return CAFEScorer()
+
+
+def _events(n, seed=3):
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        event = {
+            "value_score": rng.choice([rng.random(), rng.uniform(-0.5, 1.5), None, "0.4"]),
+            "novelty_score": rng.random(),
+            "confidence": rng.random(),
+            "risk_score": rng.choice([rng.random(), 1.0, 0.0]),
+        }
+        model = MODELS[i % len(MODELS)]
+        if i % 2:
+            event["model"] = model
+        else:
+            event["context"] = {"route_model": model}
+        events.append(event)
+    return events
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_score_events_matches_score_event(scorer, monkeypatch, use_numpy):
+    if use_numpy and not cafe_loop.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(cafe_loop, "NUMPY_AVAILABLE", use_numpy)
+    events = _events(2000)
+    assert scorer.score_events(events) == [scorer.score_event(event) for event in events]
+    assert scorer.score_events([]) == []
+
+
+def test_disabled_scorer_scores_nothing(scorer):
+    scorer.enabled = False
+    assert scorer.score_events(_events(3)) == [{"enabled": False}] * 3
+
+
+def test_model_bias_is_memoized_and_invalidated(scorer):
+    assert scorer._model_bias("Meta-Llama-3-8B") == -0.3
+    assert scorer._model_bias("Meta-Llama-3-8B") == -0.3
+    assert scorer._resolve_bias.cache_info().hits == 1
+
+    scorer.set_model_conf_bias({"llama": 0.1})
+    assert scorer._resolve_bias.cache_info().currsize == 0
+    assert scorer._model_bias("Meta-Llama-3-8B") == 0.1
+    assert scorer._model_bias("gpt-4o") == 0.0
+    assert scorer.score_events([{"model": "llama-2", "confidence": 0.5}])[0]["model_conf_bias"] == 0.1
+
+
+def test_record_learning_events_scores_the_batch_once(tmp_path, monkeypatch, scorer):
+    monkeypatch.setattr(storage_v2_module.LearningStorageV2, "_instance", None)
+    storage = storage_v2_module.LearningStorageV2(base_path=str(tmp_path))
+    monkeypatch.setattr(cafe_loop, "_cafe_scorer", scorer)
+    calls = []
+    real = scorer.score_events
+    monkeypatch.setattr(scorer, "score_events", lambda events: calls.append(len(events)) or real(events))
+
+    events = _events(50)
+    events[0]["cafe"] = {"enabled": True, "score": 1.0}
+    storage.record_learning_events(events)
+
+    assert calls == [49]
+    stored = storage.list_learning_events(limit=100)
+    assert stored[0]["cafe"] == {"enabled": True, "score": 1.0}
+    for event, row in zip(events[1:], stored[1:]):
+        assert row["cafe"] == scorer.score_event(event)
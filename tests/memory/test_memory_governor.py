@@ -0,0 +1,99 @@
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.memory.memory_governor import MemoryGovernor, TTLSignatureCache  # noqa: E402
+
+
+def _payload(i):
+    return {"source": "test", "event_type": "observation", "content": f"payload {i}"}
+
+
+def _rss_kb():
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def test_repeat_inside_window_is_dropped_and_expires_after_window():
+    cache = TTLSignatureCache(window_seconds=10, capacity=100)
+    assert cache.seen("a", now=1000.0) is False
+    assert cache.seen("a", now=1005.0) is True
+    # The repeat refreshed the window, so 1014 is still inside it.
+    assert cache.seen("a", now=1014.0) is True
+    assert cache.seen("a", now=1030.0) is False
+    assert cache.expirations == 1
+
+
+def test_capacity_bound_evicts_least_recently_seen():
+    cache = TTLSignatureCache(window_seconds=3600, capacity=3)
+    for sig in ("a", "b", "c"):
+        cache.seen(sig, now=0.0)
+    cache.seen("a", now=1.0)
+    cache.seen("d", now=2.0)
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.evictions == 1
+
+
+def test_windows_follow_category_ttl_and_overrides():
+    gov = MemoryGovernor(dedup_capacity=10)
+    assert gov.dedup_window_seconds("learning_event") == 30 * 86400
+    assert gov.dedup_window_seconds("unknown") == 90 * 86400
+    gov.dedup_window_seconds_by_category["proposal"] = 60
+    assert gov.dedup_window_seconds("proposal") == 60
+
+
+def test_should_keep_dedups_and_reports_metrics():
+    gov = MemoryGovernor(dedup_capacity=2)
+    assert gov.should_keep(_payload(1), category="learning_event") is True
+    assert gov.should_keep(_payload(1), category="learning_event") is False
+    assert gov.should_keep({**_payload(1), "dedup_strict": False}, category="learning_event") is True
+    # Same payload in another category has its own window.
+    assert gov.should_keep(_payload(1), category="proposal") is True
+    gov.should_keep(_payload(2), category="learning_event")
+    gov.should_keep(_payload(3), category="learning_event")
+
+    metrics = gov.get_dedup_metrics()
+    assert metrics["duplicates"] == 1
+    event_metrics = metrics["categories"]["learning_event"]
+    assert event_metrics["size"] == 2 and event_metrics["evictions"] == 1
+    assert 0.0 < event_metrics["false_positive_rate"] < 1e-15
+
+
+def test_snapshot_restore_survives_restart(tmp_path):
+    path = tmp_path / "memory_governor_dedup.json"
+    gov = MemoryGovernor(dedup_capacity=100)
+    gov.should_keep(_payload(1), category="learning_event")
+    assert gov.save_snapshot(path) is True
+
+    restarted = MemoryGovernor(dedup_capacity=100)
+    assert restarted.load_snapshot(path) == 1
+    assert restarted.should_keep(_payload(1), category="learning_event") is False
+    assert restarted.should_keep(_payload(2), category="learning_event") is True
+
+
+def test_soak_signature_stream_keeps_memory_flat():
+    # MEMORY_GOVERNOR_SOAK_N=10000000 runs the full 10M soak.
+    total = int(os.getenv("MEMORY_GOVERNOR_SOAK_N", "300000"))
+    gov = MemoryGovernor(dedup_capacity=20000)
+    warmup = total // 10
+    for i in range(warmup):
+        gov.should_keep(_payload(i), category="learning_event")
+    rss_after_warmup = _rss_kb()
+    for i in range(warmup, total):
+        gov.should_keep(_payload(i), category="learning_event")
+    rss_after_soak = _rss_kb()
+
+    metrics = gov.get_dedup_metrics()["categories"]["learning_event"]
+    assert metrics["size"] == 20000
+    assert metrics["evictions"] == total - 20000
+    if rss_after_warmup and rss_after_soak:
+        assert rss_after_soak - rss_after_warmup < 16 * 1024
@@ -0,0 +1,123 @@
+"""Journaled state, batched sampling and discounting of PolicyBandit."""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import src.memory.storage_v2 as storage_v2_module
+from src.memory.policy_bandit import PolicyBandit
+
+
+@pytest.fixture()
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setenv("POLICY_CHECKPOINT_EVERY", "100000")
+    monkeypatch.setenv("POLICY_CHECKPOINT_INTERVAL", "100000")
+    # LearningStorageV2 is a process-wide singleton; build a fresh one on tmp_path.
+    monkeypatch.setattr(storage_v2_module.LearningStorageV2, "_instance", None)
+    storage = storage_v2_module.LearningStorageV2(base_path=str(tmp_path))
+    monkeypatch.setattr(storage_v2_module, "_storage_v2", storage)
+    return storage
+
+
+def _arms(bandit):
+    return json.loads(json.dumps(bandit.get_state()["arms"]))
+
+
+def test_crash_before_checkpoint_is_recovered_from_the_journal(storage):
+    random.seed(7)
+    bandit = PolicyBandit()
+    for i in range(60):
+        selected = bandit.select_policy()
+        bandit.update("win" if i % 3 else "loss", selected=selected, weight=1.0 + (i % 4) / 2)
+    bandit.get_state()["arms"]["focus_policy"]["learning_first"]["a"] = 900.0
+    bandit.apply_drift_guard()
+    expected_arms = _arms(bandit)
+    expected_selected = dict(bandit.get_state()["selected"])
+    assert "journal_seq" not in storage.get_policy_state()
+
+    # Simulated crash: the process dies without a checkpoint.
+    recovered = PolicyBandit()
+    assert _arms(recovered) == expected_arms
+    assert recovered.get_state()["selected"] == expected_selected
+    assert len(recovered.get_state()["history"]) == 61
+
+
+def test_checkpoint_truncates_journal_and_is_not_replayed_twice(storage):
+    bandit = PolicyBandit()
+    bandit.update("win", selected={"approve_threshold": "0.82"})
+    bandit.flush()
+    assert len(bandit._journal) == 0
+    assert storage.get_policy_state()["journal_seq"] == 1
+    assert "history" not in storage.get_policy_state()
+
+    bandit.update("win", selected={"approve_threshold": "0.82"})
+    recovered = PolicyBandit()
+    assert recovered.get_state()["arms"]["approve_threshold"]["0.82"]["a"] == 3.0
+
+
+def test_history_ring_is_capped_and_legacy_history_is_moved_out(storage, monkeypatch):
+    monkeypatch.setenv("POLICY_HISTORY_MAX", "10")
+    legacy = [{"ts": str(i), "verdict": "win", "selected": {}, "weight": 1.0} for i in range(25)]
+    storage.save_policy_state({**PolicyBandit.DEFAULT_STATE, "history": legacy})
+
+    bandit = PolicyBandit()
+    assert [h["ts"] for h in bandit.get_state()["history"]] == [str(i) for i in range(15, 25)]
+    for _ in range(30):
+        bandit.update("loss", selected={"scan_min_score": "6.0"})
+    assert len(bandit.get_state()["history"]) == 10
+    assert len(bandit._history) < 20
+
+    bandit.flush()
+    assert "history" not in storage.get_policy_state()
+    assert len(PolicyBandit().get_state()["history"]) == 10
+
+
+def test_select_policies_draws_a_batch_with_one_journal_row(storage):
+    bandit = PolicyBandit()
+    bandit.get_state()["arms"]["approve_threshold"]["0.86"]["a"] = 500.0
+    selections = bandit.select_policies(64)
+    assert len(selections) == 64
+    assert all(set(s) == set(PolicyBandit.POLICY_FAMILIES) for s in selections)
+    assert sum(s["approve_threshold"] == "0.86" for s in selections) > 60
+    assert bandit.get_state()["selected"] == selections[-1]
+    assert len(bandit._journal) == 1
+
+
+def test_discount_fades_old_evidence(storage, monkeypatch):
+    monkeypatch.setenv("POLICY_BANDIT_DISCOUNT", "0.9")
+    bandit = PolicyBandit()
+    for _ in range(200):
+        bandit.update("win", selected={"focus_policy": "execution_first"})
+    arms = bandit.get_state()["arms"]["focus_policy"]
+    # Steady state of a -> 1 + (a - 1) * 0.9 + 1 is a = 11.
+    assert arms["execution_first"]["a"] == pytest.approx(11.0, abs=0.01)
+    for _ in range(50):
+        bandit.update("win", selected={"focus_policy": "learning_first"})
+    assert arms["execution_first"]["a"] < 1.1
+    assert arms["learning_first"]["a"] > arms["execution_first"]["a"]
+
+    recovered = PolicyBandit()
+    assert _arms(recovered) == _arms(bandit)
+
+
+def test_legacy_jsonl_journal_and_history_are_imported(storage):
+    bandit = PolicyBandit()
+    storage.save_policy_state({**PolicyBandit.DEFAULT_STATE, "journal_seq": 1})
+    bandit.journal_file.write_text(
+        '{"seq": 1, "op": "update", "selected": {"approve_threshold": "0.82"}, "reward": 1.0}\n'
+        '{"seq": 2, "op": "update", "selected": {"approve_threshold": "0.82"}, "reward": 1.0}\n'
+        '{"seq": 3, "op": "upd',
+        encoding="utf-8",
+    )
+    bandit.history_file.write_text('{"ts": "a", "verdict": "win"}\n', encoding="utf-8")
+
+    recovered = PolicyBandit()
+    assert recovered.get_state()["arms"]["approve_threshold"]["0.82"]["a"] == 2.0
+    assert [h["ts"] for h in recovered.get_state()["history"]] == ["a"]
+    assert not bandit.journal_file.exists() and not bandit.history_file.exists()
+    assert len(PolicyBandit()._journal) == 2
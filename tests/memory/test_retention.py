@@ -0,0 +1,125 @@
+"""Tests for time-partitioned retention compaction."""
+
+import json
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.memory.memory_governor import MemoryGovernor
+from src.memory.retention import (
+    RetentionEngine,
+    list_partitions,
+    partition_dir,
+    seal_active_file,
+    stream_prune_file,
+)
+from src.memory.storage_v2 import LearningStorageV2
+
+
+def _fresh_storage(tmp_path, monkeypatch) -> LearningStorageV2:
+    monkeypatch.setattr(LearningStorageV2, "_instance", None)
+    return LearningStorageV2(base_path=str(tmp_path))
+
+
+def _write_rows(path: Path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def test_seal_splits_active_file_into_day_partitions(tmp_path):
+    active = tmp_path / "learning_events.jsonl"
+    now = datetime(2026, 10, 18, 12, 0)
+    _write_rows(active, [
+        {"id": "a", "ts": (now - timedelta(days=2)).isoformat()},
+        {"id": "b", "ts": (now - timedelta(days=1)).isoformat()},
+        {"id": "c", "ts": (now - timedelta(days=1, hours=1)).isoformat()},
+    ])
+    stats = seal_active_file(active)
+    assert stats == {"sealed_rows": 3, "partitions_touched": 2}
+    assert not active.exists()
+    days = [day.isoformat() for day, _ in list_partitions(active)]
+    assert days == ["2026-10-16", "2026-10-17"]
+    assert (partition_dir(active) / "2026-10-17.jsonl").read_text().count("\n") == 2
+
+
+def test_storage_reads_span_partitions_and_active_file(tmp_path, monkeypatch):
+    storage = _fresh_storage(tmp_path, monkeypatch)
+    for i in range(5):
+        storage.record_learning_event({"id": f"evt_{i}", "source": "test"})
+    seal_active_file(storage.learning_events_file)
+    for i in range(5, 8):
+        storage.record_learning_event({"id": f"evt_{i}", "source": "test"})
+
+    assert [e["id"] for e in storage.list_learning_events(limit=6)] == [f"evt_{i}" for i in range(2, 8)]
+    assert [e["id"] for e in storage._iter_jsonl(storage.learning_events_file)] == [f"evt_{i}" for i in range(8)]
+
+
+def test_compaction_drops_expired_partitions_and_streams_boundary(tmp_path, monkeypatch):
+    storage = _fresh_storage(tmp_path, monkeypatch)
+    governor = MemoryGovernor()
+    routing_dir = tmp_path / "routing"
+    now = datetime.now().replace(microsecond=0)
+    cutoff = governor.retention_cutoff("learning_event", now)
+
+    events = []
+    for days_ago in (45, 40, 31):
+        events.append({"id": f"old_{days_ago}", "ts": (now - timedelta(days=days_ago)).isoformat(), "source": "t"})
+    events.append({"id": "boundary_old", "ts": (cutoff - timedelta(minutes=1)).isoformat(), "source": "t"})
+    events.append({"id": "boundary_new", "ts": (cutoff + timedelta(minutes=1)).isoformat(), "source": "t"})
+    events.append({"id": "fresh", "ts": now.isoformat(), "source": "t"})
+    events.sort(key=lambda e: e["ts"])
+    _write_rows(storage.learning_events_file, events)
+
+    _write_rows(storage.outcome_evidence_file, [
+        {"id": "evd_old", "ts": (now - timedelta(days=400)).isoformat(), "verdict": "win"},
+        {"id": "evd_new", "ts": now.isoformat(), "verdict": "win"},
+    ])
+    storage.save_proposals_v2({"proposals": [
+        {"id": "p_old_done", "status": "verified", "created_at": (now - timedelta(days=90)).isoformat()},
+        {"id": "p_old_open", "status": "pending_approval", "created_at": (now - timedelta(days=90)).isoformat()},
+        {"id": "p_new_done", "status": "verified", "created_at": now.isoformat()},
+    ], "pending": []})
+    old_day = (now - timedelta(days=60)).strftime("%Y%m%d")
+    _write_rows(routing_dir / f"routing_events_{old_day}.jsonl", [{"timestamp": (now - timedelta(days=60)).isoformat()}])
+    _write_rows(routing_dir / f"routing_events_{now.strftime('%Y%m%d')}.jsonl", [{"timestamp": now.isoformat()}])
+
+    report = RetentionEngine(storage=storage, governor=governor, routing_dir=routing_dir).run(now=now)
+
+    assert report["ok"] is True
+    assert report["bytes_reclaimed"] > 0 and report["duration_ms"] >= 0
+    events_report = report["stores"]["learning_events"]
+    assert events_report["partitions_deleted"] == 3
+    assert events_report["boundary_pruned"] == 1 and events_report["rows_dropped"] == 1
+    kept = [e["id"] for e in storage._iter_jsonl(storage.learning_events_file)]
+    assert kept == ["boundary_new", "fresh"]
+    assert [e["id"] for e in storage._iter_jsonl(storage.outcome_evidence_file)] == ["evd_new"]
+    assert [p["id"] for p in storage.get_proposals_v2()["proposals"]] == ["p_old_open", "p_new_done"]
+    assert sorted(p.name for p in routing_dir.iterdir()) == [f"routing_events_{now.strftime('%Y%m%d')}.jsonl"]
+    # Counters were reconciled against what is left.
+    assert storage.reconcile_counters(apply=False)["drift_count"] == 0
+
+
+def test_boundary_prune_memory_is_independent_of_file_size(tmp_path):
+    cutoff = datetime(2026, 10, 1, 12, 0)
+
+    def peak_for(rows: int) -> int:
+        path = tmp_path / f"part_{rows}.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(rows):
+                ts = cutoff + timedelta(seconds=(i - rows // 2))
+                f.write(json.dumps({"id": i, "ts": ts.isoformat(), "pad": "x" * 200}) + "\n")
+        tracemalloc.start()
+        result = stream_prune_file(path, cutoff)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert result["rows_dropped"] == rows // 2
+        return peak
+
+    small = peak_for(2000)
+    large = peak_for(40000)
+    assert large < small + 64 * 1024
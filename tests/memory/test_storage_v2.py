@@ -0,0 +1,226 @@
+"""Tests for LearningStorageV2 tail reads and the experiment run log."""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.memory.learning_counters import LearningCounterStore
+from src.memory.storage_v2 import ExperimentRunLog, LearningStorageV2, read_tail_lines
+
+
+def _write_lines(path: Path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def _fresh_storage(tmp_path, monkeypatch) -> LearningStorageV2:
+    monkeypatch.setattr(LearningStorageV2, "_instance", None)
+    return LearningStorageV2(base_path=str(tmp_path))
+
+
+def test_read_tail_lines_matches_full_read(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _write_lines(path, [{"i": i, "pad": "x" * (i % 97)} for i in range(5000)])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n\n")
+
+    for limit in (1, 7, 100, 4999, 5000, 6000):
+        tail = read_tail_lines(path, limit=limit, chunk_size=1024)
+        expected = [x.strip() for x in path.read_text(encoding="utf-8").splitlines() if x.strip()][-limit:]
+        assert tail == expected
+
+
+def test_read_tail_lines_handles_missing_trailing_newline(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"a": 1}\n{"a": 2}', encoding="utf-8")
+    assert read_tail_lines(path, limit=1) == ['{"a": 2}']
+    assert read_tail_lines(path, limit=5) == ['{"a": 1}', '{"a": 2}']
+
+
+def test_run_log_update_appends_single_row(tmp_path):
+    log = ExperimentRunLog(tmp_path / "runs.jsonl")
+    for i in range(10):
+        assert log.add({"id": f"run_{i}", "status": "running"})
+    size_before = (tmp_path / "runs.jsonl").stat().st_size
+
+    assert log.update("run_3", {"status": "done", "score": 0.5})
+    assert log.update("missing", {"status": "done"}) is False
+
+    row = log.get("run_3")
+    assert row["status"] == "done" and row["score"] == 0.5
+    grown = (tmp_path / "runs.jsonl").stat().st_size - size_before
+    assert 0 < grown < 200
+    assert [r["id"] for r in log.recent(limit=3)] == ["run_7", "run_8", "run_9"]
+
+
+def test_run_log_index_survives_reopen_and_compaction(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    log = ExperimentRunLog(path, max_runs=50)
+    for i in range(80):
+        log.add({"id": f"run_{i}", "n": 0})
+    for n in range(1, 40):
+        log.update("run_79", {"n": n})
+
+    reopened = ExperimentRunLog(path, max_runs=50)
+    assert len(reopened) == 50
+    assert reopened.get("run_79")["n"] == 39
+    assert reopened.get("run_0") is None
+
+    log.compact()
+    lines = [x for x in path.read_text(encoding="utf-8").splitlines() if x.strip()]
+    assert len(lines) == 50
+    assert log.get("run_79")["n"] == 39
+
+
+def test_run_log_picks_up_appends_from_other_writer(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    first = ExperimentRunLog(path)
+    second = ExperimentRunLog(path)
+    first.add({"id": "run_a", "status": "running"})
+    second.update("run_a", {"status": "done"})
+    assert first.get("run_a")["status"] == "done"
+
+
+def test_legacy_experiment_runs_are_migrated(tmp_path, monkeypatch):
+    legacy = tmp_path / "experiments" / "experiment_runs_v2.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(
+        json.dumps({"runs": [{"id": f"run_{i}", "status": "completed"} for i in range(5)]}),
+        encoding="utf-8",
+    )
+
+    storage = _fresh_storage(tmp_path, monkeypatch)
+
+    assert [r["id"] for r in storage.get_experiment_runs(limit=10)] == [f"run_{i}" for i in range(5)]
+    assert not legacy.exists()
+    assert legacy.with_name("experiment_runs_v2.json.migrated").exists()
+    assert storage.update_experiment_run("run_2", {"verification": {"verdict": "win"}})
+    assert storage.get_experiment_run("run_2")["verification"]["verdict"] == "win"
+
+
+def test_counter_windows_use_buckets(tmp_path):
+    counters = LearningCounterStore(tmp_path / "counters.json")
+    now = datetime.now()
+    counters.incr("events.production", now - timedelta(hours=2))
+    counters.incr("events.production", now - timedelta(hours=30))
+    counters.incr("events.production", now - timedelta(days=20))
+
+    assert counters.window(24 * 3600)["events.production"] == 1
+    assert counters.window(7 * 24 * 3600)["events.production"] == 2
+    assert counters.window(30 * 24 * 3600)["events.production"] == 3
+    assert counters.window(3600, metrics=["evidence.win"]) == {"evidence.win": 0}
+
+    counters.flush()
+    reloaded = LearningCounterStore(tmp_path / "counters.json")
+    assert reloaded.loaded
+    assert reloaded.window(7 * 24 * 3600)["events.production"] == 2
+
+
+def test_counter_flushes_from_two_processes_merge_instead_of_overwriting(tmp_path):
+    path = tmp_path / "counters.json"
+    first = LearningCounterStore(path)
+    second = LearningCounterStore(path)
+    for _ in range(3):
+        first.incr("events.production")
+    second.incr("events.production")
+    second.incr_total("proposals.total", 2)
+    first.flush()
+    second.flush()
+    first.incr("events.production")
+    first.flush()
+
+    reloaded = LearningCounterStore(path)
+    assert reloaded.window(3600)["events.production"] == 5
+    assert reloaded.total("proposals.total") == 2
+
+
+def test_counter_reads_pick_up_other_writers(tmp_path):
+    path = tmp_path / "counters.json"
+    reader = LearningCounterStore(path)
+    writer = LearningCounterStore(path)
+    reader.incr("evidence.win")
+    writer.incr("events.production")
+    writer.incr("events.production")
+    writer.flush()
+
+    # The reader sees the writer's flushed counts plus its own unflushed delta.
+    counts = reader.window(3600)
+    assert counts["events.production"] == 2
+    assert counts["evidence.win"] == 1
+    reader.flush()
+    assert LearningCounterStore(path).window(3600) == {"events.production": 2, "evidence.win": 1}
+
+
+def test_funnel_counters_follow_proposal_status(tmp_path, monkeypatch):
+    storage = _fresh_storage(tmp_path, monkeypatch)
+    storage.record_learning_event({"source": "scanner", "content": "a"})
+    storage.record_learning_event({"source": "unit_test", "content": "b"})
+    created_at = datetime.now().isoformat()
+    rows = [{"id": f"pv2_{i}", "status": "pending_approval", "created_at": created_at} for i in range(4)]
+    storage.save_proposals_v2({"proposals": rows})
+    rows[0]["status"] = "approved"
+    rows[1]["status"] = "verified"
+    storage.save_proposals_v2({"proposals": rows})
+    storage.record_outcome_evidence({"verdict": "win"})
+    storage.record_outcome_evidence({"verdict": "loss", "holdout_pending": True})
+
+    funnel = storage.get_funnel_window(24)
+    assert funnel["events"] == {"production": 1, "non_production": 1}
+    assert (funnel["created"], funnel["approved"], funnel["executed"], funnel["verified"]) == (4, 2, 1, 1)
+    assert funnel["verdicts"] == {"win": 1, "loss": 0, "inconclusive": 0}
+    assert storage.get_proposal_total() == 4
+    assert storage.get_proposal_status_counts() == {"pending_approval": 2, "approved": 1, "verified": 1}
+
+    report = storage.reconcile_counters(apply=False)
+    assert report["drift_count"] == 0
+
+
+def test_same_proposal_transition_saved_by_two_instances_counts_once(tmp_path, monkeypatch):
+    first = _fresh_storage(tmp_path, monkeypatch)
+    second = _fresh_storage(tmp_path, monkeypatch)
+    assert first is not second
+    created_at = datetime.now().isoformat()
+    rows = [{"id": "pv2_0", "status": "pending_approval", "created_at": created_at}]
+    first.save_proposals_v2({"proposals": rows})
+    second.save_proposals_v2({"proposals": rows})
+    rows[0]["status"] = "approved"
+    first.save_proposals_v2({"proposals": rows})
+    second.save_proposals_v2({"proposals": rows})
+    first.counters.flush()
+    second.counters.flush()
+
+    counters = LearningCounterStore(first.counters_file)
+    assert counters.total("proposals.total") == 1
+    assert counters.total("status.approved") == 1
+    assert counters.total("status.pending_approval") == 0
+    assert counters.window(3600).get("proposals.approved") == 1
+    assert first.reconcile_counters(apply=False)["drift_count"] == 0
+
+
+def test_reconcile_reports_and_repairs_drift(tmp_path, monkeypatch):
+    storage = _fresh_storage(tmp_path, monkeypatch)
+    storage.record_learning_event({"source": "scanner", "content": "a"})
+    # Simulate a write that bypassed the counters (e.g. another process).
+    storage.append_jsonl(storage.learning_events_file, {"id": "evt_x", "ts": datetime.now().isoformat()})
+
+    report = storage.reconcile_counters(apply=True)
+    assert report["drift_count"] >= 1
+    assert any(row["metric"] == "events.production" and row["actual"] == 2 for row in report["drift"])
+    assert storage.get_funnel_window(1)["events"]["production"] == 2
+    assert storage.reconcile_counters(apply=False)["drift_count"] == 0
+
+
+def test_record_learning_events_appends_a_batch(tmp_path, monkeypatch):
+    storage = _fresh_storage(tmp_path, monkeypatch)
+    ids = storage.record_learning_events([
+        {"source": "user_feedback", "event_type": "a", "cafe": {}},
+        {"source": "user_feedback", "event_type": "b", "cafe": {}},
+    ])
+    rows = storage.list_learning_events(limit=10)
+    assert [row["id"] for row in rows] == ids
+    assert [row["event_type"] for row in rows] == ["a", "b"]
+    assert storage.record_learning_events([]) == []
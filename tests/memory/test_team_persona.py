@@ -0,0 +1,193 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from src.memory.persona_segments import MemberSegmentLog
+from src.memory.team_persona import TeamPersonaStore
+
+
+def _store(tmp_path):
+    return TeamPersonaStore(
+        state_path=tmp_path / "team_personas.json",
+        events_path=tmp_path / "team_persona_events.jsonl",
+    )
+
+
+def test_member_history_comes_from_segments_newest_first(tmp_path):
+    store = _store(tmp_path)
+    for i in range(30):
+        store.record_interaction("dev-a" if i % 3 else "dev-b", f"message {i}")
+
+    history = store.list_interactions("dev-b", limit=4)
+    assert [row["message_preview"] for row in history] == ["message 27", "message 24", "message 21", "message 18"]
+    assert all(row["member_id"] == "dev-b" for row in history)
+    assert store._segments.count("dev-a") == 20
+
+    everything = store.list_interactions(limit=5)
+    assert [row["message_preview"] for row in everything] == [f"message {i}" for i in range(29, 24, -1)]
+
+
+def test_segments_are_rebuilt_from_an_existing_events_log(tmp_path):
+    events = tmp_path / "team_persona_events.jsonl"
+    with open(events, "w", encoding="utf-8") as f:
+        for i in range(10):
+            f.write(json.dumps({"timestamp": f"2026-01-01T00:00:{i:02d}", "member_id": f"m{i % 2}", "n": i}) + "\n")
+    store = _store(tmp_path)
+    assert [row["n"] for row in store.list_interactions("m1", limit=3)] == [9, 7, 5]
+
+    store.record_interaction("m1", "fresh")
+    assert store.list_interactions("m1", limit=1)[0]["message_preview"] == "fresh"
+    assert store._segments.count("m1") == 6
+
+
+def test_catch_up_never_duplicates_rows(tmp_path):
+    events = tmp_path / "events.jsonl"
+    line = (json.dumps({"member_id": "a", "n": 1}) + "\n").encode()
+    events.write_bytes(line)
+    log = MemberSegmentLog(events)
+    log.append("a", line, 0)  # written, but the high-water mark was never saved
+    fresh = MemberSegmentLog(events)
+    assert fresh.indexed_offset == 0
+    fresh.catch_up()
+    assert fresh.count("a") == 1
+
+
+def test_two_stores_sharing_one_log_see_each_others_rows(tmp_path):
+    first, second = _store(tmp_path), _store(tmp_path)
+    first.record_interaction("dev-a", "one")
+    second.record_interaction("dev-a", "two")
+    first.record_interaction("dev-a", "three")
+    second.record_interaction("dev-b", "four")
+
+    for store in (first, second):
+        history = store.list_interactions("dev-a", limit=10)
+        assert [row["message_preview"] for row in history] == ["three", "two", "one"]
+    assert first._segments.count("dev-a") == 3
+    assert first.list_interactions("dev-b")[0]["message_preview"] == "four"
+
+
+def _append_from_child(tmp_path, name, count):
+    store = _store(tmp_path)
+    for i in range(count):
+        store.record_interaction("shared", f"{name}-{i}")
+    os._exit(0)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_concurrent_processes_keep_segment_offsets_consistent(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    children = [ctx.Process(target=_append_from_child, args=(tmp_path, name, 40)) for name in "ab"]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join(30)
+        assert child.exitcode == 0
+
+    store = _store(tmp_path)
+    history = store.list_interactions("shared", limit=600)
+    assert len(history) == 80
+    events = [json.loads(line) for line in (tmp_path / "team_persona_events.jsonl").read_text().splitlines()]
+    assert [row["message_preview"] for row in reversed(history)] == [row["message_preview"] for row in events]
+
+
+def test_legacy_rows_are_bucketed_by_normalized_member_id(tmp_path):
+    events = tmp_path / "team_persona_events.jsonl"
+    events.write_text(
+        "".join(json.dumps({"member_id": member, "n": i}) + "\n" for i, member in enumerate(["Dev A", "dev-a", " DEV A "])),
+        encoding="utf-8",
+    )
+    store = _store(tmp_path)
+    assert [row["n"] for row in store.list_interactions("Dev A")] == [2, 1, 0]
+    assert store._segments.count("dev-a") == 3
+
+
+def test_state_is_written_behind_as_deltas_and_survives_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_PERSONA_FLUSH_EVERY", "1000")
+    monkeypatch.setenv("TEAM_PERSONA_FLUSH_INTERVAL", "1000")
+    store = _store(tmp_path)
+    snapshot_before = (tmp_path / "team_personas.json").read_text(encoding="utf-8")
+    store.upsert_member("pm-lan", {"name": "Lan", "preferences": {"response_structure": "steps"}})
+    for _ in range(5):
+        store.record_interaction("pm-lan", "Chỉ làm luôn, không cần hỏi lại.", intent="delivery_push")
+
+    assert (tmp_path / "team_personas.json").read_text(encoding="utf-8") == snapshot_before
+    assert len(store._deltas) == 0
+    store.flush()
+    assert len(store._deltas) == 1
+
+    reopened = _store(tmp_path)
+    member = reopened.get_member("pm-lan")
+    assert member["name"] == "Lan"
+    assert member["learning"]["interaction_count"] == 5
+    assert member["signals"]["direct"] == 5
+
+
+def test_compaction_rewrites_snapshot_and_truncates_deltas(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEAM_PERSONA_FLUSH_EVERY", "1")
+    monkeypatch.setenv("TEAM_PERSONA_COMPACT_EVERY", "10")
+    store = _store(tmp_path)
+    for i in range(12):
+        store.record_interaction(f"member-{i}", "hello")
+    assert store._delta_rows == 2
+    snapshot = json.loads((tmp_path / "team_personas.json").read_text(encoding="utf-8"))
+    assert len(snapshot["members"]) == 10
+    assert len(_store(tmp_path).list_members()) == 12
+
+
+def test_legacy_delta_file_is_imported(tmp_path):
+    (tmp_path / "team_personas.json").write_text(
+        json.dumps({"version": 1, "members": {"a": {"name": "Old A"}}}), encoding="utf-8"
+    )
+    (tmp_path / "team_personas.deltas.jsonl").write_text(
+        json.dumps({"member_id": "a", "member": {"name": "New A"}}) + "\n"
+        + json.dumps({"member_id": "b", "member": {"name": "B"}}) + "\n"
+        + '{"member_id": "c", "mem',
+        encoding="utf-8",
+    )
+    store = _store(tmp_path)
+    assert store.get_member("a")["name"] == "New A"
+    assert store.get_member("b")["name"] == "B"
+    assert store._delta_rows == 2
+    assert not store.deltas_path.exists()
+
+
+def test_recommend_adaptation_uses_incremental_aggregates(tmp_path):
+    store = _store(tmp_path)
+    store.upsert_member("ops", {"work_style": {"autonomy_preference": "guarded"}})
+    for _ in range(4):
+        store.record_interaction("ops", "please review and kiểm tra carefully, safe rollout")
+
+    adaptation = store.recommend_adaptation("ops", intent="deploy")
+    assert adaptation["known_member"] is True
+    assert adaptation["features"]["safety_ratio"] == 1.0
+    assert adaptation["orchestration"]["autonomy_mode"] == "safe"
+    assert adaptation["hints"][-1] == "Intent context: deploy"
+
+    store.upsert_member("ops", {"work_style": {"autonomy_preference": "high"}, "persona": {"risk_posture": "balanced"}})
+    assert store.recommend_adaptation("ops")["orchestration"]["autonomy_mode"] == "full_auto"
+
+
+def test_pending_deltas_are_flushed_on_a_timer(tmp_path, monkeypatch):
+    import time
+
+    monkeypatch.setenv("TEAM_PERSONA_FLUSH_EVERY", "1000")
+    monkeypatch.setenv("TEAM_PERSONA_FLUSH_INTERVAL", "0.1")
+    store = _store(tmp_path)
+    store.record_interaction("dev-a", "first")
+    store.record_interaction("dev-b", "second")
+    deadline = time.monotonic() + 5
+    while not len(store._deltas) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(store._deltas) == 2
+    while store._flusher is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert store._flusher is None
+
+
+def test_record_interaction_stores_a_normalized_member(tmp_path):
+    store = _store(tmp_path)
+    updated = store.record_interaction("Dev A", "hello")["member"]
+    assert updated == store._normalize_member(updated["member_id"], updated)
+    assert updated["name"] == updated["member_id"]
@@ -0,0 +1,182 @@
+"""Write-behind journal, normalized rule keys and ranked index of UserFeedbackManager."""
+
+import json
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import src.memory.user_feedback as uf
+from src.memory.user_feedback import UserFeedbackManager
+
+
+@pytest.fixture()
+def events(monkeypatch):
+    batches = []
+    exit_hooks = []
+    monkeypatch.setattr(uf, "record_learning_events", lambda rows: batches.append(list(rows)))
+    # Run the managers' exit flushes while record_learning_events is still patched,
+    # instead of at interpreter exit against the real storage under data/.
+    monkeypatch.setattr(uf, "atexit", SimpleNamespace(register=exit_hooks.append))
+    monkeypatch.setenv("FEEDBACK_CHECKPOINT_EVERY", "100000")
+    monkeypatch.setenv("FEEDBACK_CHECKPOINT_INTERVAL", "100000")
+    monkeypatch.setenv("FEEDBACK_EVENT_INTERVAL", "100000")
+    yield batches
+    for hook in exit_hooks:
+        try:
+            hook()
+        except Exception:
+            pass  # like atexit: a manager left broken by its test must not fail teardown
+
+
+def _state(fm):
+    return fm.stats, fm.learning_rules, fm.preference_patterns, fm.user_preferences, len(fm.feedback_history)
+
+
+def test_crash_before_checkpoint_is_recovered_from_the_journal(tmp_path, events):
+    fm = UserFeedbackManager(str(tmp_path))
+    for i in range(40):
+        fm.record_implicit_feedback("engage", f"widget_{i % 4}")
+        fm.record_correction(f"Use var x = {i % 3}", f"Use let x = {i % 3}")
+    fm.record_denial("rm -rf", reason="too risky")
+    fm.set_control_level("APPROVE")
+    assert not (tmp_path / "user_feedback.json").exists()
+    expected = json.loads(json.dumps(_state(fm)))
+
+    # Simulated crash: the process dies without a checkpoint.
+    fm._pending_events.clear()
+
+    recovered = UserFeedbackManager(str(tmp_path))
+    assert json.loads(json.dumps(_state(recovered))) == expected
+    assert recovered.get_control_level() == "APPROVE"
+    recovered._pending_events.clear()
+
+
+def test_crash_between_checkpoint_files_does_not_double_apply(tmp_path, events, monkeypatch):
+    fm = UserFeedbackManager(str(tmp_path))
+    fm.record_approval("deploy")
+    fm.flush()
+    fm.record_approval("deploy")
+    fm.record_approval("deploy")
+    expected = json.loads(json.dumps(_state(fm)))
+
+    real_write = fm._write_json
+
+    def write_then_die(path, data):
+        real_write(path, data)
+        if path == fm.learning_file:
+            raise OSError("disk went away")
+
+    monkeypatch.setattr(fm, "_write_json", write_then_die)
+    with pytest.raises(OSError):
+        fm._checkpoint()
+
+    recovered = UserFeedbackManager(str(tmp_path))
+    assert json.loads(json.dumps(_state(recovered))) == expected
+    assert recovered.learning_rules["approval:deploy"]["count"] == 3
+
+
+def test_checkpoint_rewrites_files_and_truncates_journal(tmp_path, events, monkeypatch):
+    monkeypatch.setenv("FEEDBACK_CHECKPOINT_EVERY", "5")
+    fm = UserFeedbackManager(str(tmp_path))
+    for i in range(7):
+        fm.record_approval(f"action_{i}")
+    saved = json.loads((tmp_path / "user_feedback.json").read_text(encoding="utf-8"))
+    assert saved["journal_seq"] == 5
+    assert len(fm._journal) == 2
+    assert UserFeedbackManager(str(tmp_path)).stats["approvals"] == 7
+    fm.flush()
+
+
+def test_legacy_jsonl_journal_is_imported(tmp_path, events):
+    (tmp_path / "user_feedback.journal.jsonl").write_text(
+        '{"seq": 1, "op": "preference", "key": "tone", "value": "brief"}\n'
+        '{"seq": 2, "op": "feedback", "entry": {"type": "approval", "action": "deploy",'
+        ' "timestamp": "2026-01-01T00:00:00"}}\n'
+        '{"seq": 3, "op": "feedback", "entry": {"ty',
+        encoding="utf-8",
+    )
+    fm = UserFeedbackManager(str(tmp_path))
+    assert fm.get_preference_setting("tone") == "brief"
+    assert fm.stats["approvals"] == 1
+    assert not (tmp_path / "user_feedback.journal.jsonl").exists()
+    assert len(fm._journal) == 2
+    fm._pending_events.clear()
+
+
+def test_learning_events_are_emitted_in_batches(tmp_path, events, monkeypatch):
+    monkeypatch.setenv("FEEDBACK_EVENT_BATCH", "4")
+    fm = UserFeedbackManager(str(tmp_path))
+    for _ in range(10):
+        fm.record_implicit_feedback("repeat", "generate_tests")
+    assert [len(b) for b in events] == [4, 4]
+    fm.flush()
+    assert [len(b) for b in events] == [4, 4, 2]
+    assert events[0][0]["event_type"] == "implicit_repeat"
+
+
+def test_near_identical_originals_share_one_rule(tmp_path, events):
+    fm = UserFeedbackManager(str(tmp_path))
+    fm.record_correction("Use var x = 1", "Use let x = 1")
+    fm.record_correction("  use  VAR x = 1. ", "Use const x = 1")
+    assert len(fm.get_corrections()) == 1
+    assert fm.get_corrections()[0]["count"] == 2
+    assert fm.get_correction_for("USE VAR X = 1") == "Use const x = 1"
+    fm.record_approval("Deploy Staging")
+    fm.record_approval("deploy staging")
+    fm.record_approval("deploy  staging!")
+    assert fm.should_auto_approve("DEPLOY STAGING")
+    fm.flush()
+
+
+def test_legacy_rule_keys_are_merged_on_load(tmp_path, events):
+    (tmp_path / "feedback_learning.json").write_text(json.dumps({
+        "rules": {
+            "correction:Use var": {"original": "Use var", "corrected": "a", "count": 2, "last_seen": "2026-01-01"},
+            "correction:use var": {"original": "use var", "corrected": "b", "count": 3, "last_seen": "2026-02-01"},
+            "denial:Drop DB": {"action": "Drop DB", "count": 1, "last_denied": "2026-01-01", "reasons": ["x"]},
+        },
+        "patterns": {},
+    }), encoding="utf-8")
+    fm = UserFeedbackManager(str(tmp_path))
+    corrections = fm.get_corrections()
+    assert len(corrections) == 1
+    assert corrections[0]["count"] == 5 and corrections[0]["corrected"] == "b"
+    assert fm.should_auto_deny("drop db") is False
+    fm.flush()
+
+
+def test_ranked_index_matches_a_full_sort(tmp_path, events):
+    fm = UserFeedbackManager(str(tmp_path))
+    rng = random.Random(5)
+    for _ in range(400):
+        n = rng.randrange(30)
+        fm.record_correction(f"original {n}", f"fixed {n}")
+        fm.record_approval(f"action {rng.randrange(20)}")
+    counts = [rule["count"] for rule in fm.get_corrections()]
+    assert counts == sorted(counts, reverse=True)
+    assert len(counts) == 30
+    top = fm.get_preferred_actions(limit=3)
+    assert [a["count"] for a in top] == sorted((r["count"] for k, r in fm.learning_rules.items() if k.startswith("approval:")), reverse=True)[:3]
+    fm.flush()
+
+
+def test_pending_work_is_flushed_without_another_write(tmp_path, events, monkeypatch):
+    import time
+
+    monkeypatch.setenv("FEEDBACK_EVENT_INTERVAL", "0.1")
+    monkeypatch.setenv("FEEDBACK_CHECKPOINT_INTERVAL", "0.2")
+    fm = UserFeedbackManager(str(tmp_path))
+    fm.record_approval("deploy")
+    deadline = time.monotonic() + 5
+    while (not events or not (tmp_path / "user_feedback.json").exists()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert sum(len(batch) for batch in events) == 1
+    assert json.loads((tmp_path / "user_feedback.json").read_text())["stats"]["approvals"] == 1
+    while fm._flusher is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert fm._flusher is None
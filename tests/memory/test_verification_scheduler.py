@@ -0,0 +1,172 @@
+"""Tests for the cooperative verification scheduler."""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import src.memory.outcome_verifier as outcome_verifier_module
+import src.memory.proposal_engine as proposal_engine_module
+import src.memory.storage_v2 as storage_v2_module
+from src.memory.verification_scheduler import SamplingPlan, TimerWheel, VerificationScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _health(score=80.0):
+    return {
+        "health_score": score,
+        "open_issues": 0,
+        "status": "healthy",
+        "recent_stats": {"total_errors": 0, "avg_duration_ms": 100.0, "success_rate": 0.9},
+    }
+
+
+def test_timer_wheel_returns_due_items_in_order():
+    clock = FakeClock()
+    wheel = TimerWheel(tick_seconds=1.0, slots=8, clock=clock)
+    wheel.schedule(clock.now + 3, "c")
+    wheel.schedule(clock.now + 1, "a")
+    wheel.schedule(clock.now + 2, "b")
+    wheel.schedule(clock.now + 20, "far")
+
+    assert wheel.next_due() == clock.now + 1
+    assert wheel.advance(clock.now + 0.5) == []
+    assert wheel.advance(clock.now + 3) == ["a", "b", "c"]
+    assert len(wheel) == 1
+    assert wheel.advance(clock.now + 19) == []
+    assert wheel.advance(clock.now + 25) == ["far"]
+    assert wheel.next_due() is None
+
+
+def test_parallel_plans_share_samples_without_threads():
+    clock = FakeClock()
+    calls = []
+    finished = []
+
+    def sampler():
+        calls.append(clock.now)
+        return _health()
+
+    scheduler = VerificationScheduler(
+        sampler=sampler,
+        finalize=lambda plan: {"ok": True, "key": plan.key, "samples": len(plan.samples)},
+        tick_seconds=0.5,
+        clock=clock,
+    )
+    for i in range(200):
+        scheduler.register(SamplingPlan(key=f"run_{i}", sample_target=3, interval_seconds=10.0, context={},
+                                        on_complete=finished.append))
+
+    assert scheduler.poll() == []
+    assert len(calls) == 1
+    assert scheduler.next_due_in() == 10.0
+    clock.now += 10
+    scheduler.poll()
+    clock.now += 10
+    done = scheduler.poll()
+
+    assert len(calls) == 3
+    assert len(done) == 200 and len(finished) == 200
+    assert all(row["samples"] == 3 for row in done)
+    assert scheduler.pending == {}
+
+
+def test_scheduled_verification_does_not_block_on_sampling(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_v2_module.LearningStorageV2, "_instance", None)
+    storage = storage_v2_module.LearningStorageV2(base_path=str(tmp_path))
+    monkeypatch.setattr(storage_v2_module, "_storage_v2", storage)
+    monkeypatch.setattr(proposal_engine_module, "_engine_v2", None)
+    monkeypatch.setattr(outcome_verifier_module, "health_check", lambda: _health(85.0))
+    monkeypatch.setenv("VERIFICATION_HOLDOUT_ENABLED", "false")
+    monkeypatch.setenv("VERIFICATION_MULTI_SAMPLE_COUNT", "3")
+    monkeypatch.setenv("VERIFICATION_MULTI_SAMPLE_INTERVAL_SECONDS", "5")
+    verifier = outcome_verifier_module.OutcomeVerifier()
+
+    storage.add_experiment_run({
+        "id": "run_async",
+        "proposal_id": "",
+        "artifacts": {"baseline_health": _health(80.0), "execution_success": True},
+    })
+    verdicts = []
+    started = time.perf_counter()
+    scheduled = verifier.schedule_verification("run_async", on_complete=verdicts.append)
+    assert time.perf_counter() - started < 1.0
+    assert scheduled["scheduled"] is True
+    assert verifier.is_verification_pending("run_async")
+    assert storage.get_experiment_run("run_async")["verification"]["pending_recheck"] is True
+
+    now = time.monotonic()
+    verifier.poll_verifications(now)
+    verifier.poll_verifications(now + 5)
+    assert verdicts == []
+    verifier.poll_verifications(now + 10)
+
+    assert len(verdicts) == 1 and verdicts[0]["ok"] is True
+    evidence = verdicts[0]["evidence"]
+    assert evidence["verification_sampling"]["sample_count"] == 3
+    assert evidence["delta"]["health_score"] == 5.0
+    assert storage.get_experiment_run("run_async")["verification"]["evidence_id"] == verdicts[0]["evidence_id"]
+    assert verifier.pending_verifications() == 0
+
+
+def test_register_and_poll_from_several_threads():
+    import threading
+
+    scheduler = VerificationScheduler(
+        sampler=_health,
+        finalize=lambda plan: {"ok": True, "key": plan.key},
+        tick_seconds=0.001,
+    )
+    finished = []
+    stop = threading.Event()
+
+    def register(worker):
+        for i in range(100):
+            scheduler.register(SamplingPlan(f"{worker}-{i}", 2, 0.0, {}, on_complete=finished.append))
+
+    def poll():
+        while not stop.is_set():
+            scheduler.poll()
+
+    pollers = [threading.Thread(target=poll) for _ in range(2)]
+    registrars = [threading.Thread(target=register, args=(w,)) for w in range(4)]
+    for t in pollers + registrars:
+        t.start()
+    for t in registrars:
+        t.join()
+    scheduler.drain(timeout_seconds=10, sleep=lambda s: time.sleep(0.001))
+    stop.set()
+    for t in pollers:
+        t.join()
+
+    assert scheduler.pending_count() == 0
+    assert sorted(r["key"] for r in finished) == sorted(f"{w}-{i}" for w in range(4) for i in range(100))
+    assert scheduler.stats["completed"] == 400 and scheduler.stats["errors"] == 0
+
+
+def test_fold_counts_only_real_verdicts():
+    import threading
+    from types import SimpleNamespace
+
+    from src.memory.learning_loop import LearningLoop
+
+    loop = SimpleNamespace(
+        completed_verifications=[
+            {"verdict": "win", "pending_recheck": False},
+            {"verdict": "scheduled", "pending_recheck": False},
+            {"verdict": "loss", "pending_recheck": True},
+            {"verdict": "inconclusive", "pending_recheck": False},
+        ],
+        _completed_verifications_lock=threading.Lock(),
+    )
+    folded = LearningLoop._fold_completed_verifications(loop, {"verified": 1})
+    assert folded == {"verified": 3, "wins": 1, "losses": 1, "inconclusive": 1}
+    assert loop.completed_verifications == []
@@ -0,0 +1,185 @@
+"""Tests for WisdomHub persistence and indexed queries."""
+
+import json
+import sqlite3
+import threading
+from dataclasses import asdict
+
+import pytest
+
+from wisdom import WisdomHub
+from wisdom.store import pattern_key
+
+
+@pytest.fixture()
+def hub(tmp_path):
+    h = WisdomHub(str(tmp_path))
+    yield h
+    h.close()
+
+
+def test_pattern_key_is_name_based():
+    assert pattern_key("Retry With Backoff") == pattern_key("  retry-with  backoff! ")
+    assert pattern_key("a") != pattern_key("b")
+
+
+def test_repeated_pattern_is_merged(hub):
+    hub.record_pattern("Cache results", "optimization", "memoize", project_id="p1")
+    hub.record_pattern("cache results", "optimization", "memoize", project_id="p2")
+    p = hub.record_pattern("Cache Results", "optimization", "memoize", project_id="p2", success=False)
+
+    assert len(hub.patterns) == 1
+    assert (p.success_count, p.failure_count) == (2, 1)
+    assert p.projects_used_in == ["p1", "p2"]
+    assert hub.get_pattern("cache results") is p
+
+
+def test_state_survives_reopen(tmp_path):
+    hub = WisdomHub(str(tmp_path))
+    hub.record_pattern("Use WAL", "architecture", "sqlite wal")
+    hub.record_pattern("Use WAL", "architecture", "sqlite wal")
+    hub.create_insight("Batch writes", "d", "optimization", ["e"], ["do it"], ["p1"])
+    hub.record_lesson("no index", "full scans", "add index", "critical", "p1")
+    hub.close()
+
+    reopened = WisdomHub(str(tmp_path))
+    try:
+        assert reopened.get_pattern("use wal").success_count == 2
+        assert [i.title for i in reopened.get_actionable_insights()] == ["Batch writes"]
+        assert reopened.get_critical_lessons()[0].how_to_avoid == "add index"
+        # Ids continue after reload
+        assert reopened.record_lesson("x", "y", "z", "minor", "p1").lesson_id == "LES-0002"
+    finally:
+        reopened.close()
+
+
+def test_indexed_queries(hub):
+    for n in range(20):
+        for _ in range(n % 4 + 1):
+            hub.record_pattern(f"pattern {n}", f"cat{n % 3}", "d", success=n % 5 != 0)
+
+    by_cat = hub.get_patterns_by_category("cat1")
+    assert [p.name for p in by_cat] == [f"pattern {n}" for n in range(20) if n % 3 == 1]
+
+    best = hub.get_best_patterns(min_confidence=0.7, limit=5)
+    expected = sorted(
+        (p for p in hub.patterns.values() if p.confidence >= 0.7 and p.success_count >= 2),
+        key=lambda p: (p.confidence, p.success_count), reverse=True,
+    )[:5]
+    assert [(p.confidence, p.success_count) for p in best] == [(p.confidence, p.success_count) for p in expected]
+
+    hub.create_insight("a", "d", "c", [], [], [])
+    hub.create_insight("b", "d", "c", [], ["act"], [])
+    assert [i.title for i in hub.get_actionable_insights()] == ["b"]
+
+    hub.record_lesson("1", "", "", "minor", "p")
+    hub.record_lesson("2", "", "", "major", "p")
+    hub.record_lesson("3", "", "", "critical", "p")
+    recs = hub.get_recommendations_for_project()
+    assert [lesson["what"] for lesson in recs["lessons_to_avoid"]] == ["2", "3"]
+
+
+def test_legacy_json_imported_once(tmp_path):
+    patterns_dir = tmp_path / "wisdom" / "patterns"
+    patterns_dir.mkdir(parents=True)
+    base = {
+        "category": "code", "description": "d", "code_example": None, "confidence": 1.0,
+        "first_seen": "2026-01-01T00:00:00", "last_seen": "2026-01-02T00:00:00", "metadata": {},
+    }
+    (patterns_dir / "patterns.json").write_text(json.dumps({"patterns": {
+        "PAT-guard_clause_0": dict(base, pattern_id="PAT-guard_clause_0", name="Guard Clause",
+                                   success_count=1, failure_count=0, projects_used_in=["a"]),
+        "PAT-guard_clause_1": dict(base, pattern_id="PAT-guard_clause_1", name="Guard Clause",
+                                   success_count=2, failure_count=1, projects_used_in=["b"],
+                                   last_seen="2026-02-01T00:00:00"),
+    }}), encoding="utf-8")
+    (patterns_dir / "lessons.json").write_text(json.dumps({"lessons": [{
+        "lesson_id": "LES-0001", "what_failed": "w", "why_it_failed": "y", "how_to_avoid": "h",
+        "severity": "critical", "project": "a", "timestamp": "2026-01-01T00:00:00",
+    }]}), encoding="utf-8")
+
+    hub = WisdomHub(str(tmp_path))
+    try:
+        merged = hub.get_pattern("guard clause")
+        assert len(hub.patterns) == 1
+        assert (merged.success_count, merged.failure_count) == (3, 1)
+        assert merged.projects_used_in == ["a", "b"]
+        assert merged.last_seen == "2026-02-01T00:00:00"
+        assert len(hub.lessons) == 1
+    finally:
+        hub.close()
+
+    # A second open does not import again
+    hub = WisdomHub(str(tmp_path))
+    try:
+        assert len(hub.lessons) == 1
+        assert hub.get_pattern("guard clause").success_count == 3
+    finally:
+        hub.close()
+
+
+def test_learn_from_project_single_transaction(hub):
+    hub.learn_from_project("proj", {
+        "patterns_used": [{"name": "Pool connections", "category": "architecture"}] * 3,
+        "failures": [{"what": "leak", "why": "no close", "avoidance": "use with", "severity": "critical"}],
+        "improvements_made": [{"category": "perf", "description": "faster parser caching tokens"}] * 3,
+    })
+    assert hub.get_pattern("pool connections").success_count == 3
+    assert len(hub.get_critical_lessons()) == 1
+    assert len(hub.get_actionable_insights()) == 1
+
+
+def test_concurrent_records_get_unique_ids(hub):
+    def worker(t):
+        for i in range(25):
+            hub.create_insight(f"{t}-{i}", "d", "c", [], ["act"], [])
+            hub.record_lesson(f"{t}-{i}", "", "", "minor", "p")
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert len({i.insight_id for i in hub.insights}) == 100
+    assert len({lesson.lesson_id for lesson in hub.lessons}) == 100
+    assert hub._store.counts() == {"patterns": 0, "insights": 100, "lessons": 100}
+
+
+def test_closing_one_hub_keeps_the_shared_engine_open(tmp_path):
+    first = WisdomHub(str(tmp_path))
+    second = WisdomHub(str(tmp_path))
+    first.close()
+    first.close()
+    second.record_pattern("Still open", "code", "d")
+    second.close()
+    assert second._store._engine._closed
+
+
+def test_two_hubs_on_one_store_see_each_others_records(tmp_path):
+    first = WisdomHub(str(tmp_path))
+    second = WisdomHub(str(tmp_path))
+    try:
+        first.record_pattern("Retry with backoff", "resilience", "d")
+        second.record_pattern("Retry with backoff", "resilience", "d")
+        first.record_pattern("Retry with backoff", "resilience", "d")
+        assert [p.success_count for p in second.get_best_patterns()] == [3]
+
+        a = first.create_insight("from first", "d", "c", [], ["act"], [])
+        b = second.create_insight("from second", "d", "c", [], ["act"], [])
+        assert (a.insight_id, b.insight_id) == ("INS-0001", "INS-0002")
+        assert [i.title for i in first.get_actionable_insights()] == ["from first", "from second"]
+
+        first.record_lesson("w1", "", "", "critical", "p")
+        second.record_lesson("w2", "", "", "critical", "p")
+        assert [lesson.what_failed for lesson in second.get_critical_lessons()] == ["w1", "w2"]
+        assert first._store.counts() == {"patterns": 1, "insights": 2, "lessons": 2}
+    finally:
+        first.close()
+        second.close()
+
+
+def test_duplicate_insight_id_fails_loudly(hub):
+    insight = hub.create_insight("original", "d", "c", [], ["act"], [])
+    with pytest.raises(sqlite3.IntegrityError):
+        hub._store.insert_insight(dict(asdict(insight), title="overwrite"))
+    assert [i.title for i in hub.get_actionable_insights()] == ["original"]
@@ -12,9 +12,14 @@ Features:
     - Failure analysis to avoid repeating mistakes
     - Cross-project knowledge transfer
     - Insight generation
+
+Storage:
+    Records live in wisdom/wisdom.db (see wisdom.store). Each change
+    writes one row; ranking, actionable and severity queries run against
+    SQLite indexes, category lookups against an in-memory index. Patterns are keyed by their name, so
+    recording the same pattern again updates it instead of adding a copy.
 """
 
-import json
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -23,6 +28,8 @@ from dataclasses import dataclass, field, asdict
 import threading
 from collections import defaultdict
 
+from .store import WisdomStore, pattern_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -91,79 +98,71 @@ class WisdomHub:
 
         # Storage paths
         self.wisdom_dir = self.project_root / "wisdom"
+        self.db_path = self.wisdom_dir / "wisdom.db"
+        # Legacy JSON files, imported once into an empty store
         self.patterns_file = self.wisdom_dir / "patterns" / "patterns.json"
         self.insights_file = self.wisdom_dir / "insights" / "insights.json"
         self.lessons_file = self.wisdom_dir / "patterns" / "lessons.json"
 
-        # Ensure directories exist
-        for f in [self.patterns_file, self.insights_file, self.lessons_file]:
-            f.parent.mkdir(parents=True, exist_ok=True)
+        self._store = WisdomStore(self.db_path)
 
-        # Data storage
+        # Data storage (in-memory view of the store)
         self.patterns: Dict[str, Pattern] = {}
         self.insights: List[Insight] = []
         self.lessons: List[Lesson] = []
+        self._patterns_by_category: Dict[str, Dict[str, Pattern]] = defaultdict(dict)
 
         self._load()
 
     def _load(self):
-        """Load wisdom from files."""
-        # Load patterns
-        if self.patterns_file.exists():
-            try:
-                with open(self.patterns_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.patterns = {k: Pattern(**v) for k, v in data.get("patterns", {}).items()}
-            except Exception as e:
-                logger.warning(f"Failed to load patterns: {e}")
-
-        # Load insights
-        if self.insights_file.exists():
-            try:
-                with open(self.insights_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.insights = [Insight(**i) for i in data.get("insights", [])]
-            except Exception as e:
-                logger.warning(f"Failed to load insights: {e}")
-
-        # Load lessons
-        if self.lessons_file.exists():
-            try:
-                with open(self.lessons_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                self.lessons = [Lesson(**l) for l in data.get("lessons", [])]
-            except Exception as e:
-                logger.warning(f"Failed to load lessons: {e}")
+        """Load wisdom from the store (importing legacy JSON on first use)."""
+        try:
+            self._store.import_legacy_json(self.patterns_file, self.insights_file, self.lessons_file)
+        except Exception as e:
+            logger.warning(f"Failed to import legacy wisdom JSON: {e}")
+
+        try:
+            self.patterns = {k: Pattern(**v) for k, v in self._store.load_patterns().items()}
+        except Exception as e:
+            logger.warning(f"Failed to load patterns: {e}")
+
+        try:
+            self.insights = [Insight(**i) for i in self._store.load_insights()]
+        except Exception as e:
+            logger.warning(f"Failed to load insights: {e}")
+
+        try:
+            self.lessons = [Lesson(**lesson) for lesson in self._store.load_lessons()]
+        except Exception as e:
+            logger.warning(f"Failed to load lessons: {e}")
+
+        for key, pattern in self.patterns.items():
+            self._patterns_by_category[pattern.category][key] = pattern
 
     def _save(self):
-        """Save wisdom to files."""
-        with self._lock:
-            # Save patterns
-            data = {
-                "last_updated": datetime.now().isoformat(),
-                "total_patterns": len(self.patterns),
-                "patterns": {k: asdict(v) for k, v in self.patterns.items()}
-            }
-            with open(self.patterns_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-
-            # Save insights
-            data = {
-                "last_updated": datetime.now().isoformat(),
-                "total_insights": len(self.insights),
-                "insights": [asdict(i) for i in self.insights]
-            }
-            with open(self.insights_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-
-            # Save lessons
-            data = {
-                "last_updated": datetime.now().isoformat(),
-                "total_lessons": len(self.lessons),
-                "lessons": [asdict(l) for l in self.lessons]
-            }
-            with open(self.lessons_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+        """Write every record to the store (records are normally saved as they change)."""
+        with self._lock, self._store.transaction():
+            for key, pattern in self.patterns.items():
+                self._store.upsert_pattern(key, asdict(pattern))
+            for insight in self.insights:
+                self._store.insert_insight(asdict(insight), ignore_existing=True)
+            for lesson in self.lessons:
+                self._store.insert_lesson(asdict(lesson), ignore_existing=True)
+
+    def close(self):
+        """Close the underlying store."""
+        self._store.close()
+
+    def _cache_pattern(self, key: str, data: Dict) -> Pattern:
+        """Refresh the in-memory pattern from a store row (other hubs may share the store)."""
+        pattern = self.patterns.get(key)
+        if pattern is None:
+            pattern = self.patterns[key] = Pattern(**data)
+        else:
+            for name, value in data.items():
+                setattr(pattern, name, value)
+        self._patterns_by_category[pattern.category][key] = pattern
+        return pattern
 
     # ==================== PATTERN MANAGEMENT ====================
 
@@ -176,52 +175,60 @@ class WisdomHub:
         project_id: str = "nexus",
         success: bool = True
     ) -> Pattern:
-        """Record a pattern (success or failure)."""
-        pattern_id = f"PAT-{name.replace(' ', '_').lower()}_{len(self.patterns)}"
-
-        if pattern_id in self.patterns:
-            # Update existing pattern
-            pattern = self.patterns[pattern_id]
-            if success:
-                pattern.success_count += 1
+        """Record a pattern (success or failure). Patterns with the same name are merged."""
+        pattern_id = pattern_key(name)
+
+        with self._lock, self._store.transaction():
+            row = self._store.get_pattern(pattern_id)
+            if row is not None:
+                # Update existing pattern, starting from the stored counts
+                pattern = self._cache_pattern(pattern_id, row)
+                if success:
+                    pattern.success_count += 1
+                else:
+                    pattern.failure_count += 1
+                pattern.confidence = pattern.success_count / (pattern.success_count + pattern.failure_count)
+                pattern.last_seen = datetime.now().isoformat()
+                if project_id not in pattern.projects_used_in:
+                    pattern.projects_used_in.append(project_id)
             else:
-                pattern.failure_count += 1
-            pattern.confidence = pattern.success_count / (pattern.success_count + pattern.failure_count)
-            pattern.last_seen = datetime.now().isoformat()
-            if project_id not in pattern.projects_used_in:
-                pattern.projects_used_in.append(project_id)
-        else:
-            # Create new pattern
-            now = datetime.now().isoformat()
-            pattern = Pattern(
-                pattern_id=pattern_id,
-                name=name,
-                category=category,
-                description=description,
-                code_example=code_example,
-                success_count=1 if success else 0,
-                failure_count=0 if success else 1,
-                confidence=1.0 if success else 0.0,
-                projects_used_in=[project_id],
-                first_seen=now,
-                last_seen=now
-            )
-            self.patterns[pattern_id] = pattern
-
-        self._save()
+                # Create new pattern
+                now = datetime.now().isoformat()
+                pattern = Pattern(
+                    pattern_id=pattern_id,
+                    name=name,
+                    category=category,
+                    description=description,
+                    code_example=code_example,
+                    success_count=1 if success else 0,
+                    failure_count=0 if success else 1,
+                    confidence=1.0 if success else 0.0,
+                    projects_used_in=[project_id],
+                    first_seen=now,
+                    last_seen=now
+                )
+                self.patterns[pattern_id] = pattern
+                self._patterns_by_category[category][pattern_id] = pattern
+
+            self._store.upsert_pattern(pattern_id, asdict(pattern))
         return pattern
 
+    def get_pattern(self, name: str) -> Optional[Pattern]:
+        """Get a pattern by name."""
+        return self.patterns.get(pattern_key(name))
+
     def get_patterns_by_category(self, category: str) -> List[Pattern]:
         """Get patterns by category."""
-        return [p for p in self.patterns.values() if p.category == category]
+        with self._lock:
+            return list(self._patterns_by_category.get(category, {}).values())
 
     def get_best_patterns(self, min_confidence: float = 0.7, limit: int = 10) -> List[Pattern]:
         """Get best patterns sorted by confidence and usage."""
-        patterns = [
-            p for p in self.patterns.values()
-            if p.confidence >= min_confidence and p.success_count >= 2
-        ]
-        return sorted(patterns, key=lambda x: (x.confidence, x.success_count), reverse=True)[:limit]
+        with self._lock:
+            return [
+                self._cache_pattern(key, row)
+                for key, row in self._store.best_patterns(min_confidence, 2, limit).items()
+            ]
 
     # ==================== INSIGHT MANAGEMENT ====================
 
@@ -236,30 +243,30 @@ class WisdomHub:
         confidence: float = 0.7
     ) -> Insight:
         """Create a new insight."""
-        insight_num = len(self.insights) + 1
-        insight_id = f"INS-{insight_num:04d}"
-
-        insight = Insight(
-            insight_id=insight_id,
-            title=title,
-            description=description,
-            category=category,
-            evidence=evidence,
-            actionable=len(action_items) > 0,
-            action_items=action_items,
-            confidence=confidence,
-            created_at=datetime.now().isoformat(),
-            projects_involved=projects_involved
-        )
-
-        self.insights.append(insight)
-        self._save()
+        # Ids come from the table inside the write transaction, so hubs sharing the
+        # store never reuse one; a collision fails the plain INSERT instead of overwriting.
+        with self._lock, self._store.transaction():
+            insight_id = f"INS-{self._store.next_seq('insights'):04d}"
+            insight = Insight(
+                insight_id=insight_id,
+                title=title,
+                description=description,
+                category=category,
+                evidence=evidence,
+                actionable=len(action_items) > 0,
+                action_items=action_items,
+                confidence=confidence,
+                created_at=datetime.now().isoformat(),
+                projects_involved=projects_involved
+            )
+            self._store.insert_insight(asdict(insight))
+            self.insights.append(insight)
 
         return insight
 
-    def get_actionable_insights(self) -> List[Insight]:
-        """Get insights that have action items."""
-        return [i for i in self.insights if i.actionable]
+    def get_actionable_insights(self, limit: int = -1) -> List[Insight]:
+        """Get insights that have action items (oldest first; limit -1 for all)."""
+        return [Insight(**row) for row in self._store.actionable_insights(limit)]
 
     # ==================== LESSON MANAGEMENT ====================
 
@@ -272,27 +279,29 @@ class WisdomHub:
         project: str
     ) -> Lesson:
         """Record a lesson learned from failure."""
-        lesson_num = len(self.lessons) + 1
-        lesson_id = f"LES-{lesson_num:04d}"
-
-        lesson = Lesson(
-            lesson_id=lesson_id,
-            what_failed=what_failed,
-            why_it_failed=why_it_failed,
-            how_to_avoid=how_to_avoid,
-            severity=severity,
-            project=project,
-            timestamp=datetime.now().isoformat()
-        )
-
-        self.lessons.append(lesson)
-        self._save()
+        with self._lock, self._store.transaction():
+            lesson_id = f"LES-{self._store.next_seq('lessons'):04d}"
+            lesson = Lesson(
+                lesson_id=lesson_id,
+                what_failed=what_failed,
+                why_it_failed=why_it_failed,
+                how_to_avoid=how_to_avoid,
+                severity=severity,
+                project=project,
+                timestamp=datetime.now().isoformat()
+            )
+            self._store.insert_lesson(asdict(lesson))
+            self.lessons.append(lesson)
 
         return lesson
 
+    def get_lessons_by_severity(self, *severities: str, limit: int = -1) -> List[Lesson]:
+        """Get lessons with any of the given severities (oldest first; limit -1 for all)."""
+        return [Lesson(**row) for row in self._store.lessons_by_severity(severities, limit)]
+
     def get_critical_lessons(self) -> List[Lesson]:
         """Get critical lessons (must avoid)."""
-        return [l for l in self.lessons if l.severity == "critical"]
+        return self.get_lessons_by_severity("critical")
 
     # ==================== CROSS-PROJECT LEARNING ====================
 
@@ -308,31 +317,33 @@ class WisdomHub:
                 - failures: List of failures
                 - benchmarks: Benchmark results
         """
-        # Extract successful patterns
-        for pattern_data in project_data.get("patterns_used", []):
-            self.record_pattern(
-                name=pattern_data.get("name", "unknown"),
-                category=pattern_data.get("category", "code"),
-                description=pattern_data.get("description", ""),
-                code_example=pattern_data.get("code_example"),
-                project_id=project_id,
-                success=pattern_data.get("success", True)
-            )
-
-        # Extract lessons from failures
-        for failure in project_data.get("failures", []):
-            self.record_lesson(
-                what_failed=failure.get("what", "unknown"),
-                why_it_failed=failure.get("why", "unknown"),
-                how_to_avoid=failure.get("avoidance", "unknown"),
-                severity=failure.get("severity", "major"),
-                project=project_id
-            )
-
-        # Generate insights from improvements
-        improvements = project_data.get("improvements_made", [])
-        if len(improvements) >= 3:
-            self._generate_insights_from_improvements(project_id, improvements)
+        # One transaction for the whole project
+        with self._lock, self._store.transaction():
+            # Extract successful patterns
+            for pattern_data in project_data.get("patterns_used", []):
+                self.record_pattern(
+                    name=pattern_data.get("name", "unknown"),
+                    category=pattern_data.get("category", "code"),
+                    description=pattern_data.get("description", ""),
+                    code_example=pattern_data.get("code_example"),
+                    project_id=project_id,
+                    success=pattern_data.get("success", True)
+                )
+
+            # Extract lessons from failures
+            for failure in project_data.get("failures", []):
+                self.record_lesson(
+                    what_failed=failure.get("what", "unknown"),
+                    why_it_failed=failure.get("why", "unknown"),
+                    how_to_avoid=failure.get("avoidance", "unknown"),
+                    severity=failure.get("severity", "major"),
+                    project=project_id
+                )
+
+            # Generate insights from improvements
+            improvements = project_data.get("improvements_made", [])
+            if len(improvements) >= 3:
+                self._generate_insights_from_improvements(project_id, improvements)
 
         logger.info(f"Learned from project {project_id}: {len(project_data.get('patterns_used', []))} patterns, "
                    f"{len(project_data.get('failures', []))} lessons")
@@ -392,10 +403,10 @@ class WisdomHub:
         recommended = self.get_best_patterns(min_confidence=0.6, limit=5)
 
         # Get relevant lessons
-        lessons_to_avoid = [l for l in self.lessons if l.severity in ["critical", "major"]]
+        lessons_to_avoid = self.get_lessons_by_severity("critical", "major", limit=10)
 
         # Get actionable insights
-        insights = self.get_actionable_insights()[:5]
+        insights = self.get_actionable_insights(limit=5)
 
         return {
             "recommended_patterns": [
@@ -404,7 +415,7 @@ class WisdomHub:
             ],
             "lessons_to_avoid": [
                 {"what": l.what_failed, "avoidance": l.how_to_avoid}
-                for l in lessons_to_avoid[:10]
+                for l in lessons_to_avoid
             ],
             "insights_to_consider": [
                 {"title": i.title, "actions": i.action_items}
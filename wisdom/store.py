@@ -0,0 +1,285 @@
+"""
+Wisdom Store
+============
+
+SQLite persistence for WisdomHub patterns, insights and lessons.
+
+- One row per record, written as it changes (no full-file rewrites)
+- Patterns are keyed by a stable slug of their name, so repeated
+  recordings of the same pattern update one row
+- Secondary indexes: patterns by category and by (confidence,
+  success_count); insights by actionable flag; lessons by severity
+- Runs on the shared state engine (src/core/state_engine.py): WAL
+  journal, one connection per thread, nested batched transactions
+
+The first open of an empty store imports the legacy JSON files
+(patterns.json, insights.json, lessons.json) if they exist, merging
+duplicate patterns that the old counter-suffixed ids had split.
+"""
+
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from core.state_engine import get_state_engine, release_state_engine  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS patterns (
+    pattern_key      TEXT PRIMARY KEY,
+    pattern_id       TEXT NOT NULL,
+    name             TEXT NOT NULL,
+    category         TEXT NOT NULL,
+    description      TEXT,
+    code_example     TEXT,
+    success_count    INTEGER NOT NULL DEFAULT 0,
+    failure_count    INTEGER NOT NULL DEFAULT 0,
+    confidence       REAL NOT NULL DEFAULT 0,
+    projects_used_in TEXT NOT NULL DEFAULT '[]',
+    first_seen       TEXT,
+    last_seen        TEXT,
+    metadata         TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_patterns_category ON patterns (category);
+CREATE INDEX IF NOT EXISTS idx_patterns_rank ON patterns (confidence DESC, success_count DESC);
+
+CREATE TABLE IF NOT EXISTS insights (
+    seq               INTEGER PRIMARY KEY AUTOINCREMENT,
+    insight_id        TEXT UNIQUE NOT NULL,
+    title             TEXT,
+    description       TEXT,
+    category          TEXT,
+    evidence          TEXT NOT NULL DEFAULT '[]',
+    actionable        INTEGER NOT NULL DEFAULT 0,
+    action_items      TEXT NOT NULL DEFAULT '[]',
+    confidence        REAL NOT NULL DEFAULT 0,
+    created_at        TEXT,
+    projects_involved TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_insights_actionable ON insights (actionable, seq);
+
+CREATE TABLE IF NOT EXISTS lessons (
+    seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+    lesson_id     TEXT UNIQUE NOT NULL,
+    what_failed   TEXT,
+    why_it_failed TEXT,
+    how_to_avoid  TEXT,
+    severity      TEXT,
+    project       TEXT,
+    timestamp     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_lessons_severity ON lessons (severity, seq);
+"""
+
+_PATTERN_COLUMNS = (
+    "pattern_key", "pattern_id", "name", "category", "description", "code_example", "success_count",
+    "failure_count", "confidence", "projects_used_in", "first_seen", "last_seen", "metadata",
+)
+_INSIGHT_COLUMNS = (
+    "insight_id", "title", "description", "category", "evidence", "actionable", "action_items",
+    "confidence", "created_at", "projects_involved",
+)
+_LESSON_COLUMNS = (
+    "lesson_id", "what_failed", "why_it_failed", "how_to_avoid", "severity", "project", "timestamp",
+)
+_PATTERN_JSON_FIELDS = ("projects_used_in", "metadata")
+_INSIGHT_JSON_FIELDS = ("evidence", "action_items", "projects_involved")
+
+
+def _insert_sql(table: str, columns: Tuple[str, ...], ignore_existing: bool = False) -> str:
+    """Plain INSERT: a duplicate key raises unless ``ignore_existing`` skips it."""
+    verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"
+
+
+def _upsert_sql(table: str, key: str, columns: Tuple[str, ...]) -> str:
+    """INSERT that updates in place on key conflict (keeps rowid/seq, unlike OR REPLACE)."""
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)}) "
+        f"ON CONFLICT({key}) DO UPDATE SET {updates}"
+    )
+
+
+def pattern_key(name: str) -> str:
+    """Stable key for a pattern name: case, spacing and punctuation insensitive."""
+    slug = re.sub(r"[^0-9a-z]+", "_", name.strip().lower()).strip("_")
+    return f"PAT-{slug or 'unnamed'}"
+
+
+class WisdomStore:
+    """Row-level SQLite storage for the wisdom hub."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._engine = get_state_engine(self.db_path)
+        self._closed = False
+        self._engine.connection().executescript(_SCHEMA)
+
+    def transaction(self):
+        """Group writes into one commit. Nested calls join the outer one."""
+        return self._engine.transaction()
+
+    def close(self) -> None:
+        """Release this store's reference; the engine closes with its last holder."""
+        if not self._closed:
+            self._closed = True
+            release_state_engine(self._engine)
+
+    # ── Writes ────────────────────────────────────────────────────
+
+    def upsert_pattern(self, key: str, pattern: Dict[str, Any]) -> None:
+        row = dict(pattern, pattern_key=key)
+        for name in _PATTERN_JSON_FIELDS:
+            row[name] = json.dumps(row.get(name) or ([] if name == "projects_used_in" else {}))
+        with self.transaction() as conn:
+            conn.execute(
+                _upsert_sql("patterns", "pattern_key", _PATTERN_COLUMNS),
+                row,
+            )
+
+    def next_seq(self, table: str) -> int:
+        """Sequence number the next insight/lesson row will get; call inside ``transaction()``."""
+        if table not in ("insights", "lessons"):
+            raise ValueError(f"no sequence for table {table!r}")
+        return self._rows(f"SELECT COALESCE(MAX(seq), 0) + 1 FROM {table}")[0][0]
+
+    def insert_insight(self, insight: Dict[str, Any], ignore_existing: bool = False) -> None:
+        """Insert one insight. A duplicate insight_id raises sqlite3.IntegrityError."""
+        row = dict(insight, actionable=1 if insight.get("actionable") else 0)
+        for name in _INSIGHT_JSON_FIELDS:
+            row[name] = json.dumps(row.get(name) or [])
+        with self.transaction() as conn:
+            conn.execute(_insert_sql("insights", _INSIGHT_COLUMNS, ignore_existing), row)
+
+    def insert_lesson(self, lesson: Dict[str, Any], ignore_existing: bool = False) -> None:
+        """Insert one lesson. A duplicate lesson_id raises sqlite3.IntegrityError."""
+        with self.transaction() as conn:
+            conn.execute(_insert_sql("lessons", _LESSON_COLUMNS, ignore_existing), lesson)
+
+    # ── Reads ─────────────────────────────────────────────────────
+
+    def _rows(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        return self._engine.connection().execute(sql, params).fetchall()
+
+    def _dicts(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        cursor = self._engine.connection().execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def _patterns(self, clause: str, params: Tuple = ()) -> Dict[str, Dict[str, Any]]:
+        patterns = {}
+        for data in self._dicts(f"SELECT * FROM patterns {clause}", params):
+            key = data.pop("pattern_key")
+            for name in _PATTERN_JSON_FIELDS:
+                data[name] = json.loads(data[name])
+            patterns[key] = data
+        return patterns
+
+    def _insights(self, clause: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        insights = []
+        for data in self._dicts(f"SELECT * FROM insights {clause}", params):
+            data.pop("seq")
+            data["actionable"] = bool(data["actionable"])
+            for name in _INSIGHT_JSON_FIELDS:
+                data[name] = json.loads(data[name])
+            insights.append(data)
+        return insights
+
+    def _lessons(self, clause: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        lessons = []
+        for data in self._dicts(f"SELECT * FROM lessons {clause}", params):
+            data.pop("seq")
+            lessons.append(data)
+        return lessons
+
+    def load_patterns(self) -> Dict[str, Dict[str, Any]]:
+        return self._patterns("ORDER BY rowid")
+
+    def load_insights(self) -> List[Dict[str, Any]]:
+        return self._insights("ORDER BY seq")
+
+    def load_lessons(self) -> List[Dict[str, Any]]:
+        return self._lessons("ORDER BY seq")
+
+    def get_pattern(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._patterns("WHERE pattern_key = ?", (key,)).get(key)
+
+    def best_patterns(self, min_confidence: float, min_success: int, limit: int) -> Dict[str, Dict[str, Any]]:
+        """Patterns by key, best first (dicts keep insertion order)."""
+        return self._patterns(
+            "WHERE confidence >= ? AND success_count >= ? "
+            "ORDER BY confidence DESC, success_count DESC LIMIT ?",
+            (min_confidence, min_success, limit),
+        )
+
+    def actionable_insights(self, limit: int = -1) -> List[Dict[str, Any]]:
+        return self._insights("WHERE actionable = 1 ORDER BY seq LIMIT ?", (limit,))
+
+    def lessons_by_severity(self, severities: Tuple[str, ...], limit: int = -1) -> List[Dict[str, Any]]:
+        marks = ",".join("?" * len(severities))
+        return self._lessons(f"WHERE severity IN ({marks}) ORDER BY seq LIMIT ?", (*severities, limit))
+
+    def counts(self) -> Dict[str, int]:
+        row = self._rows(
+            "SELECT (SELECT COUNT(*) FROM patterns), (SELECT COUNT(*) FROM insights), "
+            "(SELECT COUNT(*) FROM lessons)"
+        )[0]
+        return {"patterns": row[0], "insights": row[1], "lessons": row[2]}
+
+    # ── Legacy import ─────────────────────────────────────────────
+
+    def import_legacy_json(self, patterns_file: Path, insights_file: Path, lessons_file: Path) -> Dict[str, int]:
+        """Import the old JSON files into an empty store. Returns rows imported."""
+        if any(self.counts().values()):
+            return {"patterns": 0, "insights": 0, "lessons": 0}
+
+        patterns: Dict[str, Dict[str, Any]] = {}
+        for item in _read_json(patterns_file, "patterns", {}).values():
+            key = pattern_key(item.get("name", ""))
+            merged = patterns.get(key)
+            if merged is None:
+                patterns[key] = dict(item, pattern_id=key)
+                continue
+            merged["success_count"] += item.get("success_count", 0)
+            merged["failure_count"] += item.get("failure_count", 0)
+            total = merged["success_count"] + merged["failure_count"]
+            merged["confidence"] = merged["success_count"] / total if total else 0.0
+            merged["first_seen"] = min(merged["first_seen"], item.get("first_seen", merged["first_seen"]))
+            merged["last_seen"] = max(merged["last_seen"], item.get("last_seen", merged["last_seen"]))
+            for project in item.get("projects_used_in", []):
+                if project not in merged["projects_used_in"]:
+                    merged["projects_used_in"].append(project)
+
+        insights = _read_json(insights_file, "insights", [])
+        lessons = _read_json(lessons_file, "lessons", [])
+        with self.transaction():
+            for key, item in patterns.items():
+                item.setdefault("metadata", {})
+                self.upsert_pattern(key, item)
+            for item in insights:
+                self.insert_insight(item)
+            for item in lessons:
+                self.insert_lesson(item)
+
+        imported = {"patterns": len(patterns), "insights": len(insights), "lessons": len(lessons)}
+        if any(imported.values()):
+            logger.info(f"Imported legacy wisdom JSON into {self.db_path.name}: {imported}")
+        return imported
+
+
+def _read_json(path: Path, section: str, default: Any) -> Any:
+    if not path.exists():
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get(section, default)
+    except Exception as e:
+        logger.warning(f"Failed to read legacy {section} from {path}: {e}")
+        return default